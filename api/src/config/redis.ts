@@ -0,0 +1,47 @@
+import { createClient } from 'redis';
+
+// Optional cache: without REDIS_URL (or while Redis is down) every lookup misses
+// and routes read from Postgres instead
+const redisUrl = process.env.REDIS_URL;
+
+const redisClient = redisUrl
+  ? createClient({
+      url: redisUrl,
+      password: process.env.REDIS_PASSWORD || undefined,
+      socket: { connectTimeout: 2000 },
+    })
+  : null;
+
+redisClient?.on('error', (err) => console.error('Redis Client Error', err));
+
+// Connect in the background; the client reconnects on its own after a failure
+export const connectRedis = () => {
+  if (!redisClient) {
+    return;
+  }
+  redisClient.connect().catch((error) => {
+    console.error('Redis connection failed, serving from Postgres:', error);
+  });
+};
+
+export const cache = {
+  // Parsed JSON value of a key, or null on a miss or when Redis is unavailable
+  async getJson<T = any>(key: string): Promise<T | null> {
+    if (!redisClient?.isReady) {
+      return null;
+    }
+    try {
+      const value = await redisClient.get(key);
+      return value ? (JSON.parse(value) as T) : null;
+    } catch (error) {
+      console.error('Redis get failed:', error);
+      return null;
+    }
+  },
+};
+
+// Keys of the latest readings written by the web-scraping jobs (utils/redis_publisher.py)
+export const swellKey = (buoyId: number) => `swell:buoy:${buoyId}:latest`;
+export const windKey = (spotId: number) => `wind:spot:${spotId}:latest`;
+
+export default redisClient;
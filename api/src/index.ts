@@ -7,6 +7,7 @@ import rateLimit from 'express-rate-limit';
 import dotenv from 'dotenv';
 import { pool } from './config/database';
 import { ensureBucketsExist } from './config/minio';
+import { connectRedis } from './config/redis';
 import { errorHandler } from './middleware/errorHandler';
 
 import authRouter from './routes/auth';
@@ -78,6 +79,9 @@ const startServer = async () => {
     await ensureBucketsExist();
     console.log('MinIO buckets verified');
 
+    // Optional live-data cache; the API serves from Postgres until (or unless) it connects
+    connectRedis();
+
     app.listen(PORT, () => {
       console.log(`Server running on port ${PORT}`);
       console.log(`Environment: ${process.env.NODE_ENV || 'development'}`);
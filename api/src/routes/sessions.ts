@@ -59,13 +59,17 @@ async function fetchSwellSignature(session: any) {
             formattedSwellHeight = rounded % 1 === 0 ? `${Math.floor(rounded)}ft` : `${rounded.toFixed(1)}ft`;
           }
           
-          // Format wind direction
+          // Format wind and swell directions (both stored in whole degrees)
+          const directions = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE', 'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW'];
           let formattedWindDir = null;
           if (wind.wind_direction != null) {
-            const directions = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE', 'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW'];
             const index = Math.round(wind.wind_direction / 22.5) % 16;
             formattedWindDir = directions[index];
           }
+          let formattedSwellDir = null;
+          if (swell.swell_direction != null) {
+            formattedSwellDir = directions[Math.round(swell.swell_direction / 22.5) % 16];
+          }
           
           // Format tide height
           let formattedTide = null;
@@ -77,7 +81,7 @@ async function fetchSwellSignature(session: any) {
           return {
             swell_height: formattedSwellHeight,
             swell_period: swell.swell_period != null ? Math.round(swell.swell_period) : null,
-            swell_direction: swell.swell_direction || null,
+            swell_direction: formattedSwellDir,
             wind_speed: wind.wind_speed != null ? Math.round(wind.wind_speed) : null,
             wind_direction: formattedWindDir,
             tide_height: formattedTide
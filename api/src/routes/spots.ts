@@ -1,5 +1,6 @@
 import { Router } from 'express';
 import { query, analyticsQuery } from '../config/database';
+import { cache, swellKey, windKey } from '../config/redis';
 import { asyncHandler, ApiError } from '../middleware/errorHandler';
 
 const router = Router();
@@ -192,7 +193,7 @@ function getMostCommon(arr: any[], field: string): string | null {
   return Object.entries(counts).sort((a, b) => b[1] - a[1])[0][0];
 }
 
-// Helper to convert wind degrees to cardinal direction
+// Helper to convert wind or swell degrees to cardinal direction
 function degreesToCardinal(degrees: number): string {
   const directions = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE', 'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW'];
   const index = Math.round(degrees / 22.5) % 16;
@@ -230,18 +231,17 @@ router.get('/:id/live', asyncHandler(async (req, res) => {
     if (analyticsSpotResult.rows.length > 0) {
       const analyticsSpotId = analyticsSpotResult.rows[0].id;
       
-      // Get latest wind data for this spot
-      const windResult = await analyticsQuery(
+      // Get latest wind data for this spot (pushed to Redis by the wind scraper, Postgres on a miss)
+      const w = await cache.getJson(windKey(analyticsSpotId)) ?? (await analyticsQuery(
         `SELECT timestamp, wind_speed, wind_direction, wind_gust
          FROM ingested.wind_data
          WHERE spot_id = $1
          ORDER BY timestamp DESC
          LIMIT 1`,
         [analyticsSpotId]
-      );
+      )).rows[0];
       
-      if (windResult.rows.length > 0) {
-        const w = windResult.rows[0];
+      if (w) {
         const windDir = w.wind_direction != null ? degreesToCardinal(w.wind_direction) : null;
         const windSpeed = w.wind_speed != null ? Math.round(w.wind_speed) : null;
         windData = {
@@ -262,21 +262,21 @@ router.get('/:id/live', asyncHandler(async (req, res) => {
       if (buoyLinkResult.rows.length > 0) {
         const buoyId = buoyLinkResult.rows[0].buoy_id;
         
-        // Get latest swell data from linked buoy
-        const swellResult = await analyticsQuery(
+        // Get latest swell data from linked buoy (pushed to Redis by the swell scraper, Postgres on a miss)
+        const s = await cache.getJson(swellKey(buoyId)) ?? (await analyticsQuery(
           `SELECT timestamp, wave_height, swell_height, swell_period, swell_direction, tide
            FROM ingested.swell_data
            WHERE buoy_id = $1
            ORDER BY timestamp DESC
            LIMIT 1`,
           [buoyId]
-        );
+        )).rows[0];
         
-        if (swellResult.rows.length > 0) {
-          const s = swellResult.rows[0];
+        if (s) {
           const height = s.swell_height || s.wave_height;
           const period = s.swell_period != null ? Math.round(s.swell_period) : null;
-          const direction = s.swell_direction || null;
+          // swell_direction is stored in whole degrees
+          const direction = s.swell_direction != null ? degreesToCardinal(s.swell_direction) : null;
           
           swellData = {
             formatted: height != null ? `${formatHeight(height)}ft ${period}s ${direction || ''}`.trim() : null,
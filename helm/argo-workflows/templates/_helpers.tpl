@@ -66,3 +66,19 @@ Controller selector labels
 {{ include "argo-workflows.selectorLabels" . }}
 app.kubernetes.io/component: controller
 {{- end }}
+
+{{/*
+Scraper daemon labels
+*/}}
+{{- define "argo-workflows.scraperDaemon.labels" -}}
+{{ include "argo-workflows.labels" . }}
+app.kubernetes.io/component: scraper-daemon
+{{- end }}
+
+{{/*
+Scraper daemon selector labels
+*/}}
+{{- define "argo-workflows.scraperDaemon.selectorLabels" -}}
+{{ include "argo-workflows.selectorLabels" . }}
+app.kubernetes.io/component: scraper-daemon
+{{- end }}
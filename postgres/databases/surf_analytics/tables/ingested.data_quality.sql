@@ -0,0 +1,22 @@
+/*
+ * Table: data_quality
+ * 
+ * Description:
+ *  This table records readings that failed validation before insert.
+ *  Flagged readings were still inserted into their source table; quarantined readings
+ *  (out of range or missing required fields) were kept out of it and are only stored here.
+ *  The rules column lists every rule the reading violated (e.g. range:wave_height, spike:tide).
+ * 
+ * Modifications:
+ *   The table is modified by Argo (swell and wind scrapers) for hourly data inserts.
+ */
+CREATE TABLE IF NOT EXISTS ingested.data_quality (
+    source_table VARCHAR(255) NOT NULL,
+    station_id INT NOT NULL,
+    timestamp TIMESTAMPTZ NOT NULL,
+    status VARCHAR(16) NOT NULL CHECK (status IN ('flagged', 'quarantined')),
+    rules TEXT[] NOT NULL,
+    record JSONB NOT NULL,
+    recorded_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (source_table, station_id, timestamp)
+);
@@ -0,0 +1,35 @@
+/*
+ * Table: spot_conditions
+ * 
+ * Description:
+ *  This table stores precomputed spot-level conditions, so consumers do not need to join
+ *  spot_buoy_link, buoy_info, swell_data and wind_data themselves.
+ *  Swell fields are inverse-distance weighted averages of the latest readings of the spot's
+ *  linked buoys (directions are circular means in degrees); wind fields are the spot's latest
+ *  wind reading. One row is written per spot each time the conditions are computed.
+ * 
+ * Modifications:
+ *   The table is modified by Argo (spot conditions job) after each ingest.
+ */
+CREATE TABLE IF NOT EXISTS ingested.spot_conditions (
+    timestamp TIMESTAMPTZ NOT NULL,
+    spot_id INT NOT NULL,
+    buoy_count INT NOT NULL DEFAULT 0,
+    nearest_buoy_km FLOAT DEFAULT NULL,
+    swell_observed_at TIMESTAMPTZ DEFAULT NULL,
+    wave_height FLOAT DEFAULT NULL,
+    swell_height FLOAT DEFAULT NULL,
+    swell_period FLOAT DEFAULT NULL,
+    swell_direction FLOAT DEFAULT NULL,
+    wind_wave_height FLOAT DEFAULT NULL,
+    wind_wave_period FLOAT DEFAULT NULL,
+    wind_wave_direction FLOAT DEFAULT NULL,
+    average_wave_period FLOAT DEFAULT NULL,
+    tide FLOAT DEFAULT NULL,
+    wind_observed_at TIMESTAMPTZ DEFAULT NULL,
+    wind_speed FLOAT DEFAULT NULL,
+    wind_direction INT DEFAULT NULL,
+    wind_gust FLOAT DEFAULT NULL,
+    PRIMARY KEY (timestamp, spot_id),
+    FOREIGN KEY (spot_id) REFERENCES reference.spot_info(id) ON DELETE CASCADE
+);
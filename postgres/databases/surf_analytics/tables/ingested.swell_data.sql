@@ -8,6 +8,17 @@
  *  wave height, swell period, wind wave direction, and other 
  *  related metrics.
  * 
+ *  Directions are whole degrees [0, 360) and wave_steepness is a code:
+ *  1 = SWELL, 2 = AVERAGE, 3 = STEEP, 4 = VERY_STEEP (utils/encoding.py in
+ *  web-scraping). Tables created before this encoding are converted with
+ *  web-scraping/jobs/migrate_swell_encoding.py.
+ * 
+ *  tide_predicted is TRUE when the buoy reported no tide and the value was
+ *  predicted from its harmonic constituents (reference.tide_constituents).
+ * 
+ *  ingested_at is the insert time, the watermark of the Parquet export
+ *  (rows can be inserted long after their timestamp, e.g. from the spool).
+ * 
  * Modifications:
  *   The table is only modified by Argo for hourly data inserts.
  */
@@ -17,13 +28,23 @@ CREATE TABLE IF NOT EXISTS ingested.swell_data (
     wave_height FLOAT DEFAULT NULL,
     swell_height FLOAT DEFAULT NULL,
     swell_period FLOAT DEFAULT NULL,
-    swell_direction VARCHAR(255) DEFAULT NULL,
+    swell_direction SMALLINT DEFAULT NULL CHECK (swell_direction BETWEEN 0 AND 359),
     wind_wave_height FLOAT DEFAULT NULL,
     wind_wave_period FLOAT DEFAULT NULL,
-    wind_wave_direction VARCHAR(255) DEFAULT NULL,
-    wave_steepness VARCHAR(255) DEFAULT NULL,
+    wind_wave_direction SMALLINT DEFAULT NULL CHECK (wind_wave_direction BETWEEN 0 AND 359),
+    wave_steepness SMALLINT DEFAULT NULL CHECK (wave_steepness BETWEEN 1 AND 4),
     average_wave_period FLOAT DEFAULT NULL,
     tide FLOAT DEFAULT NULL,
+    tide_predicted BOOLEAN NOT NULL DEFAULT FALSE,
+    ingested_at TIMESTAMPTZ NOT NULL DEFAULT now(),
     PRIMARY KEY (timestamp, buoy_id),
     FOREIGN KEY (buoy_id) REFERENCES reference.buoy_info(id) ON DELETE CASCADE
 );
+
+-- Columns added after the table was first created
+ALTER TABLE ingested.swell_data
+    ADD COLUMN IF NOT EXISTS tide_predicted BOOLEAN NOT NULL DEFAULT FALSE,
+    ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMPTZ NOT NULL DEFAULT now();
+
+-- The Parquet export selects rows by insert time
+CREATE INDEX IF NOT EXISTS idx_swell_data_ingested_at ON ingested.swell_data(ingested_at);
@@ -0,0 +1,25 @@
+/*
+ * Table: swell_spectra
+ * 
+ * Description:
+ *  This table stores the NDBC spectral wave data of each buoy, one row per observation.
+ *  Each spectrum is kept as compact little-endian float32 arrays packed into bytea
+ *  (4 bytes per frequency band) so readers can decode them with numpy.frombuffer:
+ *    frequencies - band centre frequencies in Hz
+ *    energy      - spectral energy density per band in m^2/Hz (.data_spec)
+ *    direction   - mean wave direction (alpha1) per band in degrees, NaN where missing (.swdir)
+ *  The separation frequency is NDBC's split between swell and wind waves.
+ * 
+ * Modifications:
+ *   The table is only modified by Argo (swell scraper in spectra mode) for hourly inserts.
+ */
+CREATE TABLE IF NOT EXISTS ingested.swell_spectra (
+    timestamp TIMESTAMPTZ NOT NULL,
+    buoy_id INT NOT NULL,
+    separation_frequency REAL DEFAULT NULL,
+    frequencies BYTEA NOT NULL,
+    energy BYTEA NOT NULL,
+    direction BYTEA NOT NULL,
+    PRIMARY KEY (timestamp, buoy_id),
+    FOREIGN KEY (buoy_id) REFERENCES reference.buoy_info(id) ON DELETE CASCADE
+);
@@ -0,0 +1,20 @@
+/*
+ * Table: tide_predictions
+ * 
+ * Description:
+ *  This table stores predicted tide curves for every buoy with harmonic
+ *  constituents in reference.tide_constituents, one row per buoy and
+ *  prediction time (6-minute steps by default) over the days ahead. Heights
+ *  are in feet above MLLW, like the tide column of swell_data.
+ * 
+ * Modifications:
+ *   The table is modified by Argo (tide-predictions job), which upserts the
+ *   coming days and deletes predictions older than a day.
+ */
+CREATE TABLE IF NOT EXISTS ingested.tide_predictions (
+    buoy_id INT NOT NULL,
+    prediction_time TIMESTAMPTZ NOT NULL,
+    tide FLOAT NOT NULL,
+    PRIMARY KEY (buoy_id, prediction_time),
+    FOREIGN KEY (buoy_id) REFERENCES reference.buoy_info(id) ON DELETE CASCADE
+);
@@ -5,6 +5,7 @@
  *  This table stores wind data for various spots. 
  *  It is populated automatically by an Argo process or other data source, and new records are inserted based on timestamps. 
  *  The data includes information about wind speed, direction, and gusts, as well as the spot associated with the data.
+ *  ingested_at is the insert time, the watermark of the Parquet export.
  * 
  * Modifications:
  *   The table is modified by Argo for hourly data inserts.
@@ -15,6 +16,14 @@ CREATE TABLE IF NOT EXISTS ingested.wind_data (
     wind_speed FLOAT NOT NULL,
     wind_direction INT DEFAULT NULL,
     wind_gust FLOAT DEFAULT NULL,
+    ingested_at TIMESTAMPTZ NOT NULL DEFAULT now(),
     PRIMARY KEY (timestamp, spot_id),
     FOREIGN KEY (spot_id) REFERENCES reference.spot_info(id) ON DELETE CASCADE
 );
+
+-- Columns added after the table was first created
+ALTER TABLE ingested.wind_data
+    ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMPTZ NOT NULL DEFAULT now();
+
+-- The Parquet export selects rows by insert time
+CREATE INDEX IF NOT EXISTS idx_wind_data_ingested_at ON ingested.wind_data(ingested_at);
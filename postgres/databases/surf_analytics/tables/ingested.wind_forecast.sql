@@ -0,0 +1,22 @@
+/*
+ * Table: wind_forecast
+ * 
+ * Description:
+ *  This table stores the OpenWeather multi-hour wind forecast for each spot.
+ *  Every run stores the full forecast issued that hour, one row per spot and forecast time,
+ *  so forecasts can be compared against the observations later recorded in wind_data.
+ *  Rows are keyed by (spot_id, forecast_time, issued_at); a rerun within the same hour replaces them.
+ * 
+ * Modifications:
+ *   The table is modified by Argo (wind scraper in forecast mode) for hourly upserts.
+ */
+CREATE TABLE IF NOT EXISTS ingested.wind_forecast (
+    spot_id INT NOT NULL,
+    forecast_time TIMESTAMPTZ NOT NULL,
+    issued_at TIMESTAMPTZ NOT NULL,
+    wind_speed FLOAT NOT NULL,
+    wind_direction INT DEFAULT NULL,
+    wind_gust FLOAT DEFAULT NULL,
+    PRIMARY KEY (spot_id, forecast_time, issued_at),
+    FOREIGN KEY (spot_id) REFERENCES reference.spot_info(id) ON DELETE CASCADE
+);
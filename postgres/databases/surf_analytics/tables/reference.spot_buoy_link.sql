@@ -4,18 +4,32 @@
  * Description:
  *   This table establishes a many-to-many relationship between spots and buoys.
  *   It links a spot with one or more buoys using their respective IDs.
+ *   link_source is 'manual' for the curated seed links below and 'auto' for
+ *   links maintained by the spot-buoy-link-sync job (nearest buoys within a
+ *   radius, with distance_km). Spots with manual links get no automatic links.
  * 
  * Modifications:
- *   This table will not have any records inserted or removed manually.
+ *   Automatic links are inserted, updated and removed by Argo; manual links
+ *   are only added through this file.
  */
 CREATE TABLE IF NOT EXISTS reference.spot_buoy_link (
     spot_id INT,
     buoy_id INT,
+    link_source VARCHAR(16) NOT NULL DEFAULT 'manual' CHECK (link_source IN ('manual', 'auto')),
+    distance_km REAL DEFAULT NULL,
     PRIMARY KEY (spot_id, buoy_id),
     FOREIGN KEY (spot_id) REFERENCES reference.spot_info(id),
     FOREIGN KEY (buoy_id) REFERENCES reference.buoy_info(id)
 );
 
+-- Columns added after the table was first created
+ALTER TABLE reference.spot_buoy_link
+    ADD COLUMN IF NOT EXISTS link_source VARCHAR(16) NOT NULL DEFAULT 'manual' CHECK (link_source IN ('manual', 'auto')),
+    ADD COLUMN IF NOT EXISTS distance_km REAL DEFAULT NULL;
+
+-- The link sync job maintains the automatic links (argo_read only has SELECT on reference)
+GRANT INSERT, UPDATE, DELETE ON reference.spot_buoy_link TO argo_write;
+
 -- Insert seed data (idempotent - ON CONFLICT DO NOTHING)
 INSERT INTO reference.spot_buoy_link (spot_id, buoy_id)
 VALUES
@@ -0,0 +1,28 @@
+/*
+ * Table: tide_constituents
+ * 
+ * Description:
+ *   This table stores the harmonic tide constituents of each buoy, used by
+ *   web-scraping/jobs/utils/tides.py to predict tide heights without a network
+ *   call. Values come from the NOAA CO-OPS harmonic constituents of the nearest
+ *   tide station (mdapi harcon.json with units=english, so heights are in feet
+ *   like NDBC's tide column): amplitude in feet, phase as the Greenwich phase
+ *   lag (phase_GMT) in degrees and speed in degrees per hour. The row with
+ *   constituent 'Z0' (speed 0) holds the mean sea level above the tide datum
+ *   (MLLW), and is added by hand from the station's datums page.
+ * 
+ * Modifications:
+ *   Rows are loaded with `tide_predictions.py --import-harcon <buoy_id> <file>`.
+ */
+CREATE TABLE IF NOT EXISTS reference.tide_constituents (
+    buoy_id INT NOT NULL,
+    constituent VARCHAR(8) NOT NULL,
+    amplitude FLOAT NOT NULL,
+    phase FLOAT NOT NULL,
+    speed FLOAT DEFAULT NULL,
+    PRIMARY KEY (buoy_id, constituent),
+    FOREIGN KEY (buoy_id) REFERENCES reference.buoy_info(id) ON DELETE CASCADE
+);
+
+-- The import command replaces a buoy's constituents (argo_read only has SELECT on reference)
+GRANT INSERT, UPDATE, DELETE ON reference.tide_constituents TO argo_write;
@@ -14,7 +14,7 @@ GRANT USAGE ON SCHEMA ingested TO argo_write;
 
 GRANT SELECT, INSERT, UPDATE, DELETE ON ALL TABLES IN SCHEMA ingested TO argo_write;
 
-ALTER DEFAULT PRIVILEGES IN SCHEMA ingested GRANT SELECT ON TABLES TO argo_write;
+ALTER DEFAULT PRIVILEGES IN SCHEMA ingested GRANT SELECT, INSERT, UPDATE, DELETE ON TABLES TO argo_write;
 
 -- Ensure role is inheritable
 ALTER ROLE argo_write INHERIT;
@@ -0,0 +1,202 @@
+# Standard Library Imports
+import argparse
+import os
+import time
+
+# Local Application Imports
+from utils import Logger, PostgresConnection
+from utils.directions import COMPASS_POINTS
+from utils.encoding import DIRECTION_FIELDS, STEEPNESS_CODES, STEEPNESS_FIELD, encode_direction
+
+# Accessing environment variables for DB connection info
+DB_HOST = os.getenv("DB_HOST")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_NAME = os.getenv("DB_NAME")
+
+# Rows converted per committed UPDATE, and the pause between batches to leave room for the scrapers
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "5000"))
+MIGRATION_PAUSE_SECONDS = float(os.getenv("MIGRATION_PAUSE_SECONDS", "0.1"))
+
+# When the migration starts: the start of the oldest open transaction, so rows that are still
+# being inserted count as inserted during the migration
+MIGRATION_START_QUERY = """
+SELECT LEAST(now(), (SELECT min(xact_start) FROM pg_stat_activity WHERE datname = current_database()))
+"""
+
+ENCODED_FIELDS = DIRECTION_FIELDS + [STEEPNESS_FIELD]
+
+# Keyset bounds before the first and after the last (timestamp, buoy_id) primary key
+FIRST_KEY = ("-infinity", 0)
+LAST_KEY = ("infinity", 0)
+
+COLUMN_TYPE_QUERY = """
+SELECT data_type FROM information_schema.columns
+WHERE table_schema = 'ingested' AND table_name = 'swell_data' AND column_name = 'swell_direction'
+"""
+
+NEXT_KEY_QUERY = """
+SELECT timestamp, buoy_id FROM ingested.swell_data
+WHERE (timestamp, buoy_id) > (%s, %s)
+ORDER BY timestamp, buoy_id
+OFFSET %s LIMIT 1
+"""
+
+def staging_column(field):
+    """Return the SMALLINT column a field is backfilled into before the swap."""
+    return f"{field}_encoded"
+
+def direction_sql(column):
+    """
+    Build the SQL expression converting a VARCHAR direction to degrees, mirroring encode_direction().
+
+    Compass points map to their rounded degrees and numeric strings (rows written by an
+    already updated scraper before the swap) are rounded half up; anything else is NULL.
+    """
+    points = " ".join(f"WHEN '{point}' THEN {encode_direction(point)}" for point in COMPASS_POINTS)
+    return (
+        f"(CASE upper(btrim({column})) {points} "
+        f"ELSE CASE WHEN btrim({column}) ~ '^-?[0-9]+(\\.[0-9]+)?$' "
+        f"THEN mod(mod(floor(btrim({column})::numeric + 0.5), 360) + 360, 360) END END)::smallint"
+    )
+
+def steepness_sql(column):
+    """Build the SQL expression converting a VARCHAR steepness label to its code, mirroring encode_steepness()."""
+    labels = " ".join(f"WHEN '{label}' THEN {code}" for label, code in STEEPNESS_CODES.items())
+    codes = ", ".join(f"'{code}'" for code in STEEPNESS_CODES.values())
+    return (
+        f"(CASE upper(replace(btrim({column}), ' ', '_')) {labels} "
+        f"ELSE CASE WHEN btrim({column}) IN ({codes}) THEN btrim({column})::int END END)::smallint"
+    )
+
+def conversion_assignments():
+    """Return the SET clause filling every staging column from its VARCHAR column."""
+    expressions = {field: direction_sql(field) for field in DIRECTION_FIELDS}
+    expressions[STEEPNESS_FIELD] = steepness_sql(STEEPNESS_FIELD)
+    return ", ".join(f"{staging_column(field)} = {expressions[field]}" for field in ENCODED_FIELDS)
+
+ADD_STAGING_COLUMNS_SQL = "ALTER TABLE ingested.swell_data " + ", ".join(
+    f"ADD COLUMN IF NOT EXISTS {staging_column(field)} SMALLINT" for field in ENCODED_FIELDS
+)
+
+BACKFILL_BATCH_SQL = f"""
+UPDATE ingested.swell_data SET {conversion_assignments()}
+WHERE (timestamp, buoy_id) > (%s, %s) AND (timestamp, buoy_id) <= (%s, %s)
+"""
+
+# Converting the rows written since the migration started (whatever their timestamp, e.g.
+# spool replays behind the backfill) and replacing the columns happen in one transaction,
+# so readers see either the old or the new columns
+SWAP_SQL = f"""
+LOCK TABLE ingested.swell_data IN ACCESS EXCLUSIVE MODE;
+UPDATE ingested.swell_data SET {conversion_assignments()}
+WHERE ingested_at >= %s OR timestamp >= %s;
+ALTER TABLE ingested.swell_data {', '.join(f'DROP COLUMN {field}' for field in ENCODED_FIELDS)};
+{' '.join(f'ALTER TABLE ingested.swell_data RENAME COLUMN {staging_column(field)} TO {field};' for field in ENCODED_FIELDS)}
+ALTER TABLE ingested.swell_data
+    ADD CONSTRAINT swell_data_swell_direction_check CHECK (swell_direction BETWEEN 0 AND 359),
+    ADD CONSTRAINT swell_data_wind_wave_direction_check CHECK (wind_wave_direction BETWEEN 0 AND 359),
+    ADD CONSTRAINT swell_data_wave_steepness_check CHECK (wave_steepness BETWEEN 1 AND {max(STEEPNESS_CODES.values())});
+"""
+
+def is_migrated(db_connection):
+    """
+    Check whether ingested.swell_data already uses the compact encoding.
+
+    Returns:
+        bool or None: True if swell_direction is a SMALLINT, None if the check failed.
+    """
+    rows = db_connection.execute_query(COLUMN_TYPE_QUERY, fetch=True)
+    if rows is None:
+        return None
+    return bool(rows) and rows[0][0] == "smallint"
+
+def backfill(db_connection, logger, batch_size=MIGRATION_BATCH_SIZE, pause=MIGRATION_PAUSE_SECONDS, sleep=time.sleep):
+    """
+    Fill the staging columns in primary-key order, one committed batch at a time.
+
+    Every batch is a short UPDATE over a (timestamp, buoy_id) range found with the primary
+    key index, so the scrapers keep inserting while the backfill runs. Batches are
+    idempotent: an interrupted backfill is simply run again.
+
+    Args:
+        db_connection (PostgresConnection): An open database connection.
+        logger (Logger): The logger instance to log messages.
+        batch_size (int, optional): Rows per batch.
+        pause (float, optional): Seconds to wait between batches.
+        sleep (callable, optional): Used to pause, for tests.
+
+    Returns:
+        tuple or None: The last key converted, or None if a batch failed.
+    """
+    lower, batches = FIRST_KEY, 0
+    while True:
+        rows = db_connection.execute_query(NEXT_KEY_QUERY, (*lower, batch_size - 1), fetch=True)
+        if rows is None:
+            logger.log_json("ERROR", "Failed to find the next backfill batch", {"after": lower})
+            return None
+        upper = tuple(rows[0]) if rows else LAST_KEY
+
+        if db_connection.execute_query(BACKFILL_BATCH_SQL, (*lower, *upper)) is None:
+            logger.log_json("ERROR", "Failed to backfill batch", {"after": lower, "through": upper})
+            return None
+        batches += 1
+
+        if upper == LAST_KEY:
+            logger.log_json("INFO", "Backfilled swell data encoding", {"batches": batches, "last_key": lower})
+            return lower
+        if batches % 100 == 0:
+            logger.log_json("INFO", "Backfill progress", {"batches": batches, "through": upper})
+        lower = upper
+        sleep(pause)
+
+def migrate(db_connection, logger, batch_size=MIGRATION_BATCH_SIZE, pause=MIGRATION_PAUSE_SECONDS, sleep=time.sleep):
+    """
+    Convert ingested.swell_data's direction and steepness columns from VARCHAR to SMALLINT.
+
+    The SMALLINT values are backfilled into staging columns in batches; a final short
+    transaction converts the rows inserted since the migration started again (found through
+    the ingested_at index) and swaps the columns in. Running the migration again after it
+    completed does nothing.
+
+    Returns:
+        bool: True if the table uses the compact encoding afterwards.
+    """
+    migrated = is_migrated(db_connection)
+    if migrated is None:
+        logger.log_json("ERROR", "Failed to read the swell_data column types")
+        return False
+    if migrated:
+        logger.log_json("INFO", "Swell data already uses the compact encoding")
+        return True
+
+    rows = db_connection.execute_query(MIGRATION_START_QUERY, fetch=True)
+    if not rows:
+        logger.log_json("ERROR", "Failed to read the migration start time")
+        return False
+    started_at = rows[0][0]
+
+    if db_connection.execute_query(ADD_STAGING_COLUMNS_SQL) is None:
+        logger.log_json("ERROR", "Failed to add the staging columns")
+        return False
+
+    last_key = backfill(db_connection, logger, batch_size, pause, sleep)
+    if last_key is None:
+        return False
+
+    if db_connection.execute_query(SWAP_SQL, (started_at, last_key[0])) is None:
+        logger.log_json("ERROR", "Failed to swap in the encoded columns")
+        return False
+
+    logger.log_json("INFO", "Swell data migrated to the compact encoding")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert swell_data directions and steepness to SMALLINT in batches.")
+    parser.add_argument("--batch-size", type=int, default=MIGRATION_BATCH_SIZE, help="Rows per committed batch")
+    parser.add_argument("--pause", type=float, default=MIGRATION_PAUSE_SECONDS, help="Seconds between batches")
+    args = parser.parse_args()
+
+    with Logger(job_name="migrate-swell-encoding") as logger:
+        with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+            migrate(db_connection, logger, args.batch_size, args.pause)
@@ -0,0 +1,287 @@
+# Standard Library Imports
+import argparse
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+
+# Third-Party Imports
+import pyarrow as pa
+import pyarrow.parquet as pq
+from botocore.exceptions import ClientError
+
+# Local Application Imports
+from utils import Logger, PostgresConnection
+from utils.minio_client import create_s3_client
+
+# Accessing environment variables for DB connection info
+DB_HOST = os.getenv("DB_HOST")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_NAME = os.getenv("DB_NAME")
+
+# Export destination and tuning
+EXPORT_BUCKET = os.getenv("EXPORT_BUCKET", "surf-analytics")
+EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", "5000"))
+EXPORT_COMPRESSION = os.getenv("EXPORT_COMPRESSION", "zstd")
+
+# Every dataset version lives under its own prefix with its own manifest, so readers never
+# see partitions of two schemas side by side. v1 (unprefixed, VARCHAR directions and steepness)
+# is no longer written; v2 stores them as int16 and is exported in full on its first run.
+EXPORT_DATASET_VERSION = os.getenv("EXPORT_DATASET_VERSION", "v2")
+MANIFEST_KEY = f"{EXPORT_DATASET_VERSION}/_manifest.json"
+
+# Rows are exported by insert time (ingested_at), once they are this old. The watermark
+# never passes a transaction that is still committing, so rows inserted late (validated
+# one by one, replayed from the spool) are exported by the next run instead of being lost.
+EXPORT_SETTLE_SECONDS = float(os.getenv("EXPORT_SETTLE_SECONDS", "300"))
+EXPORT_BOUND_QUERY = "SELECT now() - make_interval(secs => %s)"
+
+TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+# Arrow schema of each exported table, in column order
+EXPORT_TABLES = {
+    "ingested.swell_data": pa.schema([
+        ("timestamp", TIMESTAMP),
+        ("buoy_id", pa.int32()),
+        ("wave_height", pa.float64()),
+        ("swell_height", pa.float64()),
+        ("swell_period", pa.float64()),
+        ("swell_direction", pa.int16()),
+        ("wind_wave_height", pa.float64()),
+        ("wind_wave_period", pa.float64()),
+        ("wind_wave_direction", pa.int16()),
+        ("wave_steepness", pa.int16()),
+        ("average_wave_period", pa.float64()),
+        ("tide", pa.float64())
+    ]),
+    "ingested.wind_data": pa.schema([
+        ("timestamp", TIMESTAMP),
+        ("spot_id", pa.int32()),
+        ("wind_speed", pa.float64()),
+        ("wind_direction", pa.int32()),
+        ("wind_gust", pa.float64())
+    ])
+}
+
+def load_manifest(s3_client, bucket=EXPORT_BUCKET):
+    """Load the export manifest, or an empty one before the first export.
+
+    Returns:
+        dict: {"updated_at": str, "tables": {table: {"watermark", "watermark_column", "rows", "partitions"}}}.
+    """
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=MANIFEST_KEY)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+            return {"updated_at": None, "tables": {}}
+        raise
+    return json.loads(response["Body"].read())
+
+def save_manifest(s3_client, manifest, bucket=EXPORT_BUCKET):
+    """Write the export manifest back to the bucket."""
+    manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+    s3_client.put_object(
+        Body=json.dumps(manifest, indent=2),
+        Bucket=bucket,
+        Key=MANIFEST_KEY,
+        ContentType="application/json"
+    )
+
+def partition_key(table, day, watermark):
+    """
+    Build the object key of a day partition file.
+
+    The file name is derived from the watermark the export started from, so a run that
+    crashed before saving the manifest is redone under the same keys instead of leaving
+    duplicate files behind.
+    """
+    token = datetime.fromisoformat(watermark).strftime("%Y%m%dT%H%M%S%f") if watermark else "initial"
+    return f"{EXPORT_DATASET_VERSION}/{table.split('.')[1]}/date={day}/part-{token}.parquet"
+
+def _day_runs(timestamps):
+    """Yield (day, start, end) for the contiguous runs of rows falling on the same UTC day."""
+    days = [timestamp.astimezone(timezone.utc).date().isoformat() for timestamp in timestamps]
+    start = 0
+    for i in range(1, len(days) + 1):
+        if i == len(days) or days[i] != days[start]:
+            yield days[start], start, i
+            start = i
+
+def export_bound(db_connection, settle_seconds=EXPORT_SETTLE_SECONDS):
+    """
+    Return the insert time up to which rows are exported by this run.
+
+    Returns:
+        datetime or None: The database's now() minus the settle window, or None if the query failed.
+    """
+    rows = db_connection.execute_query(EXPORT_BOUND_QUERY, (settle_seconds,), fetch=True)
+    return rows[0][0] if rows else None
+
+def export_filter(table_state, bound):
+    """
+    Build the WHERE clause selecting the rows a run exports.
+
+    Rows inserted after the watermark and up to the bound are new. Manifests written before
+    the ingested_at watermark hold the largest exported timestamp instead; their first run
+    continues from it. A pending rebuild also selects every row from its first day on.
+
+    Args:
+        table_state (dict): The table's manifest entry.
+        bound (datetime): Insert time up to which rows are exported.
+
+    Returns:
+        tuple: The WHERE clause and its parameters.
+    """
+    since, params = [], [bound]
+    watermark = table_state.get("watermark")
+    if watermark:
+        column = "ingested_at" if table_state.get("watermark_column") == "ingested_at" else "timestamp"
+        since.append(f"{column} > %s")
+        params.append(watermark)
+        if table_state.get("rebuild_from"):
+            since.append("timestamp >= %s")
+            params.append(table_state["rebuild_from"])
+
+    where = "ingested_at <= %s"
+    if since:
+        where += f" AND ({' OR '.join(since)})"
+    return where, tuple(params)
+
+def export_table(db_connection, s3_client, table, schema, table_state, logger,
+                 bucket=EXPORT_BUCKET, fetch_size=EXPORT_FETCH_SIZE, bound=None):
+    """
+    Stream the rows inserted since a table's watermark into day-partitioned Parquet files.
+
+    Rows are read in timestamp order through a server-side cursor and written chunk by chunk,
+    so memory use does not depend on how many rows are exported. Each touched day gets one
+    new compressed file; the table's manifest entry is updated only after every file is uploaded,
+    and its watermark then moves to the bound, whether or not any rows were found.
+
+    Args:
+        db_connection (PostgresConnection): An open database connection.
+        s3_client: The MinIO client.
+        table (str): The table to export.
+        schema (pyarrow.Schema): Arrow schema of the exported columns.
+        table_state (dict): The table's manifest entry, updated in place.
+        logger (Logger): The logger instance to log messages.
+        bucket (str, optional): The destination bucket.
+        fetch_size (int, optional): Rows fetched and written per chunk.
+        bound (datetime, optional): Insert time up to which rows are exported, defaults to export_bound().
+
+    Returns:
+        int: The number of rows exported.
+
+    Raises:
+        ConnectionError: If the export bound could not be read.
+    """
+    bound = bound or export_bound(db_connection)
+    if bound is None:
+        raise ConnectionError("Could not read the export bound")
+
+    watermark = table_state.get("watermark")
+    where, params = export_filter(table_state, bound)
+    query = f"SELECT {', '.join(schema.names)} FROM {table} WHERE {where} ORDER BY timestamp"
+
+    uploaded = {}
+    exported = 0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        writer, day, path = None, None, None
+
+        def finish_day():
+            writer.close()
+            key = partition_key(table, day, watermark)
+            s3_client.upload_file(path, bucket, key)
+            uploaded[day] = {"key": key, "rows": pq.ParquetFile(path).metadata.num_rows}
+
+        for chunk in db_connection.stream_query(query, params, fetch_size=fetch_size, columnar=True):
+            batch = pa.table({field.name: pa.array(chunk[field.name], type=field.type) for field in schema}, schema=schema)
+            for chunk_day, start, end in _day_runs(chunk["timestamp"]):
+                if chunk_day != day:
+                    if writer:
+                        finish_day()
+                    day = chunk_day
+                    path = os.path.join(tmp_dir, f"{day}.parquet")
+                    writer = pq.ParquetWriter(path, schema, compression=EXPORT_COMPRESSION)
+                writer.write_table(batch.slice(start, end - start))
+            exported += len(chunk["timestamp"])
+
+        if writer:
+            finish_day()
+
+    partitions = table_state.setdefault("partitions", {})
+    for day, file in uploaded.items():
+        entry = partitions.setdefault(day, {"files": [], "rows": 0})
+        if file["key"] not in entry["files"]:
+            entry["files"].append(file["key"])
+        entry["rows"] += file["rows"]
+    table_state["watermark"] = bound.astimezone(timezone.utc).isoformat()
+    table_state["watermark_column"] = "ingested_at"
+    table_state.pop("rebuild_from", None)
+    table_state["rows"] = table_state.get("rows", 0) + exported
+
+    logger.log_json("INFO", "Exported rows to Parquet", {
+        "table": table,
+        "rows": exported,
+        "days": sorted(uploaded),
+        "watermark": table_state.get("watermark")
+    })
+    return exported
+
+def drop_partitions(s3_client, manifest, rebuild_from, logger, bucket=EXPORT_BUCKET):
+    """
+    Delete the partitions from a day onwards and mark them for re-export by the next export.
+
+    Used to rewrite days after their rows changed in the database (e.g. a schema migration);
+    new rows are exported incrementally whatever their timestamp.
+
+    Args:
+        s3_client: The MinIO client.
+        manifest (dict): The export manifest, updated in place.
+        rebuild_from (str): The first day to rebuild (YYYY-MM-DD).
+        logger (Logger): The logger instance to log messages.
+        bucket (str, optional): The export bucket.
+    """
+    first_day = datetime.fromisoformat(rebuild_from).replace(tzinfo=timezone.utc)
+    for table, table_state in manifest["tables"].items():
+        partitions = table_state.get("partitions", {})
+        for day in [day for day in partitions if day >= rebuild_from]:
+            for key in partitions[day]["files"]:
+                s3_client.delete_object(Bucket=bucket, Key=key)
+            table_state["rows"] -= partitions.pop(day)["rows"]
+        pending = table_state.get("rebuild_from")
+        if not pending or first_day.isoformat() < pending:
+            table_state["rebuild_from"] = first_day.isoformat()
+        logger.log_json("INFO", "Dropped Parquet partitions for rebuild", {"table": table, "from": rebuild_from})
+
+def run_export(db_connection, s3_client, logger, rebuild_from=None, bucket=EXPORT_BUCKET):
+    """Export every table's new rows and save the manifest after each table."""
+    manifest = load_manifest(s3_client, bucket)
+    if rebuild_from:
+        drop_partitions(s3_client, manifest, rebuild_from, logger, bucket)
+        save_manifest(s3_client, manifest, bucket)
+
+    bound = export_bound(db_connection)
+    if bound is None:
+        logger.log_json("ERROR", "Could not read the export bound, nothing exported")
+        return
+
+    for table, schema in EXPORT_TABLES.items():
+        table_state = manifest["tables"].setdefault(table, {"watermark": None, "rows": 0, "partitions": {}})
+        try:
+            export_table(db_connection, s3_client, table, schema, table_state, logger, bucket, bound=bound)
+        except ConnectionError as e:
+            logger.log_json("ERROR", "Failed to export table", {"table": table, "error": str(e)})
+            continue
+        save_manifest(s3_client, manifest, bucket)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export new ingested rows to day-partitioned Parquet in MinIO.")
+    parser.add_argument("--rebuild-from", help="Delete and re-export partitions from this day (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    with Logger(job_name="parquet-export-hourly") as logger:
+        logger.log_json("INFO", "Starting Parquet export job")
+        with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+            run_export(db_connection, create_s3_client(), logger, args.rebuild_from)
+        logger.log_json("INFO", "Completed Parquet export job")
@@ -0,0 +1,206 @@
+# Standard Library Imports
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+# Local Application Imports
+from utils import SWELL_RULES, WIND_RULES, Logger, ParsePool, PostgresConnection, Validator
+from utils.archive import ArchiveReader
+from utils.encoding import encode_swell_record
+from utils.tides import TidePredictor
+from swell_scraper_hourly import ARCHIVE_KIND as SWELL_PAGE_KIND, fill_predicted_tides, parse_swell_page
+from wind_scraper_hourly import (ARCHIVE_KINDS as WIND_KINDS, FORECAST_CONFLICT_COLUMNS, flatten_forecast,
+                                 parse_wind_response, split_group_response)
+
+# Accessing environment variables for DB connection info
+DB_HOST = os.getenv("DB_HOST")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_NAME = os.getenv("DB_NAME")
+
+# Archived bodies are downloaded, parsed and upserted REPROCESS_BATCH_SIZE at a time
+REPROCESS_BATCH_SIZE = int(os.getenv("REPROCESS_BATCH_SIZE", "500"))
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", "8"))
+
+# Where the rows parsed from each kind of response are upserted
+TARGETS = {
+    SWELL_PAGE_KIND: {"table": "ingested.swell_data", "conflict_columns": ["timestamp", "buoy_id"],
+                      "station_keys": ["buoy_id"], "rules": SWELL_RULES},
+    WIND_KINDS["current"]: {"table": "ingested.wind_data", "conflict_columns": ["timestamp", "spot_id"],
+                            "station_keys": ["spot_id"], "rules": WIND_RULES},
+    WIND_KINDS["group"]: {"table": "ingested.wind_data", "conflict_columns": ["timestamp", "spot_id"],
+                          "station_keys": ["spot_id"], "rules": WIND_RULES},
+    WIND_KINDS["forecast"]: {"table": "ingested.wind_forecast", "conflict_columns": FORECAST_CONFLICT_COLUMNS,
+                             "station_keys": ["spot_id", "forecast_time"], "rules": None}
+}
+
+def parse_archived(kind, body, meta):
+    """
+    Run an archived body through the current parser of its kind.
+
+    Module-level and pure so it can run in a ParsePool worker process.
+
+    Args:
+        kind (str): The response kind recorded in the index.
+        body (bytes): The raw response body.
+        meta (dict): The index entry's details (station and fetch time).
+
+    Returns:
+        tuple: The parsed rows, the error class if parsing failed (or None), and a list of
+            (level, message, context) events.
+    """
+    if kind == SWELL_PAGE_KIND:
+        record, error_class, events = parse_swell_page(meta["buoy_id"], body.decode("utf-8"), meta["timestamp"])
+        return ([record] if record else []), error_class, events
+
+    try:
+        data = json.loads(body)
+        if kind == WIND_KINDS["current"]:
+            return [{"spot_id": meta["spot_id"], "timestamp": meta["timestamp"], **parse_wind_response(data)}], None, []
+        if kind == WIND_KINDS["group"]:
+            readings, _ = split_group_response(data)
+            return [
+                {"spot_id": spot_id, "timestamp": meta["timestamp"], **readings[int(location_id)]}
+                for location_id, spot_ids in meta["locations"].items() if int(location_id) in readings
+                for spot_id in spot_ids
+            ], None, []
+        if kind == WIND_KINDS["forecast"]:
+            return flatten_forecast(meta["spot_ids"], data, meta["issued_at"]), None, []
+    except (KeyError, TypeError, ValueError) as e:
+        return [], "parse_error", [("ERROR", "Failed to parse archived response", {"kind": kind, "error": str(e), **meta})]
+    return [], "unknown_kind", [("WARNING", "No parser for archived response", {"kind": kind})]
+
+def matches_station(entry, station_id):
+    """Check whether an index entry belongs to a buoy or spot."""
+    if station_id is None:
+        return True
+    station_ids = [entry.get("buoy_id"), entry.get("spot_id"), *entry.get("spot_ids", []),
+                   *(spot_id for spot_ids in entry.get("locations", {}).values() for spot_id in spot_ids)]
+    return str(station_id) in {str(value) for value in station_ids if value is not None}
+
+def batches(iterable, size):
+    """Yield lists of up to size items."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def load_bodies(reader, entries, logger, fetch_pool):
+    """Download the bodies of a batch of index entries in parallel; unreadable ones come back as None."""
+    def load(entry):
+        try:
+            return reader.body(entry["sha256"])
+        except Exception as e:
+            logger.log_json("ERROR", "Failed to read archived response", {"sha256": entry["sha256"], "error": str(e)})
+            return None
+    return list(fetch_pool.map(load, entries))
+
+def upsert_rows(db_connection, kind, rows, logger, dry_run=False, tide_predictor=None):
+    """
+    Validate the rows parsed from one kind of response and overwrite the stored ones.
+
+    Spike checks need the previous reading and are skipped; range and sentinel checks
+    apply as on ingest, and quarantined readings are recorded in ingested.data_quality.
+    Swell readings without a tide get the predicted one, as on ingest.
+
+    Returns:
+        int: The number of rows written (or that would be written on a dry run).
+    """
+    target = TARGETS[kind]
+    if target["rules"]:
+        validator = Validator(target["rules"])
+        result = validator.validate(rows)
+        if not dry_run:
+            validator.record_issues(db_connection, result, logger)
+        rows = result.accepted + [record for record, _ in result.flagged]
+    if kind == SWELL_PAGE_KIND:
+        if tide_predictor:
+            fill_predicted_tides(rows, tide_predictor)
+        rows = [encode_swell_record(row) for row in rows]
+    if dry_run or not rows:
+        return len(rows)
+
+    if not db_connection.insert_many(target["table"], rows, on_conflict="update",
+                                     conflict_columns=target["conflict_columns"]):
+        logger.log_json("ERROR", "Failed to upsert reprocessed rows", {"table": target["table"], "rows": len(rows)})
+        return 0
+    db_connection.notify_changes(target["table"], rows, *target["station_keys"])
+    return len(rows)
+
+def reprocess(db_connection, reader, logger, job_name, days, station_id=None, dry_run=False,
+              parse_pool=None, batch_size=REPROCESS_BATCH_SIZE):
+    """
+    Stream a job's archived responses through the current parsers and upsert the results.
+
+    Bodies are downloaded in threads and parsed in a warm process pool, one batch at a
+    time, so memory stays bounded however many runs are replayed. Rows keep the fetch
+    time of the original response and overwrite what that run stored.
+
+    Args:
+        db_connection (PostgresConnection): An open database connection.
+        reader (ArchiveReader): Reader over the archive bucket.
+        logger (Logger): The logger instance to log messages.
+        job_name (str): The scraper job whose runs are reprocessed.
+        days (int): Number of days to go back, including today.
+        station_id (str, optional): Only reprocess responses of this buoy or spot.
+        dry_run (bool, optional): Parse and validate without writing anything.
+        parse_pool (ParsePool, optional): Warm parser pool to reuse; a new one is started otherwise.
+        batch_size (int, optional): Responses per batch.
+
+    Returns:
+        dict: Counts of responses read, parse failures and rows written per table.
+    """
+    summary = {"responses": 0, "unreadable": 0, "parse_failures": 0, "rows": {}}
+    tide_predictor = None
+    entries = (entry for entry in reader.entries(job_name, days) if matches_station(entry, station_id))
+    owned_pool = parse_pool is None
+    parse_pool = parse_pool or ParsePool()
+    try:
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as fetch_pool:
+            for batch in batches(entries, batch_size):
+                bodies = load_bodies(reader, batch, logger, fetch_pool)
+                readable = [(entry, body) for entry, body in zip(batch, bodies) if body is not None]
+                summary["responses"] += len(batch)
+                summary["unreadable"] += len(batch) - len(readable)
+
+                kinds = [entry["kind"] for entry, _ in readable]
+                metas = [{key: value for key, value in entry.items() if key not in ("kind", "sha256", "bytes")}
+                         for entry, _ in readable]
+                results = parse_pool.map(parse_archived, kinds, [body for _, body in readable], metas) if readable else []
+
+                rows_by_kind = {}
+                for kind, (rows, error_class, events) in zip(kinds, results):
+                    for level, message, context in events:
+                        logger.log_json(level, message, context)
+                    if error_class:
+                        summary["parse_failures"] += 1
+                    rows_by_kind.setdefault(kind, []).extend(rows)
+
+                for kind, rows in rows_by_kind.items():
+                    if kind in TARGETS and rows:
+                        # Missing tides are predicted as on ingest
+                        if kind == SWELL_PAGE_KIND:
+                            tide_predictor = tide_predictor or TidePredictor.load(db_connection) or TidePredictor({})
+                        table = TARGETS[kind]["table"]
+                        written = upsert_rows(db_connection, kind, rows, logger, dry_run, tide_predictor)
+                        summary["rows"][table] = summary["rows"].get(table, 0) + written
+    finally:
+        if owned_pool:
+            parse_pool.close()
+
+    logger.log_json("INFO", "Reprocessed archived responses",
+                    {"job_name": job_name, "days": days, "dry_run": dry_run, **summary})
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-parse archived raw responses and upsert the results.")
+    parser.add_argument("job_name", help="The scraper job whose archived responses are reprocessed, e.g. swell-scraper-hourly")
+    parser.add_argument("--days", type=int, default=1, help="Number of days to go back, including today")
+    parser.add_argument("--station", help="Only reprocess one buoy or spot")
+    parser.add_argument("--dry-run", action="store_true", help="Parse and validate without writing")
+    args = parser.parse_args()
+
+    with Logger(job_name="reprocess-archive") as logger:
+        with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+            reprocess(db_connection, ArchiveReader(), logger, args.job_name, args.days, args.station, args.dry_run)
@@ -0,0 +1,142 @@
+# Standard Library Imports
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Local Application Imports
+import swell_scraper_hourly
+import wind_scraper_hourly
+from utils import Logger, ParsePool, PostgresConnection, ReferenceSnapshot
+from utils.health_server import HealthServer
+from utils.interval_scheduler import IntervalScheduler
+from utils.minio_client import create_s3_client
+
+# Accessing environment variables for DB connection info
+DB_HOST = os.getenv("DB_HOST")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_NAME = os.getenv("DB_NAME")
+
+# Internal schedules (seconds). Each run starts a random 0-SCHEDULE_JITTER_SECONDS after its slot.
+SWELL_INTERVAL_SECONDS = float(os.getenv("SWELL_INTERVAL_SECONDS", "1200"))
+WIND_INTERVAL_SECONDS = float(os.getenv("WIND_INTERVAL_SECONDS", "3600"))
+SCHEDULE_JITTER_SECONDS = float(os.getenv("SCHEDULE_JITTER_SECONDS", "60"))
+
+# Run deadlines of the daemon's runs. Both jobs share one loop, so a wind run delays the next
+# swell run; keeping their sum under SWELL_INTERVAL_SECONDS means a swell slot is never lost.
+SWELL_RUN_BUDGET_SECONDS = float(os.getenv("SWELL_RUN_BUDGET_SECONDS", "600"))
+WIND_RUN_BUDGET_SECONDS = float(os.getenv("WIND_RUN_BUDGET_SECONDS", "540"))
+
+# Health endpoint; the daemon reports itself dead when its loop has not come back for this long.
+# The heartbeat is refreshed after every run, so the default covers the longest run plus the
+# reference check and log upload around it.
+HEALTH_PORT = int(os.getenv("HEALTH_PORT", "8080"))
+LIVENESS_TIMEOUT_SECONDS = float(os.getenv("LIVENESS_TIMEOUT_SECONDS",
+                                           str(max(SWELL_RUN_BUDGET_SECONDS, WIND_RUN_BUDGET_SECONDS) + 600)))
+
+class ScraperDaemon:
+    """
+    Runs the swell and wind scrapers on internal schedules in one long-lived process.
+
+    Compared with one container per cron run, the interpreter and its imports, the fetch
+    thread pool, the warm parser processes, the MinIO client and the reference data all
+    survive between runs. The reference data is the snapshot shared with the cron jobs, checked
+    once per run and re-read only when the reference tables change. Each run still writes its
+    own log object and spool/breaker state under the same job names as the cron jobs, so the
+    two deployment modes are interchangeable.
+    """
+
+    def __init__(self, scheduler=None, reference=None, s3_client=None, fetch_pool=None, parse_pool=None,
+                 swell_interval=SWELL_INTERVAL_SECONDS, wind_interval=WIND_INTERVAL_SECONDS,
+                 jitter=SCHEDULE_JITTER_SECONDS):
+        """
+        Initializes the ScraperDaemon object.
+
+        Args:
+            scheduler (IntervalScheduler, optional): The scheduler driving the runs.
+            reference (ReferenceSnapshot, optional): The reference data, kept in memory between runs.
+            s3_client (optional): MinIO client shared by the run loggers.
+            fetch_pool (ThreadPoolExecutor, optional): Download pool shared by the swell runs.
+            parse_pool (ParsePool, optional): Parser pool shared by the swell runs.
+            swell_interval (float, optional): Seconds between swell runs.
+            wind_interval (float, optional): Seconds between wind runs.
+            jitter (float, optional): Maximum random delay of each run, in seconds.
+        """
+        self.scheduler = scheduler or IntervalScheduler()
+        self.reference = reference or ReferenceSnapshot()
+        self.s3_client = s3_client
+        self.fetch_pool = fetch_pool
+        self.parse_pool = parse_pool
+        self.scheduler.add("swell", self.run_swell, swell_interval, jitter)
+        self.scheduler.add("wind", self.run_wind, wind_interval, jitter)
+
+    def refresh_reference(self, logger):
+        """Check the reference data version, reloading the tables only if they changed."""
+        with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+            self.reference.refresh(db_connection, logger)
+
+    def run_swell(self):
+        """Run one swell collection pass with the warm pools and cached buoy IDs."""
+        with Logger(job_name="swell-scraper-hourly", s3_client=self.s3_client) as logger:
+            try:
+                self.refresh_reference(logger)
+                swell_scraper_hourly.run(logger, buoy_ids=self.reference.buoy_ids, reference=self.reference,
+                                         fetch_pool=self.fetch_pool, parse_pool=self.parse_pool,
+                                         budget=SWELL_RUN_BUDGET_SECONDS)
+            except Exception as e:
+                # Logged in the run's own log; the scheduler keeps the error for the health endpoint
+                logger.log_json("ERROR", "Scraper run failed", {"error": str(e)})
+                raise
+
+    def run_wind(self):
+        """Run one wind collection pass with the cached spots."""
+        with Logger(job_name=wind_scraper_hourly.job_name("current"), s3_client=self.s3_client) as logger:
+            try:
+                self.refresh_reference(logger)
+                wind_scraper_hourly.run(logger, spots=self.reference.spots, reference=self.reference,
+                                        budget=WIND_RUN_BUDGET_SECONDS)
+            except Exception as e:
+                logger.log_json("ERROR", "Scraper run failed", {"error": str(e)})
+                raise
+
+    def live(self):
+        """Whether the scheduler loop is still coming back between runs."""
+        return self.scheduler.clock() - self.scheduler.heartbeat < LIVENESS_TIMEOUT_SECONDS
+
+    def ready(self):
+        """Whether the reference data is loaded, i.e. runs are served from the warm state."""
+        return self.reference.loaded
+
+    def status(self):
+        """Daemon state for the health endpoint."""
+        return {"reference_loaded": self.reference.loaded, "jobs": self.scheduler.status()}
+
+    def serve(self, stop_event, port=HEALTH_PORT):
+        """
+        Start the health endpoint and run the schedule until stop_event is set.
+
+        Args:
+            stop_event (threading.Event): Set to stop after the current run.
+            port (int, optional): Port of the health endpoint.
+        """
+        health_server = HealthServer(port, self.live, self.ready, self.status).start()
+        try:
+            self.scheduler.run_forever(stop_event.is_set)
+        finally:
+            health_server.stop()
+
+def main():
+    """Run the daemon until SIGTERM or SIGINT; the run in progress is completed before exiting."""
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+
+    with ThreadPoolExecutor(max_workers=swell_scraper_hourly.FETCH_WORKERS) as fetch_pool, ParsePool() as parse_pool:
+        scheduler = IntervalScheduler(clock=time.time, sleep=stop_event.wait)
+        daemon = ScraperDaemon(scheduler, s3_client=create_s3_client(), fetch_pool=fetch_pool, parse_pool=parse_pool)
+        daemon.serve(stop_event)
+
+if __name__ == "__main__":
+    main()
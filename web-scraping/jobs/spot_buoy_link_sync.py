@@ -0,0 +1,175 @@
+# Standard Library Imports
+import os
+
+# Third-Party Imports
+import numpy as np
+
+# Local Application Imports
+from utils import Logger, PostgresConnection
+from utils.spatial import SpatialIndex
+from utils.state import STATE_DIR, load_json, save_json
+
+# Accessing environment variables for DB connection info
+DB_HOST = os.getenv("DB_HOST")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_NAME = os.getenv("DB_NAME")
+
+# Each spot is linked to its LINK_COUNT nearest buoys within LINK_RADIUS_KM
+LINK_COUNT = int(os.getenv("LINK_COUNT", "2"))
+LINK_RADIUS_KM = float(os.getenv("LINK_RADIUS_KM", "50"))
+
+# Coordinates of the last sync, to find what changed since
+LINK_STATE_PATH = os.getenv("LINK_STATE_PATH", os.path.join(STATE_DIR, "spot-buoy-link-sync.json"))
+
+SPOTS_QUERY = "SELECT id, latitude, longitude FROM reference.spot_info"
+BUOYS_QUERY = "SELECT id, latitude, longitude FROM reference.buoy_info"
+MANUAL_SPOTS_QUERY = "SELECT DISTINCT spot_id FROM reference.spot_buoy_link WHERE link_source = 'manual'"
+
+# Replaces the automatic links of the given spots in one statement: links no longer wanted
+# are deleted, new ones inserted and distances refreshed. Manual links are never touched.
+REPLACE_LINKS_QUERY = """
+WITH desired (spot_id, buoy_id, distance_km) AS (
+    SELECT * FROM unnest(%s::int[], %s::int[], %s::real[])
+), removed AS (
+    DELETE FROM reference.spot_buoy_link l
+    WHERE l.link_source = 'auto' AND l.spot_id = ANY(%s::int[])
+      AND NOT EXISTS (SELECT 1 FROM desired d WHERE d.spot_id = l.spot_id AND d.buoy_id = l.buoy_id)
+)
+INSERT INTO reference.spot_buoy_link (spot_id, buoy_id, link_source, distance_km)
+SELECT spot_id, buoy_id, 'auto', distance_km FROM desired
+ON CONFLICT (spot_id, buoy_id) DO UPDATE SET distance_km = EXCLUDED.distance_km
+WHERE spot_buoy_link.link_source = 'auto'
+"""
+
+def load_coordinates(db_connection, query):
+    """
+    Load (id, latitude, longitude) rows as a dict.
+
+    Returns:
+        dict or None: ID to [latitude, longitude], or None if the query failed.
+    """
+    rows = db_connection.execute_query(query, fetch=True)
+    if rows is None:
+        return None
+    return {int(row[0]): [float(row[1]), float(row[2])] for row in rows}
+
+def changed_ids(previous, current):
+    """Return the IDs added, removed or moved between two {id: [lat, lon]} dicts."""
+    return {key for key in previous.keys() | current.keys() if previous.get(key) != current.get(key)}
+
+def affected_spots(state, spots, buoys, manual_spot_ids, config):
+    """
+    Find the spots whose links may have changed since the last sync.
+
+    A buoy change can only affect spots within LINK_RADIUS_KM of the buoy's old or new
+    position, which are found with a spatial index over the spots instead of a scan.
+
+    Args:
+        state (dict or None): The previous sync's spots, buoys, manual spots and config.
+        spots (dict): Current spot coordinates.
+        buoys (dict): Current buoy coordinates.
+        manual_spot_ids (set): Spots with manual links, which get no automatic links.
+        config (list): The current [LINK_COUNT, LINK_RADIUS_KM].
+
+    Returns:
+        set: The spot IDs to relink.
+    """
+    if not state or state.get("config") != config:
+        return set(spots) | manual_spot_ids
+
+    previous_spots = {int(key): value for key, value in state["spots"].items()}
+    previous_buoys = {int(key): value for key, value in state["buoys"].items()}
+    affected = changed_ids(previous_spots, spots) & set(spots)
+    affected |= manual_spot_ids ^ set(state.get("manual_spot_ids", []))
+
+    moved_buoys = changed_ids(previous_buoys, buoys)
+    positions = [previous_buoys[key] for key in moved_buoys if key in previous_buoys]
+    positions += [buoys[key] for key in moved_buoys if key in buoys]
+    if positions and spots:
+        spot_index = SpatialIndex.from_points(spots)
+        for spot_ids, _ in spot_index.within(*zip(*positions), config[1]):
+            affected.update(int(spot_id) for spot_id in spot_ids)
+    return affected
+
+def compute_links(spot_ids, spots, buoy_index, link_count=LINK_COUNT, radius_km=LINK_RADIUS_KM):
+    """
+    Link each spot to its nearest buoys with one batched k-nearest query.
+
+    Args:
+        spot_ids (list): The spots to link.
+        spots (dict): Spot coordinates.
+        buoy_index (SpatialIndex): Index over the buoys.
+        link_count (int, optional): Buoys per spot.
+        radius_km (float, optional): Maximum spot-buoy distance.
+
+    Returns:
+        list: (spot_id, buoy_id, distance_km) tuples.
+    """
+    if not spot_ids:
+        return []
+    latitudes, longitudes = zip(*(spots[spot_id] for spot_id in spot_ids))
+    buoy_ids, distances = buoy_index.nearest(latitudes, longitudes, k=link_count, max_distance_km=radius_km)
+    found = np.isfinite(distances)
+    rows, columns = np.nonzero(found)
+    return [
+        (int(spot_ids[row]), int(buoy_ids[row, column]), round(float(distances[row, column]), 3))
+        for row, column in zip(rows, columns)
+    ]
+
+def sync_links(db_connection, logger, state_path=LINK_STATE_PATH, link_count=LINK_COUNT, radius_km=LINK_RADIUS_KM):
+    """
+    Recompute the automatic spot-buoy links of the spots affected by reference changes.
+
+    Args:
+        db_connection (PostgresConnection): An open database connection.
+        logger (Logger): The logger instance to log messages.
+        state_path (str, optional): Where the coordinates of the last sync are kept.
+        link_count (int, optional): Buoys per spot.
+        radius_km (float, optional): Maximum spot-buoy distance.
+
+    Returns:
+        bool: True if the links are up to date afterwards.
+    """
+    spots = load_coordinates(db_connection, SPOTS_QUERY)
+    buoys = load_coordinates(db_connection, BUOYS_QUERY)
+    manual = db_connection.execute_query(MANUAL_SPOTS_QUERY, fetch=True)
+    if spots is None or buoys is None or manual is None:
+        logger.log_json("ERROR", "Failed to load reference data for spot-buoy links")
+        return False
+
+    manual_spot_ids = {int(row[0]) for row in manual}
+    config = [link_count, radius_km]
+    state = load_json(state_path, None)
+    affected = affected_spots(state, spots, buoys, manual_spot_ids, config)
+    if not affected:
+        logger.log_json("INFO", "Spot-buoy links up to date", {"spots": len(spots), "buoys": len(buoys)})
+        return True
+
+    relink = sorted(spot_id for spot_id in affected if spot_id in spots and spot_id not in manual_spot_ids)
+    links = compute_links(relink, spots, SpatialIndex.from_points(buoys), link_count, radius_km)
+    params = (
+        [link[0] for link in links],
+        [link[1] for link in links],
+        [link[2] for link in links],
+        sorted(affected)
+    )
+    if db_connection.execute_query(REPLACE_LINKS_QUERY, params) is None:
+        logger.log_json("ERROR", "Failed to update spot-buoy links", {"spots": len(affected)})
+        return False
+
+    save_json(state_path, {"spots": spots, "buoys": buoys, "manual_spot_ids": sorted(manual_spot_ids), "config": config})
+    unlinked = sorted(set(relink) - {link[0] for link in links})
+    logger.log_json("INFO", "Spot-buoy links updated", {
+        "affected_spots": len(affected),
+        "links": len(links),
+        "unlinked_spot_ids": unlinked
+    })
+    return True
+
+if __name__ == "__main__":
+    with Logger(job_name="spot-buoy-link-sync") as logger:
+        logger.log_json("INFO", "Starting spot-buoy link sync job")
+        with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+            sync_links(db_connection, logger)
+        logger.log_json("INFO", "Completed spot-buoy link sync job")
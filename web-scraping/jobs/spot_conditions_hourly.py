@@ -0,0 +1,107 @@
+# Standard Library Imports
+import os
+from datetime import datetime
+
+# Third-Party Imports
+import pandas as pd
+
+# Local Application Imports
+from utils import Logger, PostgresConnection
+from utils.fusion import DIRECTION_FIELDS, NUMERIC_FIELDS, WIND_FIELDS, fuse_spot_conditions
+
+# Accessing environment variables for DB connection info
+DB_HOST = os.getenv("DB_HOST")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_NAME = os.getenv("DB_NAME")
+
+# Readings older than this are not used for a spot's current conditions
+MAX_READING_AGE_HOURS = int(os.getenv("MAX_READING_AGE_HOURS", "6"))
+
+LINKS_QUERY = """
+SELECT l.spot_id, l.buoy_id, s.latitude, s.longitude, b.latitude, b.longitude
+FROM reference.spot_buoy_link l
+JOIN reference.spot_info s ON s.id = l.spot_id
+JOIN reference.buoy_info b ON b.id = l.buoy_id
+"""
+
+LATEST_SWELL_QUERY = f"""
+SELECT DISTINCT ON (buoy_id) buoy_id, timestamp, {', '.join(NUMERIC_FIELDS + DIRECTION_FIELDS)}
+FROM ingested.swell_data
+WHERE timestamp > NOW() - make_interval(hours => %s)
+ORDER BY buoy_id, timestamp DESC
+"""
+
+LATEST_WIND_QUERY = f"""
+SELECT DISTINCT ON (spot_id) spot_id, timestamp, {', '.join(WIND_FIELDS)}
+FROM ingested.wind_data
+WHERE timestamp > NOW() - make_interval(hours => %s)
+ORDER BY spot_id, timestamp DESC
+"""
+
+LINK_COLUMNS = ["spot_id", "buoy_id", "spot_latitude", "spot_longitude", "buoy_latitude", "buoy_longitude"]
+SWELL_COLUMNS = ["buoy_id", "timestamp"] + NUMERIC_FIELDS + DIRECTION_FIELDS
+WIND_COLUMNS = ["spot_id", "timestamp"] + WIND_FIELDS
+
+def load_inputs(db_connection, max_age_hours=MAX_READING_AGE_HOURS):
+    """
+    Load the spot-buoy links with coordinates, each buoy's latest swell reading and each spot's latest wind reading.
+
+    Args:
+        db_connection (PostgresConnection): An open database connection.
+        max_age_hours (int, optional): Maximum age of the readings used.
+
+    Returns:
+        tuple: The links, swell and wind DataFrames, or None if a query failed.
+    """
+    links = db_connection.execute_query(LINKS_QUERY, fetch=True)
+    swell = db_connection.execute_query(LATEST_SWELL_QUERY, (max_age_hours,), fetch=True)
+    wind = db_connection.execute_query(LATEST_WIND_QUERY, (max_age_hours,), fetch=True)
+    if links is None or swell is None or wind is None:
+        return None
+
+    links = pd.DataFrame(links, columns=LINK_COLUMNS)
+    links[LINK_COLUMNS[2:]] = links[LINK_COLUMNS[2:]].astype(float)  # DECIMAL columns arrive as Decimal
+    return links, pd.DataFrame(swell, columns=SWELL_COLUMNS), pd.DataFrame(wind, columns=WIND_COLUMNS)
+
+def to_rows(conditions, timestamp):
+    """Convert fused conditions into ingested.spot_conditions rows, with NULL for missing values."""
+    conditions = conditions.astype(object).where(conditions.notna(), None)
+    return [{"timestamp": timestamp, **row} for row in conditions.to_dict("records")]
+
+def compute_spot_conditions(logger):
+    """
+    Fuse the latest buoy and wind readings into spot-level conditions and store them.
+
+    Args:
+        logger (Logger): The logger instance to log messages.
+
+    Returns:
+        bool: True if the conditions were computed and written.
+    """
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+        inputs = load_inputs(db_connection)
+        if inputs is None:
+            logger.log_json("ERROR", "Failed to load readings for spot conditions")
+            return False
+
+        conditions = fuse_spot_conditions(*inputs)
+        rows = to_rows(conditions, timestamp)
+        if not db_connection.insert_many("ingested.spot_conditions", rows, on_conflict="update",
+                                         conflict_columns=["timestamp", "spot_id"]):
+            logger.log_json("ERROR", "Failed to insert spot conditions", {"spots": len(rows)})
+            return False
+        db_connection.notify_changes("ingested.spot_conditions", rows, "spot_id")
+
+    without_swell = conditions.loc[conditions["buoy_count"] == 0, "spot_id"].tolist()
+    if without_swell:
+        logger.log_json("WARNING", "Spots without recent buoy readings", {"spot_ids": without_swell})
+    logger.log_json("INFO", "Spot conditions updated", {"spots": len(rows)})
+    return True
+
+if __name__ == "__main__":
+    with Logger(job_name="spot-conditions-hourly") as logger:
+        logger.log_json("INFO", "Starting spot conditions job")
+        compute_spot_conditions(logger)
+        logger.log_json("INFO", "Completed spot conditions job")
@@ -1,18 +1,29 @@
 # Standard Library Imports
+import argparse
 import sys
 import os
 import re
-from datetime import datetime
+from datetime import datetime, timezone
 import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from io import StringIO
 
 # Third-Party Imports
 import requests
+import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup
 
 # Local Application Imports
-from utils import Logger, PostgresConnection
+from utils import (SWELL_RULES, CadenceScheduler, Logger, ParsePool, PostgresConnection, RedisPublisher, ReferenceSnapshot,
+                   RunDeadline, Spool, StationHealth, Validator, add_shard_arguments, check_shard_arguments, filter_shard,
+                   shard_label)
+from utils.archive import ResponseArchive
+from utils.deadline import prioritize
+from utils.encoding import encode_swell_record
+from utils.spectra import SPECTRA_URL, parse_spectral_file, spectra_rows
+from utils.tides import TidePredictor
 
 # Accessing environment variables for DB connection info
 DB_HOST = os.getenv("DB_HOST")
@@ -20,6 +31,21 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 
+# Number of concurrent page downloads
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", "8"))
+
+# Run deadline: the job runs every 20 minutes, and the last FLUSH_RESERVE_SECONDS of the
+# budget are kept for validating and inserting what was fetched
+RUN_BUDGET_SECONDS = float(os.getenv("RUN_BUDGET_SECONDS", "1080"))
+FLUSH_RESERVE_SECONDS = float(os.getenv("FLUSH_RESERVE_SECONDS", "120"))
+
+# Kind of the archived NDBC station pages (see utils/archive.py and reprocess_archive.py)
+ARCHIVE_KIND = "ndbc_station_page"
+
+LATEST_SPECTRA_QUERY = """
+SELECT buoy_id, MAX(timestamp) FROM ingested.swell_spectra GROUP BY buoy_id
+"""
+
 def extract_number(text):
     """
     Extract the first numeric value from a given string.
@@ -33,37 +59,66 @@ def extract_number(text):
     match = re.search(r"[\d\.]+", str(text))
     return match.group() if match else None
 
-def fetch_swell_data(buoy_id, logger):
+def fetch_swell_page(buoy_id, logger, health=None, timeout=None):
     """
-    Fetch swell data from the NOAA buoy website and parse relevant wave and swell information.
+    Fetch the raw NOAA station page for a buoy.
 
     Args:
-        buoy_id (str): The ID of the buoy to fetch data for.
+        buoy_id (str): The ID of the buoy to fetch the page for.
         logger (Logger): The logger instance to log messages.
+        health (StationHealth, optional): Circuit breaker that records a failed fetch.
+        timeout (float, optional): Request timeout in seconds.
 
     Returns:
-        dict or None: A dictionary containing the parsed wave and swell data, or None if the data could not be fetched or parsed.
+        str or None: The page body, or None if it could not be fetched.
     """
     url = f"https://www.ndbc.noaa.gov/station_page.php?station={buoy_id}"
-    response = requests.get(url)
-    
+    try:
+        response = requests.get(url, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        logger.log_json("ERROR", f"Failed to fetch data for buoy ID {buoy_id}", {"buoy_id": buoy_id, "error": str(e)})
+        if health:
+            health.record_failure(buoy_id, "timeout" if isinstance(e, requests.exceptions.Timeout) else "request_error")
+        return None
+
     if response.status_code != 200:
         logger.log_json("ERROR", f"Failed to fetch data for buoy ID {buoy_id}", {"buoy_id": buoy_id})
+        if health:
+            health.record_failure(buoy_id, f"http_{response.status_code}")
         return None
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    return response.text
+
+def parse_swell_page(buoy_id, html, timestamp=None):
+    """
+    Parse wave, swell and tide information out of a NOAA station page.
+
+    This function is pure (no logging, no I/O) so it can run in a worker process;
+    anything worth logging is returned as events for the caller to log.
+
+    Args:
+        buoy_id (str): The ID of the buoy the page belongs to.
+        html (str): The raw page body.
+        timestamp (str, optional): Fetch time of the page, defaults to now.
+
+    Returns:
+        tuple: The parsed record (or None), the error class if parsing failed (or None),
+            and a list of (level, message, context) events.
+    """
+    events = []
+    soup = BeautifulSoup(html, "html.parser")
     tables = soup.find_all("table")
 
     if not tables:
-        logger.log_json("WARNING", f"No tables found on the page for buoy ID {buoy_id}", {"buoy_id": buoy_id})
-        return None
+        events.append(("WARNING", f"No tables found on the page for buoy ID {buoy_id}", {"buoy_id": buoy_id}))
+        return None, "no_tables", events
 
     # Search for the detailed wave summary table
     detailed_table = next((table for table in tables if "Wave Summary" in table.text), None)
 
     if not detailed_table:
-        logger.log_json("WARNING", f"Detailed wave summary table not found for buoy ID {buoy_id}", {"buoy_id": buoy_id})
-        return None
+        events.append(("WARNING", f"Detailed wave summary table not found for buoy ID {buoy_id}", {"buoy_id": buoy_id}))
+        return None, "no_wave_summary", events
 
     # Search for the main data table (contains tide data)
     main_data_table = None
@@ -87,8 +142,8 @@ def fetch_swell_data(buoy_id, logger):
         wave_steepness = df.iloc[8, 1] if len(df) > 8 else None
         average_wave_period = extract_number(df.iloc[9, 1]) if len(df) > 9 else None
     except IndexError:
-        logger.log_json("ERROR", f"Failure to extract data from table for buoy ID {buoy_id}", {"buoy_id": buoy_id})
-        return None
+        events.append(("ERROR", f"Failure to extract data from table for buoy ID {buoy_id}", {"buoy_id": buoy_id}))
+        return None, "parse_error", events
 
     # Extract tide data from main data table
     tide = None
@@ -103,10 +158,10 @@ def fetch_swell_data(buoy_id, logger):
                     # Remove '+' sign and convert to float
                     tide = float(tide_value.replace('+', ''))
         except (IndexError, ValueError, AttributeError) as e:
-            logger.log_json("WARNING", f"Could not extract tide data for buoy ID {buoy_id}", {"buoy_id": buoy_id, "error": str(e)})
+            events.append(("WARNING", f"Could not extract tide data for buoy ID {buoy_id}", {"buoy_id": buoy_id, "error": str(e)}))
 
-    return {
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    record = {
+        "timestamp": timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "buoy_id": buoy_id,
         "wave_height": wave_height,
         "swell_height": swell_height,
@@ -119,33 +174,187 @@ def fetch_swell_data(buoy_id, logger):
         "average_wave_period": average_wave_period,
         "tide": tide
     }
+    return record, None, events
+
+def handle_parse_result(buoy_id, result, logger, health=None):
+    """
+    Log the events of a parse result and record its outcome in the circuit breaker.
+
+    Args:
+        buoy_id (str): The ID of the buoy the result belongs to.
+        result (tuple): The (record, error_class, events) tuple returned by parse_swell_page.
+        logger (Logger): The logger instance to log messages.
+        health (StationHealth, optional): Circuit breaker that records the outcome.
+
+    Returns:
+        dict or None: The parsed record, or None if parsing failed.
+    """
+    record, error_class, events = result
+    for level, message, context in events:
+        logger.log_json(level, message, context)
+
+    if health:
+        if record:
+            health.record_success(buoy_id)
+        else:
+            health.record_failure(buoy_id, error_class)
+    return record
+
+def fetch_swell_data(buoy_id, logger, health=None):
+    """
+    Fetch swell data from the NOAA buoy website and parse relevant wave and swell information.
+
+    Args:
+        buoy_id (str): The ID of the buoy to fetch data for.
+        logger (Logger): The logger instance to log messages.
+        health (StationHealth, optional): Circuit breaker that records the outcome of the fetch.
+
+    Returns:
+        dict or None: A dictionary containing the parsed wave and swell data, or None if the data could not be fetched or parsed.
+    """
+    html = fetch_swell_page(buoy_id, logger, health)
+    if html is None:
+        return None
+    return handle_parse_result(buoy_id, parse_swell_page(buoy_id, html), logger, health)
 
-def insert_swell_data(swell_data, logger):
+def insert_swell_data(swell_data, logger, spool=None):
     """
     Insert parsed swell data into the PostgreSQL database.
 
     Args:
         swell_data (dict): A dictionary containing swell data to be inserted into the database.
         logger (Logger): The logger instance to log messages.
+        spool (Spool, optional): Spool that receives the row if the insert fails, for replay on the next run.
+
+    Returns:
+        dict or None: The inserted row, or None if the insert failed.
     """
+    # Directions and steepness are stored as SMALLINT (see utils/encoding.py)
+    data = encode_swell_record({
+        "timestamp": swell_data['timestamp'],
+        "buoy_id": swell_data['buoy_id'],
+        "wave_height": swell_data['wave_height'],
+        "swell_height": swell_data['swell_height'],
+        "swell_period": swell_data['swell_period'],
+        "swell_direction": swell_data['swell_direction'],
+        "wind_wave_height": swell_data['wind_wave_height'],
+        "wind_wave_period": swell_data['wind_wave_period'],
+        "wind_wave_direction": swell_data['wind_wave_direction'],
+        "wave_steepness": swell_data['wave_steepness'],
+        "average_wave_period": swell_data['average_wave_period'],
+        "tide": swell_data['tide']
+    })
+    # Only set for tides predicted from harmonic constituents (the column defaults to FALSE)
+    if swell_data.get('tide_predicted'):
+        data['tide_predicted'] = True
+
     with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
-        if db_connection.insert("ingested.swell_data", {
-            "timestamp": swell_data['timestamp'],
-            "buoy_id": swell_data['buoy_id'],
-            "wave_height": swell_data['wave_height'],
-            "swell_height": swell_data['swell_height'],
-            "swell_period": swell_data['swell_period'],
-            "swell_direction": swell_data['swell_direction'],
-            "wind_wave_height": swell_data['wind_wave_height'],
-            "wind_wave_period": swell_data['wind_wave_period'],
-            "wind_wave_direction": swell_data['wind_wave_direction'],
-            "wave_steepness": swell_data['wave_steepness'],
-            "average_wave_period": swell_data['average_wave_period'],
-            "tide": swell_data['tide']
-        }):
+        if db_connection.insert("ingested.swell_data", data):
             logger.log_json("INFO", "Swell data inserted successfully", {"buoy_id": swell_data['buoy_id']})
-        else:
-            logger.log_json("ERROR", "Failed to insert swell data", {"buoy_id": swell_data['buoy_id'], "data": swell_data})
+            return data
+
+    logger.log_json("ERROR", "Failed to insert swell data", {"buoy_id": swell_data['buoy_id'], "data": swell_data})
+    if spool:
+        spool.append("ingested.swell_data", data)
+        logger.log_json("INFO", "Swell data spooled for replay", {"buoy_id": swell_data['buoy_id']})
+    return None
+
+def notify_swell_changes(rows, logger):
+    """
+    Announce the inserted swell readings on the ingested_swell_data channel in a single NOTIFY.
+
+    Args:
+        rows (list): The inserted rows, as returned by insert_swell_data().
+        logger (Logger): The logger instance to log messages.
+    """
+    if not rows:
+        return
+
+    with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+        if not db_connection.notify_changes("ingested.swell_data", rows, "buoy_id"):
+            logger.log_json("WARNING", "Failed to notify swell data changes", {"rows": len(rows)})
+
+def get_tide_predictor(logger):
+    """
+    Load the buoys' harmonic tide constituents.
+
+    Returns:
+        TidePredictor or None: The predictor, or None if the constituents could not be loaded.
+    """
+    with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+        predictor = TidePredictor.load(db_connection)
+
+    if predictor is None:
+        logger.log_json("WARNING", "Could not load tide constituents, leaving missing tides empty")
+    elif predictor.skipped:
+        logger.log_json("WARNING", "Skipped unsupported tide constituents", {"constituents": predictor.skipped})
+    return predictor
+
+def fill_predicted_tides(records, predictor):
+    """
+    Fill the tide of readings whose station page reported none, from the buoy's harmonic constituents.
+
+    All missing tides are predicted in one vectorized pass at the readings' timestamps (naive
+    timestamps are taken as UTC). Every reading gets tide_predicted, True for the filled ones.
+
+    Args:
+        records (list): Parsed swell readings, updated in place.
+        predictor (TidePredictor): Predictor over the buoys with constituents.
+
+    Returns:
+        list: IDs of the buoys whose tide was predicted.
+    """
+    missing = [record for record in records if record.get("tide") is None and record["buoy_id"] in predictor]
+    for record in records:
+        record.setdefault("tide_predicted", False)
+    if not missing:
+        return []
+
+    heights = predictor.predict_at([record["buoy_id"] for record in missing], [record["timestamp"] for record in missing])
+    for record, height in zip(missing, heights):
+        record["tide"] = round(float(height), 2)
+        record["tide_predicted"] = True
+    return [record["buoy_id"] for record in missing]
+
+def validate_swell_data(records, validator, logger, spool=None):
+    """
+    Validate a batch of parsed swell readings before they are inserted.
+
+    Flagged and quarantined readings are recorded in ingested.data_quality; quarantined
+    readings are not returned, so they never reach ingested.swell_data.
+
+    Args:
+        records (list): Parsed swell readings.
+        validator (Validator): Validator configured with SWELL_RULES.
+        logger (Logger): The logger instance to log messages.
+        spool (Spool, optional): Spool that receives the data quality rows if they cannot be written.
+
+    Returns:
+        list: The accepted and flagged readings, to be inserted.
+    """
+    with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+        if not validator.load_last_values(db_connection):
+            logger.log_json("WARNING", "Could not load last stored swell readings, skipping spike checks")
+        result = validator.validate(records)
+        validator.log_summary(result, logger)
+        validator.record_issues(db_connection, result, logger, spool)
+
+    return result.accepted + [record for record, _ in result.flagged]
+
+def replay_spooled_data(spool, logger):
+    """
+    Replay swell data spooled by earlier runs that could not reach the database.
+
+    Args:
+        spool (Spool): The spool holding rows from failed inserts.
+        logger (Logger): The logger instance to log messages.
+    """
+    if not spool.has_pending():
+        return
+
+    with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+        # Rows spooled before the compact encoding still hold compass and steepness labels
+        spool.replay(db_connection, logger, transforms={"ingested.swell_data": encode_swell_record})
 
 
 def get_buoy_ids(logger):
@@ -164,17 +373,290 @@ def get_buoy_ids(logger):
 
     return [buoy_id[0] for buoy_id in buoy_ids]
 
-if __name__ == "__main__":
-    with Logger(job_name="swell-scraper-hourly") as logger:
-        buoy_ids = get_buoy_ids(logger)
+def get_reference(logger):
+    """
+    Load the reference data snapshot, re-reading the reference tables only if they changed since it was saved.
+
+    Returns:
+        ReferenceSnapshot: The buoys, spots and spot-buoy links.
+    """
+    reference = ReferenceSnapshot()
+    with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+        reference.refresh(db_connection, logger)
+
+    if not reference.loaded:
+        logger.log_json("WARNING", "No reference data snapshot available, fetching in default order")
+    return reference
+
+def learn_update_cadence(scheduler, logger):
+    """
+    Learn each buoy's update cadence from previously ingested swell data.
+
+    Args:
+        scheduler (CadenceScheduler): The scheduler to train.
+        logger (Logger): The logger instance to log messages.
+    """
+    with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+        if not scheduler.learn(db_connection):
+            logger.log_json("WARNING", "Could not learn buoy update cadence, falling back to hourly polling")
+
+def run(logger, shard_index=0, shard_count=1, buoy_ids=None, fetch_pool=None, parse_pool=None, archive=None, reference=None,
+        budget=None):
+    """
+    Run one collection pass: replay the spool, fetch and parse the due buoys, then validate and insert their readings.
+
+    Args:
+        logger (Logger): The logger instance of the run.
+        shard_index (int, optional): The shard processed by this run.
+        shard_count (int, optional): The total number of shards.
+        buoy_ids (list, optional): All buoy IDs, taken from the reference data snapshot if not given.
+        fetch_pool (ThreadPoolExecutor, optional): Warm download pool to reuse; a new one is started otherwise.
+        parse_pool (ParsePool, optional): Warm parser pool to reuse; a new one is started otherwise.
+        archive (ResponseArchive, optional): Archive for the raw pages, defaults to one if ARCHIVE_RESPONSES is set.
+        reference (ReferenceSnapshot, optional): Reference data already refreshed for this run, loaded otherwise.
+        budget (float, optional): Run deadline in seconds, defaults to RUN_BUDGET_SECONDS.
+    """
+    deadline = RunDeadline(budget or RUN_BUDGET_SECONDS, FLUSH_RESERVE_SECONDS)
+    if archive is None:
+        archive = ResponseArchive.from_env("swell-scraper-hourly", shard_index, shard_count)
+    label = shard_label(shard_index, shard_count)
+    spool = Spool("swell-scraper-hourly", writer_id=label or None)
+    health = StationHealth(f"swell-scraper-hourly-{label}" if label else "swell-scraper-hourly")
+    scheduler = CadenceScheduler()
 
-        if not buoy_ids:
-            logger.log_json("WARNING", "No buoy IDs to process swell data for")
+    # Every shard replays the spool on its own state volume
+    replay_spooled_data(spool, logger)
 
-        for buoy_id in buoy_ids:
-            swell_data = fetch_swell_data(buoy_id, logger)
+    if reference is None:
+        reference = get_reference(logger)
+    if buoy_ids is None:
+        buoy_ids = reference.buoy_ids
+    buoy_ids = filter_shard(buoy_ids, shard_index, shard_count)
+
+    if not buoy_ids:
+        logger.log_json("WARNING", "No buoy IDs to process swell data for")
+
+    learn_update_cadence(scheduler, logger)
+    buoy_ids, deferred_buoy_ids = scheduler.partition(buoy_ids)
+    if deferred_buoy_ids:
+        logger.log_json("INFO", "Deferred buoys with no new observation expected", {"buoy_ids": deferred_buoy_ids})
+
+    skipped_buoy_ids = [buoy_id for buoy_id in buoy_ids if not health.should_fetch(buoy_id)]
+    buoy_ids = [buoy_id for buoy_id in buoy_ids if buoy_id not in skipped_buoy_ids]
+
+    # Buoys most spots depend on go first, so a run that runs out of time skips the least used ones
+    buoy_ids = prioritize(buoy_ids, reference.buoy_priorities)
+
+    def fetch(buoy_id, pending):
+        timeout = deadline.station_timeout(pending, FETCH_WORKERS)
+        if timeout is None:
+            return buoy_id, None, None  # Out of time: not fetched
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        html = fetch_swell_page(buoy_id, logger, health, timeout)
+        if archive and html is not None:
+            # The fetch time is the reading's timestamp, so reprocessing overwrites the same row
+            archive.add(ARCHIVE_KIND, html, {"buoy_id": buoy_id, "timestamp": timestamp}, logger)
+        return buoy_id, html, timestamp
+
+    # Downloads run in threads; parsing is CPU-bound and runs in a warm process pool
+    with (nullcontext(fetch_pool) if fetch_pool else ThreadPoolExecutor(max_workers=FETCH_WORKERS)) as fetch_pool:
+        pages = list(fetch_pool.map(fetch, buoy_ids, range(len(buoy_ids), 0, -1)))
+
+    late_buoy_ids = [buoy_id for buoy_id, _, timestamp in pages if timestamp is None]
+    pages = [page for page in pages if page[2] is not None]
+    fetched = [(buoy_id, html, timestamp) for buoy_id, html, timestamp in pages if html is not None]
+    for buoy_id, html, _ in pages:
+        if html is None:
+            logger.log_json("ERROR", "Failed to retrieve or insert swell data", {"buoy_id": buoy_id})
+
+    records = []
+    with (nullcontext(parse_pool) if parse_pool else ParsePool()) as parse_pool:
+        results = parse_pool.map(parse_swell_page, *zip(*fetched)) if fetched else []
+        for (buoy_id, _, _), result in zip(fetched, results):
+            swell_data = handle_parse_result(buoy_id, result, logger, health)
 
             if swell_data:
-                insert_swell_data(swell_data, logger)
+                records.append(swell_data)
             else:
                 logger.log_json("ERROR", "Failed to retrieve or insert swell data", {"buoy_id": buoy_id})
+
+    # The whole batch is validated at once before anything is inserted
+    inserted, unflushed = [], []
+    if records:
+        readings = validate_swell_data(records, Validator(SWELL_RULES), logger, spool)
+
+        # Buoys that report no tide get it predicted from their harmonic constituents. This runs after
+        # validation, so a predicted tide never makes an otherwise empty reading look complete.
+        if any(swell_data.get("tide") is None for swell_data in readings):
+            predictor = get_tide_predictor(logger)
+            predicted_buoy_ids = fill_predicted_tides(readings, predictor) if predictor else []
+            if predicted_buoy_ids:
+                logger.log_json("INFO", "Filled missing tides from harmonic predictions", {"buoy_ids": predicted_buoy_ids})
+
+        for swell_data in readings:
+            if deadline.expired:
+                unflushed.append(swell_data)
+                continue
+            row = insert_swell_data(swell_data, logger, spool)
+            if row:
+                inserted.append(row)
+
+    # Past the deadline the remaining readings go to the spool and are inserted by the next run
+    if unflushed:
+        for swell_data in unflushed:
+            spool.append("ingested.swell_data", encode_swell_record(swell_data))
+        logger.log_json("WARNING", "Run deadline reached, spooled remaining swell data",
+                        {"buoy_ids": [swell_data["buoy_id"] for swell_data in unflushed]})
+
+    # Warm the API cache with the readings that were committed
+    RedisPublisher().publish_swell(inserted, logger)
+    notify_swell_changes(inserted, logger)
+
+    if skipped_buoy_ids:
+        logger.log_json("INFO", "Skipped tripped buoys", {"buoy_ids": skipped_buoy_ids})
+    logger.log_json("WARNING" if late_buoy_ids else "INFO", "Run deadline summary",
+                    {"skipped_buoy_ids": late_buoy_ids, **deadline.summary()})
+    health.save()
+    health.log_report(logger)
+    if archive:
+        archive.save_index(logger)
+
+def fetch_spectral_file(buoy_id, kind, logger, timeout=None):
+    """
+    Fetch one of a buoy's NDBC realtime spectral files.
+
+    Args:
+        buoy_id (str): The ID of the buoy.
+        kind (str): "data_spec" (spectral energy) or "swdir" (mean wave direction).
+        logger (Logger): The logger instance to log messages.
+        timeout (float, optional): Request timeout in seconds.
+
+    Returns:
+        str or None: The file content, or None if the buoy does not publish it or the request failed.
+    """
+    url = SPECTRA_URL.format(buoy_id=buoy_id, kind=kind)
+    try:
+        response = requests.get(url, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        logger.log_json("ERROR", f"Failed to fetch {kind} for buoy ID {buoy_id}", {"buoy_id": buoy_id, "error": str(e)})
+        return None
+
+    if response.status_code == 404:
+        # Only buoys with directional wave sensors publish spectra
+        return None
+    if response.status_code != 200:
+        logger.log_json("ERROR", f"Failed to fetch {kind} for buoy ID {buoy_id}", {"buoy_id": buoy_id, "status": response.status_code})
+        return None
+    return response.text
+
+def get_latest_spectra_times(logger):
+    """
+    Retrieve the time of each buoy's latest stored spectrum.
+
+    Returns:
+        dict or None: Buoy ID (as a string) to numpy.datetime64 in UTC, or None if the query failed.
+    """
+    with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+        rows = db_connection.execute_query(LATEST_SPECTRA_QUERY, fetch=True)
+
+    if rows is None:
+        return None
+    return {
+        str(buoy_id): np.datetime64(latest.astimezone(timezone.utc).replace(tzinfo=None), "m")
+        for buoy_id, latest in rows
+    }
+
+def insert_swell_spectra(rows, logger):
+    """
+    Insert spectra rows in one batched transaction, skipping observations already stored.
+
+    Failed writes are not spooled: the NDBC files cover 45 days, so the next run fetches
+    the same observations again.
+
+    Args:
+        rows (list): Rows produced by spectra_rows().
+        logger (Logger): The logger instance to log messages.
+
+    Returns:
+        bool: True if the rows were written (or there were none).
+    """
+    if not rows:
+        return True
+
+    with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+        if db_connection.insert_many("ingested.swell_spectra", rows, on_conflict="nothing",
+                                     conflict_columns=["timestamp", "buoy_id"]):
+            logger.log_json("INFO", "Swell spectra inserted successfully", {"rows": len(rows)})
+            db_connection.notify_changes("ingested.swell_spectra", rows, "buoy_id")
+            return True
+
+    logger.log_json("ERROR", "Failed to insert swell spectra", {"rows": len(rows)})
+    return False
+
+def run_spectra(logger, shard_index=0, shard_count=1, buoy_ids=None, fetch_pool=None, reference=None):
+    """
+    Run one spectral collection pass: fetch each buoy's .data_spec and .swdir files and store the new observations.
+
+    Args:
+        logger (Logger): The logger instance of the run.
+        shard_index (int, optional): The shard processed by this run.
+        shard_count (int, optional): The total number of shards.
+        buoy_ids (list, optional): All buoy IDs, taken from the reference data snapshot if not given.
+        fetch_pool (ThreadPoolExecutor, optional): Warm download pool to reuse; a new one is started otherwise.
+        reference (ReferenceSnapshot, optional): Reference data already refreshed for this run, loaded otherwise.
+    """
+    deadline = RunDeadline(RUN_BUDGET_SECONDS, FLUSH_RESERVE_SECONDS)
+    if reference is None:
+        reference = get_reference(logger)
+    if buoy_ids is None:
+        buoy_ids = reference.buoy_ids
+    buoy_ids = prioritize(filter_shard(buoy_ids, shard_index, shard_count), reference.buoy_priorities)
+
+    latest = get_latest_spectra_times(logger)
+    if latest is None:
+        logger.log_json("ERROR", "Failed to load the latest stored spectra")
+        return
+
+    def fetch(buoy_id, pending):
+        timeout = deadline.station_timeout(pending, FETCH_WORKERS)
+        if timeout is None:
+            return buoy_id, None, None, False  # Out of time: not fetched
+        return (buoy_id, fetch_spectral_file(buoy_id, "data_spec", logger, timeout),
+                fetch_spectral_file(buoy_id, "swdir", logger, timeout), True)
+
+    with (nullcontext(fetch_pool) if fetch_pool else ThreadPoolExecutor(max_workers=FETCH_WORKERS)) as fetch_pool:
+        files = list(fetch_pool.map(fetch, buoy_ids, range(len(buoy_ids), 0, -1)))
+
+    rows, without_spectra = [], []
+    for buoy_id, data_spec, swdir, fetched in files:
+        if not fetched:
+            continue
+        if data_spec is None:
+            without_spectra.append(buoy_id)
+            continue
+        energy = parse_spectral_file(data_spec, has_separation=True)
+        direction = parse_spectral_file(swdir) if swdir else None
+        rows.extend(spectra_rows(buoy_id, energy, direction, since=latest.get(str(buoy_id))))
+
+    insert_swell_spectra(rows, logger)
+
+    late_buoy_ids = [buoy_id for buoy_id, _, _, fetched in files if not fetched]
+    if without_spectra:
+        logger.log_json("INFO", "Buoys without spectral data", {"buoy_ids": without_spectra})
+    logger.log_json("WARNING" if late_buoy_ids else "INFO", "Run deadline summary",
+                    {"skipped_buoy_ids": late_buoy_ids, **deadline.summary()})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect swell data from NOAA buoys.")
+    parser.add_argument("--mode", choices=["summary", "spectra"], default="summary",
+                        help="Ingest the wave summary or the per-frequency spectral data")
+    add_shard_arguments(parser)
+    args = parser.parse_args()
+    check_shard_arguments(parser, args)
+
+    job_name = "swell-spectra-hourly" if args.mode == "spectra" else "swell-scraper-hourly"
+    with Logger(job_name=job_name, shard_index=args.shard_index, shard_count=args.shard_count) as logger:
+        if args.mode == "spectra":
+            run_spectra(logger, args.shard_index, args.shard_count)
+        else:
+            run(logger, args.shard_index, args.shard_count)
@@ -19,6 +19,7 @@ def mock_logger():
     """Mock Logger instance for testing."""
     logger = MagicMock()
     logger.log_json = MagicMock()
+    logger.query_stats = None  # Connections opened with it record no statement timings
     return logger
 
 @pytest.fixture
@@ -0,0 +1,212 @@
+"""
+Unit tests for the raw response archive (utils/archive.py) and the reprocess job
+"""
+import pytest
+import gzip
+import io
+import json
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import ParsePool
+from utils.archive import ArchiveReader, ResponseArchive, body_key
+from reprocess_archive import parse_archived, reprocess
+from wind_scraper_hourly import fetch_wind_data
+
+RUN_TIME = datetime(2026, 1, 15, 10, 20)
+FORECAST_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "openweather_forecast.json")
+
+
+class FakeS3:
+    """Dict-backed S3 client supporting the calls used by the archive."""
+
+    def __init__(self, failing=False):
+        self.objects = {}
+        self.puts = []
+        self.failing = failing
+
+    def put_object(self, Body, Bucket, Key, **kwargs):
+        if self.failing:
+            raise ConnectionError("MinIO unavailable")
+        self.puts.append(Key)
+        self.objects[Key] = Body
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise KeyError(Key)
+        return {}
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def list_objects_v2(self, Bucket, Prefix, ContinuationToken=None):
+        return {"Contents": [{"Key": key} for key in sorted(self.objects) if key.startswith(Prefix)], "IsTruncated": False}
+
+
+@pytest.fixture
+def s3():
+    return FakeS3()
+
+
+def make_archive(s3, job_name="swell-scraper-hourly", **kwargs):
+    return ResponseArchive(job_name, s3_client=s3, now=RUN_TIME, **kwargs)
+
+
+class TestResponseArchive:
+    """Test content-addressed storage and the per-run index."""
+
+    def test_identical_bodies_are_stored_once(self, s3, mock_logger):
+        archive = make_archive(s3)
+
+        first = archive.add("ndbc_station_page", "<html>46225</html>", {"buoy_id": "46225"}, mock_logger)
+        second = archive.add("ndbc_station_page", "<html>46225</html>", {"buoy_id": "46225"}, mock_logger)
+        archive.add("ndbc_station_page", "<html>46221</html>", {"buoy_id": "46221"}, mock_logger)
+
+        assert first == second
+        assert s3.puts == [body_key(first), s3.puts[1]]
+        assert len(archive.entries) == 3
+        assert gzip.decompress(s3.objects[body_key(first)]) == b"<html>46225</html>"
+
+    def test_bodies_from_earlier_runs_are_not_uploaded(self, s3, mock_logger):
+        make_archive(s3).add("ndbc_station_page", b"same page", {"buoy_id": "46225"}, mock_logger)
+        archive = make_archive(s3)
+
+        archive.add("ndbc_station_page", b"same page", {"buoy_id": "46225"}, mock_logger)
+
+        assert len(s3.puts) == 1
+        assert archive.uploaded_bytes == 0
+
+    def test_index(self, s3, mock_logger):
+        archive = make_archive(s3, shard_index=1, shard_count=2)
+        digest = archive.add("ndbc_station_page", b"page", {"buoy_id": "46225", "timestamp": "2026-01-15 10:20:03"},
+                             mock_logger)
+
+        assert archive.save_index(mock_logger)
+
+        index = json.loads(s3.objects["index/swell-scraper-hourly/01-15-2026/10-20-shard-1-of-2.json"])
+        assert index["entries"] == [{"kind": "ndbc_station_page", "sha256": digest, "bytes": 4,
+                                     "buoy_id": "46225", "timestamp": "2026-01-15 10:20:03"}]
+
+    def test_upload_failure_does_not_raise(self, mock_logger):
+        archive = make_archive(FakeS3(failing=True))
+
+        assert archive.add("ndbc_station_page", b"page", {"buoy_id": "46225"}, mock_logger) is None
+        assert archive.entries == []
+        assert mock_logger.log_json.call_args[0][:2] == ("WARNING", "Failed to archive raw response")
+
+    def test_disabled_by_default(self):
+        assert ResponseArchive.from_env("swell-scraper-hourly") is None
+
+    def test_reader_round_trip_and_corruption(self, s3, mock_logger):
+        archive = make_archive(s3)
+        digest = archive.add("ndbc_station_page", b"page", {}, mock_logger)
+        reader = ArchiveReader(s3_client=s3)
+
+        assert reader.body(digest) == b"page"
+        s3.objects[body_key(digest)] = gzip.compress(b"tampered")
+        with pytest.raises(ValueError):
+            reader.body(digest)
+
+    @patch('wind_scraper_hourly.requests.get')
+    def test_wind_fetch_archives_raw_body(self, mock_get, s3, mock_logger, sample_wind_api_response):
+        response = Mock(content=json.dumps(sample_wind_api_response).encode())
+        response.json.return_value = sample_wind_api_response
+        mock_get.return_value = response
+        archive = make_archive(s3, job_name="wind-scraper-hourly")
+
+        fetch_wind_data(32.7, -117.2, mock_logger, archive=archive, archive_meta={"spot_id": 3})
+
+        assert archive.entries[0]["kind"] == "openweather_weather"
+        assert archive.entries[0]["spot_id"] == 3
+        assert ArchiveReader(s3_client=s3).body(archive.entries[0]["sha256"]) == response.content
+
+
+class TestReprocess:
+    """Test re-parsing archived responses and upserting the results."""
+
+    @pytest.fixture
+    def archived(self, s3, mock_logger, sample_swell_html, sample_wind_api_response):
+        swell = make_archive(s3)
+        for buoy_id in ("46225", "46221"):
+            swell.add("ndbc_station_page", sample_swell_html, {"buoy_id": buoy_id, "timestamp": "2026-01-15 10:20:03"},
+                      mock_logger)
+        swell.save_index(mock_logger)
+
+        wind = make_archive(s3, job_name="wind-scraper-hourly")
+        wind.add("openweather_weather", json.dumps(sample_wind_api_response),
+                 {"spot_id": 3, "timestamp": "2026-01-15 10:20:05"}, mock_logger)
+        wind.add("openweather_weather", b'{"main": {}}', {"spot_id": 4, "timestamp": "2026-01-15 10:20:06"}, mock_logger)
+        wind.save_index(mock_logger)
+        return ArchiveReader(s3_client=s3)
+
+    @staticmethod
+    def run(reader, db, logger, job_name, **kwargs):
+        with patch('utils.archive.datetime') as mock_datetime:
+            mock_datetime.now.return_value = RUN_TIME
+            return reprocess(db, reader, logger, job_name, days=1, parse_pool=ParsePool(size=0), batch_size=1, **kwargs)
+
+    def test_swell_pages_are_upserted_with_their_fetch_time(self, archived, mock_db_connection, mock_logger):
+        mock_db_connection.insert_many.return_value = True
+
+        summary = self.run(archived, mock_db_connection, mock_logger, "swell-scraper-hourly")
+
+        assert summary["rows"] == {"ingested.swell_data": 2}
+        (table, rows), kwargs = mock_db_connection.insert_many.call_args
+        assert table == "ingested.swell_data"
+        assert kwargs == {"on_conflict": "update", "conflict_columns": ["timestamp", "buoy_id"]}
+        assert rows[0]["timestamp"] == "2026-01-15 10:20:03"
+        assert isinstance(rows[0]["wave_steepness"], int)
+
+    def test_station_filter_and_dry_run(self, archived, mock_db_connection, mock_logger):
+        summary = self.run(archived, mock_db_connection, mock_logger, "swell-scraper-hourly", station_id=46221,
+                           dry_run=True)
+
+        assert summary["responses"] == 1
+        assert summary["rows"] == {"ingested.swell_data": 1}
+        mock_db_connection.insert_many.assert_not_called()
+
+    def test_parse_failures_are_counted(self, archived, mock_db_connection, mock_logger):
+        mock_db_connection.insert_many.return_value = True
+
+        summary = self.run(archived, mock_db_connection, mock_logger, "wind-scraper-hourly")
+
+        assert summary["parse_failures"] == 1
+        (table, rows), _ = mock_db_connection.insert_many.call_args
+        assert rows == [{"spot_id": 3, "timestamp": "2026-01-15 10:20:05", "wind_speed": 5.5, "wind_direction": 270,
+                         "wind_gust": 8.2}]
+
+    def test_missing_body_is_skipped(self, archived, s3, mock_db_connection, mock_logger):
+        """Test that both buoys' identical pages, stored once, are reported unreadable when the body is gone."""
+        mock_db_connection.insert_many.return_value = True
+        index = json.loads(s3.objects["index/swell-scraper-hourly/01-15-2026/10-20.json"])
+        del s3.objects[body_key(index["entries"][0]["sha256"])]
+
+        summary = self.run(archived, mock_db_connection, mock_logger, "swell-scraper-hourly")
+
+        assert summary["unreadable"] == 2
+        assert summary["rows"] == {}
+
+    def test_forecast_bodies(self):
+        with open(FORECAST_PATH, "rb") as forecast_file:
+            body = forecast_file.read()
+
+        rows, error_class, _ = parse_archived("openweather_forecast", body,
+                                              {"spot_ids": [1, 2], "issued_at": "2026-01-15 10:00:00+0000"})
+
+        assert error_class is None
+        assert rows and {row["spot_id"] for row in rows} == {1, 2}
+        assert all(row["issued_at"] == "2026-01-15 10:00:00+0000" for row in rows)
+
+    def test_group_bodies(self):
+        with open(os.path.join(os.path.dirname(FORECAST_PATH), "openweather_group.json"), "rb") as group_file:
+            body = group_file.read()
+
+        rows, error_class, _ = parse_archived("openweather_group", body, {
+            "locations": {"5363943": [1, 2], "5358736": [4]}, "timestamp": "2026-01-15 10:20:05"})
+
+        assert error_class is None
+        assert [(row["spot_id"], row["wind_speed"]) for row in rows] == [(1, 4.12), (2, 4.12)]
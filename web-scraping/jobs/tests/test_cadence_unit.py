@@ -0,0 +1,124 @@
+"""
+Unit tests for adaptive polling (utils/cadence.py)
+"""
+import pytest
+from unittest.mock import MagicMock
+from datetime import datetime
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.cadence import CadenceScheduler
+
+MINUTE = 60
+
+
+def learned_scheduler(rows):
+    """Build a scheduler trained on (buoy_id, median_gap, samples, since_change, since_fetch) rows."""
+    db_connection = MagicMock()
+    db_connection.execute_query.return_value = rows
+    scheduler = CadenceScheduler()
+    assert scheduler.learn(db_connection)
+    return scheduler
+
+
+class TestLearn:
+    """Test learning station intervals."""
+
+    def test_interval_clamped_to_bounds(self):
+        scheduler = learned_scheduler([
+            (46225, 5 * MINUTE, 10, 0, 0),
+            (46266, 600 * MINUTE, 10, 0, 0),
+            (46254, 90 * MINUTE, 10, 0, 0)
+        ])
+
+        assert scheduler.interval(46225) == 20 * MINUTE
+        assert scheduler.interval(46266) == 180 * MINUTE
+        assert scheduler.interval("46254") == 90 * MINUTE
+
+    def test_default_interval_without_enough_samples(self):
+        scheduler = learned_scheduler([(46225, 30 * MINUTE, 2, 0, 0), (46266, None, 0, 0, 0)])
+
+        assert scheduler.interval(46225) == 60 * MINUTE
+        assert scheduler.interval(46266) == 60 * MINUTE
+
+    def test_learn_failure(self):
+        db_connection = MagicMock()
+        db_connection.execute_query.return_value = None
+        scheduler = CadenceScheduler()
+
+        assert not scheduler.learn(db_connection)
+        assert not scheduler.learned
+
+
+class TestIsDue:
+    """Test the fetch decision."""
+
+    def test_not_due_before_expected_update(self):
+        scheduler = learned_scheduler([(46225, 60 * MINUTE, 10, 40 * MINUTE, 40 * MINUTE)])
+        assert not scheduler.is_due(46225)
+
+    def test_due_once_update_expected(self):
+        scheduler = learned_scheduler([(46225, 60 * MINUTE, 10, 65 * MINUTE, 65 * MINUTE)])
+        assert scheduler.is_due(46225)
+
+    def test_overdue_station_not_retried_immediately(self):
+        # Expected 20 minutes ago, already tried 5 minutes ago without a change
+        scheduler = learned_scheduler([(46225, 60 * MINUTE, 10, 80 * MINUTE, 5 * MINUTE)])
+        assert not scheduler.is_due(46225)
+
+    def test_overdue_station_retried_after_half_interval(self):
+        scheduler = learned_scheduler([(46225, 60 * MINUTE, 10, 120 * MINUTE, 30 * MINUTE)])
+        assert scheduler.is_due(46225)
+
+    def test_max_interval_forces_fetch(self):
+        scheduler = learned_scheduler([(46225, 180 * MINUTE, 10, 10 * MINUTE, 180 * MINUTE)])
+        assert scheduler.is_due(46225)
+
+    def test_unknown_station_is_due(self):
+        scheduler = learned_scheduler([])
+        assert scheduler.is_due(46225)
+
+    def test_fallback_to_hourly_without_history(self):
+        scheduler = CadenceScheduler()
+
+        assert scheduler.is_due(46225, now=datetime(2025, 12, 30, 1, 0))
+        assert not scheduler.is_due(46225, now=datetime(2025, 12, 30, 1, 20))
+        assert not scheduler.is_due(46225, now=datetime(2025, 12, 30, 1, 40))
+
+    def test_partition(self):
+        scheduler = learned_scheduler([
+            (46225, 60 * MINUTE, 10, 65 * MINUTE, 65 * MINUTE),
+            (46266, 60 * MINUTE, 10, 10 * MINUTE, 10 * MINUTE)
+        ])
+
+        due, deferred = scheduler.partition([46225, 46266, 46254])
+        assert due == [46225, 46254]
+        assert deferred == [46266]
+
+
+class TestRequestBudget:
+    """Simulate a day of 20-minute runs to check the request count does not go up."""
+
+    @pytest.mark.parametrize("update_minutes", [60, 120, 180])
+    def test_requests_per_day_not_above_hourly(self, update_minutes):
+        scheduler = CadenceScheduler()
+        fetches = 0
+        last_fetch = -10 ** 9
+        last_change = 0
+        for minute in range(0, 24 * 60, 20):
+            latest_observation = minute // update_minutes * update_minutes
+            scheduler.cadences = {"46225": {
+                "interval": update_minutes * MINUTE,
+                "since_change": (minute - last_change) * MINUTE,
+                "since_fetch": (minute - last_fetch) * MINUTE
+            }}
+            scheduler.learned = True
+            if scheduler.is_due(46225):
+                fetches += 1
+                last_fetch = minute
+                if latest_observation > last_change:
+                    last_change = minute
+
+        assert fetches <= 24
@@ -0,0 +1,206 @@
+"""
+Unit tests for change notifications in utils/postgres_connection.py and utils/change_listener.py
+"""
+import pytest
+import json
+from collections import namedtuple
+from unittest.mock import MagicMock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.postgres_connection import NOTIFY_PAYLOAD_LIMIT, PostgresConnection, change_channel, change_payload
+from utils.change_listener import ChangeListener
+import swell_scraper_hourly
+import wind_scraper_hourly
+
+Notify = namedtuple("Notify", ["pid", "channel", "payload"])
+
+
+class FakeListenConnection:
+    """Connection whose socket is a pipe; writing to the pipe makes it readable like a pending NOTIFY."""
+
+    def __init__(self):
+        self.read_fd, self.write_fd = os.pipe()
+        self.notifies = []
+        self.pending = []
+        self.cursor_mock = MagicMock()
+        self.autocommit = False
+        self.closed = False
+
+    def fileno(self):
+        return self.read_fd
+
+    def cursor(self):
+        return self.cursor_mock
+
+    def send(self, channel, payload):
+        self.pending.append(Notify(1, channel, payload))
+        os.write(self.write_fd, b"x")
+
+    def poll(self):
+        os.read(self.read_fd, 1024)
+        self.notifies.extend(self.pending)
+        self.pending = []
+
+    def close(self):
+        self.closed = True
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+
+class TestChangePayload:
+    """Tests for the channel names and NOTIFY payloads"""
+
+    def test_channel_per_table(self):
+        """Test that each table gets its own channel"""
+        assert change_channel("ingested.swell_data") == "ingested_swell_data"
+        assert change_channel("ingested.wind_forecast") == "ingested_wind_forecast"
+
+    def test_payload_lists_stations_and_time_range(self):
+        """Test that the payload holds the distinct station IDs and the time range of the batch"""
+        rows = [
+            {"buoy_id": 46225, "timestamp": "2025-12-30 11:00:00"},
+            {"buoy_id": 46221, "timestamp": "2025-12-30 10:50:00"},
+            {"buoy_id": 46225, "timestamp": "2025-12-30 10:55:00"}
+        ]
+
+        payload = json.loads(change_payload("ingested.swell_data", rows, "buoy_id"))
+
+        assert payload == {
+            "table": "ingested.swell_data",
+            "rows": 3,
+            "station_ids": [46221, 46225],
+            "from": "2025-12-30 10:50:00",
+            "to": "2025-12-30 11:00:00"
+        }
+
+    def test_payload_is_compact(self):
+        """Test that the payload has no whitespace between tokens"""
+        payload = change_payload("ingested.wind_data", [{"spot_id": 1, "timestamp": "2025-12-30 11:00:00"}], "spot_id")
+        assert ", " not in payload and ": " not in payload
+
+    def test_payload_drops_station_list_over_limit(self):
+        """Test that a batch with too many stations for one NOTIFY sends station_ids as null"""
+        rows = [{"spot_id": 100000 + i, "timestamp": "2025-12-30 11:00:00"} for i in range(2000)]
+
+        encoded = change_payload("ingested.wind_data", rows, "spot_id")
+        payload = json.loads(encoded)
+
+        assert len(encoded) <= NOTIFY_PAYLOAD_LIMIT
+        assert payload["station_ids"] is None
+        assert payload["rows"] == 2000
+
+    def test_custom_time_key(self):
+        """Test that forecast rows are ranged by forecast_time"""
+        rows = [{"spot_id": 1, "forecast_time": "2025-12-31 03:00:00+0000"},
+                {"spot_id": 1, "forecast_time": "2025-12-30 12:00:00+0000"}]
+
+        payload = json.loads(change_payload("ingested.wind_forecast", rows, "spot_id", "forecast_time"))
+
+        assert payload["from"] == "2025-12-30 12:00:00+0000"
+        assert payload["to"] == "2025-12-31 03:00:00+0000"
+
+
+class TestNotifyChanges:
+    """Tests for PostgresConnection.notify_changes()"""
+
+    def test_sends_single_pg_notify(self, mock_logger):
+        """Test that a batch is announced with one pg_notify call on the table's channel"""
+        db = PostgresConnection("localhost", "user", "password", "db", mock_logger)
+        rows = [{"buoy_id": 46225, "timestamp": "2025-12-30 11:00:00"}]
+
+        with patch.object(db, "execute_query", return_value=True) as execute_query:
+            assert db.notify_changes("ingested.swell_data", rows, "buoy_id") is True
+
+        execute_query.assert_called_once()
+        query, (channel, payload) = execute_query.call_args[0]
+        assert "pg_notify" in query
+        assert channel == "ingested_swell_data"
+        assert json.loads(payload)["station_ids"] == [46225]
+
+    def test_empty_batch_sends_nothing(self, mock_logger):
+        """Test that nothing is sent when no rows were written"""
+        db = PostgresConnection("localhost", "user", "password", "db", mock_logger)
+
+        with patch.object(db, "execute_query") as execute_query:
+            assert db.notify_changes("ingested.swell_data", [], "buoy_id") is True
+
+        execute_query.assert_not_called()
+
+    def test_reports_failure(self, mock_logger):
+        """Test that a failed NOTIFY returns False"""
+        db = PostgresConnection("localhost", "user", "password", "db", mock_logger)
+
+        with patch.object(db, "execute_query", return_value=None):
+            assert db.notify_changes("ingested.wind_data", [{"spot_id": 1, "timestamp": "t"}], "spot_id") is False
+
+    def test_scrapers_notify_inserted_rows(self, mock_logger):
+        """Test that the scraper helpers announce their inserted rows on the right channel"""
+        mock_db = MagicMock()
+        with patch('swell_scraper_hourly.PostgresConnection') as mock_conn:
+            mock_conn.return_value.__enter__.return_value = mock_db
+            swell_scraper_hourly.notify_swell_changes([{"buoy_id": 46225, "timestamp": "t"}], mock_logger)
+        with patch('wind_scraper_hourly.PostgresConnection') as mock_conn:
+            mock_conn.return_value.__enter__.return_value = mock_db
+            wind_scraper_hourly.notify_wind_changes([{"spot_id": 1, "timestamp": "t"}], mock_logger)
+            wind_scraper_hourly.notify_wind_changes([], mock_logger)
+
+        calls = [call[0][:3] for call in mock_db.notify_changes.call_args_list]
+        assert calls == [("ingested.swell_data", [{"buoy_id": 46225, "timestamp": "t"}], "buoy_id"),
+                         ("ingested.wind_data", [{"spot_id": 1, "timestamp": "t"}], "spot_id")]
+
+
+class TestChangeListener:
+    """Tests for the ChangeListener helper"""
+
+    def test_listens_on_table_channels_in_autocommit(self):
+        """Test that connecting issues LISTEN for every table's channel outside a transaction"""
+        conn = FakeListenConnection()
+
+        with ChangeListener("localhost", "user", "password", "db",
+                            ["ingested.swell_data", "ingested.wind_data"], connection=conn):
+            pass
+
+        assert conn.autocommit is True
+        executed = [call[0][0] for call in conn.cursor_mock.__enter__.return_value.execute.call_args_list]
+        assert executed == ['LISTEN "ingested_swell_data"', 'LISTEN "ingested_wind_data"']
+        assert conn.closed
+
+    def test_poll_decodes_notifications(self):
+        """Test that pending notifications are returned as decoded payloads with their channel"""
+        conn = FakeListenConnection()
+        listener = ChangeListener("localhost", "user", "password", "db", ["ingested.swell_data"], connection=conn)
+        listener.connect()
+        payload = change_payload("ingested.swell_data", [{"buoy_id": 46225, "timestamp": "2025-12-30 11:00:00"}], "buoy_id")
+        conn.send("ingested_swell_data", payload)
+        conn.send("ingested_swell_data", payload)
+
+        changes = listener.poll(timeout=1)
+
+        assert len(changes) == 2
+        assert changes[0]["channel"] == "ingested_swell_data"
+        assert changes[0]["station_ids"] == [46225]
+        listener.close()
+
+    def test_poll_times_out_without_notifications(self):
+        """Test that polling returns an empty list once the timeout expires"""
+        conn = FakeListenConnection()
+        listener = ChangeListener("localhost", "user", "password", "db", ["ingested.swell_data"], connection=conn)
+        listener.connect()
+
+        assert listener.poll(timeout=0.01) == []
+        listener.close()
+
+    def test_poll_keeps_non_json_payloads(self):
+        """Test that a payload sent by hand (not JSON) is passed through"""
+        conn = FakeListenConnection()
+        listener = ChangeListener("localhost", "user", "password", "db", ["ingested.wind_data"], connection=conn)
+        listener.connect()
+        conn.send("ingested_wind_data", "manual refresh")
+
+        changes = listener.poll(timeout=1)
+
+        assert changes == [{"table": None, "payload": "manual refresh", "channel": "ingested_wind_data"}]
+        listener.close()
@@ -0,0 +1,104 @@
+"""
+Unit tests for the run deadline and station priorities (utils/deadline.py)
+"""
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.deadline import RunDeadline, prioritize
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class TestRunDeadline:
+    """Test the run budget and per-station timeouts."""
+
+    def test_remaining_budget(self):
+        clock = FakeClock()
+        deadline = RunDeadline(600, reserve_seconds=100, clock=clock)
+        clock.advance(250)
+
+        assert deadline.elapsed() == 250
+        assert deadline.remaining() == 350
+        assert deadline.fetch_remaining() == 250
+        assert not deadline.expired
+
+    def test_expired_after_budget(self):
+        clock = FakeClock()
+        deadline = RunDeadline(600, clock=clock)
+        clock.advance(600)
+
+        assert deadline.expired
+
+    def test_timeout_is_fair_share_of_remaining_time(self):
+        """Test that pending stations split the fetch time left, per round of concurrent workers."""
+        deadline = RunDeadline(1000, reserve_seconds=100, max_timeout=60, clock=FakeClock())
+
+        assert deadline.station_timeout(pending=90) == 10
+        assert deadline.station_timeout(pending=90, workers=9) == 60
+        assert deadline.station_timeout(pending=900, workers=8) == pytest.approx(900 / 113, abs=0.01)
+
+    def test_timeout_clamped(self):
+        """Test that timeouts stay between the minimum and maximum."""
+        clock = FakeClock()
+        deadline = RunDeadline(1000, reserve_seconds=100, min_timeout=2, max_timeout=30, clock=clock)
+
+        assert deadline.station_timeout(pending=1) == 30
+        assert deadline.station_timeout(pending=10000) == 2
+
+    def test_timeout_never_exceeds_fetch_time_left(self):
+        clock = FakeClock()
+        deadline = RunDeadline(1000, reserve_seconds=100, min_timeout=2, max_timeout=30, clock=clock)
+        clock.advance(895)
+
+        assert deadline.station_timeout(pending=1) == 5
+
+    def test_no_timeout_once_fetch_budget_is_spent(self):
+        """Test that no further stations are started inside the flush reserve."""
+        clock = FakeClock()
+        deadline = RunDeadline(1000, reserve_seconds=100, min_timeout=2, clock=clock)
+        clock.advance(899)
+
+        assert deadline.station_timeout(pending=5) is None
+        assert not deadline.expired
+
+    def test_reserve_larger_than_budget(self):
+        deadline = RunDeadline(60, reserve_seconds=120, clock=FakeClock())
+
+        assert deadline.station_timeout(pending=1) is None
+
+    def test_summary(self):
+        clock = FakeClock()
+        deadline = RunDeadline(1080, clock=clock)
+        clock.advance(12.34)
+
+        assert deadline.summary() == {"budget_seconds": 1080, "elapsed_seconds": 12.3}
+
+
+class TestPriorities:
+    """Test station prioritization by linked spots."""
+
+    def test_most_linked_first(self):
+        """Test that stations are ordered by priority and unlinked stations keep their order at the end."""
+        station_ids = ["41013", "46221", "46225", "46254", "46266"]
+        priorities = {"46225": 3, "46221": 1, "46266": 3}
+
+        assert prioritize(station_ids, priorities) == ["46225", "46266", "46221", "41013", "46254"]
+
+    def test_prioritize_with_key(self):
+        spots = [(1, 32.7, -117.2), (2, 33.6, -117.9), (3, 34.0, -118.5)]
+
+        assert prioritize(spots, {"3": 2, "2": 1}, key=lambda spot: spot[0]) == [spots[2], spots[1], spots[0]]
@@ -0,0 +1,153 @@
+"""
+Unit tests for the compact swell encoding (utils/encoding.py) and its backfill migration
+"""
+import pytest
+import numpy as np
+from unittest.mock import MagicMock
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.directions import COMPASS_POINTS, to_compass
+from utils.encoding import decode_steepness, encode_direction, encode_steepness, encode_swell_record
+import migrate_swell_encoding
+from migrate_swell_encoding import (BACKFILL_BATCH_SQL, COLUMN_TYPE_QUERY, FIRST_KEY, LAST_KEY, MIGRATION_START_QUERY,
+                                    NEXT_KEY_QUERY, SWAP_SQL, backfill, migrate)
+
+
+class TestEncodeDirection:
+    """Test the SMALLINT direction encoding."""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("N", 0), ("NNE", 23), ("wnw", 293), (" NNW ", 338), (292.6, 293), ("270", 270), (359.6, 0), (-10, 350)
+    ])
+    def test_encoded(self, value, expected):
+        assert encode_direction(value) == expected
+
+    @pytest.mark.parametrize("value", [None, "", "-", "N/A", "MM", np.nan, float("inf")])
+    def test_missing(self, value):
+        assert encode_direction(value) is None
+
+    def test_compass_round_trip(self):
+        """Test that every compass point decodes back to itself."""
+        assert to_compass([encode_direction(point) for point in COMPASS_POINTS]) == COMPASS_POINTS
+
+
+class TestEncodeSteepness:
+    """Test the steepness codes."""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("SWELL", 1), ("AVERAGE", 2), ("steep", 3), ("VERY_STEEP", 4), ("Very Steep", 4), (2, 2)
+    ])
+    def test_encoded(self, value, expected):
+        assert encode_steepness(value) == expected
+
+    @pytest.mark.parametrize("value", [None, "N/A", "", 9, np.nan])
+    def test_missing(self, value):
+        assert encode_steepness(value) is None
+
+    def test_decode(self):
+        assert decode_steepness(4) == "VERY_STEEP"
+        assert decode_steepness(None) is None
+
+
+class TestEncodeSwellRecord:
+    """Test encoding a whole reading."""
+
+    def test_encodes_and_is_idempotent(self):
+        record = {"buoy_id": "46225", "swell_height": 5.2, "swell_direction": "WNW",
+                  "wind_wave_direction": "NW", "wave_steepness": "AVERAGE"}
+
+        encoded = encode_swell_record(record)
+
+        assert encoded == {"buoy_id": "46225", "swell_height": 5.2, "swell_direction": 293,
+                           "wind_wave_direction": 315, "wave_steepness": 2}
+        assert record["swell_direction"] == "WNW"
+        assert encode_swell_record(encoded) == encoded
+
+
+class TestMigration:
+    """Test the batched backfill against a database that answers by query."""
+
+    STARTED_AT = "2025-12-30 06:00:00+00"
+
+    def make_db(self, keys, column_type="character varying", fail_on_batch=None, started_at=STARTED_AT):
+        db = MagicMock()
+        updates = []
+
+        def execute_query(query, params=None, fetch=False):
+            if query == COLUMN_TYPE_QUERY:
+                return [(column_type,)]
+            if query == MIGRATION_START_QUERY:
+                return [(started_at,)] if started_at else None
+            if query == NEXT_KEY_QUERY:
+                lower, offset = tuple(params[:2]), params[2]
+                remaining = [key for key in keys if lower == FIRST_KEY or key > lower]
+                return [remaining[offset]] if offset < len(remaining) else []
+            if query == BACKFILL_BATCH_SQL:
+                if len(updates) == fail_on_batch:
+                    return None
+                updates.append(params)
+            return True
+
+        db.execute_query.side_effect = execute_query
+        db.updates = updates
+        return db
+
+    def test_batches_cover_the_table(self, mock_logger):
+        keys = [(f"2025-12-30 0{hour}:00", buoy_id) for hour in range(5) for buoy_id in (46221, 46225)]
+        db = self.make_db(keys)
+        sleep = MagicMock()
+
+        last_key = backfill(db, mock_logger, batch_size=4, pause=0.5, sleep=sleep)
+
+        assert db.updates == [
+            (*FIRST_KEY, *keys[3]),
+            (*keys[3], *keys[7]),
+            (*keys[7], *LAST_KEY)
+        ]
+        assert last_key == keys[7]
+        assert sleep.call_count == 2
+
+    def test_migrate_swaps_after_backfill(self, mock_logger):
+        db = self.make_db([("2025-12-30 00:00", 46225)])
+
+        assert migrate(db, mock_logger, batch_size=10, pause=0, sleep=MagicMock())
+
+        queries = [call[0][0] for call in db.execute_query.call_args_list]
+        assert queries[1] == MIGRATION_START_QUERY
+        assert queries[2] == migrate_swell_encoding.ADD_STAGING_COLUMNS_SQL
+        assert queries[-1] == SWAP_SQL
+        assert db.execute_query.call_args_list[-1][0][1] == (self.STARTED_AT, FIRST_KEY[0])
+
+    def test_swap_converts_rows_inserted_since_the_start(self):
+        """Test that the catch-up is bounded by insert time, so old spooled rows replayed mid-backfill are included."""
+        assert "WHERE ingested_at >= %s OR timestamp >= %s;" in SWAP_SQL
+        assert "make_interval" not in SWAP_SQL
+
+    def test_unknown_start_time_does_not_migrate(self, mock_logger):
+        db = self.make_db([("2025-12-30 00:00", 46225)], started_at=None)
+
+        assert not migrate(db, mock_logger)
+        assert migrate_swell_encoding.ADD_STAGING_COLUMNS_SQL not in [call[0][0] for call in db.execute_query.call_args_list]
+
+    def test_failed_batch_does_not_swap(self, mock_logger):
+        keys = [("2025-12-30 00:00", buoy_id) for buoy_id in range(10)]
+        db = self.make_db(keys, fail_on_batch=1)
+
+        assert not migrate(db, mock_logger, batch_size=4, pause=0, sleep=MagicMock())
+        assert SWAP_SQL not in [call[0][0] for call in db.execute_query.call_args_list]
+
+    def test_already_migrated(self, mock_logger):
+        db = self.make_db([], column_type="smallint")
+
+        assert migrate(db, mock_logger)
+        assert db.execute_query.call_count == 1
+
+    def test_sql_mapping_matches_python(self):
+        """Test that the backfill's CASE uses the same codes as the insert path."""
+        for point in COMPASS_POINTS:
+            assert f"WHEN '{point}' THEN {encode_direction(point)} " in BACKFILL_BATCH_SQL
+        assert "WHEN 'VERY_STEEP' THEN 4" in BACKFILL_BATCH_SQL
+        assert "%" not in BACKFILL_BATCH_SQL.replace("%s", "")
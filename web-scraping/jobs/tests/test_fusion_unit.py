@@ -0,0 +1,164 @@
+"""
+Unit tests for spot-level condition fusion (utils/directions.py, utils/fusion.py, spot_conditions_hourly.py)
+"""
+import pytest
+import math
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.directions import circular_mean, to_compass, to_degrees
+from utils.fusion import fuse_spot_conditions, haversine_km
+from spot_conditions_hourly import LINK_COLUMNS, SWELL_COLUMNS, WIND_COLUMNS, compute_spot_conditions, to_rows
+
+SPOTS = {6: (32.957927, -117.268223), 4: (32.866565, -117.254110), 1: (32.717984, -117.256269)}
+BUOYS = {46266: (32.957, -117.279), 46225: (32.933, -117.391), 46254: (32.868, -117.267), 46232: (32.517, -117.425)}
+LINKS = [(6, 46266), (6, 46225), (4, 46254), (1, 46232)]
+
+
+def links_frame():
+    return pd.DataFrame(
+        [(spot, buoy, *SPOTS[spot], *BUOYS[buoy]) for spot, buoy in LINKS],
+        columns=LINK_COLUMNS
+    )
+
+
+def swell_frame(rows):
+    return pd.DataFrame(rows, columns=SWELL_COLUMNS)
+
+
+def swell_row(buoy_id, swell_height, swell_direction, tide=None, timestamp=datetime(2025, 12, 30, 1, 50)):
+    return (buoy_id, timestamp, 5.9, swell_height, 14.0, 2.3, 6.0, 8.5, tide, swell_direction, "NW")
+
+
+def wind_frame(rows=()):
+    return pd.DataFrame(list(rows), columns=WIND_COLUMNS)
+
+
+class TestDirections:
+    """Test compass conversions and circular averaging."""
+
+    def test_compass_to_degrees(self):
+        assert to_degrees(["N", "WNW", "se", "270", 365, None, "MM"]).tolist()[:5] == [0.0, 292.5, 135.0, 270.0, 5.0]
+        assert np.isnan(to_degrees([None, "MM"])).all()
+
+    def test_degrees_to_compass(self):
+        assert to_compass([0, 292.5, 350, 11.24, np.nan]) == ["N", "WNW", "N", "N", None]
+
+    def test_circular_mean_wraps_north(self):
+        mean = circular_mean([350, 10])
+        assert min(mean, 360 - mean) == pytest.approx(0, abs=1e-6)
+        assert circular_mean([270, 300], weights=[3, 1]) == pytest.approx(277.4, abs=0.1)
+        assert math.isnan(circular_mean([90, 270]))
+
+
+class TestFuseSpotConditions:
+    """Test inverse-distance weighting over linked buoys."""
+
+    def test_haversine(self):
+        assert haversine_km(32.7157, -117.1611, 34.0522, -118.2437) == pytest.approx(179.4, abs=0.5)
+
+    def test_nearer_buoy_dominates(self):
+        swell = swell_frame([swell_row(46266, 2.0, "W"), swell_row(46225, 6.0, "NW")])
+
+        fused = fuse_spot_conditions(links_frame(), swell, wind_frame()).set_index("spot_id")
+
+        # 46266 is ~1 km from Del Mar, 46225 is ~12 km away
+        assert fused.loc[6, "buoy_count"] == 2
+        assert 2.0 < fused.loc[6, "swell_height"] < 2.1
+        assert 270 < fused.loc[6, "swell_direction"] < 272
+        assert fused.loc[6, "nearest_buoy_km"] == pytest.approx(1.0, abs=0.1)
+
+    def test_matches_reference_implementation(self):
+        swell = swell_frame([swell_row(46266, 2.0, "WNW", tide=0.4), swell_row(46225, 6.0, "NNW", tide=None)])
+
+        fused = fuse_spot_conditions(links_frame(), swell, wind_frame(), power=2.0, min_distance_km=1.0).set_index("spot_id")
+
+        spot = SPOTS[6]
+        distances = [max(haversine_km(*spot, *BUOYS[buoy]), 1.0) for buoy in (46266, 46225)]
+        weights = [1 / d ** 2 for d in distances]
+        expected_height = (weights[0] * 2.0 + weights[1] * 6.0) / sum(weights)
+        assert fused.loc[6, "swell_height"] == pytest.approx(expected_height, abs=0.01)
+        assert fused.loc[6, "swell_direction"] == pytest.approx(circular_mean([292.5, 337.5], weights), abs=0.1)
+        # Only the buoy that reported a tide takes part in the tide average
+        assert fused.loc[6, "tide"] == 0.4
+
+    def test_spots_without_buoy_readings_keep_wind(self):
+        swell = swell_frame([swell_row(46254, 3.0, "W")])
+        wind = wind_frame([(1, datetime(2025, 12, 30, 1, 0), 5.5, 270, 8.2)])
+
+        fused = fuse_spot_conditions(links_frame(), swell, wind).set_index("spot_id")
+
+        assert sorted(fused.index) == [1, 4]
+        assert fused.loc[1, "buoy_count"] == 0
+        assert np.isnan(fused.loc[1, "swell_height"])
+        assert fused.loc[1, "wind_speed"] == 5.5
+        assert np.isnan(fused.loc[4, "wind_speed"])
+
+    def test_many_spots_in_one_pass(self):
+        rng = np.random.default_rng(7)
+        spot_count, buoy_count = 5000, 200
+        links = pd.DataFrame({
+            "spot_id": np.repeat(np.arange(spot_count), 3),
+            "buoy_id": rng.integers(0, buoy_count, spot_count * 3),
+            "spot_latitude": np.repeat(rng.uniform(30, 40, spot_count), 3),
+            "spot_longitude": np.repeat(rng.uniform(-125, -115, spot_count), 3),
+            "buoy_latitude": rng.uniform(30, 40, spot_count * 3),
+            "buoy_longitude": rng.uniform(-125, -115, spot_count * 3)
+        }).drop_duplicates(["spot_id", "buoy_id"])
+        swell = swell_frame([swell_row(buoy, float(buoy % 7), "W") for buoy in range(buoy_count)])
+
+        fused = fuse_spot_conditions(links, swell, wind_frame())
+
+        assert len(fused) == spot_count
+        assert fused["swell_direction"].between(269.9, 270.1).all()
+
+
+class TestComputeSpotConditions:
+    """Test the fusion job."""
+
+    def test_rows_upserted(self, mock_logger, mock_db_connection):
+        mock_db_connection.execute_query.side_effect = [
+            [(spot, buoy, Decimal(str(SPOTS[spot][0])), Decimal(str(SPOTS[spot][1])), Decimal(str(BUOYS[buoy][0])),
+              Decimal(str(BUOYS[buoy][1]))) for spot, buoy in LINKS],
+            [swell_row(46266, 2.0, "W"), swell_row(46254, 3.0, "WSW")],
+            [(6, datetime(2025, 12, 30, 1, 0), 5.5, 270, None)]
+        ]
+        mock_db_connection.insert_many.return_value = True
+
+        with patch('spot_conditions_hourly.PostgresConnection') as mock_conn:
+            mock_conn.return_value.__enter__.return_value = mock_db_connection
+            assert compute_spot_conditions(mock_logger)
+
+        table, rows = mock_db_connection.insert_many.call_args[0]
+        assert table == "ingested.spot_conditions"
+        assert mock_db_connection.insert_many.call_args.kwargs["conflict_columns"] == ["timestamp", "spot_id"]
+        by_spot = {row["spot_id"]: row for row in rows}
+        assert sorted(by_spot) == [4, 6]
+        assert by_spot[6]["wind_speed"] == 5.5 and by_spot[6]["wind_gust"] is None
+        assert by_spot[4]["wind_speed"] is None
+
+    def test_query_failure(self, mock_logger, mock_db_connection):
+        mock_db_connection.execute_query.return_value = None
+
+        with patch('spot_conditions_hourly.PostgresConnection') as mock_conn:
+            mock_conn.return_value.__enter__.return_value = mock_db_connection
+            assert not compute_spot_conditions(mock_logger)
+
+        mock_db_connection.insert_many.assert_not_called()
+
+    def test_rows_hold_plain_python_values(self):
+        swell = swell_frame([swell_row(46266, 2.0, "W")])
+        rows = to_rows(fuse_spot_conditions(links_frame(), swell, wind_frame()), "2025-12-30 02:00:00")
+
+        assert type(rows[0]["spot_id"]) is int
+        assert type(rows[0]["buoy_count"]) is int
+        assert type(rows[0]["swell_height"]) is float
+        assert rows[0]["tide"] is None
@@ -180,7 +180,7 @@ class TestWindScraperIntegration:
         
         # Mock mixed responses
         call_count = [0]
-        def mock_get_side_effect(url):
+        def mock_get_side_effect(url, **kwargs):
             call_count[0] += 1
             if call_count[0] % 2 == 1:  # Odd calls succeed
                 mock_response = Mock()
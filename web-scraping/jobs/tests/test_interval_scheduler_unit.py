@@ -0,0 +1,181 @@
+"""
+Unit tests for the daemon's internal scheduler (utils/interval_scheduler.py)
+"""
+import pytest
+import random
+from unittest.mock import MagicMock
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.interval_scheduler import IntervalScheduler
+
+MINUTE = 60
+
+
+class FakeClock:
+    """Wall clock advanced by hand; sleeping advances it."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def fake_scheduler(seed=0):
+    clock = FakeClock()
+    return clock, IntervalScheduler(clock=clock, sleep=clock.sleep, rng=random.Random(seed))
+
+
+def run_for(clock, scheduler, seconds):
+    """Drive the scheduler loop until the fake clock has advanced by seconds."""
+    end = clock.now + seconds
+    scheduler.run_forever(lambda: clock.now >= end, max_sleep=MINUTE)
+
+
+class TestSchedule:
+    """Test when jobs run."""
+
+    def test_runs_on_interval(self):
+        clock, scheduler = fake_scheduler()
+        runs = []
+        scheduler.add("swell", lambda: runs.append(clock.now), 20 * MINUTE)
+
+        run_for(clock, scheduler, 60 * MINUTE)
+
+        assert runs == [0, 20 * MINUTE, 40 * MINUTE]
+
+    def test_run_immediately_false_waits_one_interval(self):
+        clock, scheduler = fake_scheduler()
+        runs = []
+        scheduler.add("wind", lambda: runs.append(clock.now), 60 * MINUTE, run_immediately=False)
+
+        run_for(clock, scheduler, 61 * MINUTE)
+
+        assert runs == [60 * MINUTE]
+
+    def test_jitter_stays_within_slot(self):
+        """Test that each run is delayed by at most the jitter and slots do not drift."""
+        clock, scheduler = fake_scheduler(seed=42)
+        runs = []
+        scheduler.add("swell", lambda: runs.append(clock.now), 20 * MINUTE, jitter=MINUTE)
+
+        run_for(clock, scheduler, 24 * 60 * MINUTE)
+
+        assert len(runs) == 72
+        offsets = [run - i * 20 * MINUTE for i, run in enumerate(runs)]
+        assert all(0 <= offset <= MINUTE for offset in offsets)
+        assert len(set(round(offset, 6) for offset in offsets)) > 1
+
+    def test_jitter_capped_at_interval(self):
+        clock, scheduler = fake_scheduler()
+        job = scheduler.add("swell", lambda: None, 10, jitter=100)
+
+        assert job.jitter == 10
+
+    def test_jobs_run_in_due_order_without_overlap(self):
+        """Test that two due jobs run one after the other in the same thread."""
+        clock, scheduler = fake_scheduler()
+        order = []
+
+        def slow_swell():
+            order.append(("swell", clock.now))
+            clock.now += 5 * MINUTE
+
+        scheduler.add("swell", slow_swell, 20 * MINUTE)
+        scheduler.add("wind", lambda: order.append(("wind", clock.now)), 60 * MINUTE)
+
+        assert scheduler.run_pending() == ["swell", "wind"]
+        assert order == [("swell", 0), ("wind", 5 * MINUTE)]
+
+    def test_overrun_skips_missed_slots(self):
+        """Test that a run longer than its interval skips the slots it overran instead of catching up."""
+        clock, scheduler = fake_scheduler()
+        runs = []
+
+        def overrun():
+            runs.append(clock.now)
+            if len(runs) == 1:
+                clock.now += 45 * MINUTE
+
+        job = scheduler.add("swell", overrun, 20 * MINUTE)
+
+        run_for(clock, scheduler, 100 * MINUTE)
+
+        assert runs == [0, 45 * MINUTE, 60 * MINUTE, 80 * MINUTE]
+        assert job.missed == 1
+
+    def test_sleeps_until_next_run(self):
+        clock, scheduler = fake_scheduler()
+        scheduler.add("swell", lambda: None, 20 * MINUTE)
+
+        scheduler.run_pending()
+
+        assert scheduler.seconds_until_next() == 20 * MINUTE
+        clock.now += 25 * MINUTE
+        assert scheduler.seconds_until_next() == 0
+
+    def test_sleep_capped_for_responsive_stop(self):
+        clock, scheduler = fake_scheduler()
+        scheduler.add("wind", lambda: None, 60 * MINUTE)
+
+        run_for(clock, scheduler, 60 * MINUTE)
+
+        assert max(clock.sleeps) == MINUTE
+
+
+class TestFailures:
+    """Test that failing jobs do not stop the loop."""
+
+    def test_failed_run_is_recorded_and_rescheduled(self, mock_logger):
+        clock, scheduler = fake_scheduler()
+        calls = []
+
+        def flaky():
+            calls.append(clock.now)
+            if len(calls) == 1:
+                raise RuntimeError("database unavailable")
+
+        job = scheduler.add("swell", flaky, 20 * MINUTE)
+
+        scheduler.run_pending(mock_logger)
+        assert job.last_error == "database unavailable"
+        mock_logger.log_json.assert_called_once_with(
+            "ERROR", "Scheduled job failed", {"job": "swell", "error": "database unavailable"})
+
+        run_for(clock, scheduler, 21 * MINUTE)
+        assert calls == [0, 20 * MINUTE]
+        assert job.last_error is None
+        assert job.runs == 2
+
+    def test_status(self):
+        clock, scheduler = fake_scheduler()
+        scheduler.add("swell", lambda: clock.sleep(30), 20 * MINUTE)
+
+        scheduler.run_pending()
+
+        status = scheduler.status()["swell"]
+        assert status["runs"] == 1
+        assert status["last_run"] == 0
+        assert status["last_duration"] == 30
+        assert status["next_run"] == 20 * MINUTE
+        assert scheduler.heartbeat == 30
+
+    def test_heartbeat_refreshed_after_each_job(self):
+        """Test that two long runs due together never leave the heartbeat older than one run."""
+        clock, scheduler = fake_scheduler()
+        heartbeats = []
+        scheduler.add("swell", lambda: clock.sleep(18 * MINUTE), 20 * MINUTE)
+        scheduler.add("wind", lambda: (heartbeats.append(scheduler.heartbeat), clock.sleep(55 * MINUTE)), 60 * MINUTE)
+
+        scheduler.run_pending()
+
+        assert heartbeats == [18 * MINUTE]
+        assert scheduler.heartbeat == 73 * MINUTE
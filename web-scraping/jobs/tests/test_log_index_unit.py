@@ -0,0 +1,182 @@
+"""
+Unit tests for run manifests (utils/logger.py) and the log index (utils/log_index.py)
+"""
+import pytest
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from datetime import datetime
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.logger import Logger
+from utils.log_index import LogIndex
+
+
+class FakeS3:
+    """Dict-backed S3 client supporting the calls used by Logger and LogIndex."""
+
+    def __init__(self, page_size=2):
+        self.objects = {}
+        self.page_size = page_size
+        self.gets = []
+
+    def put_object(self, Body, Bucket, Key, **kwargs):
+        self.objects[Key] = Body.encode("utf-8") if isinstance(Body, str) else Body
+
+    def get_object(self, Bucket, Key, Range=None):
+        self.gets.append((Key, Range))
+        data = self.objects[Key]
+        if Range:
+            start, end = Range[len("bytes="):].split("-")
+            data = data[int(start):int(end) + 1]
+        return {"Body": io.BytesIO(data)}
+
+    def list_objects_v2(self, Bucket, Prefix, ContinuationToken=None):
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        start = int(ContinuationToken or 0)
+        page = keys[start:start + self.page_size]
+        response = {"Contents": [{"Key": key} for key in page], "IsTruncated": start + self.page_size < len(keys)}
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(start + self.page_size)
+        return response
+
+
+def run_job(s3, when, failing_buoys, job_name="swell-scraper-hourly"):
+    """Simulate one logged run at a given time."""
+    with patch('utils.logger.datetime') as mock_datetime:
+        mock_datetime.now.return_value = when
+        with patch('utils.logger.create_s3_client', return_value=s3):
+            with Logger(job_name) as logger:
+                logger.log_json("INFO", "Starting swell scraper job")
+                for buoy_id in failing_buoys:
+                    logger.log_json("ERROR", f"Failed to fetch data for buoy ID {buoy_id}",
+                                    {"buoy_id": buoy_id, "error": "404 Client Error: Not Found"})
+                logger.log_json("WARNING", "Stations currently tripped", {"tripped": []})
+                logger.log_json("INFO", "Completed swell scraper job ✓")
+    return logger
+
+
+@pytest.fixture
+def fake_s3():
+    return FakeS3()
+
+
+class TestRunManifest:
+    """Test the manifest written next to each run's log."""
+
+    def test_manifest_written_next_to_log(self, fake_s3):
+        logger = run_job(fake_s3, datetime(2025, 12, 30, 1, 0), ["46225", "46266"])
+
+        assert logger.manifest_path == "swell-scraper-hourly/12-30-2025/01-00.manifest.json"
+        manifest = json.loads(fake_s3.objects[logger.manifest_path])
+        assert manifest["log_path"] == "swell-scraper-hourly/12-30-2025/01-00.log"
+        assert manifest["counts"] == {"INFO": 2, "ERROR": 2, "WARNING": 1}
+        assert manifest["failed_stations"]["buoy_id"] == ["46225", "46266"]
+        assert manifest["exception"] is None
+        assert manifest["duration_seconds"] >= 0
+
+    def test_index_offsets_point_at_lines(self, fake_s3):
+        logger = run_job(fake_s3, datetime(2025, 12, 30, 1, 0), ["46225"])
+        manifest = json.loads(fake_s3.objects[logger.manifest_path])
+        log = fake_s3.objects[logger.log_path]
+
+        assert manifest["log_bytes"] == len(log)
+        assert [line["level"] for line in manifest["index"]] == ["ERROR", "WARNING"]
+        for line in manifest["index"]:
+            entry = json.loads(log[line["offset"]:line["offset"] + line["length"]])
+            assert entry["level"] == line["level"]
+
+    def test_non_ascii_messages_keep_offsets_in_bytes(self, fake_s3):
+        with patch('utils.logger.create_s3_client', return_value=fake_s3):
+            logger = Logger("swell-scraper-hourly")
+        logger.log_json("INFO", "Completed ✓ ✓ ✓")
+        logger.log_json("ERROR", "Failed", {"buoy_id": "46225"})
+        logger.upload_logs()
+
+        line = logger.build_manifest()["index"][0]
+        entry = json.loads(fake_s3.objects[logger.log_path][line["offset"]:line["offset"] + line["length"]])
+        assert entry["context"] == {"buoy_id": "46225"}
+
+    def test_failed_spots_of_group_requests_indexed(self, fake_s3):
+        """Test that a failed request for several spots lists each of them as a failed spot."""
+        with patch('utils.logger.create_s3_client', return_value=fake_s3):
+            logger = Logger("wind-scraper-hourly")
+        logger.log_json("ERROR", "Error fetching wind data", {"latitude": 32.7, "longitude": -117.2, "spot_id": 3})
+        logger.log_json("ERROR", "Error fetching wind forecast", {"latitude": 32.8, "longitude": -117.3, "spot_ids": [1, 2]})
+        logger.log_json("WARNING", "Failed to retrieve wind forecast", {"spot_ids": [4]})
+
+        assert logger.build_manifest()["failed_stations"] == {"buoy_id": [], "spot_id": ["1", "2", "3"]}
+
+    def test_offsets_survive_concurrent_logging(self, fake_s3):
+        """Test that fetch threads logging at once still get offsets pointing at their own lines."""
+        with patch('utils.logger.create_s3_client', return_value=fake_s3):
+            logger = Logger("swell-scraper-hourly")
+
+        def log_station(worker):
+            for i in range(300):
+                logger.log_json("ERROR" if i % 2 else "WARNING", "x" * (i % 17), {"buoy_id": f"{worker}-{i}"})
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(log_station, range(8)))
+        finally:
+            sys.setswitchinterval(switch_interval)
+        logger.upload_logs()
+
+        log = fake_s3.objects[logger.log_path]
+        manifest = logger.build_manifest()
+        assert manifest["log_bytes"] == len(log) and len(manifest["index"]) == 8 * 300
+        for line in manifest["index"]:
+            entry = json.loads(log[line["offset"]:line["offset"] + line["length"]])
+            assert entry["level"] == line["level"]
+
+    def test_exception_recorded(self, fake_s3):
+        with patch('utils.logger.create_s3_client', return_value=fake_s3):
+            with pytest.raises(RuntimeError):
+                with Logger("swell-scraper-hourly") as logger:
+                    raise RuntimeError("boom")
+
+        assert json.loads(fake_s3.objects[logger.manifest_path])["exception"] == "RuntimeError"
+
+
+class TestLogIndex:
+    """Test queries answered from manifests alone."""
+
+    @pytest.fixture
+    def week_of_runs(self, fake_s3):
+        run_job(fake_s3, datetime(2025, 12, 20, 1, 0), ["46225"])
+        run_job(fake_s3, datetime(2025, 12, 28, 1, 0), ["46225"])
+        run_job(fake_s3, datetime(2025, 12, 28, 2, 0), [])
+        run_job(fake_s3, datetime(2025, 12, 29, 1, 0), ["46266"])
+        run_job(fake_s3, datetime(2025, 12, 30, 1, 0), ["46225", "46266"])
+        run_job(fake_s3, datetime(2025, 12, 30, 1, 0), ["46225"], job_name="wind-scraper-hourly")
+        return LogIndex(s3_client=fake_s3)
+
+    def test_runs_failing_station(self, week_of_runs, fake_s3):
+        runs = week_of_runs.runs_failing_station("swell-scraper-hourly", "46225", days=7, now=datetime(2025, 12, 30, 3, 0))
+
+        assert [run["log_path"] for run in runs] == [
+            "swell-scraper-hourly/12-28-2025/01-00.log",
+            "swell-scraper-hourly/12-30-2025/01-00.log"
+        ]
+        assert not any(key.endswith(".log") for key, _ in fake_s3.gets)
+
+    def test_failing_stations(self, week_of_runs):
+        counts = week_of_runs.failing_stations("swell-scraper-hourly", days=3, now=datetime(2025, 12, 30, 3, 0))
+
+        assert counts == {"46225": 2, "46266": 2}
+
+    def test_fetch_lines_uses_ranged_gets(self, week_of_runs, fake_s3):
+        run = week_of_runs.runs_failing_station("swell-scraper-hourly", 46266, days=1, now=datetime(2025, 12, 30, 3, 0))[0]
+        fake_s3.gets.clear()
+
+        entries = week_of_runs.fetch_lines(run)
+
+        assert [entry["context"]["buoy_id"] for entry in entries] == ["46225", "46266"]
+        assert all(byte_range is not None for _, byte_range in fake_s3.gets)
@@ -0,0 +1,230 @@
+"""
+Unit tests for parquet_export_hourly.py
+"""
+import pytest
+import io
+import os
+import re
+from datetime import datetime, timedelta, timezone
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from botocore.exceptions import ClientError
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from parquet_export_hourly import (EXPORT_BOUND_QUERY, EXPORT_TABLES, MANIFEST_KEY, export_table, load_manifest,
+                                   run_export, save_manifest)
+
+
+class FakeS3:
+    """Dict-backed S3 client supporting the calls used by the export job."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Body, Bucket, Key, **kwargs):
+        self.objects[Key] = Body.encode("utf-8") if isinstance(Body, str) else Body
+
+    def upload_file(self, Filename, Bucket, Key):
+        with open(Filename, "rb") as f:
+            self.objects[Key] = f.read()
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def read_table(self, key):
+        return pq.read_table(io.BytesIO(self.objects[key]))
+
+
+class FakeDatabase:
+    """
+    Serves rows of each table through stream_query(), honouring the export filter.
+
+    Rows are stored with their insert time, the fake clock's now at add(); the export
+    bound is now minus the settle window.
+    """
+
+    CONDITION = re.compile(r"(ingested_at|timestamp) (<=|>=|>) %s")
+
+    def __init__(self):
+        self.tables = {table: [] for table in EXPORT_TABLES}
+        self.now = datetime(2025, 12, 30, 12, 0, tzinfo=timezone.utc)
+        self.largest_chunk = 0
+
+    def add(self, table, rows):
+        self.tables[table] += [(row, self.now) for row in rows]
+
+    def execute_query(self, query, params=None, fetch=False):
+        assert query == EXPORT_BOUND_QUERY
+        return [(self.now - timedelta(seconds=params[0]),)]
+
+    def stream_query(self, query, params=None, fetch_size=2000, columnar=False, **kwargs):
+        table = query.split(" FROM ")[1].split(" ")[0]
+        names = EXPORT_TABLES[table].names
+        conditions = [(column, op, datetime.fromisoformat(value) if isinstance(value, str) else value)
+                      for (column, op), value in zip(self.CONDITION.findall(query), params)]
+
+        def matches(row, ingested_at):
+            values = {"ingested_at": ingested_at, "timestamp": row[0]}
+            results = [{"<=": values[c] <= v, ">=": values[c] >= v, ">": values[c] > v}[op] for c, op, v in conditions]
+            return results[0] and (len(results) == 1 or any(results[1:]))
+
+        rows = sorted((row for row, ingested_at in self.tables[table] if matches(row, ingested_at)), key=lambda row: row[0])
+        for start in range(0, len(rows), fetch_size):
+            chunk = rows[start:start + fetch_size]
+            self.largest_chunk = max(self.largest_chunk, len(chunk))
+            yield dict(zip(names, zip(*chunk)))
+
+
+def swell_rows(start, hours, buoy_id=46225):
+    return [
+        (start + timedelta(hours=h), buoy_id, 3.1, 2.5, 14.0, 293, 1.2, 6.0, 315, 2, 8.5, None)
+        for h in range(hours)
+    ]
+
+
+def wind_rows(start, hours, spot_id=1):
+    return [(start + timedelta(hours=h), spot_id, 5.5, 270, None) for h in range(hours)]
+
+
+@pytest.fixture
+def fake_s3():
+    return FakeS3()
+
+
+@pytest.fixture
+def fake_db():
+    db = FakeDatabase()
+    db.add("ingested.swell_data", swell_rows(datetime(2025, 12, 29, 20, 50, tzinfo=timezone.utc), 10))
+    db.add("ingested.wind_data", wind_rows(datetime(2025, 12, 30, 0, 0, tzinfo=timezone.utc), 3))
+    db.now += timedelta(minutes=10)
+    return db
+
+
+class TestParquetExport:
+    """Test the incremental export."""
+
+    def test_first_export_partitions_by_day(self, fake_s3, fake_db, mock_logger):
+        run_export(fake_db, fake_s3, mock_logger)
+
+        manifest = load_manifest(fake_s3)
+        swell = manifest["tables"]["ingested.swell_data"]
+        assert swell["rows"] == 10
+        assert swell["watermark"] == "2025-12-30T12:05:00+00:00"
+        assert {day: entry["rows"] for day, entry in swell["partitions"].items()} == {"2025-12-29": 4, "2025-12-30": 6}
+        assert swell["partitions"]["2025-12-29"]["files"] == ["v2/swell_data/date=2025-12-29/part-initial.parquet"]
+
+    def test_v1_dataset_is_left_alone(self, fake_s3, fake_db, mock_logger):
+        """Test that the int16 export starts a new dataset instead of adding to the VARCHAR one."""
+        fake_s3.put_object(Body='{"tables": {"ingested.swell_data": {"watermark": "2025-12-30T12:00:00+00:00"}}}',
+                           Bucket="surf-analytics", Key="_manifest.json")
+        fake_s3.put_object(Body=b"v1", Bucket="surf-analytics", Key="swell_data/date=2025-12-29/part-initial.parquet")
+
+        run_export(fake_db, fake_s3, mock_logger)
+
+        assert load_manifest(fake_s3)["tables"]["ingested.swell_data"]["rows"] == 10
+        assert fake_s3.objects["swell_data/date=2025-12-29/part-initial.parquet"] == b"v1"
+        assert fake_s3.read_table("v2/swell_data/date=2025-12-29/part-initial.parquet").schema.field(
+            "swell_direction").type == pa.int16()
+
+    def test_parquet_types_and_compression(self, fake_s3, fake_db, mock_logger):
+        run_export(fake_db, fake_s3, mock_logger)
+
+        key = "v2/swell_data/date=2025-12-30/part-initial.parquet"
+        table = fake_s3.read_table(key)
+        assert table.schema.field("timestamp").type == pa.timestamp("us", tz="UTC")
+        assert table.schema.field("swell_height").type == pa.float64()
+        assert table.column("tide").null_count == 6
+        metadata = pq.ParquetFile(io.BytesIO(fake_s3.objects[key])).metadata
+        assert metadata.row_group(0).column(0).compression == "ZSTD"
+
+    def test_incremental_export_only_new_rows(self, fake_s3, fake_db, mock_logger):
+        run_export(fake_db, fake_s3, mock_logger)
+        fake_db.add("ingested.swell_data", swell_rows(datetime(2025, 12, 30, 6, 50, tzinfo=timezone.utc), 2))
+        fake_db.now += timedelta(hours=1)
+
+        run_export(fake_db, fake_s3, mock_logger)
+
+        swell = load_manifest(fake_s3)["tables"]["ingested.swell_data"]
+        assert swell["rows"] == 12
+        new_key = swell["partitions"]["2025-12-30"]["files"][1]
+        assert new_key == "v2/swell_data/date=2025-12-30/part-20251230T120500000000.parquet"
+        assert fake_s3.read_table(new_key).num_rows == 2
+
+    def test_rerun_after_crash_overwrites_same_files(self, fake_s3, fake_db, mock_logger):
+        run_export(fake_db, fake_s3, mock_logger)
+        del fake_s3.objects[MANIFEST_KEY]  # Files uploaded but the manifest was never saved
+
+        run_export(fake_db, fake_s3, mock_logger)
+
+        parquet_keys = [key for key in fake_s3.objects if key.endswith(".parquet")]
+        assert len(parquet_keys) == 3
+        assert load_manifest(fake_s3)["tables"]["ingested.swell_data"]["rows"] == 10
+
+    def test_late_rows_are_exported(self, fake_s3, fake_db, mock_logger):
+        """Test that a row inserted after later timestamps were exported (e.g. replayed from the spool) is not lost."""
+        run_export(fake_db, fake_s3, mock_logger)
+        fake_db.add("ingested.swell_data", swell_rows(datetime(2025, 12, 30, 1, 20, tzinfo=timezone.utc), 1, buoy_id=46266))
+        fake_db.now += timedelta(hours=1)
+
+        run_export(fake_db, fake_s3, mock_logger)
+
+        swell = load_manifest(fake_s3)["tables"]["ingested.swell_data"]
+        assert swell["rows"] == 11
+        assert fake_s3.read_table(swell["partitions"]["2025-12-30"]["files"][1]).num_rows == 1
+
+    def test_rows_inside_settle_window_wait(self, fake_s3, fake_db, mock_logger):
+        run_export(fake_db, fake_s3, mock_logger)
+        fake_db.add("ingested.swell_data", swell_rows(datetime(2025, 12, 30, 6, 50, tzinfo=timezone.utc), 1))
+
+        run_export(fake_db, fake_s3, mock_logger)
+        assert load_manifest(fake_s3)["tables"]["ingested.swell_data"]["rows"] == 10
+
+        fake_db.now += timedelta(minutes=10)
+        run_export(fake_db, fake_s3, mock_logger)
+        assert load_manifest(fake_s3)["tables"]["ingested.swell_data"]["rows"] == 11
+
+    def test_legacy_timestamp_watermark(self, fake_s3, fake_db, mock_logger):
+        """Test that a manifest from before ingested_at continues from its largest exported timestamp."""
+        save_manifest(fake_s3, {"tables": {"ingested.swell_data": {
+            "watermark": "2025-12-30T02:50:00+00:00", "rows": 6, "partitions": {}}}})
+
+        run_export(fake_db, fake_s3, mock_logger)
+
+        swell = load_manifest(fake_s3)["tables"]["ingested.swell_data"]
+        assert swell["rows"] == 9
+        assert swell["watermark_column"] == "ingested_at"
+
+    def test_rebuild_rewrites_days(self, fake_s3, fake_db, mock_logger):
+        run_export(fake_db, fake_s3, mock_logger)
+        fake_db.add("ingested.swell_data", swell_rows(datetime(2025, 12, 30, 8, 50, tzinfo=timezone.utc), 1))
+        fake_db.now += timedelta(hours=1)
+
+        run_export(fake_db, fake_s3, mock_logger, rebuild_from="2025-12-30")
+
+        swell = load_manifest(fake_s3)["tables"]["ingested.swell_data"]
+        assert swell["rows"] == 11
+        assert swell["partitions"]["2025-12-29"]["rows"] == 4
+        assert len(swell["partitions"]["2025-12-30"]["files"]) == 1
+        assert fake_s3.read_table(swell["partitions"]["2025-12-30"]["files"][0]).num_rows == 7
+        assert "rebuild_from" not in swell
+
+    def test_streams_in_chunks(self, fake_s3, fake_db, mock_logger):
+        fake_db.tables["ingested.swell_data"] = []
+        fake_db.add("ingested.swell_data", swell_rows(datetime(2025, 12, 1, tzinfo=timezone.utc), 24 * 30))
+        fake_db.now += timedelta(minutes=10)
+
+        state = {"watermark": None, "rows": 0, "partitions": {}}
+        export_table(fake_db, fake_s3, "ingested.swell_data", EXPORT_TABLES["ingested.swell_data"], state,
+                     mock_logger, fetch_size=100)
+
+        assert fake_db.largest_chunk == 100
+        assert len(state["partitions"]) == 30
+        assert all(entry["rows"] == 24 for entry in state["partitions"].values())
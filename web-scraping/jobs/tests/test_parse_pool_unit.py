@@ -0,0 +1,128 @@
+"""
+Unit tests and benchmark for process-pool parsing (utils/parse_pool.py)
+"""
+import pytest
+import os
+import time
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.parse_pool import ParsePool
+from swell_scraper_hourly import parse_swell_page
+
+
+def loaded_modules(_):
+    return {name for name in ("pandas", "bs4") if name in sys.modules}
+
+
+def synthetic_page(i):
+    """Build a station page shaped like NDBC's, with a wave summary, an observation table and filler tables."""
+    observations = "".join(
+        f"<tr><th>2025-12-30 {h:02d}:50</th><td>NW</td><td>{10 + h % 7}.{i % 10}</td><td>+{h % 3}.{i % 10}</td></tr>"
+        for h in range(24)
+    )
+    filler = "".join(
+        f"<table><tr><th>Section {t}</th></tr>" + "<tr><td>label</td><td>value</td></tr>" * 20 + "</table>"
+        for t in range(10)
+    )
+    return f"""
+    <html><body>
+        {filler}
+        <table>
+            <tr><th>Wave Summary</th></tr>
+            <tr><td>Significant Wave Height</td><td>{i % 9}.5 ft</td></tr>
+            <tr><td>Swell Height</td><td>5.2 ft</td></tr>
+            <tr><td>Swell Period</td><td>14 s</td></tr>
+            <tr><td>Swell Direction</td><td>WNW</td></tr>
+            <tr><td>Wind Wave Height</td><td>2.3 ft</td></tr>
+            <tr><td>Wind Wave Period</td><td>6 s</td></tr>
+            <tr><td>Wind Wave Direction</td><td>NW</td></tr>
+            <tr><td>Steepness</td><td>AVERAGE</td></tr>
+            <tr><td>Average Period</td><td>8.5 s</td></tr>
+        </table>
+        <table>
+            <thead><tr><th>Date</th><th>WDIR</th><th>WSPD</th><th>TIDE</th></tr></thead>
+            <tbody>{observations}</tbody>
+        </table>
+    </body></html>
+    """
+
+
+class TestParseSwellPage:
+    """Test that parsing is pure and returns plain records."""
+
+    def test_parse_returns_record_and_no_events(self, sample_swell_html):
+        record, error_class, events = parse_swell_page("46225", sample_swell_html, "2025-12-30 01:50:00")
+
+        assert error_class is None
+        assert events == []
+        assert record["timestamp"] == "2025-12-30 01:50:00"
+        assert record["swell_height"] == "5.2"
+        assert record["swell_direction"] == "WNW"
+
+    def test_parse_failure_returns_error_class_and_event(self):
+        record, error_class, events = parse_swell_page("46225", "<html><body><table><tr><td>x</td></tr></table></body></html>")
+
+        assert record is None
+        assert error_class == "no_wave_summary"
+        assert events == [(
+            "WARNING",
+            "Detailed wave summary table not found for buoy ID 46225",
+            {"buoy_id": "46225"}
+        )]
+
+
+class TestParsePool:
+    """Test the warm process pool."""
+
+    def test_inline_pool(self):
+        pool = ParsePool(size=0)
+
+        assert pool.executor is None
+        assert list(pool.map(len, ["ab", "c"])) == [2, 1]
+
+    def test_pool_matches_inline(self):
+        pages = [synthetic_page(i) for i in range(6)]
+        ids = [str(46200 + i) for i in range(6)]
+        timestamps = ["2025-12-30 01:50:00"] * 6
+
+        inline = list(ParsePool(size=0).map(parse_swell_page, ids, pages, timestamps))
+        with ParsePool(size=2) as pool:
+            pooled = list(pool.map(parse_swell_page, ids, pages, timestamps))
+
+        assert pooled == inline
+        assert all(record is not None for record, _, _ in pooled)
+
+    def test_warm_starts_every_worker(self):
+        with ParsePool(size=3) as pool:
+            assert len(pool.warm()) == 3
+
+    def test_workers_are_warm(self):
+        with ParsePool(size=2) as pool:
+            assert list(pool.map(loaded_modules, range(2))) == [{"pandas", "bs4"}] * 2
+
+
+@pytest.mark.slow
+class TestParsePoolBenchmark:
+    """Parse throughput scaling with core count on synthetic pages."""
+
+    def test_parse_throughput_scales_with_cores(self):
+        page_count = 60
+        pages = [synthetic_page(i) for i in range(page_count)]
+        ids = [str(46000 + i) for i in range(page_count)]
+        cores = os.cpu_count() or 1
+
+        throughput = {}
+        sizes = [0, 1] + [size for size in (2, cores) if 2 <= size <= cores]
+        for size in sorted(set(sizes)):
+            with ParsePool(size=size) as pool:
+                start = time.perf_counter()
+                results = list(pool.map(parse_swell_page, ids, pages, chunksize=4))
+                elapsed = time.perf_counter() - start
+            assert all(record is not None for record, _, _ in results)
+            throughput[size] = page_count / elapsed
+            print(f"\nworkers={size}: {throughput[size]:,.1f} pages/s")
+
+        if cores >= 2:
+            assert throughput[2] > throughput[1] * 1.3
@@ -0,0 +1,289 @@
+"""
+Unit tests for streaming reads and query instrumentation in utils/postgres_connection.py
+"""
+import pytest
+import tracemalloc
+from unittest.mock import MagicMock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.logger import Logger
+from utils.postgres_connection import PostgresConnection
+from utils.query_stats import QueryStats, statement_shape
+
+
+class FakeNamedCursor:
+    """Server-side cursor that generates rows on demand instead of holding the result."""
+
+    def __init__(self, row_count):
+        self.row_count = row_count
+        self.position = 0
+        self.description = [("timestamp",), ("buoy_id",), ("swell_height",)]
+        self.largest_fetch = 0
+        self.executed = None
+        self.closed = False
+
+    def execute(self, query, params):
+        self.executed = (query, params)
+
+    def fetchmany(self, size):
+        end = min(self.position + size, self.row_count)
+        rows = [(f"2025-12-30 {i % 24:02d}:50:00", 46225, i * 0.01) for i in range(self.position, end)]
+        self.position = end
+        self.largest_fetch = max(self.largest_fetch, len(rows))
+        return rows
+
+    def fetchall(self):
+        raise AssertionError("streaming reads must not call fetchall()")
+
+    def close(self):
+        self.closed = True
+
+
+def streaming_connection(row_count, mock_logger):
+    connection = PostgresConnection("host", "user", "password", "db", mock_logger)
+    connection.conn = MagicMock()
+    cursor = FakeNamedCursor(row_count)
+    connection.conn.cursor.return_value = cursor
+    return connection, cursor
+
+
+class TestStreamQuery:
+    """Test lazily streamed results."""
+
+    def test_rows_streamed_through_named_cursor(self, mock_logger):
+        connection, cursor = streaming_connection(5, mock_logger)
+
+        rows = list(connection.stream_query("SELECT * FROM ingested.swell_data", fetch_size=2))
+
+        assert len(rows) == 5
+        assert rows[4] == ("2025-12-30 04:50:00", 46225, 0.04)
+        assert connection.conn.cursor.call_args.kwargs["name"].startswith("stream_")
+        assert cursor.itersize == 2
+        assert cursor.largest_fetch == 2
+        assert cursor.closed
+        connection.conn.rollback.assert_called_once()
+
+    def test_chunked(self, mock_logger):
+        connection, _ = streaming_connection(5, mock_logger)
+
+        chunks = list(connection.stream_query("SELECT 1", fetch_size=2, chunked=True))
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+    def test_columnar(self, mock_logger):
+        connection, _ = streaming_connection(3, mock_logger)
+
+        chunks = list(connection.stream_query("SELECT 1", fetch_size=3, columnar=True))
+
+        assert chunks == [{
+            "timestamp": ("2025-12-30 00:50:00", "2025-12-30 01:50:00", "2025-12-30 02:50:00"),
+            "buoy_id": (46225, 46225, 46225),
+            "swell_height": (0.0, 0.01, 0.02)
+        }]
+
+    @patch('utils.postgres_connection.psycopg2.Error', Exception)  # psycopg2 is mocked in conftest
+    def test_closing_generator_releases_cursor(self, mock_logger):
+        connection, cursor = streaming_connection(100, mock_logger)
+
+        stream = connection.stream_query("SELECT 1", fetch_size=10)
+        next(stream)
+        stream.close()
+
+        assert cursor.closed
+        assert cursor.position == 10
+
+    def test_not_connected(self, mock_logger):
+        connection = PostgresConnection("host", "user", "password", "db", mock_logger)
+
+        with pytest.raises(ConnectionError):
+            list(connection.stream_query("SELECT 1"))
+
+    def test_iter_select_builds_query(self, mock_logger):
+        connection, cursor = streaming_connection(1, mock_logger)
+
+        list(connection.iter_select("ingested.swell_data", "timestamp, buoy_id", where="buoy_id = %s",
+                                    params=(46225,), order_by="timestamp"))
+
+        assert cursor.executed == (
+            "SELECT timestamp, buoy_id FROM ingested.swell_data WHERE buoy_id = %s ORDER BY timestamp",
+            (46225,)
+        )
+
+    def test_peak_memory_independent_of_result_size(self, mock_logger):
+        def peak_while_streaming(row_count):
+            connection, _ = streaming_connection(row_count, mock_logger)
+            tracemalloc.start()
+            total = 0.0
+            for chunk in connection.stream_query("SELECT 1", fetch_size=1000, columnar=True):
+                total += sum(chunk["swell_height"])
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+
+        small, large = peak_while_streaming(10_000), peak_while_streaming(200_000)
+
+        assert large < small * 1.5
+
+
+def timed_connection(mock_logger, **kwargs):
+    connection = PostgresConnection("host", "user", "password", "db", mock_logger, **kwargs)
+    connection.conn = MagicMock()
+    connection.cursor = MagicMock()
+    connection.cursor.rowcount = 3
+    return connection
+
+
+class TestInsertMany:
+    """Test batch insert failures."""
+
+    @patch('utils.postgres_connection.psycopg2.Error', Exception)  # psycopg2 is mocked in conftest
+    def test_failed_insert_is_rolled_back(self, mock_logger):
+        connection = timed_connection(mock_logger)
+        connection.conn.closed = 0
+
+        with patch('utils.postgres_connection.extras.execute_values', side_effect=Exception("duplicate key")):
+            assert not connection.insert_many("ingested.swell_data", [{"buoy_id": 1}])
+
+        connection.conn.rollback.assert_called_once()
+
+    @patch('utils.postgres_connection.psycopg2.Error', Exception)
+    def test_dropped_connection_returns_false(self, mock_logger):
+        """Test that a connection lost mid-insert fails the insert instead of raising from the rollback."""
+        connection = timed_connection(mock_logger)
+        connection.conn.closed = 2
+        connection.conn.rollback.side_effect = RuntimeError("connection already closed")
+
+        with patch('utils.postgres_connection.extras.execute_values',
+                   side_effect=Exception("server closed the connection unexpectedly")):
+            assert not connection.insert_many("ingested.swell_data", [{"buoy_id": 1}] * 3)
+
+        connection.conn.rollback.assert_not_called()
+        mock_logger.log_json.assert_called_once_with(
+            "ERROR", "Failure executing batch insert: server closed the connection unexpectedly",
+            {"table": "ingested.swell_data", "rows": 3})
+
+
+class TestStatementShape:
+    """Test that statements are reduced to their shape without values."""
+
+    def test_literals_and_placeholders(self):
+        assert statement_shape("SELECT *  FROM ingested.swell_data\n WHERE buoy_id = 46225 AND tag = 'it''s'") == \
+            "SELECT * FROM ingested.swell_data WHERE buoy_id = ? AND tag = ?"
+        assert statement_shape("SELECT id FROM t2 WHERE id IN (%s, %s, %s)") == "SELECT id FROM t2 WHERE id IN (?)"
+
+    def test_value_rows_are_folded(self):
+        assert statement_shape("INSERT INTO t (a, b) VALUES (1, 'x'), (2, 'y'), (3, 'z')") == "INSERT INTO t (a, b) VALUES (?)"
+
+
+class TestQueryTiming:
+    """Test slow-query logging, plan capture, per-run aggregates and statement_timeout."""
+
+    def test_slow_query_logged_without_values(self, mock_logger):
+        connection = timed_connection(mock_logger, slow_query_ms=1e-9, explain_slow=False)
+
+        connection.execute_query("UPDATE reference.buoy_info SET name = %s WHERE id = %s", ("secret", 46225))
+
+        level, message, context = mock_logger.log_json.call_args[0]
+        assert (level, message) == ("WARNING", "Slow query")
+        assert context["statement"] == "UPDATE reference.buoy_info SET name = ? WHERE id = ?"
+        assert context["rows"] == 3
+        assert "secret" not in str(context) and "plan" not in context
+
+    def test_fast_query_not_logged(self, mock_logger):
+        connection = timed_connection(mock_logger, slow_query_ms=1e9)
+
+        connection.execute_query("SELECT 1", fetch=True)
+
+        mock_logger.log_json.assert_not_called()
+
+    def test_plan_captured_once_per_shape_and_rolled_back(self, mock_logger):
+        mock_logger.query_stats = QueryStats()
+        connection = timed_connection(mock_logger, slow_query_ms=1e-9, explain_slow=True)
+        connection.cursor.query = b"SELECT * FROM ingested.swell_data WHERE buoy_id = 46225"
+        connection.cursor.fetchall.return_value = [("Seq Scan on swell_data",), ("Buffers: shared hit=12",)]
+
+        connection.execute_query("SELECT * FROM ingested.swell_data WHERE buoy_id = %s", (46225,), fetch=True)
+        connection.execute_query("SELECT * FROM ingested.swell_data WHERE buoy_id = %s", (46221,), fetch=True)
+
+        statements = [call[0][0] for call in connection.cursor.execute.call_args_list]
+        assert statements[1:5] == [
+            "SAVEPOINT slow_query_explain",
+            "EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM ingested.swell_data WHERE buoy_id = 46225",
+            "ROLLBACK TO SAVEPOINT slow_query_explain",
+            "RELEASE SAVEPOINT slow_query_explain"
+        ]
+        assert len(statements) == 6
+        first, second = [call[0][2] for call in mock_logger.log_json.call_args_list]
+        assert first["plan"] == ["Seq Scan on swell_data", "Buffers: shared hit=12"]
+        assert "plan" not in second
+
+    def test_writes_are_explained_without_running_again(self, mock_logger):
+        connection = timed_connection(mock_logger, slow_query_ms=1e-9, explain_slow=True)
+        connection.cursor.query = b"INSERT INTO ingested.wind_data VALUES (1)"
+        connection.cursor.fetchall.return_value = [("Insert on wind_data",)]
+
+        connection.execute_query("INSERT INTO ingested.wind_data VALUES (%s)", (1,))
+
+        assert mock_logger.log_json.call_args[0][2]["plan"] == ["Insert on wind_data"]
+        statements = [call[0][0] for call in connection.cursor.execute.call_args_list]
+        assert "EXPLAIN INSERT INTO ingested.wind_data VALUES (1)" in statements
+        assert not any("ANALYZE" in statement for statement in statements)
+        connection.conn.rollback.assert_called_once()  # The savepoint's transaction after the commit
+
+    @patch('utils.postgres_connection.psycopg2.Error', Exception)  # psycopg2 is mocked in conftest
+    def test_plan_falls_back_to_plain_explain(self, mock_logger):
+        connection = timed_connection(mock_logger, slow_query_ms=1e-9, explain_slow=True)
+        connection.cursor.query = b"SELECT * FROM ingested.wind_data"
+        connection.cursor.fetchall.return_value = [("Seq Scan on wind_data",)]
+
+        def execute(statement, params=None):
+            if statement.startswith("EXPLAIN (ANALYZE"):
+                raise Exception("canceling statement due to statement timeout")
+        connection.cursor.execute.side_effect = execute
+
+        connection.execute_query("SELECT * FROM ingested.wind_data", fetch=True)
+
+        assert mock_logger.log_json.call_args[0][2]["plan"] == ["Seq Scan on wind_data"]
+        statements = [call[0][0] for call in connection.cursor.execute.call_args_list]
+        assert statements.count("ROLLBACK TO SAVEPOINT slow_query_explain") == 2
+
+    def test_stats_aggregate_across_connections(self, mock_logger):
+        mock_logger.query_stats = QueryStats()
+        for _ in range(2):
+            timed_connection(mock_logger, slow_query_ms=0).insert_many("ingested.swell_data", [{"buoy_id": 1}] * 4)
+        timed_connection(mock_logger, slow_query_ms=0).execute_query("SELECT 1", fetch=True)
+
+        summary = mock_logger.query_stats.summary()
+
+        assert summary["statements"] == 3
+        assert sorted((shape["calls"], shape["rows"]) for shape in summary["shapes"]) == [(1, 0), (2, 8)]
+        mock_logger.log_json.assert_not_called()
+
+    def test_run_summary_in_manifest(self):
+        logger = Logger("swell-scraper-hourly", s3_client=MagicMock())
+        logger.query_stats.record("SELECT ?", 0.25, rows=10, slow=True)
+
+        manifest = logger.build_manifest()
+
+        assert manifest["queries"]["total_ms"] == 250.0
+        assert manifest["queries"]["shapes"][0] == {"statement": "SELECT ?", "calls": 1, "total_ms": 250.0,
+                                                    "max_ms": 250.0, "rows": 10, "slow": 1}
+
+    @patch('utils.postgres_connection.psycopg2.connect')
+    def test_statement_timeout(self, mock_connect, mock_logger):
+        PostgresConnection("host", "user", "password", "db", mock_logger, statement_timeout_ms=30000).connect()
+        PostgresConnection("host", "user", "password", "db", mock_logger, statement_timeout_ms=0).connect()
+
+        assert mock_connect.call_args_list[0].kwargs["options"] == "-c statement_timeout=30000"
+        assert "options" not in mock_connect.call_args_list[1].kwargs
+
+    def test_set_statement_timeout(self, mock_logger):
+        connection = timed_connection(mock_logger, slow_query_ms=0)
+
+        assert connection.set_statement_timeout(5000)
+
+        connection.cursor.execute.assert_called_once_with("SELECT set_config('statement_timeout', %s, false)", ("5000",))
+        assert connection.statement_timeout_ms == 5000
@@ -0,0 +1,199 @@
+"""
+Unit tests for the OpenWeather quota ledger (utils/quota.py)
+"""
+import pytest
+import json
+import requests
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, Mock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import QuotaLedger
+from utils.deadline import RunDeadline
+from wind_scraper_hourly import estimate_requests, fetch_wind_data, fetch_wind_per_spot, run
+
+NOON = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc).timestamp()
+LATE_EVENING = datetime(2026, 1, 15, 23, 0, tzinfo=timezone.utc).timestamp()
+
+
+class FakeClock:
+    """Clock whose sleep() advances time instead of waiting."""
+
+    def __init__(self, now):
+        self.now = now
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def ledger_path(tmp_path):
+    return str(tmp_path / "quota" / "openweather.json")
+
+
+def make_ledger(path, clock, **kwargs):
+    limits = {"calls_per_minute": 0, "daily_limit": 0, "monthly_limit": 0, "reserve": 0}
+    return QuotaLedger(path=path, clock=clock, sleep=clock.sleep, **{**limits, **kwargs})
+
+
+class TestQuotaLedger:
+    """Test the token bucket and the persisted call counts."""
+
+    def test_token_bucket_waits_for_a_token(self, ledger_path):
+        clock = FakeClock(NOON)
+        ledger = make_ledger(ledger_path, clock, calls_per_minute=2)
+
+        assert all(ledger.acquire() for _ in range(3))
+        assert clock.slept == [pytest.approx(30)]
+
+    def test_token_wait_longer_than_max_is_denied(self, ledger_path):
+        clock = FakeClock(NOON)
+        ledger = make_ledger(ledger_path, clock, calls_per_minute=2, max_wait=10)
+
+        assert [ledger.acquire() for _ in range(3)] == [True, True, False]
+        assert ledger.denied == 1 and clock.slept == []
+
+    def test_daily_limit_holds_across_runs(self, ledger_path):
+        clock = FakeClock(NOON)
+        first_run = make_ledger(ledger_path, clock, daily_limit=3)
+        assert [first_run.acquire() for _ in range(4)] == [True, True, True, False]
+        first_run.save()
+
+        assert not make_ledger(ledger_path, clock, daily_limit=3).acquire()
+        clock.now += 86400
+        assert make_ledger(ledger_path, clock, daily_limit=3).acquire()
+
+    def test_monthly_limit(self, ledger_path):
+        ledger = make_ledger(ledger_path, FakeClock(NOON), monthly_limit=2)
+
+        assert [ledger.acquire() for _ in range(3)] == [True, True, False]
+
+    def test_concurrent_runs_are_merged(self, ledger_path):
+        clock = FakeClock(NOON)
+        first, second = make_ledger(ledger_path, clock), make_ledger(ledger_path, clock)
+        for _ in range(2):
+            first.acquire()
+        for _ in range(3):
+            second.acquire()
+
+        first.save()
+        second.save()
+
+        with open(ledger_path) as f:
+            state = json.load(f)
+        assert state["days"] == {"2026-01-15": 5} and state["months"] == {"2026-01": 5}
+        assert second.used_today() == 5
+
+    def test_shards_split_the_plan(self, ledger_path):
+        ledger = make_ledger(ledger_path, FakeClock(NOON), calls_per_minute=60, daily_limit=100, shard_count=4)
+
+        assert ledger.calls_per_minute == 15
+        assert ledger.daily_limit == 25 and ledger.monthly_limit == 0
+
+    def test_rejection_stops_further_calls(self, ledger_path):
+        ledger = make_ledger(ledger_path, FakeClock(NOON))
+        ledger.record_rejection()
+
+        assert not ledger.acquire()
+        assert ledger.allowance() == 0
+
+    def test_report(self, ledger_path):
+        ledger = make_ledger(ledger_path, FakeClock(NOON), daily_limit=100)
+        ledger.acquire()
+
+        assert ledger.report() == {"calls": 1, "denied": 0, "rejected": False, "used_today": 1,
+                                   "daily_budget": 100, "used_this_month": 1, "monthly_limit": None}
+
+
+class TestRationing:
+    """Test pacing the budget across the day and degrading a run that would exceed it."""
+
+    ITEMS = list(range(10))
+
+    def ration(self, ledger):
+        return ledger.ration(self.ITEMS, len, linked=lambda item: item < 3)
+
+    def test_monthly_budget_is_paced(self, ledger_path):
+        """Test that 17 days are left in January, and 13 of 24 hours are unlocked by the next run."""
+        ledger = make_ledger(ledger_path, FakeClock(NOON), monthly_limit=17000)
+
+        assert ledger.daily_budget() == pytest.approx(1000)
+        assert ledger.allowance(3600) == pytest.approx(1000 * 13 / 24)
+
+    def test_reserve_is_held_back(self, ledger_path):
+        ledger = make_ledger(ledger_path, FakeClock(NOON), monthly_limit=17000, reserve=0.1)
+
+        assert ledger.daily_budget() == pytest.approx(900)
+
+    def test_levels(self, ledger_path):
+        clock = FakeClock(LATE_EVENING)
+
+        assert self.ration(make_ledger(ledger_path, clock)) == (self.ITEMS, "normal")
+        assert self.ration(make_ledger(ledger_path, clock, daily_limit=5)) == ([0, 1, 2], "linked_only")
+        assert self.ration(make_ledger(ledger_path, clock, daily_limit=2)) == ([0, 1], "rationed")
+
+    def test_exhausted_quota_pauses_the_run(self, ledger_path):
+        ledger = make_ledger(ledger_path, FakeClock(LATE_EVENING), daily_limit=1)
+        ledger.acquire()
+
+        assert self.ration(ledger) == ([], "paused")
+
+    def test_batched_estimate(self):
+        spots = [(spot_id, 30.0, -117.0) for spot_id in range(25)]
+        cache = {str(spot_id): {"location_id": 6000000 + spot_id, "latitude": 30.0, "longitude": -117.0}
+                 for spot_id in range(23)}
+
+        assert estimate_requests(spots) == 25
+        assert estimate_requests(spots, batched=True, location_cache=cache) == 2 + 2
+
+
+class TestWindQuota:
+    """Test that the wind fetches take every request from the ledger."""
+
+    @patch('wind_scraper_hourly.requests.get')
+    def test_exhausted_quota_skips_the_request(self, mock_get, ledger_path, mock_logger):
+        ledger = make_ledger(ledger_path, FakeClock(NOON), daily_limit=1)
+        ledger.acquire()
+
+        assert fetch_wind_data(32.7, -117.2, mock_logger, quota=ledger, spot_id=3) is None
+        mock_get.assert_not_called()
+        mock_logger.log_json.assert_called_with("WARNING", "OpenWeather quota exhausted, request skipped",
+                                                {"latitude": 32.7, "longitude": -117.2, "spot_id": 3})
+
+    @patch('wind_scraper_hourly.requests.get')
+    def test_rate_limit_response_stops_the_run(self, mock_get, ledger_path, mock_logger):
+        mock_get.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            "429 Too Many Requests", response=Mock(status_code=429))
+        ledger = make_ledger(ledger_path, FakeClock(NOON))
+
+        readings, _, _ = fetch_wind_per_spot([(1, 32.7, -117.2), (2, 32.8, -117.3)], mock_logger, RunDeadline(600),
+                                             quota=ledger)
+
+        assert readings == []
+        assert mock_get.call_count == 1
+        assert ledger.report()["rejected"] and ledger.denied == 1
+
+    @patch('wind_scraper_hourly.replay_spooled_data')
+    @patch('wind_scraper_hourly.Spool')
+    @patch('wind_scraper_hourly.fetch_wind_data', return_value=None)
+    def test_tight_quota_fetches_only_linked_spots(self, mock_fetch, _spool, _replay, ledger_path, mock_logger):
+        """Test a whole run against a ledger with room for the linked spots only."""
+        reference = MagicMock()
+        reference.spots = [(4, 32.4, -117.2), (5, 32.5, -117.2), (6, 32.6, -117.2), (7, 32.7, -117.2)]
+        reference.spot_priorities = {"4": 1, "6": 2}  # Keyed by spot ID as a string, like ReferenceSnapshot
+        ledger = make_ledger(ledger_path, FakeClock(LATE_EVENING), daily_limit=3)
+
+        run(mock_logger, archive=False, quota=ledger, reference=reference)
+
+        assert [call[0][:2] for call in mock_fetch.call_args_list] == [(32.6, -117.2), (32.4, -117.2)]
+        mock_logger.log_json.assert_any_call("WARNING", "OpenWeather quota is tight, running in degraded mode", {
+            "level": "linked_only", "allowance": 3, "deferred_spot_ids": [5, 7]
+        })
@@ -0,0 +1,190 @@
+"""
+Unit tests for the time-range reader with its range cache (utils/reader.py)
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.reader import READ_TABLES, SurfDataReader, subtract_ranges, to_utc
+
+START = datetime(2025, 12, 1, tzinfo=timezone.utc)
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+class FakeDatabase:
+    """Stand-in for PostgresConnection.stream_query over hourly swell readings."""
+
+    def __init__(self, buoy_ids=(46221, 46225), hours=31 * 24):
+        columns = list(READ_TABLES["ingested.swell_data"].columns)
+        self.rows = []
+        for buoy_id in sorted(buoy_ids):
+            for hour in range(hours):
+                values = {column: float(hour % 10) for column in columns}
+                values["swell_direction"] = 270 if hour % 5 else None
+                self.rows.append((buoy_id, START + timedelta(hours=hour), *values.values()))
+        self.names = ["buoy_id", "timestamp"] + columns
+        self.queries = []
+
+    def stream_query(self, query, params=None, fetch_size=2000, chunked=False, columnar=False):
+        station_ids, start, end = params
+        self.queries.append((sorted(station_ids), start, end))
+        rows = [row for row in self.rows if row[0] in station_ids and start <= row[1] < end]
+        for i in range(0, len(rows), fetch_size):
+            yield dict(zip(self.names, zip(*rows[i:i + fetch_size])))
+
+
+def make_reader(db, **kwargs):
+    return SurfDataReader(db, clock=lambda: NOW, fetch_size=100, **kwargs)
+
+
+class TestSubtractRanges:
+    """Test finding the uncovered parts of a range."""
+
+    def test_gaps(self):
+        assert subtract_ranges(0, 10, []) == [(0, 10)]
+        assert subtract_ranges(0, 10, [(2, 4), (6, 8)]) == [(0, 2), (4, 6), (8, 10)]
+        assert subtract_ranges(3, 7, [(0, 4), (6, 12)]) == [(4, 6)]
+        assert subtract_ranges(3, 7, [(0, 10)]) == []
+
+
+class TestRead:
+    """Test typed, column-oriented results."""
+
+    def test_typed_columns(self):
+        reader = make_reader(FakeDatabase())
+
+        frame = reader.read("ingested.swell_data", [46225, 46221], "2025-12-02", "2025-12-03")
+
+        assert len(frame) == 48
+        assert frame["buoy_id"].tolist() == [46221] * 24 + [46225] * 24
+        assert str(frame["timestamp"].dtype) == "datetime64[ns, UTC]"
+        assert frame["timestamp"].iloc[0] == pd.Timestamp("2025-12-02", tz="UTC")
+        assert frame["swell_height"].dtype == np.float64
+        assert frame["swell_direction"].dtype == np.float32
+        assert frame["swell_direction"].isna().sum() == 10
+
+    def test_columns_and_arrays(self):
+        reader = make_reader(FakeDatabase())
+
+        arrays = reader.read_arrays("ingested.swell_data", [46225], "2025-12-02", "2025-12-02 06:00",
+                                    columns=["swell_height"])
+
+        assert list(arrays) == ["buoy_id", "timestamp", "swell_height"]
+        np.testing.assert_array_equal(arrays["swell_height"], [4.0, 5.0, 6.0, 7.0, 8.0, 9.0])
+
+    def test_empty_range(self):
+        reader = make_reader(FakeDatabase())
+
+        frame = reader.read("ingested.swell_data", [46225], "2024-01-01", "2024-01-02")
+
+        assert frame.empty
+        assert list(frame.columns) == ["buoy_id", "timestamp"] + list(READ_TABLES["ingested.swell_data"].columns)
+
+    def test_unknown_column(self):
+        with pytest.raises(ValueError):
+            make_reader(FakeDatabase()).read("ingested.swell_data", [46225], START, NOW, columns=["wind_speed"])
+
+
+class TestRangeCache:
+    """Test that only missing ranges are fetched."""
+
+    def test_repeat_is_served_from_cache(self):
+        db = FakeDatabase()
+        reader = make_reader(db)
+
+        first = reader.read("ingested.swell_data", [46225, 46221], "2025-12-02", "2025-12-05")
+        second = reader.read("ingested.swell_data", [46221, 46225], "2025-12-03", "2025-12-04")
+
+        assert len(db.queries) == 1
+        assert reader.cache_info()["hits"] == 1
+        pd.testing.assert_frame_equal(
+            second, first[first["timestamp"].between("2025-12-03", "2025-12-04", inclusive="left")]
+            .reset_index(drop=True))
+
+    def test_overlap_fetches_only_the_missing_part(self):
+        db = FakeDatabase()
+        reader = make_reader(db)
+
+        reader.read("ingested.swell_data", [46225, 46221], "2025-12-02", "2025-12-05")
+        frame = reader.read("ingested.swell_data", [46225, 46221], "2025-12-04", "2025-12-07")
+
+        assert db.queries[1] == ([46221, 46225], to_utc("2025-12-05").to_pydatetime(), to_utc("2025-12-07").to_pydatetime())
+        assert len(frame) == 2 * 72
+        assert not frame.duplicated(["buoy_id", "timestamp"]).any()
+
+    def test_ranges_are_merged(self):
+        db = FakeDatabase()
+        reader = make_reader(db)
+
+        reader.read("ingested.swell_data", [46225], "2025-12-02", "2025-12-03")
+        reader.read("ingested.swell_data", [46225], "2025-12-05", "2025-12-06")
+        frame = reader.read("ingested.swell_data", [46225], "2025-12-01", "2025-12-07")
+
+        assert [query[1:] for query in db.queries[2:]] == [
+            (to_utc("2025-12-01").to_pydatetime(), to_utc("2025-12-02").to_pydatetime()),
+            (to_utc("2025-12-03").to_pydatetime(), to_utc("2025-12-05").to_pydatetime()),
+            (to_utc("2025-12-06").to_pydatetime(), to_utc("2025-12-07").to_pydatetime())
+        ]
+        assert len(frame) == 6 * 24
+        assert frame["timestamp"].is_monotonic_increasing
+        assert reader.cache_info()["segments"] == 1
+
+    def test_stations_with_different_gaps(self):
+        """Test that a new station is fetched for the whole range and a cached one only for its gap."""
+        db = FakeDatabase()
+        reader = make_reader(db)
+
+        reader.read("ingested.swell_data", [46225], "2025-12-02", "2025-12-03")
+        reader.read("ingested.swell_data", [46225, 46221], "2025-12-02", "2025-12-04")
+
+        assert sorted(db.queries[1:]) == [
+            ([46221], to_utc("2025-12-02").to_pydatetime(), to_utc("2025-12-04").to_pydatetime()),
+            ([46225], to_utc("2025-12-03").to_pydatetime(), to_utc("2025-12-04").to_pydatetime())
+        ]
+
+    def test_stations_with_the_same_gap_share_a_query(self):
+        db = FakeDatabase()
+        reader = make_reader(db)
+
+        reader.read("ingested.swell_data", [46225, 46221], "2025-12-02", "2025-12-03")
+        reader.read("ingested.swell_data", [46225, 46221], "2025-12-02", "2025-12-04")
+
+        assert db.queries[1] == ([46221, 46225], to_utc("2025-12-03").to_pydatetime(),
+                                 to_utc("2025-12-04").to_pydatetime())
+
+    def test_recent_readings_are_not_cached(self):
+        """Test that readings inside the settle window are fetched again on every read."""
+        db = FakeDatabase()
+        reader = make_reader(db, settle_seconds=6 * 3600)
+
+        first = reader.read("ingested.swell_data", [46225], "2025-12-31", "2026-01-01")
+        reader.read("ingested.swell_data", [46225], "2025-12-31", "2026-01-01")
+
+        assert len(first) == 24
+        assert db.queries[1][1] == datetime(2025, 12, 31, 18, tzinfo=timezone.utc)
+
+    def test_memory_budget_evicts_least_recently_read(self):
+        db = FakeDatabase()
+        reader = make_reader(db, memory_budget_mb=0)
+        frame = reader.read("ingested.swell_data", [46225], "2025-12-02", "2025-12-03")
+        segment_bytes = int(frame.drop(columns="buoy_id").memory_usage(index=True).sum())
+
+        reader = make_reader(db, memory_budget_mb=2.5 * segment_bytes / (1024 * 1024))
+        reader.read("ingested.swell_data", [46225], "2025-12-02", "2025-12-03")
+        reader.read("ingested.swell_data", [46225], "2025-12-10", "2025-12-11")
+        reader.read("ingested.swell_data", [46225], "2025-12-02", "2025-12-03")
+        reader.read("ingested.swell_data", [46225], "2025-12-20", "2025-12-21")
+
+        info = reader.cache_info()
+        assert info["evictions"] == 1
+        assert info["bytes"] <= info["budget"]
+        queries = len(db.queries)
+        reader.read("ingested.swell_data", [46225], "2025-12-02", "2025-12-03")
+        assert len(db.queries) == queries
+        reader.read("ingested.swell_data", [46225], "2025-12-10", "2025-12-11")
+        assert len(db.queries) == queries + 1
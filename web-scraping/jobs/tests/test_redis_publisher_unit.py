@@ -0,0 +1,115 @@
+"""
+Unit tests for publishing ingested readings to Redis (utils/redis_publisher.py)
+"""
+import pytest
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import fakeredis
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.redis_publisher import RedisPublisher, SWELL_TTL_SECONDS, WIND_TTL_SECONDS
+
+
+@pytest.fixture
+def fake_redis():
+    """A local Redis stand-in."""
+    return fakeredis.FakeRedis()
+
+
+def swell_row(buoy_id=46225, **overrides):
+    row = {
+        "timestamp": "2025-12-30 01:50:00",
+        "buoy_id": buoy_id,
+        "wave_height": "5.9",
+        "swell_height": "5.2",
+        "swell_period": "14",
+        "swell_direction": 293,
+        "wind_wave_height": "2.3",
+        "wind_wave_period": "6",
+        "wind_wave_direction": 315,
+        "wave_steepness": 2,
+        "average_wave_period": "8.5",
+        "tide": -0.3
+    }
+    row.update(overrides)
+    return row
+
+
+class TestRedisPublisher:
+    """Test cache warming after ingest."""
+
+    def test_swell_readings_published_with_api_fields(self, fake_redis, mock_logger):
+        publisher = RedisPublisher(client=fake_redis)
+
+        assert publisher.publish_swell([swell_row(), swell_row(46266, swell_height="3.1")], mock_logger) == 2
+
+        assert json.loads(fake_redis.get("swell:buoy:46225:latest")) == {
+            "timestamp": "2025-12-30T01:50:00.000Z",
+            "wave_height": 5.9,
+            "swell_height": 5.2,
+            "swell_period": 14.0,
+            "swell_direction": 293,
+            "tide": -0.3
+        }
+        assert json.loads(fake_redis.get("swell:buoy:46266:latest"))["swell_height"] == 3.1
+        assert 0 < fake_redis.ttl("swell:buoy:46225:latest") <= SWELL_TTL_SECONDS
+
+    def test_wind_readings_published(self, fake_redis, mock_logger):
+        publisher = RedisPublisher(client=fake_redis)
+        row = {"spot_id": 1, "timestamp": "2025-12-30 01:00:00", "wind_speed": 5.5, "wind_direction": 270, "wind_gust": None}
+
+        publisher.publish_wind([row], mock_logger)
+
+        assert json.loads(fake_redis.get("wind:spot:1:latest")) == {
+            "timestamp": "2025-12-30T01:00:00.000Z", "wind_speed": 5.5, "wind_direction": 270, "wind_gust": None
+        }
+        assert 0 < fake_redis.ttl("wind:spot:1:latest") <= WIND_TTL_SECONDS
+
+    def test_newer_reading_replaces_cached_one(self, fake_redis, mock_logger):
+        publisher = RedisPublisher(client=fake_redis)
+
+        publisher.publish_swell([swell_row()], mock_logger)
+        publisher.publish_swell([swell_row(timestamp="2025-12-30 02:50:00")], mock_logger)
+
+        assert json.loads(fake_redis.get("swell:buoy:46225:latest"))["timestamp"] == "2025-12-30T02:50:00.000Z"
+
+    def test_aware_timestamps_are_converted_to_utc(self, fake_redis, mock_logger):
+        publisher = RedisPublisher(client=fake_redis)
+        pacific = timezone(timedelta(hours=-8))
+
+        publisher.publish_swell([swell_row(timestamp=datetime(2025, 12, 29, 17, 50, tzinfo=pacific))], mock_logger)
+
+        assert json.loads(fake_redis.get("swell:buoy:46225:latest"))["timestamp"] == "2025-12-30T01:50:00.000Z"
+
+    def test_writes_are_pipelined(self, mock_logger):
+        client = MagicMock()
+        publisher = RedisPublisher(client=client)
+
+        publisher.publish_swell([swell_row(46000 + i) for i in range(50)], mock_logger)
+
+        client.pipeline.assert_called_once_with(transaction=False)
+        assert client.pipeline.return_value.set.call_count == 50
+        client.pipeline.return_value.execute.assert_called_once()
+        client.set.assert_not_called()
+
+    def test_disabled_without_url(self, mock_logger):
+        publisher = RedisPublisher(url=None)
+
+        assert not publisher.enabled
+        assert publisher.publish_swell([swell_row()], mock_logger) == 0
+        mock_logger.log_json.assert_not_called()
+
+    def test_redis_errors_do_not_fail_the_job(self, mock_logger):
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = ConnectionError("Connection refused")
+        publisher = RedisPublisher(client=client)
+
+        assert publisher.publish_swell([swell_row()], mock_logger) == 0
+        mock_logger.log_json.assert_called_once_with(
+            "WARNING", "Failed to publish readings to Redis", {"entries": 1, "error": "Connection refused"}
+        )
@@ -0,0 +1,149 @@
+"""
+Unit tests for the reference data snapshot (utils/reference_snapshot.py)
+"""
+import pytest
+import json
+from unittest.mock import MagicMock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import ReferenceSnapshot
+from utils.reference_snapshot import BUOYS_QUERY, LINKS_QUERY, REFERENCE_VERSION_QUERY, SPOTS_QUERY
+
+TABLES = {
+    REFERENCE_VERSION_QUERY: [("buoys-v1", "spots-v1", "links-v1")],
+    BUOYS_QUERY: [(46225, 32.933, -117.391), (46254, 32.868, -117.267), (46266, 32.957, -117.279)],
+    SPOTS_QUERY: [(4, 32.866565, -117.25411), (6, 32.957927, -117.268223), (7, 32.969365, -117.269284)],
+    LINKS_QUERY: [(4, 46254), (6, 46225), (6, 46266), (7, 46225), (7, 46266)]
+}
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / "reference-snapshot.json")
+
+
+@pytest.fixture
+def reference_db():
+    """Database answering the version and reference queries from TABLES (a copy, so tests can change it)."""
+    db = MagicMock()
+    db.tables = dict(TABLES)
+    db.execute_query.side_effect = lambda query, params=None, fetch=False: db.tables[query]
+    return db
+
+
+def query_count(db, query):
+    return sum(1 for call in db.execute_query.call_args_list if call[0][0] == query)
+
+
+class TestReferenceSnapshot:
+    """Test reloading the reference data only when its checksums change."""
+
+    def test_first_refresh_loads_and_saves(self, snapshot_path, reference_db, mock_logger):
+        snapshot = ReferenceSnapshot(snapshot_path)
+        assert not snapshot.loaded
+
+        assert snapshot.refresh(reference_db, mock_logger)
+        assert snapshot.loaded
+        assert snapshot.buoy_ids == [46225, 46254, 46266]
+        assert snapshot.spots == [(4, 32.866565, -117.25411), (6, 32.957927, -117.268223), (7, 32.969365, -117.269284)]
+        with open(snapshot_path) as f:
+            assert json.load(f)["version"] == ["buoys-v1", "spots-v1", "links-v1"]
+        mock_logger.log_json.assert_called_with("INFO", "Loaded reference data", {"buoys": 3, "spots": 3, "links": 5})
+
+    def test_derived_lookups(self, snapshot_path, reference_db, mock_logger):
+        snapshot = ReferenceSnapshot(snapshot_path)
+        snapshot.refresh(reference_db, mock_logger)
+
+        assert snapshot.buoy_spots == {46254: [4], 46225: [6, 7], 46266: [6, 7]}
+        assert snapshot.spot_buoys == {4: [46254], 6: [46225, 46266], 7: [46225, 46266]}
+        assert snapshot.buoy_priorities == {"46254": 1, "46225": 2, "46266": 2}
+        assert snapshot.spot_priorities == {"4": 1, "6": 2, "7": 2}
+        assert snapshot.buoy_locations[46225] == (32.933, -117.391)
+
+    def test_unchanged_version_skips_the_tables(self, snapshot_path, reference_db, mock_logger):
+        snapshot = ReferenceSnapshot(snapshot_path)
+        snapshot.refresh(reference_db, mock_logger)
+
+        assert not snapshot.refresh(reference_db, mock_logger)
+        assert query_count(reference_db, REFERENCE_VERSION_QUERY) == 2
+        assert query_count(reference_db, BUOYS_QUERY) == 1
+
+    def test_next_run_starts_from_the_saved_snapshot(self, snapshot_path, reference_db, mock_logger):
+        ReferenceSnapshot(snapshot_path).refresh(reference_db, mock_logger)
+        first = ReferenceSnapshot(snapshot_path)
+
+        assert first.loaded and first.spot_buoys[6] == [46225, 46266]
+        assert not first.refresh(reference_db, mock_logger)
+        assert query_count(reference_db, SPOTS_QUERY) == 1
+
+    def test_changed_links_reload(self, snapshot_path, reference_db, mock_logger):
+        snapshot = ReferenceSnapshot(snapshot_path)
+        snapshot.refresh(reference_db, mock_logger)
+        reference_db.tables[REFERENCE_VERSION_QUERY] = [("buoys-v1", "spots-v1", "links-v2")]
+        reference_db.tables[LINKS_QUERY] = [(4, 46254), (4, 46225)]
+
+        assert snapshot.refresh(reference_db, mock_logger)
+        assert snapshot.spot_buoys == {4: [46254, 46225]}
+        assert ReferenceSnapshot(snapshot_path).buoy_priorities == {"46254": 1, "46225": 1}
+
+    def test_version_check_failure_keeps_snapshot(self, snapshot_path, reference_db, mock_logger):
+        ReferenceSnapshot(snapshot_path).refresh(reference_db, mock_logger)
+        reference_db.tables[REFERENCE_VERSION_QUERY] = None
+        snapshot = ReferenceSnapshot(snapshot_path)
+
+        assert not snapshot.refresh(reference_db, mock_logger)
+        assert snapshot.buoy_ids == [46225, 46254, 46266]
+        mock_logger.log_json.assert_called_with("WARNING", "Could not check the reference data version", {"cached": True})
+
+    def test_failed_reload_keeps_snapshot(self, snapshot_path, reference_db, mock_logger):
+        snapshot = ReferenceSnapshot(snapshot_path)
+        snapshot.refresh(reference_db, mock_logger)
+        reference_db.tables[REFERENCE_VERSION_QUERY] = [("buoys-v2", "spots-v1", "links-v1")]
+        reference_db.tables[BUOYS_QUERY] = None
+
+        assert not snapshot.refresh(reference_db, mock_logger)
+        assert snapshot.version == ["buoys-v1", "spots-v1", "links-v1"]
+        assert snapshot.buoy_ids == [46225, 46254, 46266]
+
+    def test_unreadable_snapshot_starts_empty(self, snapshot_path):
+        with open(snapshot_path, "w") as f:
+            f.write('{"version": ["buoys-v1"]}')
+
+        snapshot = ReferenceSnapshot(snapshot_path)
+
+        assert not snapshot.loaded
+        assert snapshot.buoy_ids == [] and snapshot.buoy_priorities == {}
+
+
+class TestScraperReference:
+    """Test that the scrapers take their station lists and priorities from the snapshot."""
+
+    @pytest.fixture
+    def snapshot(self, snapshot_path, reference_db, mock_logger):
+        snapshot = ReferenceSnapshot(snapshot_path)
+        snapshot.refresh(reference_db, mock_logger)
+        return snapshot
+
+    @patch('swell_scraper_hourly.get_latest_spectra_times', return_value=None)
+    def test_spectra_uses_snapshot_buoys(self, _, snapshot, mock_logger):
+        from swell_scraper_hourly import run_spectra
+
+        with patch('swell_scraper_hourly.prioritize', return_value=[]) as prioritize:
+            run_spectra(mock_logger, reference=snapshot)
+
+        prioritize.assert_called_once_with([46225, 46254, 46266], {"46254": 1, "46225": 2, "46266": 2})
+
+    @patch('wind_scraper_hourly.PostgresConnection')
+    def test_get_reference_refreshes_the_shared_snapshot(self, mock_pg_conn, snapshot_path, reference_db, mock_logger):
+        from wind_scraper_hourly import get_reference
+
+        mock_pg_conn.return_value.__enter__.return_value = reference_db
+        with patch.dict(os.environ, {"REFERENCE_SNAPSHOT_PATH": snapshot_path}):
+            assert get_reference(mock_logger).spot_priorities == {"4": 1, "6": 2, "7": 2}
+            assert get_reference(mock_logger).loaded
+
+        assert query_count(reference_db, REFERENCE_VERSION_QUERY) == 2
+        assert query_count(reference_db, LINKS_QUERY) == 1
@@ -0,0 +1,149 @@
+"""
+Unit tests for scraper_daemon.py and the health endpoint (utils/health_server.py)
+"""
+import pytest
+import json
+import random
+import urllib.error
+import urllib.request
+from unittest.mock import MagicMock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import scraper_daemon
+from scraper_daemon import ScraperDaemon
+from utils.reference_snapshot import BUOYS_QUERY, LINKS_QUERY, REFERENCE_VERSION_QUERY, SPOTS_QUERY
+from utils.health_server import HealthServer
+from utils.interval_scheduler import IntervalScheduler
+
+MINUTE = 60
+
+
+class FakeClock:
+    """Wall clock advanced by hand; sleeping advances it."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def reference_db(tmp_path, monkeypatch):
+    """Database answering the reference version query, then the buoy, spot and link queries."""
+    monkeypatch.setenv("REFERENCE_SNAPSHOT_PATH", str(tmp_path / "reference-snapshot.json"))
+    db = MagicMock()
+    tables = {
+        REFERENCE_VERSION_QUERY: [("buoys-v1", "spots-v1", "links-v1")],
+        BUOYS_QUERY: [(46221, 33.855, -118.633), (46225, 32.933, -117.391)],
+        SPOTS_QUERY: [(1, 32.7, -117.2)],
+        LINKS_QUERY: [(1, 46225)]
+    }
+    db.execute_query.side_effect = lambda query, params=None, fetch=False: tables[query]
+    with patch('scraper_daemon.PostgresConnection') as mock_conn:
+        mock_conn.return_value.__enter__.return_value = db
+        yield db
+
+
+def query_count(db, query):
+    return sum(1 for call in db.execute_query.call_args_list if call[0][0] == query)
+
+
+def get(port, path):
+    """GET a path from the health server, returning (status, body)."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+class TestScraperDaemon:
+    """Test the daemon's schedule with a fake clock."""
+
+    @patch('scraper_daemon.Logger')
+    @patch('scraper_daemon.wind_scraper_hourly.run')
+    @patch('scraper_daemon.swell_scraper_hourly.run')
+    def test_schedules_swell_and_wind(self, swell_run, wind_run, mock_logger_class, reference_db):
+        """Test that a simulated day runs swell every 20 minutes and wind hourly, reusing the warm state."""
+        clock = FakeClock()
+        scheduler = IntervalScheduler(clock=clock, sleep=clock.sleep, rng=random.Random(1))
+        fetch_pool, parse_pool = MagicMock(), MagicMock()
+        daemon = ScraperDaemon(scheduler, fetch_pool=fetch_pool, parse_pool=parse_pool,
+                               swell_interval=20 * MINUTE, wind_interval=60 * MINUTE, jitter=MINUTE)
+
+        scheduler.run_forever(lambda: clock.now >= 24 * 60 * MINUTE, max_sleep=MINUTE)
+
+        assert swell_run.call_count == 72
+        assert wind_run.call_count == 24
+        assert query_count(reference_db, BUOYS_QUERY) == 1
+        kwargs = swell_run.call_args[1]
+        assert kwargs["buoy_ids"] == [46221, 46225]
+        assert kwargs["reference"] is daemon.reference and kwargs["reference"].buoy_priorities == {"46225": 1}
+        assert kwargs["fetch_pool"] is fetch_pool and kwargs["parse_pool"] is parse_pool
+        assert kwargs["budget"] == scraper_daemon.SWELL_RUN_BUDGET_SECONDS
+        assert wind_run.call_args[1]["spots"] == [(1, 32.7, -117.2)]
+        assert wind_run.call_args[1]["budget"] == scraper_daemon.WIND_RUN_BUDGET_SECONDS
+        job_names = {call[1]["job_name"] for call in mock_logger_class.call_args_list}
+        assert job_names == {"swell-scraper-hourly", "wind-scraper-hourly"}
+
+    @patch('scraper_daemon.Logger')
+    @patch('scraper_daemon.wind_scraper_hourly.run')
+    @patch('scraper_daemon.swell_scraper_hourly.run', side_effect=RuntimeError("boom"))
+    def test_failing_run_does_not_stop_wind(self, swell_run, wind_run, mock_logger_class, reference_db):
+        clock = FakeClock()
+        scheduler = IntervalScheduler(clock=clock, sleep=clock.sleep, rng=random.Random(1))
+        ScraperDaemon(scheduler, swell_interval=20 * MINUTE, wind_interval=60 * MINUTE, jitter=0)
+
+        scheduler.run_forever(lambda: clock.now >= 2 * 60 * MINUTE, max_sleep=MINUTE)
+
+        assert swell_run.call_count == 6
+        assert wind_run.call_count == 2
+        assert scheduler.status()["swell"]["last_error"] == "boom"
+        run_logger = mock_logger_class.return_value.__enter__.return_value
+        run_logger.log_json.assert_any_call("ERROR", "Scraper run failed", {"error": "boom"})
+
+    def test_default_budgets_fit_a_swell_slot(self):
+        """Test that a wind run and a swell run together end before the next swell slot, within the liveness timeout."""
+        assert scraper_daemon.SWELL_RUN_BUDGET_SECONDS + scraper_daemon.WIND_RUN_BUDGET_SECONDS \
+            < scraper_daemon.SWELL_INTERVAL_SECONDS
+        assert max(scraper_daemon.SWELL_RUN_BUDGET_SECONDS, scraper_daemon.WIND_RUN_BUDGET_SECONDS) \
+            < scraper_daemon.LIVENESS_TIMEOUT_SECONDS
+
+    def test_readiness_and_liveness(self, reference_db, mock_logger):
+        clock = FakeClock()
+        scheduler = IntervalScheduler(clock=clock, sleep=clock.sleep)
+        daemon = ScraperDaemon(scheduler)
+
+        assert daemon.live()
+        assert not daemon.ready()
+        daemon.refresh_reference(mock_logger)
+        assert daemon.ready()
+
+        clock.now += scraper_daemon.LIVENESS_TIMEOUT_SECONDS + 1
+        assert not daemon.live()
+
+
+class TestHealthServer:
+    """Test the probe endpoints over HTTP."""
+
+    def test_endpoints(self):
+        state = {"live": True, "ready": False}
+        server = HealthServer(0, lambda: state["live"], lambda: state["ready"], lambda: {"jobs": {}},
+                              host="127.0.0.1").start()
+        try:
+            assert get(server.port, "/healthz") == (200, {"ok": True, "jobs": {}})
+            assert get(server.port, "/readyz")[0] == 503
+            state["ready"] = True
+            assert get(server.port, "/readyz") == (200, {"ok": True, "jobs": {}})
+            state["live"] = False
+            assert get(server.port, "/healthz")[0] == 503
+            assert get(server.port, "/metrics")[0] == 404
+        finally:
+            server.stop()
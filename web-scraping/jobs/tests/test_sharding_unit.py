@@ -0,0 +1,94 @@
+"""
+Unit tests for station sharding (utils/sharding.py)
+"""
+import pytest
+import argparse
+import subprocess
+from unittest.mock import patch
+from datetime import datetime
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.sharding import add_shard_arguments, check_shard_arguments, filter_shard, shard_label, shard_of
+from utils.logger import Logger
+
+STATIONS = [46274, 46225, 46266, 46254, 46258, 46232, 46235] + list(range(41001, 41101))
+
+
+class TestShardAssignment:
+    """Test stable hash-based shard assignment."""
+
+    def test_every_station_in_exactly_one_shard(self):
+        shards = [filter_shard(STATIONS, index, 4) for index in range(4)]
+
+        assert sorted(sum(shards, [])) == sorted(STATIONS)
+
+    def test_membership_stable_when_stations_added(self):
+        before = filter_shard(STATIONS, 1, 4)
+        after = filter_shard(STATIONS + list(range(51001, 51051)), 1, 4)
+
+        assert set(before) <= set(after)
+
+    def test_assignment_stable_across_processes(self):
+        code = "from utils.sharding import shard_of; print([shard_of(s, 4) for s in (46274, 46225, 46266)])"
+        output = subprocess.check_output(
+            [sys.executable, "-c", code],
+            cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), '..')),
+            env={**os.environ, "PYTHONHASHSEED": "123"}
+        )
+
+        assert output.decode().strip() == str([shard_of(s, 4) for s in (46274, 46225, 46266)])
+
+    def test_string_and_int_ids_agree(self):
+        assert shard_of("46225", 8) == shard_of(46225, 8)
+
+    def test_shards_roughly_balanced(self):
+        sizes = [len(filter_shard(STATIONS, index, 4)) for index in range(4)]
+
+        assert min(sizes) > len(STATIONS) / 4 * 0.5
+
+    def test_spot_tuples_filtered_by_id(self):
+        spots = [(1, 32.71, -117.25), (2, 32.75, -117.25), (3, 32.79, -117.25)]
+        shards = [filter_shard(spots, index, 2) for index in range(2)]
+
+        assert sorted(sum(shards, [])) == spots
+
+    def test_single_shard_keeps_everything(self):
+        assert filter_shard(STATIONS, 0, 1) == STATIONS
+
+
+class TestShardArguments:
+    """Test the shared command-line arguments."""
+
+    def test_defaults_are_unsharded(self):
+        parser = argparse.ArgumentParser()
+        add_shard_arguments(parser)
+        args = parser.parse_args([])
+
+        assert (args.shard_index, args.shard_count) == (0, 1)
+
+    def test_invalid_shard_rejected(self):
+        parser = argparse.ArgumentParser()
+        add_shard_arguments(parser)
+        args = parser.parse_args(["--shard-index", "4", "--shard-count", "4"])
+
+        with pytest.raises(SystemExit):
+            check_shard_arguments(parser, args)
+
+
+class TestShardLogPaths:
+    """Test per-shard log paths."""
+
+    def test_shard_label(self):
+        assert shard_label(0, 1) == ""
+        assert shard_label(2, 4) == "shard-2-of-4"
+
+    @patch('utils.logger.datetime')
+    def test_log_path_includes_shard(self, mock_datetime):
+        mock_datetime.now.return_value = datetime(2025, 12, 30, 1, 0)
+
+        assert Logger("swell-scraper-hourly").log_path == "swell-scraper-hourly/12-30-2025/01-00.log"
+        assert Logger("swell-scraper-hourly", shard_index=2, shard_count=4).log_path == \
+            "swell-scraper-hourly/12-30-2025/01-00-shard-2-of-4.log"
@@ -0,0 +1,216 @@
+"""
+Unit tests for the spatial index (utils/spatial.py) and the spot-buoy link sync job
+"""
+import pytest
+import time
+import numpy as np
+from unittest.mock import MagicMock
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.spatial import SpatialIndex, haversine_km
+from spot_buoy_link_sync import (BUOYS_QUERY, MANUAL_SPOTS_QUERY, REPLACE_LINKS_QUERY, SPOTS_QUERY, affected_spots,
+                                 compute_links, sync_links)
+
+# Seed coordinates from reference.buoy_info and reference.spot_info
+BUOYS = {
+    46274: [33.062, -117.314],
+    46225: [32.933, -117.391],
+    46266: [32.957, -117.279],
+    46254: [32.868, -117.267],
+    46258: [32.749, -117.502],
+    46232: [32.517, -117.425],
+    46235: [32.570, -117.169]
+}
+SPOTS = {
+    1: [32.717984, -117.256269],
+    2: [32.752463, -117.252912],
+    3: [32.790586, -117.255453],
+    4: [32.866565, -117.254110],
+    5: [32.879067, -117.251771],
+    6: [32.957927, -117.268223],
+    7: [32.969365, -117.269284]
+}
+
+
+def random_points(count, seed=0, lat=(-70, 70), lon=(-180, 180)):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(*lat, count), rng.uniform(*lon, count)
+
+
+def brute_force_nearest(index, latitudes, longitudes, k):
+    distances = haversine_km(np.asarray(latitudes)[:, None], np.asarray(longitudes)[:, None],
+                             index.latitudes[None, :], index.longitudes[None, :])
+    order = np.argsort(distances, axis=1)[:, :k]
+    return index.ids[order], np.take_along_axis(distances, order, axis=1)
+
+
+class TestHaversine:
+    """Test great-circle distances."""
+
+    def test_known_distance(self):
+        # Scripps Nearshore to Torrey Pines Outer
+        assert haversine_km(32.868, -117.267, 32.933, -117.391) == pytest.approx(13.65, abs=0.05)
+
+    def test_broadcasts(self):
+        assert haversine_km(0, [0, 90, 180], 0, 0).tolist() == pytest.approx([0, 10007.5, 20015.1], abs=0.1)
+
+
+class TestSpatialIndex:
+    """Test batched k-nearest and radius queries."""
+
+    def test_nearest_matches_brute_force(self):
+        buoy_lat, buoy_lon = random_points(500, seed=1)
+        index = SpatialIndex(np.arange(500) + 40000, buoy_lat, buoy_lon)
+        spot_lat, spot_lon = random_points(2000, seed=2)
+
+        ids, distances = index.nearest(spot_lat, spot_lon, k=3)
+        expected_ids, expected_distances = brute_force_nearest(index, spot_lat, spot_lon, 3)
+
+        np.testing.assert_allclose(distances, expected_distances, rtol=1e-9, atol=1e-6)
+        assert (ids == expected_ids).mean() > 0.999  # ties aside
+
+    def test_antimeridian(self):
+        index = SpatialIndex([1, 2], [0.0, 0.0], [179.9, -170.0])
+
+        ids, distances = index.nearest([0.0], [-179.9], k=1)
+
+        assert ids[0, 0] == 1
+        assert distances[0, 0] == pytest.approx(22.2, abs=0.1)
+
+    def test_max_distance(self):
+        index = SpatialIndex.from_points(BUOYS)
+
+        ids, distances = index.nearest([SPOTS[6][0]], [SPOTS[6][1]], k=3, max_distance_km=11)
+
+        assert ids[0].tolist() == [46266, 46254, None]
+        assert distances[0, 2] == np.inf
+
+    def test_more_neighbours_than_points(self):
+        ids, distances = SpatialIndex([1], [0.0], [0.0]).nearest([1.0], [1.0], k=2)
+
+        assert ids[0].tolist() == [1, None]
+
+    def test_within(self):
+        index = SpatialIndex.from_points(BUOYS)
+
+        (ids, distances), (far_ids, _) = index.within([SPOTS[4][0], 0.0], [SPOTS[4][1], 0.0], 15)
+
+        assert ids.tolist() == [46254, 46266, 46225]
+        assert np.all(np.diff(distances) >= 0)
+        assert all(distance <= 15 for distance in distances)
+        assert len(far_ids) == 0
+
+    def test_empty_index(self):
+        index = SpatialIndex.from_points({})
+
+        ids, distances = index.nearest([0.0], [0.0], k=2)
+
+        assert ids[0].tolist() == [None, None]
+        assert index.within([0.0], [0.0], 10)[0][0].tolist() == []
+
+
+class TestLinkSync:
+    """Test the incremental spot-buoy link job."""
+
+    def make_db(self, spots=SPOTS, buoys=BUOYS, manual=(), replace_result=True):
+        db = MagicMock()
+        answers = {
+            SPOTS_QUERY: lambda: [(key, *value) for key, value in spots.items()],
+            BUOYS_QUERY: lambda: [(key, *value) for key, value in buoys.items()],
+            MANUAL_SPOTS_QUERY: lambda: [(spot_id,) for spot_id in manual]
+        }
+        db.execute_query.side_effect = lambda query, params=None, fetch=False: (
+            answers[query]() if query in answers else replace_result)
+        return db
+
+    @staticmethod
+    def replaced(db):
+        calls = [call for call in db.execute_query.call_args_list if call[0][0] == REPLACE_LINKS_QUERY]
+        return [call[0][1] for call in calls]
+
+    def test_first_sync_links_every_spot(self, tmp_path, mock_logger):
+        db = self.make_db()
+
+        assert sync_links(db, mock_logger, state_path=str(tmp_path / "links.json"), link_count=2, radius_km=50)
+
+        (spot_ids, buoy_ids, distances, affected), = self.replaced(db)
+        assert affected == list(SPOTS)
+        links = set(zip(spot_ids, buoy_ids))
+        assert (6, 46266) in links and (4, 46254) in links
+        assert len(links) == 14
+        assert all(distance <= 50 for distance in distances)
+
+    def test_unchanged_reference_data_skips(self, tmp_path, mock_logger):
+        state_path = str(tmp_path / "links.json")
+        sync_links(self.make_db(), mock_logger, state_path=state_path)
+        db = self.make_db()
+
+        assert sync_links(db, mock_logger, state_path=state_path)
+
+        assert self.replaced(db) == []
+        mock_logger.log_json.assert_called_with("INFO", "Spot-buoy links up to date", {"spots": 7, "buoys": 7})
+
+    def test_moved_buoy_relinks_only_nearby_spots(self, tmp_path, mock_logger):
+        state_path = str(tmp_path / "links.json")
+        far_spots = {**SPOTS, 100: [21.3, -157.9]}
+        far_buoys = {**BUOYS, 51201: [21.671, -158.118]}
+        sync_links(self.make_db(far_spots, far_buoys), mock_logger, state_path=state_path)
+        moved = {**far_buoys, 51201: [21.5, -158.0]}
+        db = self.make_db(far_spots, moved)
+
+        sync_links(db, mock_logger, state_path=state_path)
+
+        (spot_ids, buoy_ids, _, affected), = self.replaced(db)
+        assert affected == [100]
+        assert list(zip(spot_ids, buoy_ids)) == [(100, 51201)]
+
+    def test_manual_spots_get_no_automatic_links(self, tmp_path, mock_logger):
+        db = self.make_db(manual=[6, 7])
+
+        sync_links(db, mock_logger, state_path=str(tmp_path / "links.json"))
+
+        (spot_ids, _, _, affected), = self.replaced(db)
+        assert 6 in affected and 7 in affected
+        assert not {6, 7} & set(spot_ids)
+
+    def test_failed_update_is_retried(self, tmp_path, mock_logger):
+        state_path = str(tmp_path / "links.json")
+        sync_links(self.make_db(replace_result=None), mock_logger, state_path=state_path)
+        db = self.make_db()
+
+        sync_links(db, mock_logger, state_path=state_path)
+
+        assert self.replaced(db)[0][3] == list(SPOTS)
+
+    def test_new_spot_only(self):
+        state = {"spots": {str(key): value for key, value in SPOTS.items()},
+                 "buoys": {str(key): value for key, value in BUOYS.items()},
+                 "manual_spot_ids": [], "config": [2, 50.0]}
+
+        assert affected_spots(state, {**SPOTS, 8: [33.0, -117.3]}, BUOYS, set(), [2, 50.0]) == {8}
+
+
+@pytest.mark.slow
+class TestSpatialBenchmark:
+    """Linking 100k spots, against a brute-force scan of a sample."""
+
+    def test_link_100k_spots(self):
+        buoy_lat, buoy_lon = random_points(1_000, seed=3, lat=(20, 50), lon=(-130, -60))
+        buoys = SpatialIndex(np.arange(1_000), buoy_lat, buoy_lon)
+        spot_lat, spot_lon = random_points(100_000, seed=4, lat=(20, 50), lon=(-130, -60))
+        spots = {i: [lat, lon] for i, (lat, lon) in enumerate(zip(spot_lat, spot_lon))}
+
+        start = time.perf_counter()
+        links = compute_links(list(spots), spots, buoys, link_count=2, radius_km=200)
+        elapsed = time.perf_counter() - start
+
+        sample = slice(0, 2_000)
+        scan_start = time.perf_counter()
+        brute_force_nearest(buoys, spot_lat[sample], spot_lon[sample], 2)
+        scan_elapsed = (time.perf_counter() - scan_start) * 50
+        print(f"\n100,000 spots x 1,000 buoys: KD-tree {elapsed * 1000:,.0f} ms ({len(links):,} links), "
+              f"brute force ~{scan_elapsed * 1000:,.0f} ms (extrapolated from 2,000 spots)")
+        assert elapsed < 10
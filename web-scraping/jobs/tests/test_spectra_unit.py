@@ -0,0 +1,220 @@
+"""
+Unit tests for NDBC spectral wave data (utils/spectra.py and the swell scraper's spectra mode)
+"""
+import pytest
+import numpy as np
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, Mock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.spectra import (ARRAY_DTYPE, decode_spectra, pack_array, parse_spectral_file, read_spectra, spectra_rows,
+                           unpack_array)
+from swell_scraper_hourly import fetch_spectral_file, run_spectra
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as fixture:
+        return fixture.read()
+
+
+@pytest.fixture
+def energy():
+    return parse_spectral_file(read_fixture("46225.data_spec"), has_separation=True)
+
+
+@pytest.fixture
+def direction():
+    return parse_spectral_file(read_fixture("46225.swdir"))
+
+
+def stored(rows):
+    """Simulate the rows coming back from Postgres: bytea arrives as memoryview."""
+    return [(row["timestamp"], row["separation_frequency"], memoryview(row["frequencies"]),
+             memoryview(row["energy"]), memoryview(row["direction"])) for row in rows]
+
+
+class TestParseSpectralFile:
+    """Test parsing the recorded .data_spec and .swdir files."""
+
+    def test_energy_shape_and_order(self, energy):
+        assert energy.values.shape == (4, 47)
+        assert energy.values.dtype == ARRAY_DTYPE
+        assert energy.frequencies[0] == pytest.approx(0.02)
+        assert energy.frequencies[-1] == pytest.approx(0.485)
+        assert energy.timestamps.tolist() == [
+            datetime(2025, 12, 30, 8, 40), datetime(2025, 12, 30, 9, 40),
+            datetime(2025, 12, 30, 10, 40), datetime(2025, 12, 30, 11, 40)
+        ]
+
+    def test_swell_peak(self, energy):
+        """Test that the energy peak of the latest observation is the 15 s swell train."""
+        assert energy.frequencies[np.argmax(energy.values[-1])] == pytest.approx(0.0675)
+        assert energy.values[-1].max() == pytest.approx(2.5)
+
+    def test_missing_separation_frequency(self, energy):
+        """Test that the 9.999 placeholder becomes NaN."""
+        assert energy.separation_frequency[0] == pytest.approx(0.11)
+        assert np.isnan(energy.separation_frequency[1])
+        assert energy.separation_frequency[3] == pytest.approx(0.1)
+
+    def test_missing_direction_is_nan(self, direction):
+        assert direction.values.shape == (3, 47)
+        assert direction.separation_frequency is None
+        assert np.isnan(direction.values[:, 0]).all()
+        assert direction.values[-1, 10] == pytest.approx(270.0)
+        assert direction.values[-1, 20] == pytest.approx(300.0)
+
+    def test_two_digit_years(self):
+        spectrum = parse_spectral_file("#YY MM DD hh mm\n99 01 02 03 04 0.5 (0.1) 0.7 (0.2)\n")
+
+        assert spectrum.timestamps.tolist() == [datetime(2099, 1, 2, 3, 4)]
+
+    def test_lines_with_other_band_count_dropped(self):
+        text = "2025 12 30 10 40 1.0 (0.1) 2.0 (0.2)\n2025 12 30 11 40 1.0 (0.1)\n"
+
+        assert parse_spectral_file(text).values.shape == (1, 2)
+
+    def test_empty_file(self):
+        spectrum = parse_spectral_file("#YY  MM DD hh mm\n", has_separation=True)
+
+        assert len(spectrum.timestamps) == 0
+        assert spectrum.values.shape == (0, 0)
+
+
+class TestArrayEncoding:
+    """Test the float32 bytea encoding."""
+
+    def test_round_trip(self):
+        values = np.array([0.0, 1.5, np.nan, 2.25], dtype=np.float64)
+
+        packed = pack_array(values)
+        decoded = unpack_array(memoryview(packed))
+
+        assert len(packed) == 16
+        np.testing.assert_array_equal(decoded, values.astype(np.float32))
+
+    def test_decode_does_not_copy(self):
+        """Test that decoding reinterprets the buffer instead of copying it."""
+        packed = pack_array(np.arange(47))
+
+        decoded = unpack_array(packed)
+
+        assert not decoded.flags.owndata
+        assert not decoded.flags.writeable
+        assert np.shares_memory(decoded, np.frombuffer(packed, dtype=np.uint8))
+
+
+class TestSpectraRows:
+    """Test building ingested.swell_spectra rows."""
+
+    def test_rows_match_directions_by_time(self, energy, direction):
+        rows = spectra_rows("46225", energy, direction)
+
+        assert [row["timestamp"] for row in rows] == [
+            "2025-12-30 08:40:00+00", "2025-12-30 09:40:00+00", "2025-12-30 10:40:00+00", "2025-12-30 11:40:00+00"
+        ]
+        assert rows[0]["buoy_id"] == 46225
+        assert rows[1]["separation_frequency"] is None
+        assert all(len(row["energy"]) == len(row["direction"]) == 47 * 4 for row in rows)
+        # The 09:40 observation is missing from the .swdir file
+        assert np.isnan(unpack_array(rows[1]["direction"])).all()
+        assert unpack_array(rows[0]["direction"])[10] == pytest.approx(273.0)
+        assert unpack_array(rows[3]["direction"])[10] == pytest.approx(270.0)
+
+    def test_since_keeps_new_observations(self, energy, direction):
+        rows = spectra_rows("46225", energy, direction, since=np.datetime64("2025-12-30T09:40", "m"))
+
+        assert [row["timestamp"] for row in rows] == ["2025-12-30 10:40:00+00", "2025-12-30 11:40:00+00"]
+
+    def test_without_direction_file(self, energy):
+        rows = spectra_rows("46225", energy, None)
+
+        assert len(rows) == 4
+        assert np.isnan(unpack_array(rows[0]["direction"])).all()
+
+
+class TestDecodeSpectra:
+    """Test reading spectra back into NumPy."""
+
+    def test_decode_matrix(self, energy, direction):
+        batch = decode_spectra(stored(spectra_rows("46225", energy, direction)))
+
+        assert batch.energy.shape == (4, 47)
+        assert batch.direction.shape == (4, 47)
+        np.testing.assert_array_equal(batch.energy, energy.values)
+        np.testing.assert_array_equal(batch.frequencies, energy.frequencies)
+        assert np.isnan(batch.separation_frequency[1])
+        assert batch.timestamps[0] == "2025-12-30 08:40:00+00"
+
+    def test_different_bins_rejected(self, energy):
+        rows = stored(spectra_rows("46225", energy, None))
+        rows[1] = (rows[1][0], rows[1][1], memoryview(pack_array(np.arange(47) * 0.01)), rows[1][3], rows[1][4])
+
+        with pytest.raises(ValueError):
+            decode_spectra(rows)
+
+    def test_empty(self):
+        batch = decode_spectra([])
+
+        assert batch.energy.shape == (0, 0)
+
+    def test_read_spectra(self, energy):
+        db_connection = MagicMock()
+        db_connection.execute_query.return_value = stored(spectra_rows("46225", energy, None))
+
+        batch = read_spectra(db_connection, 46225, "2025-12-30", "2025-12-31")
+
+        assert batch.energy.shape == (4, 47)
+        assert db_connection.execute_query.call_args[0][1] == (46225, "2025-12-30", "2025-12-31")
+
+    def test_read_spectra_failure(self):
+        db_connection = MagicMock()
+        db_connection.execute_query.return_value = None
+
+        assert read_spectra(db_connection, 46225, "2025-12-30", "2025-12-31") is None
+
+
+class TestSpectraMode:
+    """Test the swell scraper's spectra mode against the recorded files."""
+
+    @patch('swell_scraper_hourly.requests.get')
+    def test_buoy_without_spectra(self, mock_get, mock_logger):
+        mock_get.return_value = Mock(status_code=404)
+
+        assert fetch_spectral_file("41013", "data_spec", mock_logger, timeout=5) is None
+        assert mock_get.call_args[0][0] == "https://www.ndbc.noaa.gov/data/realtime2/41013.data_spec"
+        mock_logger.log_json.assert_not_called()
+
+    @patch('swell_scraper_hourly.get_reference', return_value=MagicMock(buoy_priorities={}))
+    @patch('swell_scraper_hourly.requests.get')
+    @patch('swell_scraper_hourly.PostgresConnection')
+    def test_run_inserts_new_observations(self, mock_pg_conn, mock_get, _, mock_logger):
+        """Test that only observations newer than the latest stored one are inserted, in one batch."""
+        files = {
+            "46225.data_spec": read_fixture("46225.data_spec"),
+            "46225.swdir": read_fixture("46225.swdir")
+        }
+
+        def get(url, timeout=None):
+            name = url.rsplit("/", 1)[1]
+            return Mock(status_code=200, text=files[name]) if name in files else Mock(status_code=404)
+
+        mock_get.side_effect = get
+        db = MagicMock()
+        db.execute_query.return_value = [(46225, datetime(2025, 12, 30, 9, 40, tzinfo=timezone.utc))]
+        db.insert_many.return_value = True
+        mock_pg_conn.return_value.__enter__.return_value = db
+
+        run_spectra(mock_logger, buoy_ids=["46225", "41013"])
+
+        table, rows = db.insert_many.call_args[0]
+        assert table == "ingested.swell_spectra"
+        assert [row["timestamp"] for row in rows] == ["2025-12-30 10:40:00+00", "2025-12-30 11:40:00+00"]
+        assert db.insert_many.call_args[1] == {"on_conflict": "nothing", "conflict_columns": ["timestamp", "buoy_id"]}
+        db.notify_changes.assert_called_once_with("ingested.swell_spectra", rows, "buoy_id")
+        mock_logger.log_json.assert_any_call("INFO", "Buoys without spectral data", {"buoy_ids": ["41013"]})
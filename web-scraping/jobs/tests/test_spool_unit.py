@@ -0,0 +1,219 @@
+"""
+Unit tests for the write-ahead spool (utils/spool.py)
+"""
+import pytest
+import json
+import os
+
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.spool import Spool
+
+
+class FakeDatabase:
+    """
+    Stand-in for PostgresConnection that enforces the (timestamp, buoy_id) primary key.
+
+    fail makes the database unreachable; rows of a buoy in reject violate a constraint,
+    which fails their whole batch.
+    """
+
+    def __init__(self, fail=False, reject=()):
+        self.fail = fail
+        self.reject = set(reject)
+        self.rows = {}
+        self.calls = 0
+
+    def execute_query(self, query, params=None, fetch=False):
+        return None if self.fail else [(1,)]
+
+    def insert_many(self, table, rows, on_conflict=None, conflict_columns=None, page_size=500):
+        self.calls += 1
+        if self.fail or any(row["buoy_id"] in self.reject for row in rows):
+            return False
+        for row in rows:
+            key = (table, row["timestamp"], row["buoy_id"])
+            if key in self.rows and on_conflict != "nothing":
+                raise AssertionError("duplicate key")
+            self.rows.setdefault(key, row)
+        return True
+
+
+def make_row(i):
+    return {
+        "timestamp": f"2025-12-30 {i // 60 % 24:02d}:{i % 60:02d}:00",
+        "buoy_id": 46225 + i // 1440,
+        "wave_height": "6.5",
+        "swell_direction": "WNW",
+        "tide": 0.5
+    }
+
+
+class TestSpoolAppend:
+    """Test durable appends to the spool."""
+
+    def test_append_writes_one_line_per_row(self, tmp_path):
+        spool = Spool("swell-scraper-hourly", spool_dir=str(tmp_path))
+        spool.append("ingested.swell_data", make_row(0))
+        spool.append("ingested.swell_data", make_row(1))
+
+        records, skipped = spool.read_records(spool.path)
+
+        assert skipped == 0
+        assert [r["data"] for r in records] == [make_row(0), make_row(1)]
+        assert records[0]["table"] == "ingested.swell_data"
+
+    def test_append_fsyncs(self, tmp_path, mocker):
+        fsync = mocker.spy(os, "fsync")
+        spool = Spool("swell-scraper-hourly", spool_dir=str(tmp_path))
+        spool.append("ingested.swell_data", make_row(0))
+
+        assert fsync.call_count >= 1
+
+    def test_has_pending(self, tmp_path):
+        spool = Spool("swell-scraper-hourly", spool_dir=str(tmp_path))
+        assert not spool.has_pending()
+
+        spool.append("ingested.swell_data", make_row(0))
+        assert spool.has_pending()
+
+
+class TestSpoolCrashSafety:
+    """Test that spooled rows survive crashes at every stage."""
+
+    def test_torn_trailing_line_is_skipped(self, tmp_path, mock_logger):
+        spool = Spool("swell-scraper-hourly", spool_dir=str(tmp_path))
+        spool.append("ingested.swell_data", make_row(0))
+        with open(spool.path, "a") as f:
+            f.write('{"table": "ingested.swell_data", "data": {"timest')
+
+        db = FakeDatabase()
+        assert spool.replay(db, mock_logger) == 1
+        mock_logger.log_json.assert_any_call(
+            "WARNING",
+            "Skipped torn records in spool",
+            {"job_name": "swell-scraper-hourly", "skipped": 1}
+        )
+
+    def test_append_after_torn_line_is_not_lost(self, tmp_path, mock_logger):
+        spool = Spool("swell-scraper-hourly", spool_dir=str(tmp_path))
+        with open(spool.path, "w") as f:
+            f.write('{"table": "ingested.swell_data", "da')
+        spool.append("ingested.swell_data", make_row(1))
+
+        db = FakeDatabase()
+        assert spool.replay(db, mock_logger) == 1
+        assert list(db.rows.values()) == [make_row(1)]
+
+    def test_failed_replay_keeps_rows(self, tmp_path, mock_logger):
+        spool = Spool("swell-scraper-hourly", spool_dir=str(tmp_path))
+        spool.append("ingested.swell_data", make_row(0))
+
+        assert spool.replay(FakeDatabase(fail=True), mock_logger) == 0
+        assert len(spool.pending_files()) == 1
+
+        db = FakeDatabase()
+        assert spool.replay(db, mock_logger) == 1
+        assert spool.pending_files() == []
+        assert not spool.has_pending()
+
+    def test_crash_after_commit_replays_idempotently(self, tmp_path, mock_logger, mocker):
+        spool = Spool("swell-scraper-hourly", spool_dir=str(tmp_path))
+        for i in range(3):
+            spool.append("ingested.swell_data", make_row(i))
+
+        db = FakeDatabase()
+        # Simulate the process dying after the commit but before sealed files are removed
+        mocker.patch("utils.spool.os.remove", side_effect=SystemExit)
+        with pytest.raises(SystemExit):
+            spool.replay(db, mock_logger)
+        mocker.stopall()
+
+        assert len(spool.pending_files()) == 1
+        assert spool.replay(db, mock_logger) == 3
+        assert len(db.rows) == 3
+
+    def test_rows_spooled_after_seal_are_replayed_later(self, tmp_path, mock_logger):
+        spool = Spool("swell-scraper-hourly", spool_dir=str(tmp_path))
+        spool.append("ingested.swell_data", make_row(0))
+        spool.seal()
+        spool.append("ingested.swell_data", make_row(1))
+
+        db = FakeDatabase()
+        assert spool.replay(db, mock_logger) == 2
+        assert db.calls == 1
+
+    def test_shards_replay_only_their_own_files(self, tmp_path, mock_logger):
+        first = Spool("swell-scraper-hourly", spool_dir=str(tmp_path), writer_id="shard-0-of-2")
+        second = Spool("swell-scraper-hourly", spool_dir=str(tmp_path), writer_id="shard-1-of-2")
+        first.append("ingested.swell_data", make_row(0))
+        second.append("ingested.swell_data", make_row(1))
+        second.seal()
+
+        assert first.replay(FakeDatabase(), mock_logger) == 1
+        assert len(second.pending_files()) == 1
+        assert Spool("swell-scraper-hourly", spool_dir=str(tmp_path)).replay(FakeDatabase(), mock_logger) == 1
+
+    def test_transforms_upgrade_old_rows(self, tmp_path, mock_logger):
+        """Test that rows spooled in an older format are converted before loading."""
+        spool = Spool("swell-scraper-hourly", spool_dir=str(tmp_path))
+        spool.append("ingested.swell_data", make_row(0))
+
+        db = FakeDatabase()
+        upgrade = lambda row: {**row, "swell_direction": 293}
+        assert spool.replay(db, mock_logger, transforms={"ingested.swell_data": upgrade}) == 1
+        assert list(db.rows.values()) == [{**make_row(0), "swell_direction": 293}]
+
+    def test_rejected_rows_go_to_dead_letter_file(self, tmp_path, mock_logger):
+        """Test that a row the database rejects no longer blocks the rows spooled around it."""
+        spool = Spool("swell-scraper-hourly", spool_dir=str(tmp_path))
+        for i in (0, 1440, 1, 2):  # Row 1440 belongs to buoy 46226, which was deleted
+            spool.append("ingested.swell_data", make_row(i))
+
+        db = FakeDatabase(reject={46226})
+        assert spool.replay(db, mock_logger) == 3
+        assert spool.pending_files() == []
+        assert sorted(row["buoy_id"] for row in db.rows.values()) == [46225, 46225, 46225]
+
+        dead_files = list(tmp_path.glob("swell-scraper-hourly.*.dead"))
+        assert len(dead_files) == 1
+        records, _ = spool.read_records(str(dead_files[0]))
+        assert records == [{"table": "ingested.swell_data", "data": make_row(1440)}]
+        mock_logger.log_json.assert_any_call("WARNING", "Moved rejected spooled rows to dead-letter file", {
+            "job_name": "swell-scraper-hourly", "rows": 1, "path": str(dead_files[0])
+        })
+
+    def test_unreachable_database_dead_letters_nothing(self, tmp_path, mock_logger):
+        spool = Spool("swell-scraper-hourly", spool_dir=str(tmp_path))
+        for i in range(4):
+            spool.append("ingested.swell_data", make_row(i))
+
+        db = FakeDatabase(fail=True)
+        assert spool.replay(db, mock_logger) == 0
+        assert db.calls == 1
+        assert len(spool.pending_files()) == 1
+        assert list(tmp_path.glob("*.dead")) == []
+
+    def test_nothing_to_replay(self, tmp_path, mock_logger):
+        spool = Spool("swell-scraper-hourly", spool_dir=str(tmp_path))
+        db = FakeDatabase()
+
+        assert spool.replay(db, mock_logger) == 0
+        assert db.calls == 0
+
+
+class TestSpoolReplayBatching:
+    """Test that a large spool is loaded as one bulk insert."""
+
+    def test_large_spool_is_one_insert(self, tmp_path, mock_logger):
+        spool = Spool("swell-scraper-hourly", spool_dir=str(tmp_path))
+        row_count = 20000
+        with open(spool.path, "w") as f:
+            for i in range(row_count):
+                f.write(json.dumps({"table": "ingested.swell_data", "data": make_row(i)}) + "\n")
+
+        db = FakeDatabase()
+        assert spool.replay(db, mock_logger) == row_count
+        assert db.calls == 1
+        assert len(db.rows) == row_count
@@ -0,0 +1,107 @@
+"""
+Unit tests for the per-station circuit breaker (utils/station_health.py)
+"""
+import pytest
+from datetime import datetime, timedelta
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.station_health import StationHealth
+
+NOW = datetime(2025, 12, 30, 1, 0, 0)
+
+
+@pytest.fixture
+def health(tmp_path):
+    return StationHealth("swell-scraper-hourly", path=str(tmp_path / "health.json"), failure_threshold=3)
+
+
+class TestCircuitBreaker:
+    """Test tripping, backoff and recovery."""
+
+    def test_station_fetched_below_threshold(self, health):
+        health.record_failure("46225", "http_404", now=NOW)
+        health.record_failure("46225", "http_404", now=NOW)
+
+        assert not health.is_tripped("46225")
+        assert health.should_fetch("46225", now=NOW)
+
+    def test_station_skipped_once_tripped(self, health):
+        for _ in range(3):
+            health.record_failure("46225", "no_wave_summary", now=NOW)
+
+        assert health.is_tripped("46225")
+        assert not health.should_fetch("46225", now=NOW)
+        assert health.should_fetch("46225", now=NOW + timedelta(hours=1))
+
+    def test_backoff_doubles_and_is_capped(self, tmp_path):
+        health = StationHealth("swell-scraper-hourly", path=str(tmp_path / "health.json"),
+                               failure_threshold=1, base_backoff_hours=1, max_backoff_hours=4)
+        probes = []
+        for _ in range(5):
+            health.record_failure("46225", "http_404", now=NOW)
+            probes.append(health.stations["46225"]["next_probe_at"])
+
+        assert probes == [
+            "2025-12-30 02:00:00",
+            "2025-12-30 03:00:00",
+            "2025-12-30 05:00:00",
+            "2025-12-30 05:00:00",
+            "2025-12-30 05:00:00"
+        ]
+
+    def test_success_closes_breaker(self, health):
+        for _ in range(4):
+            health.record_failure("46225", "http_404", now=NOW)
+        health.record_success("46225", now=NOW)
+
+        assert not health.is_tripped("46225")
+        assert health.stations["46225"]["last_success"] == "2025-12-30 01:00:00"
+        assert health.stations["46225"]["next_probe_at"] is None
+
+    def test_unknown_station_is_fetched(self, health):
+        assert health.should_fetch("99999", now=NOW)
+
+
+class TestPersistenceAndReport:
+    """Test that health state persists and is reported."""
+
+    def test_state_round_trips(self, tmp_path):
+        path = str(tmp_path / "health.json")
+        health = StationHealth("swell-scraper-hourly", path=path)
+        for _ in range(3):
+            health.record_failure(46225, "http_404", now=NOW)
+        health.save()
+
+        reloaded = StationHealth("swell-scraper-hourly", path=path)
+        assert reloaded.is_tripped(46225)
+        assert not reloaded.should_fetch(46225, now=NOW)
+
+    def test_corrupt_state_file_starts_fresh(self, tmp_path):
+        path = tmp_path / "health.json"
+        path.write_text("{not json")
+
+        health = StationHealth("swell-scraper-hourly", path=str(path))
+        assert health.stations == {}
+
+    def test_tripped_report(self, health, mock_logger):
+        for _ in range(3):
+            health.record_failure("46225", "no_wave_summary", now=NOW)
+        health.record_failure("46266", "http_500", now=NOW)
+
+        health.log_report(mock_logger)
+
+        tripped = health.tripped()
+        assert [station["station_id"] for station in tripped] == ["46225"]
+        assert tripped[0]["last_error_class"] == "no_wave_summary"
+        mock_logger.log_json.assert_called_once_with(
+            "WARNING",
+            "Stations currently tripped",
+            {"job_name": "swell-scraper-hourly", "stations": tripped}
+        )
+
+    def test_no_report_when_nothing_tripped(self, health, mock_logger):
+        health.log_report(mock_logger)
+        mock_logger.log_json.assert_not_called()
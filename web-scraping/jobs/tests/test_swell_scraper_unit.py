@@ -2,6 +2,7 @@
 Unit tests for swell_scraper_hourly.py
 """
 import pytest
+import requests
 from unittest.mock import MagicMock, patch, Mock
 from datetime import datetime
 import pandas as pd
@@ -11,7 +12,9 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from swell_scraper_hourly import extract_number, fetch_swell_data, insert_swell_data, get_buoy_ids
+from swell_scraper_hourly import (extract_number, fetch_swell_data, fetch_swell_page, insert_swell_data, get_buoy_ids,
+                                  validate_swell_data)
+from utils.validation import SWELL_RULES, Validator
 
 
 class TestExtractNumber:
@@ -100,7 +103,48 @@ class TestFetchSwellData:
             "Detailed wave summary table not found for buoy ID 41013",
             {"buoy_id": "41013"}
         )
-    
+
+    @patch('swell_scraper_hourly.requests.get')
+    def test_fetch_failure_recorded_in_health(self, mock_get, mock_logger):
+        """Test that a failed fetch is recorded with its error class."""
+        mock_response = Mock()
+        mock_response.status_code = 404
+        mock_get.return_value = mock_response
+        mock_health = MagicMock()
+
+        result = fetch_swell_data("99999", mock_logger, mock_health)
+
+        assert result is None
+        mock_health.record_failure.assert_called_once_with("99999", "http_404")
+
+    @patch('swell_scraper_hourly.requests.get')
+    def test_fetch_timeout_recorded_in_health(self, mock_get, mock_logger):
+        """Test that a request exceeding its deadline-derived timeout is handled as a failed fetch."""
+        mock_get.side_effect = requests.exceptions.Timeout("Read timed out")
+        mock_health = MagicMock()
+
+        result = fetch_swell_page("46225", mock_logger, mock_health, timeout=3.5)
+
+        assert result is None
+        assert mock_get.call_args[1]["timeout"] == 3.5
+        mock_health.record_failure.assert_called_once_with("46225", "timeout")
+
+    @patch('swell_scraper_hourly.requests.get')
+    def test_successful_fetch_recorded_in_health(self, mock_get, mock_logger, sample_swell_html):
+        """Test that a successful fetch closes the station's breaker."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.text = sample_swell_html
+        mock_get.return_value = mock_response
+        mock_health = MagicMock()
+
+        result = fetch_swell_data("46225", mock_logger, mock_health)
+
+        assert result is not None
+        assert result['swell_direction'] == 'WNW'
+        mock_health.record_success.assert_called_once_with("46225")
+
+
 class TestInsertSwellData:
     """Test the insert_swell_data function."""
     
@@ -128,6 +172,8 @@ class TestInsertSwellData:
             insert_swell_data(swell_data, mock_logger)
         
         mock_db_connection.insert.assert_called_once()
+        data = mock_db_connection.insert.call_args[0][1]
+        assert (data['swell_direction'], data['wind_wave_direction'], data['wave_steepness']) == (293, 315, 2)
         mock_logger.log_json.assert_called_with(
             "INFO",
             "Swell data inserted successfully",
@@ -163,6 +209,41 @@ class TestInsertSwellData:
             {"buoy_id": '41013', "data": swell_data}
         )
 
+    def test_failed_insert_is_spooled(self, mock_logger, mock_db_connection):
+        """Test that a failed insertion is written to the spool for replay."""
+        mock_db_connection.insert.return_value = False
+        mock_spool = MagicMock()
+
+        swell_data = {
+            'timestamp': '2025-12-30 01:50:00',
+            'buoy_id': '41013',
+            'wave_height': '6.5',
+            'swell_height': '5.2',
+            'swell_period': '14',
+            'swell_direction': 'WNW',
+            'wind_wave_height': '2.3',
+            'wind_wave_period': '6',
+            'wind_wave_direction': 'NW',
+            'wave_steepness': 'AVERAGE',
+            'average_wave_period': '8.5',
+            'tide': None
+        }
+
+        with patch('swell_scraper_hourly.PostgresConnection') as mock_conn:
+            mock_conn.return_value.__enter__.return_value = mock_db_connection
+            insert_swell_data(swell_data, mock_logger, mock_spool)
+
+        # The spooled row is already in the stored form
+        mock_spool.append.assert_called_once_with(
+            "ingested.swell_data",
+            {**swell_data, 'swell_direction': 293, 'wind_wave_direction': 315, 'wave_steepness': 2}
+        )
+        mock_logger.log_json.assert_called_with(
+            "INFO",
+            "Swell data spooled for replay",
+            {"buoy_id": '41013'}
+        )
+
 
 class TestGetBuoyIds:
     """Test the get_buoy_ids function."""
@@ -191,3 +272,24 @@ class TestGetBuoyIds:
             "WARNING",
             "No buoy IDs found in the database"
         )
+
+
+class TestValidateSwellData:
+    """Test the validation stage before insert."""
+
+    def test_quarantined_readings_not_inserted(self, mock_logger, mock_db_connection):
+        """Test that only accepted and flagged readings are returned for insertion."""
+        mock_db_connection.execute_query.return_value = []
+        mock_db_connection.insert_many.return_value = True
+        good = {"timestamp": "2025-12-30 01:50:00", "buoy_id": 46225, "wave_height": "5.9", "swell_height": "5.2", "tide": -0.3}
+        sentinel = {**good, "buoy_id": 46266, "tide": 999.0}
+        bad = {**good, "buoy_id": 46254, "wave_height": "180"}
+
+        with patch('swell_scraper_hourly.PostgresConnection') as mock_conn:
+            mock_conn.return_value.__enter__.return_value = mock_db_connection
+            readings = validate_swell_data([good, sentinel, bad], Validator(SWELL_RULES), mock_logger)
+
+        assert [reading["buoy_id"] for reading in readings] == [46225, 46266]
+        assert readings[1]["tide"] is None
+        rows = mock_db_connection.insert_many.call_args[0][1]
+        assert [(row["station_id"], row["status"]) for row in rows] == [(46266, "flagged"), (46254, "quarantined")]
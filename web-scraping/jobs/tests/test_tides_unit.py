@@ -0,0 +1,277 @@
+"""
+Unit tests for harmonic tide prediction (utils/tides.py) and the tide predictions job
+"""
+import pytest
+import json
+import math
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.tides import (CONSTITUENTS, J2000, TidePredictor, astronomical_arguments, constituent_speed,
+                         constituents_from_harcon, nodal_corrections)
+from swell_scraper_hourly import fill_predicted_tides, insert_swell_data
+from tide_predictions import DELETE_STALE_CONSTITUENTS_QUERY, import_harcon, write_predictions
+
+HARCON_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "tide_harcon.json")
+
+# NOAA CO-OPS published constituent speeds, degrees per hour
+PUBLISHED_SPEEDS = {
+    "M2": 28.9841042, "S2": 30.0, "N2": 28.4397295, "K1": 15.0410686, "M4": 57.9682084, "O1": 13.9430356,
+    "M6": 86.9523127, "MK3": 44.0251729, "S4": 60.0, "MN4": 57.4238337, "NU2": 28.5125831, "S6": 90.0,
+    "MU2": 27.9682084, "2N2": 27.8953548, "OO1": 16.1391017, "LAM2": 29.4556253, "J1": 15.5854433,
+    "MM": 0.5443747, "SSA": 0.0821373, "SA": 0.0410686, "MSF": 1.0158958, "MF": 1.0980331, "RHO1": 13.4715145,
+    "Q1": 13.3986609, "T2": 29.9589333, "R2": 30.0410667, "2Q1": 12.8542862, "P1": 14.9589314,
+    "2SM2": 31.0158958, "M3": 43.4761563, "L2": 29.5284789, "2MK3": 42.9271398, "K2": 30.0821373,
+    "M8": 115.9364166, "MS4": 58.9841042
+}
+
+
+@pytest.fixture
+def harcon():
+    with open(HARCON_PATH) as harcon_file:
+        return json.load(harcon_file)
+
+
+@pytest.fixture
+def predictor(harcon):
+    return TidePredictor({"46225": constituents_from_harcon(harcon) + [("Z0", 2.8, 0.0, 0.0)]})
+
+
+def reference_height(constituents, timestamp):
+    """Scalar textbook evaluation of one height, independent of the vectorized code path."""
+    days = (pd.Timestamp(timestamp, tz="UTC") - J2000).total_seconds() / 86400
+    century = days / 36525
+    hour_angle = 360 * (days - math.floor(days))
+    s = 218.3164477 + 481267.88123421 * century
+    h = 280.46646 + 36000.76983 * century
+    p = 83.3532465 + 4069.0137287 * century
+    p1 = 282.93735 + 1.71946 * century
+    node = math.radians(125.04452 - 1934.136261 * century)
+    nodal = {name: (float(f), float(u)) for name, (f, u) in nodal_corrections(np.array(math.degrees(node))).items()}
+
+    height = 0.0
+    for name, amplitude, phase, _ in constituents:
+        if name == "Z0":
+            height += amplitude
+            continue
+        (a, b, c, d, e), offset, group = CONSTITUENTS[name]
+        f, u = nodal[group] if group else (1.0, 0.0)
+        argument = a * hour_angle + b * s + c * h + d * p + e * p1 + offset + u
+        height += f * amplitude * math.cos(math.radians(argument - phase))
+    return height
+
+
+class TestAstronomy:
+    """Test astronomical arguments, speeds and nodal factors against published values."""
+
+    def test_mean_longitudes_match_meeus(self):
+        """Test Meeus, Astronomical Algorithms example 47.a (1992-04-12 0h): L' = 134.290182, D = 113.842304, M' = 5.150833, F = 219.889721."""
+        _, s, h, p, _, node = astronomical_arguments(["1992-04-12 00:00"])
+
+        assert s[0] == pytest.approx(134.290182, abs=1e-3)
+        assert h[0] == pytest.approx(134.290182 - 113.842304, abs=1e-3)
+        assert p[0] == pytest.approx(134.290182 - 5.150833, abs=1e-3)
+        assert node[0] == pytest.approx(134.290182 - 219.889721 + 360, abs=1e-3)
+
+    def test_moon_and_sun_align_at_new_moon(self):
+        """Test the new moon of the 2024-04-08 total solar eclipse (18:21 UTC); mean longitudes differ from true ones by a few degrees."""
+        _, s, h, _, _, _ = astronomical_arguments(["2024-04-08 18:21"])
+
+        assert abs((s[0] - h[0] + 180) % 360 - 180) < 5
+
+    def test_hour_angle_of_mean_sun(self):
+        hour_angle, *_ = astronomical_arguments(["2026-01-15 00:00", "2026-01-15 06:00", "2026-01-15 12:00"])
+
+        assert hour_angle.tolist() == pytest.approx([180, 270, 0], abs=1e-6)
+
+    def test_speeds_match_noaa(self):
+        assert set(PUBLISHED_SPEEDS) == set(CONSTITUENTS)
+        for name, speed in PUBLISHED_SPEEDS.items():
+            assert constituent_speed(name) == pytest.approx(speed, abs=1e-6), name
+
+    def test_nodal_factor_extremes(self):
+        """Test Schureman's extremes of f over the 18.6-year nodal cycle (N = 0 and N = 180 degrees)."""
+        groups = nodal_corrections(np.array([0.0, 180.0]))
+
+        assert groups["M2"][0] == pytest.approx([0.963, 1.038], abs=1e-3)
+        assert groups["K1"][0] == pytest.approx([1.113, 0.882], abs=1e-3)
+        assert groups["O1"][0] == pytest.approx([1.183, 0.806], abs=1e-3)
+        assert groups["K2"][0] == pytest.approx([1.317, 0.748], abs=1e-3)
+        assert np.abs(groups["M2"][1]).max() < 1e-9  # u vanishes at the extremes
+
+
+class TestTidePredictor:
+    """Test vectorized predictions against the fixture constituents."""
+
+    def test_matches_scalar_reference(self, harcon, predictor):
+        constituents = [row for row in constituents_from_harcon(harcon) if row[0] != "M1"] + [("Z0", 2.8, 0.0, 0.0)]
+        rng = np.random.default_rng(0)
+        offsets = rng.uniform(0, 20 * 365.25 * 86400, 200)
+        times = [datetime(2015, 1, 1) + pd.Timedelta(seconds=float(offset)) for offset in offsets]
+
+        heights = predictor.predict(["46225"], times)[0]
+
+        expected = [reference_height(constituents, timestamp) for timestamp in times]
+        np.testing.assert_allclose(heights, expected, atol=1e-6)
+
+    def test_unsupported_constituents_are_skipped(self, harcon):
+        rows = constituents_from_harcon(harcon) + [("K1", 0.1, 0.0, 14.0)]
+
+        predictor = TidePredictor({"46225": rows})
+
+        assert predictor.skipped == {"46225": ["M1", "K1"]}
+        assert "K1" in predictor.names
+
+    def test_pure_m2_tide(self):
+        predictor = TidePredictor({"1": [("M2", 1.0, 0.0, None), ("Z0", 3.0, 0.0, 0.0)]})
+
+        _, times, heights = predictor.curves("2026-01-15", days=2, step_minutes=1)
+
+        curve = heights[0]
+        highs = np.flatnonzero((curve[1:-1] > curve[:-2]) & (curve[1:-1] >= curve[2:])) + 1
+        assert np.diff(times[highs]).astype("timedelta64[s]").astype(float) / 3600 == pytest.approx(12.42, abs=0.02)
+        f = nodal_corrections(astronomical_arguments(["2026-01-15"])[-1])["M2"][0][0]
+        assert curve.max() == pytest.approx(3.0 + f, abs=1e-4)
+
+    def test_spring_tides_follow_new_moon(self):
+        """Test that M2 and S2 with equal phase lags reinforce at the 2024-04-08 new moon and oppose at the first quarter."""
+        predictor = TidePredictor({"1": [("M2", 1.0, 0.0, None), ("S2", 0.5, 0.0, None)]})
+
+        _, _, spring = predictor.curves("2024-04-08", days=1, step_minutes=6)
+        _, _, neap = predictor.curves("2024-04-15", days=1, step_minutes=6)
+
+        assert np.ptp(spring) == pytest.approx(2 * 1.5, rel=0.05)
+        assert np.ptp(neap) == pytest.approx(2 * 0.5, rel=0.1)
+
+    def test_predict_at_pairs(self, predictor):
+        times = ["2026-01-15 10:00:00", "2026-01-15 10:20:00", "2026-01-16 00:00:00+00:00"]
+
+        heights = predictor.predict_at(["46225", 46225, "46221"], times)
+
+        np.testing.assert_allclose(heights[:2], predictor.predict(["46225"], times[:2])[0])
+        assert np.isnan(heights[2])
+
+    def test_naive_and_aware_timestamps_agree(self, predictor):
+        naive, aware = predictor.predict(["46225"], ["2026-01-15 10:00:00", datetime(2026, 1, 15, 10, tzinfo=timezone.utc)])[0]
+
+        assert naive == aware
+
+    def test_load(self):
+        db = MagicMock()
+        db.execute_query.return_value = [(46225, "M2", 1.65, 147.0, 28.984104), (46225, "Z0", 2.8, 0.0, 0.0)]
+
+        predictor = TidePredictor.load(db)
+
+        assert 46225 in predictor and "46225" in predictor
+        assert predictor.datum.tolist() == [2.8]
+
+    def test_load_failure(self):
+        db = MagicMock()
+        db.execute_query.return_value = None
+
+        assert TidePredictor.load(db) is None
+
+
+class TestTideFill:
+    """Test filling missing tides in swell readings."""
+
+    def test_only_missing_tides_of_known_buoys_are_filled(self, predictor):
+        records = [
+            {"buoy_id": "46225", "timestamp": "2026-01-15 10:20:03", "tide": None},
+            {"buoy_id": "46225", "timestamp": "2026-01-15 10:20:03", "tide": 1.5},
+            {"buoy_id": "46221", "timestamp": "2026-01-15 10:20:03", "tide": None}
+        ]
+
+        assert fill_predicted_tides(records, predictor) == ["46225"]
+
+        expected = predictor.predict(["46225"], ["2026-01-15 10:20:03"])[0, 0]
+        assert records[0]["tide"] == round(expected, 2) and records[0]["tide_predicted"] is True
+        assert records[1]["tide"] == 1.5 and records[1]["tide_predicted"] is False
+        assert records[2]["tide"] is None and records[2]["tide_predicted"] is False
+
+    def test_predicted_flag_is_stored(self, mock_logger, mock_db_connection):
+        mock_db_connection.insert.return_value = True
+        swell_data = {"timestamp": "2026-01-15 10:20:03", "buoy_id": "46225", "wave_height": "5.9", "swell_height": None,
+                      "swell_period": None, "swell_direction": None, "wind_wave_height": None, "wind_wave_period": None,
+                      "wind_wave_direction": None, "wave_steepness": None, "average_wave_period": None, "tide": 2.41,
+                      "tide_predicted": True}
+
+        with patch('swell_scraper_hourly.PostgresConnection') as mock_conn:
+            mock_conn.return_value.__enter__.return_value = mock_db_connection
+            insert_swell_data(swell_data, mock_logger)
+
+        assert mock_db_connection.insert.call_args[0][1]["tide_predicted"] is True
+
+
+class TestTidePredictionsJob:
+    """Test writing tide curves and importing constituents."""
+
+    def test_write_predictions(self, predictor, mock_db_connection, mock_logger):
+        mock_db_connection.insert_many.return_value = True
+        start = datetime(2026, 1, 15, tzinfo=timezone.utc)
+
+        written = write_predictions(mock_db_connection, predictor, mock_logger, start=start, days=2, step_minutes=6)
+
+        assert written == 480
+        (table, rows), kwargs = mock_db_connection.insert_many.call_args
+        assert table == "ingested.tide_predictions"
+        assert kwargs == {"on_conflict": "update", "conflict_columns": ["buoy_id", "prediction_time"]}
+        assert rows[0]["prediction_time"] == "2026-01-15 00:00:00+0000" and rows[-1]["prediction_time"] == "2026-01-16 23:54:00+0000"
+        assert rows[0]["tide"] == pytest.approx(predictor.predict(["46225"], [start])[0, 0], abs=1e-3)
+        mock_db_connection.execute_query.assert_called_once()
+        assert mock_db_connection.execute_query.call_args[0][1] == (datetime(2026, 1, 14, tzinfo=timezone.utc),)
+
+    def test_failed_write_keeps_old_predictions(self, predictor, mock_db_connection, mock_logger):
+        mock_db_connection.insert_many.return_value = False
+
+        assert write_predictions(mock_db_connection, predictor, mock_logger, days=1) == 0
+        mock_db_connection.execute_query.assert_not_called()
+
+    def test_import_harcon(self, harcon, mock_db_connection, mock_logger):
+        mock_db_connection.insert_many.return_value = True
+
+        assert import_harcon(mock_db_connection, 46225, harcon, mock_logger)
+
+        (table, rows), _ = mock_db_connection.insert_many.call_args
+        assert table == "reference.tide_constituents"
+        assert len(rows) == 14 and "M1" not in {row["constituent"] for row in rows}
+        assert rows[0] == {"buoy_id": 46225, "constituent": "M2", "amplitude": 1.65, "phase": 147.0, "speed": 28.984104}
+        query, (buoy_id, kept) = mock_db_connection.execute_query.call_args[0]
+        assert query == DELETE_STALE_CONSTITUENTS_QUERY and buoy_id == 46225 and len(kept) == 14
+
+    def test_import_without_usable_constituents(self, mock_db_connection, mock_logger):
+        assert not import_harcon(mock_db_connection, 46225, {"HarmonicConstituents": []}, mock_logger)
+        mock_db_connection.insert_many.assert_not_called()
+
+
+@pytest.mark.slow
+class TestTideBenchmark:
+    """Throughput of curve and per-reading predictions."""
+
+    def test_throughput(self, harcon):
+        constituents = constituents_from_harcon(harcon)
+        predictor = TidePredictor({str(46000 + i): constituents for i in range(500)})
+
+        started = time.perf_counter()
+        station_ids, times, heights = predictor.curves("2026-01-15", days=7, step_minutes=6)
+        curve_seconds = time.perf_counter() - started
+
+        rng = np.random.default_rng(0)
+        pair_times = pd.Timestamp("2026-01-15", tz="UTC") + pd.to_timedelta(rng.uniform(0, 7 * 86400, 100_000), unit="s")
+        pair_ids = rng.choice(predictor.station_ids, 100_000)
+        started = time.perf_counter()
+        predictor.predict_at(pair_ids, pair_times)
+        pair_seconds = time.perf_counter() - started
+
+        print(f"\n7-day 6-minute curves for {len(station_ids)} stations: {heights.size:,} heights in {curve_seconds * 1000:.0f} ms "
+              f"({heights.size / curve_seconds:,.0f}/s)")
+        print(f"100,000 (station, time) pairs in {pair_seconds * 1000:.0f} ms ({100_000 / pair_seconds:,.0f}/s)")
+        assert heights.shape == (500, 1680)
+        assert curve_seconds < 5 and pair_seconds < 5
@@ -0,0 +1,244 @@
+"""
+Unit tests and benchmark for batch data-quality validation (utils/validation.py)
+"""
+import pytest
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.validation import SWELL_RULES, WIND_RULES, Validator
+
+
+def swell_reading(buoy_id=46225, **overrides):
+    reading = {
+        "timestamp": "2025-12-30 01:50:00",
+        "buoy_id": buoy_id,
+        "wave_height": "5.9",
+        "swell_height": "5.2",
+        "swell_period": "14",
+        "swell_direction": "WNW",
+        "wind_wave_height": "2.3",
+        "wind_wave_period": "6",
+        "wind_wave_direction": "NW",
+        "wave_steepness": "AVERAGE",
+        "average_wave_period": "8.5",
+        "tide": -0.3
+    }
+    reading.update(overrides)
+    return reading
+
+
+def wind_reading(spot_id=1, **overrides):
+    reading = {"timestamp": "2025-12-30 01:00:00", "spot_id": spot_id, "wind_speed": 5.5, "wind_direction": 270, "wind_gust": 8.2}
+    reading.update(overrides)
+    return reading
+
+
+class TestSwellValidation:
+    """Test the swell rule set."""
+
+    def test_clean_readings_accepted(self):
+        result = Validator(SWELL_RULES).validate([swell_reading(), swell_reading(46266)])
+
+        assert len(result.accepted) == 2
+        assert result.flagged == [] and result.quarantined == []
+        assert result.counts == {}
+
+    def test_out_of_range_quarantined(self):
+        result = Validator(SWELL_RULES).validate([swell_reading(wave_height="180"), swell_reading(46266)])
+
+        assert [rules for _, rules in result.quarantined] == [["range:wave_height"]]
+        assert result.quarantined[0][0]["buoy_id"] == 46225
+        assert len(result.accepted) == 1
+
+    def test_sentinel_nulled_and_flagged(self):
+        result = Validator(SWELL_RULES).validate([swell_reading(swell_period="99", tide=999.0)])
+
+        record, rules = result.flagged[0]
+        assert rules == ["sentinel"]
+        assert record["swell_period"] is None and record["tide"] is None
+        assert record["swell_height"] == "5.2"
+
+    def test_unparseable_value_nulled_and_flagged(self):
+        result = Validator(SWELL_RULES).validate([swell_reading(wind_wave_period="MM")])
+
+        record, rules = result.flagged[0]
+        assert rules == ["not_numeric"]
+        assert record["wind_wave_period"] is None
+
+    def test_spike_against_last_stored_value_flagged(self):
+        validator = Validator(SWELL_RULES)
+        validator.set_last_values({46225: {"wave_height": 4.0, "swell_height": 3.5, "tide": 1.2}})
+
+        result = validator.validate([swell_reading(wave_height="19.7"), swell_reading(46266, wave_height="19.7")])
+
+        assert [rules for _, rules in result.flagged] == [["spike:wave_height"]]
+        assert [record["buoy_id"] for record in result.accepted] == [46266]
+
+    def test_missing_measurements_quarantined(self):
+        result = Validator(SWELL_RULES).validate([
+            swell_reading(wave_height=None, swell_height=None, swell_period=None, tide=None)
+        ])
+
+        assert result.quarantined[0][1] == ["missing_all"]
+
+    def test_missing_required_field_quarantined(self):
+        result = Validator(SWELL_RULES).validate([swell_reading(timestamp=None)])
+
+        assert result.quarantined[0][1] == ["missing:timestamp"]
+
+    def test_counts_per_rule(self):
+        result = Validator(SWELL_RULES).validate([
+            swell_reading(wave_height="180"),
+            swell_reading(46266, wave_height="180", tide=99),
+            swell_reading(46254, swell_period="99")
+        ])
+
+        assert result.counts == {"sentinel": 2, "range:wave_height": 2}
+        assert len(result.quarantined) == 2 and len(result.flagged) == 1
+
+    def test_load_last_values(self, mock_db_connection):
+        mock_db_connection.execute_query.return_value = [(46225, 4.0, 3.5, 1.2)]
+        validator = Validator(SWELL_RULES)
+
+        assert validator.load_last_values(mock_db_connection)
+        assert "DISTINCT ON (buoy_id)" in mock_db_connection.execute_query.call_args[0][0]
+        assert validator.validate([swell_reading(tide=8.0)]).flagged[0][1] == ["spike:tide"]
+
+    def test_load_last_values_failure(self, mock_db_connection):
+        mock_db_connection.execute_query.return_value = None
+
+        assert not Validator(SWELL_RULES).load_last_values(mock_db_connection)
+
+
+class TestWindValidation:
+    """Test the wind rule set."""
+
+    def test_unit_mix_up_quarantined(self):
+        result = Validator(WIND_RULES).validate([wind_reading(wind_speed=88.0, wind_gust=120.0)])
+
+        assert result.quarantined[0][1] == ["range:wind_speed", "range:wind_gust"]
+
+    def test_gust_below_speed_flagged(self):
+        result = Validator(WIND_RULES).validate([wind_reading(wind_gust=3.0), wind_reading(2, wind_gust=None)])
+
+        assert result.flagged[0][1] == ["gust_below_speed"]
+        assert [record["spot_id"] for record in result.accepted] == [2]
+
+    def test_missing_speed_quarantined(self):
+        result = Validator(WIND_RULES).validate([wind_reading(wind_speed=None, wind_gust=None)])
+
+        assert result.quarantined[0][1] == ["missing:wind_speed"]
+
+    @patch('wind_scraper_hourly.PostgresConnection')
+    def test_readings_validated_at_their_fetch_time(self, mock_pg_conn, mock_logger):
+        """Test that data quality rows share the (spot_id, timestamp) key the readings are inserted with."""
+        from wind_scraper_hourly import validate_wind_data
+
+        mock_pg_conn.return_value.__enter__.return_value.execute_query.return_value = []
+        validator = Validator(WIND_RULES)
+        readings = [(1, {"wind_speed": 88.0, "wind_direction": 270, "wind_gust": 120.0}),
+                    (2, {"wind_speed": 5.5, "wind_direction": 270, "wind_gust": 7.0})]
+        fetched_at = {1: "2025-12-30 01:00:04", 2: "2025-12-30 01:00:09"}
+
+        with patch.object(validator, 'record_issues') as record_issues:
+            assert validate_wind_data(readings, fetched_at, validator, mock_logger) == [readings[1]]
+
+        result = record_issues.call_args[0][1]
+        assert result.quarantined[0][0]["timestamp"] == "2025-12-30 01:00:04"
+        assert result.accepted[0]["timestamp"] == "2025-12-30 01:00:09"
+
+
+class TestRecordIssues:
+    """Test the data quality side table."""
+
+    def test_quality_rows(self):
+        validator = Validator(SWELL_RULES)
+        result = validator.validate([swell_reading(wave_height="180"), swell_reading(46266, swell_period="99")])
+
+        rows = validator.quality_rows(result)
+
+        assert [(row["station_id"], row["status"], row["rules"]) for row in rows] == [
+            (46266, "flagged", ["sentinel"]),
+            (46225, "quarantined", ["range:wave_height"])
+        ]
+        assert rows[1]["source_table"] == "ingested.swell_data"
+        assert json.loads(rows[1]["record"])["wave_height"] == "180"
+
+    def test_rows_upserted(self, mock_db_connection, mock_logger):
+        validator = Validator(SWELL_RULES)
+        result = validator.validate([swell_reading(wave_height="180")])
+
+        assert validator.record_issues(mock_db_connection, result, mock_logger)
+        table, rows = mock_db_connection.insert_many.call_args[0]
+        assert table == "ingested.data_quality"
+        assert mock_db_connection.insert_many.call_args.kwargs == {
+            "on_conflict": "update", "conflict_columns": ["source_table", "station_id", "timestamp"]
+        }
+
+    def test_failed_write_spooled(self, mock_db_connection, mock_logger):
+        mock_db_connection.insert_many.return_value = False
+        mock_spool = MagicMock()
+        validator = Validator(SWELL_RULES)
+        result = validator.validate([swell_reading(wave_height="180")])
+
+        assert not validator.record_issues(mock_db_connection, result, mock_logger, mock_spool)
+        assert mock_spool.append.call_args[0][0] == "ingested.data_quality"
+
+    def test_summary_logged(self, mock_logger):
+        validator = Validator(SWELL_RULES)
+        result = validator.validate([swell_reading(wave_height="180"), swell_reading(46266)])
+
+        validator.log_summary(result, mock_logger)
+
+        mock_logger.log_json.assert_any_call("INFO", "Validated readings", {
+            "table": "ingested.swell_data",
+            "accepted": 1,
+            "flagged": 0,
+            "quarantined": 1,
+            "rules": {"range:wave_height": 1}
+        })
+
+
+def synthetic_batch(count):
+    readings = [swell_reading(46000 + i, wave_height=str(3 + (i % 50) / 10)) for i in range(count)]
+    for i in range(0, count, 97):
+        readings[i]["tide"] = 999.0
+    for i in range(0, count, 101):
+        readings[i]["wave_height"] = "250"
+    return readings
+
+
+class TestValidationCost:
+    """Validation must stay negligible next to fetching and inserting."""
+
+    def test_thousands_of_readings_validate_quickly(self):
+        validator = Validator(SWELL_RULES)
+        validator.set_last_values({46000 + i: {"wave_height": 3.0, "swell_height": 5.0, "tide": 0.0} for i in range(5000)})
+        readings = synthetic_batch(5000)
+
+        start = time.perf_counter()
+        result = validator.validate(readings)
+        elapsed = time.perf_counter() - start
+
+        assert len(result.accepted) + len(result.flagged) + len(result.quarantined) == 5000
+        assert result.counts["range:wave_height"] == 50
+        assert elapsed < 1.0
+
+
+@pytest.mark.slow
+class TestValidationBenchmark:
+    """Validation throughput on synthetic batches."""
+
+    def test_validation_throughput(self):
+        validator = Validator(SWELL_RULES)
+        for count in (1_000, 10_000, 100_000):
+            readings = synthetic_batch(count)
+            start = time.perf_counter()
+            validator.validate(readings)
+            elapsed = time.perf_counter() - start
+            print(f"\n{count:>7,} readings: {elapsed * 1000:,.1f} ms ({count / elapsed:,.0f} readings/s)")
@@ -3,13 +3,34 @@ Unit tests for wind_scraper_hourly.py
 """
 import pytest
 from unittest.mock import MagicMock, patch, Mock
+from datetime import datetime, timezone
+import json
 import requests
 
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from wind_scraper_hourly import fetch_wind_data, get_spot_info, insert_wind_data
+from wind_scraper_hourly import (
+    fetch_wind_data, get_spot_info, insert_wind_data,
+    fetch_wind_forecast, group_spots_by_cell, flatten_forecast, forecast_issue_time,
+    insert_wind_forecast, ingest_forecasts, fetch_wind_batched, split_group_response
+)
+from utils.deadline import RunDeadline
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name)) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def forecast_payload():
+    """Recorded OpenWeather /data/2.5/forecast response (trimmed to four entries)."""
+    with open(os.path.join(FIXTURES_DIR, 'openweather_forecast.json')) as f:
+        return json.load(f)
 
 
 class TestFetchWindData:
@@ -59,13 +80,13 @@ class TestFetchWindData:
         """Test handling of HTTP errors."""
         mock_get.side_effect = requests.exceptions.HTTPError("404 Not Found")
         
-        result = fetch_wind_data(37.7749, -122.4194, mock_logger)
+        result = fetch_wind_data(37.7749, -122.4194, mock_logger, spot_id=7)
         
         assert result is None
         mock_logger.log_json.assert_called_with(
             "ERROR",
             "Error fetching wind data",
-            {"error": "404 Not Found", "latitude": 37.7749, "longitude": -122.4194}
+            {"error": "404 Not Found", "latitude": 37.7749, "longitude": -122.4194, "spot_id": 7}
         )
     
     @patch('wind_scraper_hourly.requests.get')
@@ -73,13 +94,13 @@ class TestFetchWindData:
         """Test handling of connection errors."""
         mock_get.side_effect = requests.exceptions.ConnectionError("Connection refused")
         
-        result = fetch_wind_data(37.7749, -122.4194, mock_logger)
+        result = fetch_wind_data(37.7749, -122.4194, mock_logger, spot_id=7)
         
         assert result is None
         mock_logger.log_json.assert_called_with(
             "ERROR",
             "Error fetching wind data",
-            {"error": "Connection refused", "latitude": 37.7749, "longitude": -122.4194}
+            {"error": "Connection refused", "latitude": 37.7749, "longitude": -122.4194, "spot_id": 7}
         )
     
     @patch('wind_scraper_hourly.requests.get')
@@ -87,13 +108,13 @@ class TestFetchWindData:
         """Test handling of timeout errors."""
         mock_get.side_effect = requests.exceptions.Timeout("Request timed out")
         
-        result = fetch_wind_data(37.7749, -122.4194, mock_logger)
+        result = fetch_wind_data(37.7749, -122.4194, mock_logger, spot_id=7)
         
         assert result is None
         mock_logger.log_json.assert_called_with(
             "ERROR",
             "Error fetching wind data",
-            {"error": "Request timed out", "latitude": 37.7749, "longitude": -122.4194}
+            {"error": "Request timed out", "latitude": 37.7749, "longitude": -122.4194, "spot_id": 7}
         )
     
     @patch('wind_scraper_hourly.requests.get')
@@ -104,13 +125,13 @@ class TestFetchWindData:
         mock_response.json.return_value = {"main": {"temp": 285.5}}
         mock_get.return_value = mock_response
         
-        result = fetch_wind_data(37.7749, -122.4194, mock_logger)
+        result = fetch_wind_data(37.7749, -122.4194, mock_logger, spot_id=7)
         
         assert result is None
         mock_logger.log_json.assert_called_with(
             "ERROR",
             "Missing key in API response",
-            {"error": "'wind'", "latitude": 37.7749, "longitude": -122.4194}
+            {"error": "'wind'", "latitude": 37.7749, "longitude": -122.4194, "spot_id": 7}
         )
     
     @patch('wind_scraper_hourly.requests.get')
@@ -125,13 +146,13 @@ class TestFetchWindData:
         }
         mock_get.return_value = mock_response
         
-        result = fetch_wind_data(37.7749, -122.4194, mock_logger)
+        result = fetch_wind_data(37.7749, -122.4194, mock_logger, spot_id=7)
         
         assert result is None
         mock_logger.log_json.assert_called_with(
             "ERROR",
             "Missing key in API response",
-            {"error": "'speed'", "latitude": 37.7749, "longitude": -122.4194}
+            {"error": "'speed'", "latitude": 37.7749, "longitude": -122.4194, "spot_id": 7}
         )
     
     @patch('wind_scraper_hourly.requests.get')
@@ -275,3 +296,281 @@ class TestInsertWindData:
                 "wind_gust": 8.2
             }}
         )
+
+    @patch('wind_scraper_hourly.datetime')
+    def test_failed_insert_is_spooled(self, mock_datetime, mock_logger, mock_db_connection):
+        """Test that a failed insertion is written to the spool for replay."""
+        mock_datetime.now.return_value.strftime.return_value = "2025-12-30 01:50:00"
+        mock_db_connection.insert.return_value = False
+        mock_spool = MagicMock()
+
+        wind_data = {
+            'wind_speed': 5.5,
+            'wind_direction': 270,
+            'wind_gust': 8.2
+        }
+
+        with patch('wind_scraper_hourly.PostgresConnection') as mock_conn:
+            mock_conn.return_value.__enter__.return_value = mock_db_connection
+            insert_wind_data(1, wind_data, mock_logger, mock_spool)
+
+        mock_spool.append.assert_called_once_with("ingested.wind_data", {
+            "spot_id": 1,
+            "timestamp": "2025-12-30 01:50:00",
+            "wind_speed": 5.5,
+            "wind_direction": 270,
+            "wind_gust": 8.2
+        })
+
+
+class TestFetchWindForecast:
+    """Test the fetch_wind_forecast function."""
+
+    @patch('wind_scraper_hourly.requests.get')
+    def test_successful_fetch(self, mock_get, mock_logger, forecast_payload):
+        """Test that the forecast payload is returned as-is."""
+        mock_get.return_value.json.return_value = forecast_payload
+
+        result = fetch_wind_forecast(32.7157, -117.1611, mock_logger)
+
+        assert result == forecast_payload
+        assert '/data/2.5/forecast?lat=32.7157&lon=-117.1611' in mock_get.call_args[0][0]
+
+    @patch('wind_scraper_hourly.requests.get')
+    def test_fetch_http_error(self, mock_get, mock_logger):
+        """Test handling of HTTP errors."""
+        mock_get.side_effect = requests.exceptions.HTTPError("429 Too Many Requests")
+
+        assert fetch_wind_forecast(32.7157, -117.1611, mock_logger, spot_ids=[1, 2]) is None
+        mock_logger.log_json.assert_called_with(
+            "ERROR",
+            "Error fetching wind forecast",
+            {"error": "429 Too Many Requests", "latitude": 32.7157, "longitude": -117.1611, "spot_ids": [1, 2]}
+        )
+
+    @patch('wind_scraper_hourly.requests.get')
+    def test_fetch_missing_list(self, mock_get, mock_logger):
+        """Test that a response without a forecast list is rejected."""
+        mock_get.return_value.json.return_value = {"cod": "401", "message": "Invalid API key"}
+
+        assert fetch_wind_forecast(32.7157, -117.1611, mock_logger) is None
+        assert mock_logger.log_json.call_args[0][1] == "Invalid forecast response"
+
+
+class TestFlattenForecast:
+    """Test flattening forecast payloads into rows."""
+
+    def test_rows_per_spot_and_time(self, forecast_payload):
+        """Test one row per spot and forecast time, skipping entries without wind."""
+        rows = flatten_forecast([1, 2], forecast_payload, "2025-12-31 02:00:00+0000")
+
+        assert len(rows) == 6
+        assert rows[0] == {
+            "spot_id": 1,
+            "forecast_time": "2025-12-31 03:00:00+0000",
+            "issued_at": "2025-12-31 02:00:00+0000",
+            "wind_speed": 3.62,
+            "wind_direction": 292,
+            "wind_gust": 5.11
+        }
+        assert rows[2]["wind_gust"] is None
+        assert "2025-12-31 09:00:00+0000" not in {row["forecast_time"] for row in rows}
+
+    def test_issue_time_truncated_to_hour(self):
+        """Test that reruns within an hour share the same issue time."""
+        assert forecast_issue_time(datetime(2025, 12, 31, 2, 47, 13, tzinfo=timezone.utc)) == "2025-12-31 02:00:00+0000"
+
+    def test_nearby_spots_share_a_cell(self):
+        """Test that spots within a grid cell share one request at their mean position."""
+        spots = [(1, 32.71, -117.25), (2, 32.73, -117.27), (3, 33.60, -117.90)]
+
+        cells = group_spots_by_cell(spots, cell_degrees=0.1)
+
+        assert cells == [([1, 2], 32.72, -117.26), ([3], 33.6, -117.9)]
+        assert len(group_spots_by_cell(spots, cell_degrees=0)) == 3
+
+
+class TestInsertWindForecast:
+    """Test the batched, idempotent forecast write."""
+
+    def test_upsert_keyed_by_spot_time_issue(self, mock_logger, mock_db_connection, forecast_payload):
+        """Test that rows are written in one batch replacing existing keys."""
+        rows = flatten_forecast([1], forecast_payload, "2025-12-31 02:00:00+0000")
+        mock_db_connection.insert_many.return_value = True
+
+        with patch('wind_scraper_hourly.PostgresConnection') as mock_conn:
+            mock_conn.return_value.__enter__.return_value = mock_db_connection
+            insert_wind_forecast(rows, mock_logger)
+
+        mock_db_connection.insert_many.assert_called_once_with(
+            "ingested.wind_forecast", rows, on_conflict="update",
+            conflict_columns=["spot_id", "forecast_time", "issued_at"]
+        )
+        mock_logger.log_json.assert_called_with("INFO", "Wind forecast inserted successfully", {"rows": 3})
+
+    def test_failed_write_is_spooled(self, mock_logger, mock_db_connection, forecast_payload):
+        """Test that rows are spooled when the batch fails."""
+        rows = flatten_forecast([1], forecast_payload, "2025-12-31 02:00:00+0000")
+        mock_db_connection.insert_many.return_value = False
+        mock_spool = MagicMock()
+
+        with patch('wind_scraper_hourly.PostgresConnection') as mock_conn:
+            mock_conn.return_value.__enter__.return_value = mock_db_connection
+            insert_wind_forecast(rows, mock_logger, mock_spool)
+
+        assert [c[0] for c in mock_spool.append.call_args_list] == [("ingested.wind_forecast", row) for row in rows]
+
+    @patch('wind_scraper_hourly.insert_wind_forecast')
+    @patch('wind_scraper_hourly.requests.get')
+    def test_one_request_per_cell(self, mock_get, mock_insert, mock_logger, forecast_payload):
+        """Test that a cell of nearby spots costs a single forecast request."""
+        mock_get.return_value.json.return_value = forecast_payload
+        spots = [(1, 32.71, -117.25), (2, 32.73, -117.27), (3, 33.60, -117.90)]
+
+        ingest_forecasts(spots, mock_logger)
+
+        assert mock_get.call_count == 2
+        rows = mock_insert.call_args[0][0]
+        assert sorted({row["spot_id"] for row in rows}) == [1, 2, 3]
+        assert len(rows) == 9
+
+    @patch('wind_scraper_hourly.insert_wind_forecast')
+    @patch('wind_scraper_hourly.requests.get')
+    def test_cells_skipped_at_deadline(self, mock_get, mock_insert, mock_logger, forecast_payload):
+        """Test that cells left when the run deadline is reached are skipped and reported."""
+        mock_get.return_value.json.return_value = forecast_payload
+        spots = [(1, 32.71, -117.25), (2, 32.73, -117.27), (3, 33.60, -117.90)]
+        now = [0.0]
+        deadline = RunDeadline(300, reserve_seconds=60, max_timeout=30, clock=lambda: now[0])
+
+        def advance(url, timeout=None):
+            now[0] += 239  # The first request uses up the fetch budget
+            return mock_get.return_value
+        mock_get.side_effect = advance
+
+        late_spot_ids = ingest_forecasts(spots, mock_logger, deadline=deadline)
+
+        assert mock_get.call_count == 1
+        assert mock_get.call_args[1]["timeout"] == 30
+        assert late_spot_ids == [3]
+        assert {row["spot_id"] for row in mock_insert.call_args[0][0]} == {1, 2}
+
+
+class FakeOpenWeather:
+    """Serves recorded /weather and /group responses and records the requested URLs."""
+
+    def __init__(self, locations=None):
+        self.weather = load_fixture('openweather_weather.json')
+        self.group = {entry["id"]: entry for entry in load_fixture('openweather_group.json')["list"]}
+        self.locations = locations or {}  # (lat, lon) -> city ID reported by /weather
+        self.urls = []
+
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        response = Mock()
+        if "/group?" in url:
+            ids = [int(value) for value in url.split("id=")[1].split("&")[0].split(",")]
+            entries = [self.group.get(location_id, {**self.weather, "id": location_id}) for location_id in ids]
+            payload = {"cnt": len(entries), "list": entries}
+        else:
+            query = dict(part.split("=") for part in url.split("?")[1].split("&"))
+            location_id = self.locations.get((float(query["lat"]), float(query["lon"])), self.weather["id"])
+            payload = {**self.weather, "id": location_id}
+        response.json.return_value = payload
+        response.content = json.dumps(payload).encode()
+        return response
+
+
+class TestBatchedWind:
+    """Test grouped /group requests for current wind (recorded OpenWeather JSON)."""
+
+    SPOTS = [(1, 32.8473, -117.2713), (2, 32.8501, -117.2720), (3, 32.9595, -117.2653), (4, 32.5839, -117.1136)]
+    LOCATIONS = {(32.8473, -117.2713): 5363943, (32.8501, -117.2720): 5363943,
+                 (32.9595, -117.2653): 5342485, (32.5839, -117.1136): 5358736}
+
+    @pytest.fixture
+    def api(self):
+        api = FakeOpenWeather(self.LOCATIONS)
+        with patch('wind_scraper_hourly.requests.get', side_effect=api.get):
+            yield api
+
+    def test_split_group_response(self):
+        readings, missing = split_group_response(load_fixture('openweather_group.json'))
+
+        assert readings == {
+            5363943: {"wind_speed": 4.12, "wind_direction": 280, "wind_gust": 6.2},
+            5342485: {"wind_speed": 3.6, "wind_direction": 270, "wind_gust": None}
+        }
+        assert missing == [5358736]
+
+    def test_first_run_maps_each_spot(self, api, tmp_path, mock_logger):
+        cache_path = str(tmp_path / "locations.json")
+
+        readings, fetched_at, late = fetch_wind_batched(self.SPOTS, mock_logger, RunDeadline(600), cache_path=cache_path)
+
+        assert len(api.urls) == 4 and all("/weather?" in url for url in api.urls)
+        assert [spot_id for spot_id, _ in readings] == [1, 2, 3, 4]
+        assert set(fetched_at) == {1, 2, 3, 4} and late == []
+        with open(cache_path) as f:
+            assert json.load(f)["2"] == {"location_id": 5363943, "latitude": 32.8501, "longitude": -117.272}
+
+    def test_cached_spots_share_one_group_request(self, api, tmp_path, mock_logger):
+        cache_path = str(tmp_path / "locations.json")
+        fetch_wind_batched(self.SPOTS, mock_logger, RunDeadline(600), cache_path=cache_path)
+        api.urls.clear()
+
+        readings, _, _ = fetch_wind_batched(self.SPOTS, mock_logger, RunDeadline(600), cache_path=cache_path)
+
+        assert len(api.urls) == 1
+        assert "/group?id=5363943,5342485,5358736&" in api.urls[0]
+        assert dict(readings) == {
+            1: {"wind_speed": 4.12, "wind_direction": 280, "wind_gust": 6.2},
+            2: {"wind_speed": 4.12, "wind_direction": 280, "wind_gust": 6.2},
+            3: {"wind_speed": 3.6, "wind_direction": 270, "wind_gust": None}
+        }
+        mock_logger.log_json.assert_any_call("WARNING", "Missing wind data for locations", {"location_ids": [5358736]})
+        mock_logger.log_json.assert_any_call("WARNING", "Failed to retrieve or insert wind data", {"spot_id": 4})
+
+    def test_failed_group_request_names_its_spots(self, api, tmp_path, mock_logger):
+        cache_path = str(tmp_path / "locations.json")
+        fetch_wind_batched(self.SPOTS, mock_logger, RunDeadline(600), cache_path=cache_path)
+
+        with patch('wind_scraper_hourly.requests.get', side_effect=requests.exceptions.ConnectionError("Connection refused")):
+            readings, _, _ = fetch_wind_batched(self.SPOTS, mock_logger, RunDeadline(600), cache_path=cache_path)
+
+        assert readings == []
+        mock_logger.log_json.assert_any_call("ERROR", "Error fetching grouped wind data", {
+            "error": "Connection refused", "location_ids": [5363943, 5342485, 5358736], "spot_ids": [1, 2, 3, 4]
+        })
+
+    def test_requests_hold_at_most_20_locations(self, tmp_path, mock_logger):
+        spots = [(spot_id, 30 + spot_id / 100, -117.0) for spot_id in range(45)]
+        api = FakeOpenWeather({(lat, lon): 6000000 + spot_id for spot_id, lat, lon in spots})
+        cache_path = str(tmp_path / "locations.json")
+        with patch('wind_scraper_hourly.requests.get', side_effect=api.get):
+            fetch_wind_batched(spots, mock_logger, RunDeadline(600), cache_path=cache_path)
+            api.urls.clear()
+            readings, _, _ = fetch_wind_batched(spots, mock_logger, RunDeadline(600), cache_path=cache_path)
+
+        assert [url.split("id=")[1].split("&")[0].count(",") + 1 for url in api.urls] == [20, 20, 5]
+        assert len(readings) == 45
+
+    def test_moved_and_cityless_spots_use_single_requests(self, api, tmp_path, mock_logger):
+        cache_path = str(tmp_path / "locations.json")
+        api.locations[(32.5839, -117.1136)] = 0  # OpenWeather reports no city offshore
+        fetch_wind_batched(self.SPOTS, mock_logger, RunDeadline(600), cache_path=cache_path)
+        api.urls.clear()
+        moved = [*self.SPOTS[:2], (3, 32.9600, -117.2653), self.SPOTS[3]]
+
+        fetch_wind_batched(moved, mock_logger, RunDeadline(600), cache_path=cache_path)
+
+        assert len(api.urls) == 3
+        assert "/group?id=5363943&" in api.urls[0]
+        assert "lat=32.96&" in api.urls[1] and "lat=32.5839&" in api.urls[2]
+
+    def test_deadline_skips_remaining_spots(self, api, tmp_path, mock_logger):
+        readings, _, late = fetch_wind_batched(self.SPOTS, mock_logger, RunDeadline(0),
+                                               cache_path=str(tmp_path / "locations.json"))
+
+        assert readings == [] and late == [1, 2, 3, 4]
+        assert api.urls == []
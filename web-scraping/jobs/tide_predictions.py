@@ -0,0 +1,134 @@
+# Standard Library Imports
+import argparse
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+# Local Application Imports
+from utils import Logger, PostgresConnection
+from utils.tides import TidePredictor, constituents_from_harcon
+
+# Accessing environment variables for DB connection info
+DB_HOST = os.getenv("DB_HOST")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_NAME = os.getenv("DB_NAME")
+
+# Each run predicts TIDE_DAYS_AHEAD days from midnight UTC, one height every TIDE_STEP_MINUTES
+TIDE_DAYS_AHEAD = float(os.getenv("TIDE_DAYS_AHEAD", "7"))
+TIDE_STEP_MINUTES = int(os.getenv("TIDE_STEP_MINUTES", "6"))
+
+DELETE_OLD_PREDICTIONS_QUERY = "DELETE FROM ingested.tide_predictions WHERE prediction_time < %s"
+
+# Constituents of a buoy that a new import no longer lists (Z0 is not part of harcon.json and is kept)
+DELETE_STALE_CONSTITUENTS_QUERY = """
+DELETE FROM reference.tide_constituents
+WHERE buoy_id = %s AND constituent <> 'Z0' AND NOT (constituent = ANY(%s))
+"""
+
+def prediction_rows(station_ids, times, heights):
+    """
+    Flatten predicted curves into rows for ingested.tide_predictions.
+
+    Args:
+        station_ids (list): The buoys, one per row of heights.
+        times (DatetimeIndex): The prediction times, one per column of heights.
+        heights (numpy.ndarray): Heights of shape (stations, times).
+
+    Returns:
+        list: One row per buoy and prediction time.
+    """
+    time_strings = times.strftime("%Y-%m-%d %H:%M:%S%z")
+    return [
+        {"buoy_id": int(station_id), "prediction_time": prediction_time, "tide": round(float(height), 3)}
+        for station_id, curve in zip(station_ids, heights)
+        for prediction_time, height in zip(time_strings, curve)
+    ]
+
+def write_predictions(db_connection, predictor, logger, start=None, days=TIDE_DAYS_AHEAD, step_minutes=TIDE_STEP_MINUTES):
+    """
+    Predict every buoy's tide curve for the days ahead and upsert it, then drop predictions older than a day.
+
+    Args:
+        db_connection (PostgresConnection): An open database connection.
+        predictor (TidePredictor): Predictor over the buoys with constituents.
+        logger (Logger): The logger instance to log messages.
+        start (datetime, optional): First prediction time, defaults to today's midnight UTC.
+        days (float, optional): Days to predict.
+        step_minutes (int, optional): Minutes between predictions.
+
+    Returns:
+        int: The number of rows written (0 if the write failed).
+    """
+    start = start or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if not predictor.station_ids:
+        logger.log_json("WARNING", "No buoys with tide constituents to predict")
+        return 0
+
+    station_ids, times, heights = predictor.curves(start, days, step_minutes)
+    rows = prediction_rows(station_ids, times, heights)
+    if not db_connection.insert_many("ingested.tide_predictions", rows, on_conflict="update",
+                                     conflict_columns=["buoy_id", "prediction_time"]):
+        logger.log_json("ERROR", "Failed to write tide predictions", {"rows": len(rows)})
+        return 0
+
+    db_connection.execute_query(DELETE_OLD_PREDICTIONS_QUERY, (start - timedelta(days=1),))
+    db_connection.notify_changes("ingested.tide_predictions", rows, "buoy_id", "prediction_time")
+    logger.log_json("INFO", "Tide predictions written", {
+        "buoys": len(station_ids),
+        "rows": len(rows),
+        "from": times[0].strftime("%Y-%m-%d %H:%M:%S%z"),
+        "to": times[-1].strftime("%Y-%m-%d %H:%M:%S%z")
+    })
+    return len(rows)
+
+def import_harcon(db_connection, buoy_id, payload, logger):
+    """
+    Replace a buoy's constituents with those of a NOAA CO-OPS harmonic constituents response.
+
+    harcon.json has no Z0 (mean sea level above MLLW); a Z0 row already stored for the buoy is kept.
+
+    Args:
+        db_connection (PostgresConnection): An open database connection.
+        buoy_id (int): The buoy the constituents apply to.
+        payload (dict): The decoded harcon.json (requested with units=english).
+        logger (Logger): The logger instance to log messages.
+
+    Returns:
+        bool: True if the constituents were replaced.
+    """
+    constituents = constituents_from_harcon(payload)
+    skipped = TidePredictor({buoy_id: constituents}).skipped.get(buoy_id, [])
+    rows = [{"buoy_id": buoy_id, "constituent": name, "amplitude": amplitude, "phase": phase, "speed": speed}
+            for name, amplitude, phase, speed in constituents if name not in skipped]
+    if not rows:
+        logger.log_json("ERROR", "No usable tide constituents in harcon file", {"buoy_id": buoy_id, "skipped": skipped})
+        return False
+
+    if not db_connection.insert_many("reference.tide_constituents", rows, on_conflict="update",
+                                     conflict_columns=["buoy_id", "constituent"]):
+        logger.log_json("ERROR", "Failed to import tide constituents", {"buoy_id": buoy_id})
+        return False
+    db_connection.execute_query(DELETE_STALE_CONSTITUENTS_QUERY, (buoy_id, [row["constituent"] for row in rows]))
+
+    logger.log_json("INFO", "Imported tide constituents", {"buoy_id": buoy_id, "constituents": len(rows), "skipped": skipped})
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Predict tide curves from harmonic constituents.")
+    parser.add_argument("--import-harcon", nargs=2, metavar=("BUOY_ID", "FILE"),
+                        help="Load a buoy's constituents from a NOAA CO-OPS harcon.json file instead of predicting")
+    args = parser.parse_args()
+
+    with Logger(job_name="tide-predictions") as logger:
+        with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+            if args.import_harcon:
+                buoy_id, path = args.import_harcon
+                with open(path) as harcon_file:
+                    import_harcon(db_connection, int(buoy_id), json.load(harcon_file), logger)
+            else:
+                predictor = TidePredictor.load(db_connection)
+                if predictor is None:
+                    logger.log_json("ERROR", "Could not load tide constituents")
+                else:
+                    write_predictions(db_connection, predictor, logger)
@@ -1,2 +1,15 @@
 from .logger import Logger
 from .postgres_connection import PostgresConnection
+from .spool import Spool
+from .station_health import StationHealth
+from .cadence import CadenceScheduler
+from .sharding import add_shard_arguments, check_shard_arguments, filter_shard, shard_label
+from .parse_pool import ParsePool
+from .log_index import LogIndex
+from .validation import SWELL_RULES, WIND_RULES, Validator
+from .redis_publisher import RedisPublisher
+from .change_listener import ChangeListener
+from .deadline import RunDeadline
+from .reader import SurfDataReader
+from .quota import QuotaLedger
+from .reference_snapshot import ReferenceSnapshot
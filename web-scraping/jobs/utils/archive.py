@@ -0,0 +1,189 @@
+# Standard Library Imports
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+# Local Application Imports
+from .minio_client import create_s3_client
+from .sharding import shard_label
+
+# Raw responses are only archived when ARCHIVE_RESPONSES is set
+ARCHIVE_RESPONSES = os.getenv("ARCHIVE_RESPONSES", "").lower() in ("1", "true", "yes")
+ARCHIVE_BUCKET = os.getenv("ARCHIVE_BUCKET", "raw-responses")
+
+OBJECT_PREFIX = "objects"
+INDEX_PREFIX = "index"
+
+def body_key(digest):
+    """The S3 key of a compressed body, fanned out by the first two hex digits of its hash."""
+    return f"{OBJECT_PREFIX}/{digest[:2]}/{digest}.gz"
+
+class ResponseArchive:
+    """
+    Content-addressed archive of raw response bodies in MinIO.
+
+    Each body is stored once, gzip-compressed, under the SHA-256 of its content, so pages
+    that did not change between runs cost nothing after the first upload. Every run writes
+    an index `index/<job>/<MM-DD-YYYY>/<HH-MM>[-shard-i-of-n].json` listing what it fetched:
+    the response kind, the body hash, the fetch time and the station it belongs to. That is
+    everything reprocess_archive.py needs to run the bodies through the current parsers
+    again. Archiving is best effort: a failed upload is logged and never fails the scrape.
+    """
+
+    def __init__(self, job_name, shard_index=0, shard_count=1, s3_client=None, bucket=ARCHIVE_BUCKET, now=None):
+        """
+        Initializes the ResponseArchive object.
+
+        Args:
+            job_name (str): The job name, used as the index prefix.
+            shard_index (int, optional): The shard of the run.
+            shard_count (int, optional): The total number of shards.
+            s3_client (optional): S3 client to upload with, defaults to a new MinIO client.
+            bucket (str, optional): The archive bucket.
+            now (datetime, optional): The run's start time.
+        """
+        self.job_name = job_name
+        self.s3_client = s3_client or create_s3_client()
+        self.bucket = bucket
+        self.started_at = now or datetime.now()
+        label = shard_label(shard_index, shard_count)
+        time_str = self.started_at.strftime("%H-%M") + (f"-{label}" if label else "")
+        self.index_key = f"{INDEX_PREFIX}/{job_name}/{self.started_at.strftime('%m-%d-%Y')}/{time_str}.json"
+
+        self.entries = []
+        self.stored = set()  # Hashes known to be in the bucket
+        self.uploaded_bytes = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, job_name, shard_index=0, shard_count=1):
+        """Return an archive for the run if ARCHIVE_RESPONSES is set, otherwise None."""
+        return cls(job_name, shard_index, shard_count) if ARCHIVE_RESPONSES else None
+
+    def add(self, kind, body, meta, logger):
+        """
+        Archive a response body and record it in the run's index. Safe to call from fetch threads.
+
+        Args:
+            kind (str): The response kind, which selects the parser on reprocessing.
+            body (bytes or str): The raw response body.
+            meta (dict): JSON-serializable details the parser needs (station, fetch time).
+            logger (Logger): The logger instance to log messages.
+
+        Returns:
+            str or None: The body's SHA-256, or None if it could not be archived.
+        """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+
+        with self.lock:
+            known = digest in self.stored
+        if not known and not self._exists(digest):
+            compressed = gzip.compress(body, mtime=0)
+            try:
+                self.s3_client.put_object(Body=compressed, Bucket=self.bucket, Key=body_key(digest),
+                                          ContentType="application/gzip")
+            except Exception as e:
+                logger.log_json("WARNING", "Failed to archive raw response", {"kind": kind, "error": str(e), **meta})
+                return None
+            with self.lock:
+                self.uploaded_bytes += len(compressed)
+
+        with self.lock:
+            self.stored.add(digest)
+            self.entries.append({"kind": kind, "sha256": digest, "bytes": len(body), **meta})
+        return digest
+
+    def _exists(self, digest):
+        """Check whether a body is already in the bucket (a failed check uploads it again)."""
+        try:
+            self.s3_client.head_object(Bucket=self.bucket, Key=body_key(digest))
+            return True
+        except Exception:
+            return False
+
+    def save_index(self, logger):
+        """
+        Write the run's index next to the archived bodies.
+
+        Returns:
+            bool: True if the index was written (or the run archived nothing).
+        """
+        if not self.entries:
+            return True
+
+        index = {
+            "job_name": self.job_name,
+            "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "entries": self.entries
+        }
+        try:
+            self.s3_client.put_object(Body=json.dumps(index).encode("utf-8"), Bucket=self.bucket,
+                                      Key=self.index_key, ContentType="application/json")
+        except Exception as e:
+            logger.log_json("WARNING", "Failed to write raw response index", {"key": self.index_key, "error": str(e)})
+            return False
+
+        logger.log_json("INFO", "Archived raw responses", {
+            "responses": len(self.entries),
+            "unique_bodies": len({entry["sha256"] for entry in self.entries}),
+            "uploaded_bytes": self.uploaded_bytes
+        })
+        return True
+
+class ArchiveReader:
+    """Read run indexes and archived bodies back from the archive bucket."""
+
+    def __init__(self, s3_client=None, bucket=ARCHIVE_BUCKET):
+        """
+        Initializes the ArchiveReader object.
+
+        Args:
+            s3_client (optional): An S3 client, defaults to one for the cluster's MinIO.
+            bucket (str, optional): The archive bucket.
+        """
+        self.s3_client = s3_client or create_s3_client()
+        self.bucket = bucket
+
+    def index_keys(self, job_name, days, now=None):
+        """List the index keys of a job's runs over the last N days, oldest day first."""
+        now = now or datetime.now()
+        keys = []
+        for offset in range(days - 1, -1, -1):
+            prefix = f"{INDEX_PREFIX}/{job_name}/{(now - timedelta(days=offset)).strftime('%m-%d-%Y')}/"
+            keys.extend(sorted(self._list_keys(prefix)))
+        return keys
+
+    def _list_keys(self, prefix):
+        """List every object key under a prefix, following continuation tokens."""
+        kwargs = {"Bucket": self.bucket, "Prefix": prefix}
+        while True:
+            response = self.s3_client.list_objects_v2(**kwargs)
+            for obj in response.get("Contents", []):
+                yield obj["Key"]
+            if not response.get("IsTruncated"):
+                return
+            kwargs["ContinuationToken"] = response["NextContinuationToken"]
+
+    def entries(self, job_name, days, now=None):
+        """Yield the index entries of a job's runs over the last N days, one run at a time."""
+        for key in self.index_keys(job_name, days, now):
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
+            yield from json.loads(response["Body"].read())["entries"]
+
+    def body(self, digest):
+        """
+        Fetch and decompress an archived body.
+
+        Raises:
+            ValueError: If the stored content does not match its hash.
+        """
+        response = self.s3_client.get_object(Bucket=self.bucket, Key=body_key(digest))
+        body = gzip.decompress(response["Body"].read())
+        if hashlib.sha256(body).hexdigest() != digest:
+            raise ValueError(f"Archived body {digest} is corrupt")
+        return body
@@ -0,0 +1,151 @@
+# Standard Library Imports
+from datetime import datetime
+
+# Learns, per station, the typical spacing between *changed* readings. Stored timestamps are
+# fetch times, so consecutive rows with identical values mean the station had not updated yet.
+CADENCE_QUERY = """
+WITH ordered AS (
+    SELECT buoy_id,
+           timestamp,
+           ROW(wave_height, swell_height, swell_period, swell_direction, wind_wave_height,
+               wind_wave_period, wind_wave_direction, wave_steepness, average_wave_period)::text AS reading
+    FROM ingested.swell_data
+    WHERE timestamp > NOW() - make_interval(days => %s)
+),
+changes AS (
+    SELECT buoy_id,
+           timestamp,
+           EXTRACT(EPOCH FROM timestamp - LAG(timestamp) OVER w) AS gap
+    FROM (
+        SELECT buoy_id, timestamp, reading IS DISTINCT FROM LAG(reading) OVER w AS changed
+        FROM ordered
+        WINDOW w AS (PARTITION BY buoy_id ORDER BY timestamp)
+    ) flagged
+    WHERE changed
+    WINDOW w AS (PARTITION BY buoy_id ORDER BY timestamp)
+),
+fetches AS (
+    SELECT buoy_id, MAX(timestamp) AS last_fetch
+    FROM ordered
+    GROUP BY buoy_id
+)
+SELECT c.buoy_id,
+       PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY c.gap) AS median_gap,
+       COUNT(c.gap) AS samples,
+       EXTRACT(EPOCH FROM NOW() - MAX(c.timestamp)) AS since_change,
+       EXTRACT(EPOCH FROM NOW() - f.last_fetch) AS since_fetch
+FROM changes c
+JOIN fetches f USING (buoy_id)
+GROUP BY c.buoy_id, f.last_fetch
+"""
+
+class CadenceScheduler:
+    """
+    Decides which stations are worth fetching on a run, based on each station's observed update cadence.
+
+    The job runs on a short cron; a station is only fetched once a new observation is
+    likely (its last change plus its typical update interval has passed), and retried
+    at most every half interval while the expected update has not shown up yet.
+    """
+
+    def __init__(self, default_interval_minutes=60, min_interval_minutes=20, max_interval_minutes=180,
+                 min_samples=3, lookback_days=7):
+        """
+        Initializes the CadenceScheduler object.
+
+        Args:
+            default_interval_minutes (float, optional): Interval used for stations without enough history.
+            min_interval_minutes (float, optional): Lower bound for learned intervals (the cron period).
+            max_interval_minutes (float, optional): Upper bound for learned intervals, so every station
+                is still fetched at least this often.
+            min_samples (int, optional): Number of observed updates needed before trusting a learned interval.
+            lookback_days (int, optional): How much history to learn from.
+        """
+        self.default_interval = default_interval_minutes * 60
+        self.min_interval = min_interval_minutes * 60
+        self.max_interval = max_interval_minutes * 60
+        self.min_samples = min_samples
+        self.lookback_days = lookback_days
+        self.cadences = {}
+        self.learned = False
+
+    def learn(self, db_connection):
+        """
+        Learn every station's update interval from the readings already in ingested.swell_data.
+
+        Args:
+            db_connection (PostgresConnection): An open database connection.
+
+        Returns:
+            bool: True if the cadence history could be loaded.
+        """
+        rows = db_connection.execute_query(CADENCE_QUERY, (self.lookback_days,), fetch=True)
+        if rows is None:
+            return False
+
+        self.cadences = {}
+        for buoy_id, median_gap, samples, since_change, since_fetch in rows:
+            if median_gap is not None and samples >= self.min_samples:
+                interval = min(max(float(median_gap), self.min_interval), self.max_interval)
+            else:
+                interval = self.default_interval
+            self.cadences[str(buoy_id)] = {
+                "interval": interval,
+                "since_change": float(since_change),
+                "since_fetch": float(since_fetch)
+            }
+        self.learned = True
+        return True
+
+    def interval(self, station_id):
+        """Return the expected update interval of a station in seconds."""
+        cadence = self.cadences.get(str(station_id))
+        return cadence["interval"] if cadence else self.default_interval
+
+    def is_due(self, station_id, now=None):
+        """
+        Decide whether a new observation is likely for a station.
+
+        Args:
+            station_id (str or int): The station identifier.
+            now (datetime, optional): The current time, only used when no history could be loaded.
+
+        Returns:
+            bool: True if the station should be fetched on this run.
+        """
+        if not self.learned:
+            # Without history fall back to the old behaviour: one fetch per station per hour
+            return (now or datetime.now()).minute * 60 < self.min_interval
+
+        cadence = self.cadences.get(str(station_id))
+        if not cadence:
+            return True
+
+        interval = cadence["interval"]
+        if cadence["since_fetch"] >= self.max_interval:
+            return True
+
+        # Time left until the next observation is expected
+        until_expected = interval - cadence["since_change"]
+        if until_expected > 0:
+            return False
+
+        # Overdue: fetch if we have not tried since it became due, otherwise retry every half interval
+        tried_since_due = cadence["since_fetch"] < -until_expected
+        return not tried_since_due or cadence["since_fetch"] >= max(interval / 2, self.min_interval)
+
+    def partition(self, station_ids, now=None):
+        """
+        Split stations into those due on this run and those that can wait.
+
+        Args:
+            station_ids (list): The station identifiers to consider.
+            now (datetime, optional): The current time.
+
+        Returns:
+            tuple: The list of due stations and the list of deferred stations.
+        """
+        due, deferred = [], []
+        for station_id in station_ids:
+            (due if self.is_due(station_id, now) else deferred).append(station_id)
+        return due, deferred
@@ -0,0 +1,105 @@
+# Standard Library Imports
+import json
+import select
+import sys
+
+# Third-Party Imports
+import psycopg2
+
+# Local Application Imports
+from .postgres_connection import change_channel
+
+class ChangeListener:
+    """
+    Receives the change notifications the ingest jobs send after each committed batch.
+
+    Each ingested table has its own channel (see PostgresConnection.notify_changes), and every
+    notification carries a JSON payload with the table, row count, affected station IDs and
+    time range, so consumers can invalidate caches or refresh derived tables as soon as new
+    readings land instead of polling the tables.
+
+    Example:
+        with ChangeListener(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, ["ingested.swell_data"]) as listener:
+            for change in listener.changes():
+                refresh(change["table"], change["station_ids"])
+    """
+
+    def __init__(self, host, user, password, database, tables, connection=None):
+        """
+        Initializes the ChangeListener object.
+
+        Args:
+            host (str): The database host.
+            user (str): The database user.
+            password (str): The database password.
+            database (str): The database name.
+            tables (list): The tables to receive changes for (e.g. "ingested.swell_data").
+            connection (optional): An existing psycopg2 connection to listen on.
+        """
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+        self.channels = [change_channel(table) for table in tables]
+        self.conn = connection
+
+    def connect(self):
+        """Open the connection in autocommit mode and LISTEN on every channel."""
+        if self.conn is None:
+            self.conn = psycopg2.connect(host=self.host, user=self.user, password=self.password,
+                                         database=self.database, connect_timeout=5)
+        self.conn.autocommit = True  # Notifications are only delivered outside a transaction
+        with self.conn.cursor() as cursor:
+            for channel in self.channels:
+                cursor.execute(f'LISTEN "{channel}"')
+
+    def close(self):
+        """Close the connection."""
+        if self.conn:
+            self.conn.close()
+
+    def poll(self, timeout=5.0):
+        """
+        Wait for notifications.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait.
+
+        Returns:
+            list: The decoded payloads received (empty if the timeout expired).
+        """
+        if not self.conn.notifies and select.select([self.conn], [], [], timeout) == ([], [], []):
+            return []
+        self.conn.poll()
+        changes = []
+        while self.conn.notifies:
+            notify = self.conn.notifies.pop(0)
+            try:
+                change = json.loads(notify.payload)
+            except ValueError:
+                change = {"table": None, "payload": notify.payload}
+            change["channel"] = notify.channel
+            changes.append(change)
+        return changes
+
+    def changes(self, timeout=5.0):
+        """Yield change payloads forever, waiting up to timeout seconds between polls."""
+        while True:
+            yield from self.poll(timeout)
+
+    def __enter__(self):
+        """Enter the context and start listening."""
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit the context and close the connection."""
+        self.close()
+
+if __name__ == "__main__":
+    # Usage: python -m utils.change_listener ingested.swell_data [ingested.wind_data ...]
+    import os
+    with ChangeListener(os.getenv("DB_HOST"), os.getenv("DB_USER"), os.getenv("DB_PASSWORD"), os.getenv("DB_NAME"),
+                        sys.argv[1:]) as listener:
+        for change in listener.changes():
+            print(json.dumps(change), flush=True)
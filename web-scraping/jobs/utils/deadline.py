@@ -0,0 +1,83 @@
+# Standard Library Imports
+import math
+import time
+
+def prioritize(station_ids, priorities, key=lambda station: station):
+    """
+    Order stations by priority, highest first, keeping the existing order between equal priorities.
+
+    Args:
+        station_ids (list): The stations (or station tuples) to order.
+        priorities (dict): Station ID (as a string) to priority; missing stations have priority 0.
+        key (callable, optional): Extracts the station ID from an element of station_ids.
+
+    Returns:
+        list: The stations in fetch order.
+    """
+    return sorted(station_ids, key=lambda station: -priorities.get(str(key(station)), 0))
+
+class RunDeadline:
+    """
+    Time budget of a single run, so a slow run finishes before the next cron slot starts.
+
+    The budget is split into a fetch phase and a reserve kept for flushing (validation,
+    inserts, cache publishing, spool and log uploads). Each station fetch gets a timeout
+    equal to its fair share of the fetch time left, clamped between min_timeout and
+    max_timeout; once less than min_timeout is left no further stations are started.
+    """
+
+    def __init__(self, budget_seconds, reserve_seconds=120, min_timeout=2.0, max_timeout=30.0, clock=time.monotonic):
+        """
+        Initializes the RunDeadline object. The clock starts immediately.
+
+        Args:
+            budget_seconds (float): Total time the run may take.
+            reserve_seconds (float, optional): Time kept at the end of the budget for flushing.
+            min_timeout (float, optional): Shortest timeout worth starting a station fetch with.
+            max_timeout (float, optional): Longest timeout given to a single station fetch.
+            clock (callable, optional): Monotonic clock in seconds, replaceable in tests.
+        """
+        self.budget = budget_seconds
+        self.reserve = min(reserve_seconds, budget_seconds)
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.clock = clock
+        self.started = clock()
+
+    def elapsed(self):
+        """Seconds since the run started."""
+        return self.clock() - self.started
+
+    def remaining(self):
+        """Seconds left in the whole budget (negative once it is exceeded)."""
+        return self.budget - self.elapsed()
+
+    def fetch_remaining(self):
+        """Seconds left for fetching before the flush reserve starts."""
+        return self.remaining() - self.reserve
+
+    @property
+    def expired(self):
+        """Whether the whole budget has been used."""
+        return self.remaining() <= 0
+
+    def station_timeout(self, pending, workers=1):
+        """
+        Timeout for the next station fetch.
+
+        Args:
+            pending (int): Number of stations still to fetch, including this one.
+            workers (int, optional): Number of fetches running concurrently.
+
+        Returns:
+            float or None: The timeout in seconds, or None if no time is left to start another fetch.
+        """
+        left = self.fetch_remaining()
+        if left < self.min_timeout:
+            return None
+        rounds = math.ceil(max(pending, 1) / max(workers, 1))
+        return round(min(max(left / rounds, self.min_timeout), self.max_timeout, left), 2)
+
+    def summary(self):
+        """Budget usage, for the run log."""
+        return {"budget_seconds": self.budget, "elapsed_seconds": round(self.elapsed(), 1)}
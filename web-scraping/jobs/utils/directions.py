@@ -0,0 +1,61 @@
+# Third-Party Imports
+import numpy as np
+import pandas as pd
+
+# 16-point compass rose as reported on NDBC station pages, clockwise from north
+COMPASS_POINTS = ["N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
+                  "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW"]
+COMPASS_DEGREES = {point: index * 22.5 for index, point in enumerate(COMPASS_POINTS)}
+
+def to_degrees(values):
+    """
+    Convert directions to degrees.
+
+    Args:
+        values (iterable): Compass points (e.g. "WNW"), numbers or numeric strings; anything else is missing.
+
+    Returns:
+        numpy.ndarray: Directions in degrees [0, 360) as floats, NaN where missing.
+    """
+    series = pd.Series(list(values), dtype=object)
+    compass = series.astype(str).str.strip().str.upper().map(COMPASS_DEGREES)
+    numeric = pd.to_numeric(series, errors="coerce")
+    return np.mod(compass.fillna(numeric).to_numpy(dtype=float), 360.0)
+
+def to_compass(degrees):
+    """
+    Convert degrees to the nearest 16-point compass direction.
+
+    Args:
+        degrees (iterable): Directions in degrees, NaN where missing.
+
+    Returns:
+        list: Compass points, None where missing.
+    """
+    degrees = np.asarray(degrees, dtype=float)
+    index = np.round(np.mod(np.nan_to_num(degrees), 360.0) / 22.5).astype(int) % 16
+    return [None if np.isnan(value) else COMPASS_POINTS[i] for value, i in zip(degrees, index)]
+
+def vector_to_degrees(sin_sum, cos_sum):
+    """Convert summed (weighted) unit-vector components back to a direction in degrees [0, 360), NaN when undefined."""
+    sin_sum = np.asarray(sin_sum, dtype=float)
+    cos_sum = np.asarray(cos_sum, dtype=float)
+    degrees = np.mod(np.degrees(np.arctan2(sin_sum, cos_sum)), 360.0)
+    return np.where(np.hypot(sin_sum, cos_sum) > 1e-9, degrees, np.nan)
+
+def circular_mean(degrees, weights=None):
+    """
+    Weighted mean of directions, averaging unit vectors so that 350° and 10° average to 0° rather than 180°.
+
+    Args:
+        degrees (array-like): Directions in degrees; NaN values are ignored.
+        weights (array-like, optional): Weight per direction, defaults to equal weights.
+
+    Returns:
+        float: The mean direction in degrees [0, 360), NaN if it is undefined.
+    """
+    degrees = np.asarray(degrees, dtype=float)
+    weights = np.ones_like(degrees) if weights is None else np.asarray(weights, dtype=float)
+    valid = ~np.isnan(degrees)
+    radians = np.radians(degrees[valid])
+    return float(vector_to_degrees(np.sum(weights[valid] * np.sin(radians)), np.sum(weights[valid] * np.cos(radians))))
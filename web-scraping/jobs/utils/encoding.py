@@ -0,0 +1,82 @@
+# Standard Library Imports
+import math
+
+# Local Application Imports
+from .directions import COMPASS_DEGREES
+
+# ingested.swell_data stores directions as whole degrees [0, 360) in SMALLINT columns and
+# the NDBC wave steepness label as a SMALLINT code. Codes are never renumbered; new labels
+# get the next free code.
+STEEPNESS_CODES = {"SWELL": 1, "AVERAGE": 2, "STEEP": 3, "VERY_STEEP": 4}
+STEEPNESS_LABELS = {code: label for label, code in STEEPNESS_CODES.items()}
+
+DIRECTION_FIELDS = ["swell_direction", "wind_wave_direction"]
+STEEPNESS_FIELD = "wave_steepness"
+
+def encode_direction(value):
+    """
+    Encode a direction as whole degrees for a SMALLINT column.
+
+    Args:
+        value: A compass point (e.g. "WNW"), a number of degrees, a numeric string or None.
+
+    Returns:
+        int or None: Degrees in [0, 360), rounded half up, or None if the value is missing or not a direction.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        text = value.strip().upper()
+        if text in COMPASS_DEGREES:
+            degrees = COMPASS_DEGREES[text]
+        else:
+            try:
+                degrees = float(text)
+            except ValueError:
+                return None
+    else:
+        degrees = float(value)
+
+    if not math.isfinite(degrees):
+        return None
+    return int(math.floor(degrees + 0.5)) % 360
+
+def encode_steepness(value):
+    """
+    Encode an NDBC wave steepness label (e.g. "AVERAGE", "VERY_STEEP") as its SMALLINT code.
+
+    Codes are passed through unchanged, so encoding an already encoded value is harmless.
+
+    Returns:
+        int or None: The code, or None for missing or unknown labels (e.g. "N/A").
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value if value in STEEPNESS_LABELS else None
+    if not isinstance(value, str):
+        return None
+    return STEEPNESS_CODES.get(value.strip().upper().replace(" ", "_"))
+
+def decode_steepness(code):
+    """Return the NDBC label of a wave steepness code, or None."""
+    return STEEPNESS_LABELS.get(code)
+
+def encode_swell_record(record):
+    """
+    Return a copy of a swell reading with its direction and steepness fields in the stored form.
+
+    Encoding is idempotent, so rows that are already encoded (e.g. read back from the spool)
+    come out unchanged.
+
+    Args:
+        record (dict): A parsed swell reading.
+
+    Returns:
+        dict: The reading with SMALLINT-ready direction and steepness values.
+    """
+    encoded = dict(record)
+    for field in DIRECTION_FIELDS:
+        if field in encoded:
+            encoded[field] = encode_direction(encoded[field])
+    if STEEPNESS_FIELD in encoded:
+        encoded[STEEPNESS_FIELD] = encode_steepness(encoded[STEEPNESS_FIELD])
+    return encoded
@@ -0,0 +1,64 @@
+# Standard Library Imports
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class HealthServer:
+    """
+    Minimal HTTP server for Kubernetes probes, running in a background thread.
+
+    GET /healthz answers 200 while live() is true and GET /readyz while ready() is true,
+    503 otherwise; both return status() as the JSON body.
+    """
+
+    def __init__(self, port, live, ready, status=dict, host="0.0.0.0"):
+        """
+        Initializes the HealthServer object.
+
+        Args:
+            port (int): The port to listen on (0 picks a free port).
+            live (callable): Returns whether the process is alive.
+            ready (callable): Returns whether the process is ready to do work.
+            status (callable, optional): Returns a JSON-serializable status dict.
+            host (str, optional): The interface to listen on.
+        """
+        checks = {"/healthz": live, "/readyz": ready}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                check = checks.get(self.path.split("?")[0])
+                if check is None:
+                    self.send_error(404)
+                    return
+                ok = bool(check())
+                body = json.dumps({"ok": ok, **status()}, default=str).encode("utf-8")
+                self.send_response(200 if ok else 503)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Probes hit these endpoints every few seconds
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def port(self):
+        """The port the server listens on."""
+        return self.server.server_address[1]
+
+    def start(self):
+        """Start serving in a daemon thread."""
+        self.thread = threading.Thread(target=self.server.serve_forever, name="health-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        if self.thread:
+            self.server.shutdown()
+            self.thread.join()
+        self.server.server_close()
@@ -0,0 +1,142 @@
+# Standard Library Imports
+import random
+import time
+
+class ScheduledJob:
+    """A job run every interval seconds, each run delayed by a random jitter."""
+
+    def __init__(self, name, func, interval, jitter, first_run):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.slot = first_run  # Start of the current interval, before jitter
+        self.next_run = first_run
+        self.last_run = None
+        self.last_duration = None
+        self.last_error = None
+        self.runs = 0
+        self.missed = 0
+
+    def status(self):
+        """State of the job, for the health endpoint."""
+        return {
+            "interval": self.interval,
+            "next_run": self.next_run,
+            "last_run": self.last_run,
+            "last_duration": self.last_duration,
+            "last_error": self.last_error,
+            "runs": self.runs,
+            "missed": self.missed
+        }
+
+class IntervalScheduler:
+    """
+    Runs jobs on fixed intervals inside a long-lived process.
+
+    Jobs run one at a time in the calling thread, so two runs never overlap. Each run is
+    delayed by a random jitter within its interval so jobs started together do not hit the
+    upstream APIs at the same second. Slots are kept on the interval grid: a run that
+    overruns its interval skips (and counts) the missed slots instead of running back to back.
+    The clock and the sleep function can be replaced, so tests drive the scheduler with a fake clock.
+    """
+
+    def __init__(self, clock=time.time, sleep=time.sleep, rng=None):
+        """
+        Initializes the IntervalScheduler object.
+
+        Args:
+            clock (callable, optional): Returns the current time in seconds.
+            sleep (callable, optional): Sleeps for a number of seconds.
+            rng (random.Random, optional): Source of the jitter.
+        """
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self.jobs = []
+        self.heartbeat = clock()
+
+    def add(self, name, func, interval, jitter=0.0, run_immediately=True):
+        """
+        Schedule a job.
+
+        Args:
+            name (str): The job name.
+            func (callable): Called with no arguments on every run.
+            interval (float): Seconds between runs.
+            jitter (float, optional): Maximum random delay added to each run, in seconds.
+            run_immediately (bool, optional): Run in the first slot, otherwise wait one interval.
+
+        Returns:
+            ScheduledJob: The scheduled job.
+        """
+        first_slot = self.clock() + (0 if run_immediately else interval)
+        job = ScheduledJob(name, func, interval, min(jitter, interval), first_slot)
+        job.next_run = first_slot + self.rng.uniform(0, job.jitter)
+        self.jobs.append(job)
+        return job
+
+    def _advance(self, job, now):
+        """Move a job to its next slot after now, counting the slots it missed."""
+        job.slot += job.interval
+        while job.slot + job.interval <= now:
+            job.slot += job.interval
+            job.missed += 1
+        job.next_run = max(job.slot + self.rng.uniform(0, job.jitter), now)
+
+    def run_pending(self, logger=None):
+        """
+        Run every job that is due, in order of due time.
+
+        Args:
+            logger (Logger, optional): Logger for job failures.
+
+        Returns:
+            list: Names of the jobs that ran.
+        """
+        ran = []
+        for job in sorted(self.jobs, key=lambda job: job.next_run):
+            now = self.clock()
+            if job.next_run > now:
+                continue
+            job.last_run = now
+            try:
+                job.func()
+                job.last_error = None
+            except Exception as e:
+                # A failing run must not stop the daemon; the next slot runs as usual
+                job.last_error = str(e)
+                if logger:
+                    logger.log_json("ERROR", "Scheduled job failed", {"job": job.name, "error": str(e)})
+            job.runs += 1
+            job.last_duration = self.clock() - now
+            self._advance(job, self.clock())
+            ran.append(job.name)
+            # Refreshed after every job, so the liveness timeout only has to cover the longest single run
+            self.heartbeat = self.clock()
+        self.heartbeat = self.clock()
+        return ran
+
+    def seconds_until_next(self):
+        """Seconds until the next job is due (0 if one is due now)."""
+        if not self.jobs:
+            return None
+        return max(min(job.next_run for job in self.jobs) - self.clock(), 0)
+
+    def run_forever(self, stop, max_sleep=5.0, logger=None):
+        """
+        Run jobs as they become due until stop() returns True.
+
+        Args:
+            stop (callable): Checked between runs and sleeps; returns True to stop.
+            max_sleep (float, optional): Longest single sleep, so stop requests and the heartbeat stay responsive.
+            logger (Logger, optional): Logger for job failures.
+        """
+        while not stop():
+            self.run_pending(logger)
+            wait = self.seconds_until_next()
+            self.sleep(max_sleep if wait is None else min(wait, max_sleep))
+
+    def status(self):
+        """State of every job, for the health endpoint."""
+        return {job.name: job.status() for job in self.jobs}
@@ -0,0 +1,138 @@
+# Standard Library Imports
+import argparse
+import json
+from datetime import datetime, timedelta
+
+# Local Application Imports
+from .logger import BUCKET_NAME
+from .minio_client import create_s3_client
+
+MANIFEST_SUFFIX = ".manifest.json"
+
+class LogIndex:
+    """
+    Query run manifests in the log bucket without downloading whole logs.
+
+    Every Logger run writes `<job>/<MM-DD-YYYY>/<HH-MM>[-shard-i-of-n].manifest.json` next to
+    its `.log` object. Manifests are small, so questions such as "which runs failed buoy X in the
+    last week" only list and read those; individual ERROR/WARNING lines are then fetched from the
+    log with ranged GETs using the byte offsets recorded in the manifest.
+    """
+
+    def __init__(self, s3_client=None, bucket=BUCKET_NAME):
+        """
+        Initializes the LogIndex object.
+
+        Args:
+            s3_client (optional): An S3 client, defaults to one for the cluster's MinIO.
+            bucket (str, optional): The log bucket.
+        """
+        self.s3_client = s3_client or create_s3_client()
+        self.bucket = bucket
+
+    def manifest_keys(self, job_name, days, now=None):
+        """
+        List the manifest keys of a job's runs over the last N days.
+
+        Args:
+            job_name (str): The job name (top-level prefix).
+            days (int): Number of days to look back, including today.
+            now (datetime, optional): The current time.
+
+        Returns:
+            list: Manifest keys, oldest day first.
+        """
+        now = now or datetime.now()
+        keys = []
+        for offset in range(days - 1, -1, -1):
+            prefix = f"{job_name}/{(now - timedelta(days=offset)).strftime('%m-%d-%Y')}/"
+            keys.extend(key for key in self._list_keys(prefix) if key.endswith(MANIFEST_SUFFIX))
+        return keys
+
+    def _list_keys(self, prefix):
+        """List every object key under a prefix, following continuation tokens."""
+        kwargs = {"Bucket": self.bucket, "Prefix": prefix}
+        while True:
+            response = self.s3_client.list_objects_v2(**kwargs)
+            for obj in response.get("Contents", []):
+                yield obj["Key"]
+            if not response.get("IsTruncated"):
+                return
+            kwargs["ContinuationToken"] = response["NextContinuationToken"]
+
+    def manifests(self, job_name, days, now=None):
+        """Yield the manifests of a job's runs over the last N days."""
+        for key in self.manifest_keys(job_name, days, now):
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
+            yield json.loads(response["Body"].read())
+
+    def runs_failing_station(self, job_name, station_id, days=7, key="buoy_id", now=None):
+        """
+        Find the runs that logged an ERROR for a station.
+
+        Args:
+            job_name (str): The job name.
+            station_id (str or int): The buoy or spot ID.
+            days (int, optional): Number of days to look back.
+            key (str, optional): The context key identifying the station (buoy_id or spot_id).
+            now (datetime, optional): The current time.
+
+        Returns:
+            list: Manifests of the matching runs, oldest first.
+        """
+        return [
+            manifest for manifest in self.manifests(job_name, days, now)
+            if str(station_id) in manifest.get("failed_stations", {}).get(key, [])
+        ]
+
+    def failing_stations(self, job_name, days=7, key="buoy_id", now=None):
+        """
+        Count failing runs per station.
+
+        Returns:
+            dict: Station ID to the number of runs that logged an ERROR for it.
+        """
+        counts = {}
+        for manifest in self.manifests(job_name, days, now):
+            for station_id in manifest.get("failed_stations", {}).get(key, []):
+                counts[station_id] = counts.get(station_id, 0) + 1
+        return counts
+
+    def fetch_lines(self, manifest, levels=("ERROR",)):
+        """
+        Fetch indexed lines of a run's log with ranged GETs instead of downloading the whole object.
+
+        Args:
+            manifest (dict): A run manifest.
+            levels (tuple, optional): The levels to fetch (ERROR and/or WARNING).
+
+        Returns:
+            list: The parsed log entries.
+        """
+        entries = []
+        for line in manifest.get("index", []):
+            if line["level"] not in levels:
+                continue
+            byte_range = f"bytes={line['offset']}-{line['offset'] + line['length'] - 1}"
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=manifest["log_path"], Range=byte_range)
+            entries.append(json.loads(response["Body"].read()))
+        return entries
+
+if __name__ == "__main__":
+    # Usage: python -m utils.log_index <job-name> <station-id> [--days N] [--key spot_id] [--lines]
+    parser = argparse.ArgumentParser(description="Find the runs that failed a station")
+    parser.add_argument("job_name")
+    parser.add_argument("station_id")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--key", default="buoy_id", choices=["buoy_id", "spot_id"])
+    parser.add_argument("--lines", action="store_true", help="Also print the run's ERROR lines")
+    args = parser.parse_args()
+
+    index = LogIndex()
+    for manifest in index.runs_failing_station(args.job_name, args.station_id, args.days, args.key):
+        print(f"{manifest['started_at']}  {manifest['log_path']}  errors={manifest['counts'].get('ERROR', 0)}")
+        if args.lines:
+            for entry in index.fetch_lines(manifest):
+                context = entry.get("context", {})
+                if str(context.get(args.key)) == str(args.station_id):
+                    print(f"    {entry['timestamp']} {entry['message']}")
@@ -1,42 +1,59 @@
 # Standard Library Imports
 import json
-import os
+import threading
+import time
 from datetime import datetime
 
-# Third-Party Imports
-import boto3
+# Local Application Imports
+from .minio_client import create_s3_client
+from .query_stats import QueryStats
+from .sharding import shard_label
 
-# S3 Configuration (must be set via environment variables)
-MINIO_ENDPOINT = os.getenv('MINIO_ENDPOINT')
-ACCESS_KEY = os.getenv('MINIO_ACCESS_KEY')
-SECRET_KEY = os.getenv('MINIO_SECRET_KEY')
 BUCKET_NAME = 'argo-logs'
 
+# Levels whose byte offsets are indexed in the run manifest
+INDEXED_LEVELS = ("ERROR", "WARNING")
+
+# Context keys identifying the station(s) a log entry is about, mapped to their failed_stations key
+STATION_KEYS = {"buoy_id": "buoy_id", "spot_id": "spot_id", "spot_ids": "spot_id"}
+
 class Logger:
-    def __init__(self, job_name):
+    def __init__(self, job_name, shard_index=0, shard_count=1, s3_client=None):
         """
         Initializes the Logger object.
 
         Args:
-            log_path (str): The S3 path (key) where the logs will be stored.
+            job_name (str): The job name, used as the top-level S3 prefix for its logs.
+            shard_index (int, optional): Shard processed by this run, when the job is sharded.
+            shard_count (int, optional): Total number of shards of the job.
+            s3_client (optional): S3 client to upload with, defaults to a new MinIO client.
         """
         self.job_name = job_name
+        self.shard_index = shard_index
+        self.shard_count = shard_count
         self.log_path = self.generate_log_path()
 
         self.log_content = []  # Collect log entries in memory
-        self.s3_client = boto3.client(
-            's3',
-            endpoint_url=MINIO_ENDPOINT,
-            aws_access_key_id=ACCESS_KEY,
-            aws_secret_access_key=SECRET_KEY,
-            config=boto3.session.Config(signature_version='s3v4')
-        )
+        self.lock = threading.Lock()  # Fetch threads log concurrently; guards the lines and their byte offsets
+        self.s3_client = s3_client or create_s3_client()
+
+        # Run statistics for the manifest written next to the log
+        self.started_at = datetime.now()
+        self.start_time = time.monotonic()
+        self.level_counts = {}
+        self.failed_stations = {key: set() for key in dict.fromkeys(STATION_KEYS.values())}
+        self.line_index = []
+        self.byte_offset = 0
+        self.query_stats = QueryStats()  # Filled by every PostgresConnection opened with this logger
 
     def generate_log_path(self):
-        """Generate the log path based on the job name and timestamp."""
+        """Generate the log path based on the job name, timestamp and shard (if sharded)."""
         current_time = datetime.now()
         date_str = current_time.strftime("%m-%d-%Y")
         time_str = current_time.strftime("%H-%M")
+        label = shard_label(self.shard_index, self.shard_count)
+        if label:
+            time_str = f"{time_str}-{label}"
         log_path = f"{self.job_name}/{date_str}/{time_str}.log"
         return log_path
 
@@ -51,11 +68,71 @@ class Logger:
         if context:
             log_entry["context"] = context
         
-        self.log_content.append(json.dumps(log_entry))
+        line = json.dumps(log_entry)
+        with self.lock:
+            self.log_content.append(line)
+            self._index_entry(level, line, context)
+
+    def _index_entry(self, level, line, context):
+        """Update the manifest statistics for a newly logged line (called with the lock held)."""
+        length = len(line.encode("utf-8"))
+        self.level_counts[level] = self.level_counts.get(level, 0) + 1
+        if level in INDEXED_LEVELS:
+            self.line_index.append({"level": level, "offset": self.byte_offset, "length": length})
+        if level == "ERROR" and isinstance(context, dict):
+            for key, station_key in STATION_KEYS.items():
+                station_ids = context.get(key)
+                if station_ids is None:
+                    continue
+                # Group requests (one forecast cell, one /group call) name every spot they cover
+                if not isinstance(station_ids, (list, tuple)):
+                    station_ids = [station_ids]
+                self.failed_stations[station_key].update(str(station_id) for station_id in station_ids)
+        self.byte_offset += length + 1  # Lines are joined with a newline
+
+    @property
+    def manifest_path(self):
+        """The S3 key of the manifest describing this run's log."""
+        return self.log_path[:-len(".log")] + ".manifest.json"
+
+    def build_manifest(self, exc_type=None):
+        """Summarize the run: counts per level, failed stations, duration and an index of ERROR/WARNING lines."""
+        with self.lock:
+            return self._manifest(exc_type)
+
+    def _manifest(self, exc_type):
+        """Build the manifest document (called with the lock held)."""
+        return {
+            "job_name": self.job_name,
+            "log_path": self.log_path,
+            "shard_index": self.shard_index,
+            "shard_count": self.shard_count,
+            "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "duration_seconds": round(time.monotonic() - self.start_time, 3),
+            "log_bytes": max(self.byte_offset - 1, 0),
+            "counts": dict(self.level_counts),
+            "failed_stations": {key: sorted(ids) for key, ids in self.failed_stations.items()},
+            "exception": exc_type.__name__ if exc_type else None,
+            "queries": self.query_stats.summary(),
+            "index": list(self.line_index)
+        }
+
+    def upload_manifest(self, exc_type=None):
+        """Uploads the run manifest to S3 next to the log."""
+        try:
+            self.s3_client.put_object(
+                Body=json.dumps(self.build_manifest(exc_type)),
+                Bucket=BUCKET_NAME,
+                Key=self.manifest_path,
+                ContentType="application/json"
+            )
+        except Exception as e:
+            print(f"Failed to upload log manifest to S3: {e}")
 
     def upload_logs(self):
         """Uploads accumulated logs to S3 when context is exited."""
-        log_data = "\n".join(self.log_content)
+        with self.lock:
+            log_data = "\n".join(self.log_content)
         try:
             self.s3_client.put_object(Body=log_data, Bucket=BUCKET_NAME, Key=self.log_path)
             print(f"Logs successfully uploaded to {self.log_path}")
@@ -68,5 +145,8 @@ class Logger:
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        """Exit the context and write the logs to S3."""
+        """Exit the context and write the logs and their manifest to S3."""
+        if self.query_stats:
+            self.log_json("INFO", "Database time by statement", self.query_stats.summary())
         self.upload_logs()
+        self.upload_manifest(exc_type)
@@ -0,0 +1,20 @@
+# Standard Library Imports
+import os
+
+# Third-Party Imports
+import boto3
+
+# S3 Configuration (must be set via environment variables)
+MINIO_ENDPOINT = os.getenv('MINIO_ENDPOINT')
+ACCESS_KEY = os.getenv('MINIO_ACCESS_KEY')
+SECRET_KEY = os.getenv('MINIO_SECRET_KEY')
+
+def create_s3_client():
+    """Create an S3 client for the cluster's MinIO endpoint."""
+    return boto3.client(
+        's3',
+        endpoint_url=MINIO_ENDPOINT,
+        aws_access_key_id=ACCESS_KEY,
+        aws_secret_access_key=SECRET_KEY,
+        config=boto3.session.Config(signature_version='s3v4')
+    )
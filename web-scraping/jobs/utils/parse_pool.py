@@ -0,0 +1,112 @@
+# Standard Library Imports
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Number of parser processes (0 parses inline in the calling process)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", os.cpu_count() or 1))
+
+# Longest time warm() waits for every worker process to start
+WARM_TIMEOUT_SECONDS = 60
+
+# Barrier shared by the workers of the pool, set in each worker process by _warm_worker
+_start_barrier = None
+
+def _warm_worker(start_barrier):
+    """Import the heavy parsing libraries once when a worker process starts."""
+    global _start_barrier
+    _start_barrier = start_barrier
+    import bs4  # noqa: F401
+    import lxml  # noqa: F401
+    import pandas  # noqa: F401
+
+def _wait_for_workers(timeout):
+    """
+    Hold this worker until every worker of the pool is running the same task.
+
+    A worker waiting here cannot pick up another warm-up task, so the pool has to
+    start all of its processes before the barrier opens.
+
+    Args:
+        timeout (float): Seconds to wait before giving up on the barrier.
+
+    Returns:
+        int: The PID of this worker.
+    """
+    try:
+        _start_barrier.wait(timeout)
+    except threading.BrokenBarrierError:
+        pass
+    return os.getpid()
+
+class ParsePool:
+    """
+    Warm process pool for CPU-bound page parsing.
+
+    BeautifulSoup and pd.read_html hold the GIL, so parsing many pages in threads does not
+    use more than one core. Parse functions submitted here run in worker processes that
+    imported pandas/bs4 once at start-up; they must be module-level functions taking and
+    returning plain, picklable values.
+    """
+
+    def __init__(self, size=None):
+        """
+        Initializes the ParsePool object.
+
+        Args:
+            size (int, optional): Number of worker processes, defaults to PARSE_WORKERS. 0 parses inline.
+        """
+        self.size = PARSE_WORKERS if size is None else size
+        self.executor = None
+        if self.size > 0:
+            context = multiprocessing.get_context()
+            self.executor = ProcessPoolExecutor(max_workers=self.size, mp_context=context, initializer=_warm_worker,
+                                                initargs=(context.Barrier(self.size),))
+
+    def warm(self, timeout=WARM_TIMEOUT_SECONDS):
+        """
+        Start every worker process now instead of on the first submitted pages.
+
+        The executor starts workers on demand and a few trivial tasks could all run on the
+        first one, so each warm-up task blocks on a barrier until all workers have joined.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the workers to start.
+
+        Returns:
+            set: The PIDs of the started workers (all of them unless the timeout expired).
+        """
+        if not self.executor:
+            return set()
+        return set(self.executor.map(_wait_for_workers, [timeout] * self.size))
+
+    def map(self, func, *iterables, chunksize=1):
+        """
+        Apply a parse function to every item, in parallel when the pool has workers.
+
+        Args:
+            func (callable): A module-level function.
+            *iterables: Argument iterables, as for the built-in map().
+            chunksize (int, optional): Number of items sent to a worker at a time.
+
+        Returns:
+            iterator: The results, in input order.
+        """
+        if not self.executor:
+            return map(func, *iterables)
+        return self.executor.map(func, *iterables, chunksize=chunksize)
+
+    def close(self):
+        """Shut the worker processes down."""
+        if self.executor:
+            self.executor.shutdown()
+
+    def __enter__(self):
+        """Enter the context and start the workers."""
+        self.warm()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit the context and stop the workers."""
+        self.close()
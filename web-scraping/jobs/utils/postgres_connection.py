@@ -1,12 +1,79 @@
+# Standard Library Imports
+import json
+import os
+import time
+import uuid
+
 # Third-Party Imports
 import psycopg2
-from psycopg2 import sql
+from psycopg2 import extras, sql
 
 # Local Application Imports
 from .logger import Logger
+from .query_stats import statement_shape
+
+# Statements slower than SLOW_QUERY_MS are logged (0 disables); with EXPLAIN_SLOW_QUERIES (off by
+# default) the first slow execution of each statement shape in a run also captures its plan
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+EXPLAIN_SLOW_QUERIES = os.getenv("EXPLAIN_SLOW_QUERIES", "").lower() in ("1", "true", "yes")
+
+# Default statement_timeout of every connection in milliseconds (0 keeps the server's setting)
+STATEMENT_TIMEOUT_MS = int(os.getenv("STATEMENT_TIMEOUT_MS", "0"))
+
+EXPLAIN_SAVEPOINT = "slow_query_explain"
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more; above this the station list is dropped
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+def change_channel(table):
+    """Return the NOTIFY channel announcing changes to a table (e.g. ingested_swell_data)."""
+    return table.replace(".", "_")
+
+def change_payload(table, rows, station_key, time_key="timestamp"):
+    """Build the compact JSON payload describing a committed batch of rows.
+
+    Args:
+        table (str): The table the rows were written to.
+        rows (list): The written rows.
+        station_key (str): The column identifying the station (buoy_id or spot_id).
+        time_key (str, optional): The column holding the row's time.
+
+    Returns:
+        str: JSON with the table, row count, affected station IDs and time range. If the
+            station list would exceed the payload limit, station_ids is null and consumers
+            should treat every station as changed.
+    """
+    times = [str(row[time_key]) for row in rows if row.get(time_key) is not None]
+    payload = {
+        "table": table,
+        "rows": len(rows),
+        "station_ids": sorted({row[station_key] for row in rows}, key=str),
+        "from": min(times) if times else None,
+        "to": max(times) if times else None
+    }
+    encoded = json.dumps(payload, separators=(",", ":"), default=str)
+    if len(encoded.encode("utf-8")) > NOTIFY_PAYLOAD_LIMIT:
+        payload["station_ids"] = None
+        encoded = json.dumps(payload, separators=(",", ":"), default=str)
+    return encoded
 
 class PostgresConnection:
-    def __init__(self, host, user, password, database, logger=None):
+    def __init__(self, host, user, password, database, logger=None, statement_timeout_ms=None,
+                 slow_query_ms=None, explain_slow=None):
+        """
+        Initializes the PostgresConnection object.
+
+        Every statement is timed. Its time is added to the run's QueryStats (held by the
+        Logger), and statements slower than slow_query_ms are logged with their shape, row
+        count and, if explain_slow is set, their EXPLAIN (ANALYZE, BUFFERS) plan.
+
+        Args:
+            host, user, password, database (str): Connection settings.
+            logger (Logger, optional): The logger instance to log messages.
+            statement_timeout_ms (int, optional): statement_timeout for this connection, defaults to STATEMENT_TIMEOUT_MS.
+            slow_query_ms (float, optional): Slow-query threshold, defaults to SLOW_QUERY_MS.
+            explain_slow (bool, optional): Capture plans of slow statements, defaults to EXPLAIN_SLOW_QUERIES.
+        """
         self.host = host
         self.user = user
         self.password = password
@@ -14,16 +81,24 @@ class PostgresConnection:
         self.conn = None
         self.cursor = None
         self.logger = logger
+        self.statement_timeout_ms = STATEMENT_TIMEOUT_MS if statement_timeout_ms is None else statement_timeout_ms
+        self.slow_query_ms = SLOW_QUERY_MS if slow_query_ms is None else slow_query_ms
+        self.explain_slow = EXPLAIN_SLOW_QUERIES if explain_slow is None else explain_slow
 
     def connect(self):
         """Establish connection to PostgreSQL database."""
+        options = {}
+        if self.statement_timeout_ms:
+            # Applied by the server at session start, so it survives rollbacks
+            options["options"] = f"-c statement_timeout={int(self.statement_timeout_ms)}"
         try:
             self.conn = psycopg2.connect(
                 host=self.host,
                 user=self.user,
                 password=self.password,
                 database=self.database,
-                connect_timeout=5
+                connect_timeout=5,
+                **options
             )
             if self.conn:
                 self.cursor = self.conn.cursor()
@@ -38,6 +113,95 @@ class PostgresConnection:
         if self.conn:
             self.conn.close()
 
+    def set_statement_timeout(self, milliseconds):
+        """Change the statement_timeout of the open connection (0 disables it).
+
+        Returns:
+            bool: True if the setting was applied.
+        """
+        applied = self.execute_query("SELECT set_config('statement_timeout', %s, false)", (str(int(milliseconds)),))
+        if applied is not None:
+            self.statement_timeout_ms = milliseconds
+        return applied is not None
+
+    def _statement_text(self, query):
+        """The text of a statement before parameters are bound."""
+        if isinstance(query, str):
+            return query
+        try:
+            return query.as_string(self.conn)  # sql.Composable
+        except Exception:
+            return repr(query)
+
+    def _observe(self, query, started, rows=None, explain=True, committed=False):
+        """Record a finished statement in the run's QueryStats and log it if it was slow.
+
+        Args:
+            query (str or sql.Composable): The statement as passed to the cursor.
+            started (float): time.perf_counter() before it was sent.
+            rows (int, optional): Rows returned or affected.
+            explain (bool, optional): Whether the statement can be explained from cursor.query.
+            committed (bool, optional): Whether its transaction was committed, so explaining opens a new one.
+        """
+        milliseconds = (time.perf_counter() - started) * 1000
+        stats = getattr(self.logger, "query_stats", None)
+        slow = bool(self.slow_query_ms) and milliseconds >= self.slow_query_ms
+        if stats is None and not slow:
+            return
+
+        shape = statement_shape(self._statement_text(query))
+        if stats is not None:
+            stats.record(shape, milliseconds / 1000, rows, slow)
+        if not slow:
+            return
+
+        context = {"statement": shape, "duration_ms": round(milliseconds, 1), "rows": rows}
+        if explain and self.explain_slow and (stats is None or stats.claim_explain(shape)):
+            plan = self._explain()
+            if committed and self.conn:
+                self.conn.rollback()  # End the transaction the savepoint opened
+            if plan:
+                context["plan"] = plan
+        self.logger.log_json("WARNING", "Slow query", context)
+
+    def _explain(self):
+        """Capture the plan of the cursor's last statement inside a savepoint that is rolled back.
+
+        Only a SELECT is run again, under EXPLAIN ANALYZE (falling back to a plain EXPLAIN if
+        that fails); writes are never repeated and get the planner's estimate from a plain
+        EXPLAIN. For batched inserts the last page is explained.
+
+        Returns:
+            list or None: The plan lines, or None if no plan could be captured.
+        """
+        statement = getattr(self.cursor, "query", None)
+        if not isinstance(statement, (bytes, str)) or not statement:
+            return None
+        if isinstance(statement, bytes):
+            statement = statement.decode("utf-8", errors="replace")
+
+        explains = ["EXPLAIN "]
+        if statement.lstrip().split(None, 1)[0].upper() == "SELECT":
+            explains.insert(0, "EXPLAIN (ANALYZE, BUFFERS) ")
+
+        try:
+            self.cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            plan = None
+            for explain in explains:
+                try:
+                    self.cursor.execute(explain + statement)
+                    plan = [row[0] for row in self.cursor.fetchall()]
+                    break
+                except psycopg2.Error:
+                    continue
+                finally:
+                    self.cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            self.cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            return plan
+        except psycopg2.Error as e:
+            self.logger.log_json("WARNING", f"Could not capture query plan: {e}")
+            return None
+
     def execute_query(self, query, params=None, fetch=False):
         """Execute a query on the PostgreSQL database.
 
@@ -53,10 +217,14 @@ class PostgresConnection:
             if not self.conn:
                 raise ConnectionError("PostgreSQL connection is not established")
             
+            started = time.perf_counter()
             self.cursor.execute(query, params or ())
             if fetch:
-                return self.cursor.fetchall()
+                results = self.cursor.fetchall()
+                self._observe(query, started, len(results))
+                return results
             self.conn.commit()
+            self._observe(query, started, self.cursor.rowcount, committed=True)
             return True
         except psycopg2.Error as e:
             self.logger.log_json("ERROR", f"Failure executing query: {e}")
@@ -86,6 +254,93 @@ class PostgresConnection:
             return False
         return True
 
+    def insert_many(self, table, rows, on_conflict=None, conflict_columns=None, page_size=500):
+        """Insert many rows into a table in batched statements committed as one transaction.
+
+        Args:
+            table (str): The table to insert data into.
+            rows (list): A list of dictionaries sharing the same column-value keys.
+            on_conflict (str, optional): None to fail on conflicts, "nothing" to skip rows that
+                already exist, or "update" to overwrite them (requires conflict_columns).
+            conflict_columns (list, optional): The columns forming the conflict target.
+            page_size (int, optional): Maximum number of rows sent per INSERT statement.
+
+        Returns:
+            bool: True if every row was written and committed, False otherwise.
+        """
+        if not rows:
+            return True
+
+        schema, table_name = table.split(".")
+        columns = list(rows[0].keys())
+        query = sql.SQL("INSERT INTO {}.{} ({}) VALUES %s").format(
+            sql.Identifier(schema),
+            sql.Identifier(table_name),
+            sql.SQL(', ').join(map(sql.Identifier, columns))
+        )
+
+        if conflict_columns:
+            conflict_target = sql.SQL(" ({})").format(sql.SQL(', ').join(map(sql.Identifier, conflict_columns)))
+        else:
+            conflict_target = sql.SQL("")
+
+        if on_conflict == "nothing":
+            query += sql.SQL(" ON CONFLICT{} DO NOTHING").format(conflict_target)
+        elif on_conflict == "update":
+            updates = sql.SQL(', ').join(
+                sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(column))
+                for column in columns if column not in conflict_columns
+            )
+            query += sql.SQL(" ON CONFLICT{} DO UPDATE SET {}").format(conflict_target, updates)
+
+        values = [tuple(row.get(column) for column in columns) for row in rows]
+        try:
+            if not self.conn:
+                raise ConnectionError("PostgreSQL connection is not established")
+
+            started = time.perf_counter()
+            extras.execute_values(self.cursor, query, values, page_size=page_size)
+            self.conn.commit()
+            self._observe(query, started, len(rows), committed=True)
+            return True
+        except psycopg2.Error as e:
+            # A connection the server dropped is already closed and cannot be rolled back
+            if not self.conn.closed:
+                self.conn.rollback()
+            self.logger.log_json("ERROR", f"Failure executing batch insert: {e}", {"table": table, "rows": len(rows)})
+            return False
+        except ConnectionError as e:
+            self.logger.log_json("ERROR", f"Connection error: {e}", {"table": table, "rows": len(rows)})
+            return False
+
+    def notify(self, channel, payload):
+        """Send a notification to the listeners of a channel; it is delivered once committed.
+
+        Args:
+            channel (str): The channel name.
+            payload (str): The notification payload.
+
+        Returns:
+            bool: True if the notification was sent and committed.
+        """
+        return self.execute_query("SELECT pg_notify(%s, %s)", (channel, payload)) is not None
+
+    def notify_changes(self, table, rows, station_key, time_key="timestamp"):
+        """Announce a committed batch of rows with a single NOTIFY on the table's channel.
+
+        Args:
+            table (str): The table the rows were written to.
+            rows (list): The written rows.
+            station_key (str): The column identifying the station (buoy_id or spot_id).
+            time_key (str, optional): The column holding the row's time.
+
+        Returns:
+            bool: True if the notification was sent (or there were no rows).
+        """
+        if not rows:
+            return True
+        return self.notify(change_channel(table), change_payload(table, rows, station_key, time_key))
+
     def select(self, table, columns="*", where=None, params=None):
         """Select data from a table.
 
@@ -103,6 +358,81 @@ class PostgresConnection:
             query += f" WHERE {where}"
         return self.execute_query(query, params, fetch=True)
 
+    def stream_query(self, query, params=None, fetch_size=2000, chunked=False, columnar=False):
+        """Run a query through a named server-side cursor and yield its results lazily.
+
+        Only fetch_size rows are held in client memory at a time, so peak memory does not
+        depend on the size of the result. The read runs in its own transaction, which is
+        ended once the results are exhausted or the generator is closed.
+
+        Args:
+            query (str or sql.Composable): The SQL query to execute.
+            params (tuple or list, optional): Parameters to bind to the query.
+            fetch_size (int, optional): Number of rows fetched from the server per round trip.
+            chunked (bool, optional): Yield lists of up to fetch_size rows instead of single rows.
+            columnar (bool, optional): Yield chunks as dicts of column name to a tuple of values,
+                ready for pandas.DataFrame or numpy.asarray.
+
+        Yields:
+            tuple, list or dict: Rows, chunks of rows, or column-oriented chunks.
+
+        Raises:
+            ConnectionError: If the connection is not established.
+            psycopg2.Error: If the query fails (logged before being raised).
+        """
+        if not self.conn:
+            self.logger.log_json("ERROR", "Connection error: PostgreSQL connection is not established")
+            raise ConnectionError("PostgreSQL connection is not established")
+
+        cursor = self.conn.cursor(name=f"stream_{uuid.uuid4().hex}")
+        cursor.itersize = fetch_size
+        started, streamed, finished = time.perf_counter(), 0, False
+        try:
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    finished = True
+                    break
+                streamed += len(rows)
+                if columnar:
+                    names = [column[0] for column in cursor.description]
+                    yield dict(zip(names, zip(*rows)))
+                elif chunked:
+                    yield rows
+                else:
+                    yield from rows
+        except psycopg2.Error as e:
+            self.logger.log_json("ERROR", f"Failure streaming query: {e}")
+            raise
+        finally:
+            cursor.close()
+            self.conn.rollback()  # Read only: end the transaction holding the cursor's snapshot
+            if finished:
+                # Includes the time the consumer spent between chunks
+                self._observe(query, started, streamed, explain=False)
+
+    def iter_select(self, table, columns="*", where=None, params=None, order_by=None, **kwargs):
+        """Select data from a table lazily through a server-side cursor.
+
+        Args:
+            table (str): The table to select data from.
+            columns (str, optional): Columns to select, defaults to '*' for all columns.
+            where (str, optional): The WHERE condition, if any.
+            params (tuple or list, optional): Parameters to bind to the WHERE clause.
+            order_by (str, optional): The ORDER BY clause, if any.
+            **kwargs: fetch_size, chunked and columnar, as for stream_query().
+
+        Yields:
+            tuple, list or dict: Rows, chunks of rows, or column-oriented chunks.
+        """
+        query = f"SELECT {columns} FROM {table}"
+        if where:
+            query += f" WHERE {where}"
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        return self.stream_query(query, params, **kwargs)
+
     # Context Manager methods
     def __enter__(self):
         """Enter the context manager (opens the connection)."""
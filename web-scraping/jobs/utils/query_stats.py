@@ -0,0 +1,102 @@
+# Standard Library Imports
+import re
+import threading
+from functools import lru_cache
+
+# Longest statement shape kept in logs and the run manifest
+SHAPE_MAX_LENGTH = 300
+
+# Number of statement shapes listed in the per-run summary
+SUMMARY_TOP = 10
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.$])-?\d+(?:\.\d+)?(?![\w.])")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_VALUE_ROWS = re.compile(r"\(\s*\?\s*\)(?:\s*,\s*\(\s*\?\s*\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+@lru_cache(maxsize=1024)
+def statement_shape(query):
+    """
+    Reduce a statement to its shape: literals and placeholders become ?, whitespace is
+    collapsed and repeated lists are folded, so executions that differ only in their
+    values share one shape and no parameter value is ever logged.
+
+    Args:
+        query (str): The statement text, as passed to the cursor (before binding).
+
+    Returns:
+        str: The normalized statement, truncated to SHAPE_MAX_LENGTH characters.
+    """
+    shape = _STRING_LITERAL.sub("?", str(query))
+    shape = shape.replace("%s", "?")
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _WHITESPACE.sub(" ", shape).strip()
+    shape = _PLACEHOLDER_LIST.sub("?", shape)
+    shape = _VALUE_ROWS.sub("(?)", shape)
+    if len(shape) > SHAPE_MAX_LENGTH:
+        shape = shape[:SHAPE_MAX_LENGTH - 3] + "..."
+    return shape
+
+class QueryStats:
+    """
+    Per-run aggregate of database time by statement shape.
+
+    The run's Logger owns one instance and every PostgresConnection opened with that logger
+    records into it, so the total covers the many short connections a run opens. The summary
+    is logged when the run ends and written to its manifest.
+    """
+
+    def __init__(self):
+        """Initializes the QueryStats object."""
+        self.shapes = {}
+        self.explained = set()
+        self.lock = threading.Lock()
+
+    def record(self, shape, seconds, rows=None, slow=False):
+        """
+        Add one execution of a statement.
+
+        Args:
+            shape (str): The statement shape.
+            seconds (float): Time spent executing (and fetching).
+            rows (int, optional): Rows returned or affected, when known.
+            slow (bool, optional): Whether it exceeded the slow-query threshold.
+        """
+        with self.lock:
+            entry = self.shapes.setdefault(shape, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "slow": 0})
+            milliseconds = seconds * 1000
+            entry["calls"] += 1
+            entry["total_ms"] += milliseconds
+            entry["max_ms"] = max(entry["max_ms"], milliseconds)
+            entry["rows"] += max(rows or 0, 0)
+            entry["slow"] += int(slow)
+
+    def claim_explain(self, shape):
+        """Return True the first time a shape is claimed, so each slow shape is explained once per run."""
+        with self.lock:
+            if shape in self.explained:
+                return False
+            self.explained.add(shape)
+            return True
+
+    def summary(self, top=SUMMARY_TOP):
+        """
+        Summarize the run's statements, most total time first.
+
+        Returns:
+            dict: Totals and the top statement shapes with their calls, time, rows and slow count.
+        """
+        with self.lock:
+            ordered = sorted(self.shapes.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+            return {
+                "statements": sum(entry["calls"] for entry in self.shapes.values()),
+                "total_ms": round(sum(entry["total_ms"] for entry in self.shapes.values()), 1),
+                "shapes": [
+                    {"statement": shape, **entry, "total_ms": round(entry["total_ms"], 1), "max_ms": round(entry["max_ms"], 1)}
+                    for shape, entry in ordered[:top]
+                ]
+            }
+
+    def __bool__(self):
+        return bool(self.shapes)
@@ -0,0 +1,250 @@
+# Standard Library Imports
+import fcntl
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+# Local Application Imports
+from .state import STATE_DIR, load_json, save_json
+
+# OpenWeather plan limits (free plan: 60 calls per minute, 1,000,000 per month; 0 = no daily limit)
+OPENWEATHER_CALLS_PER_MINUTE = float(os.getenv("OPENWEATHER_CALLS_PER_MINUTE", "60"))
+OPENWEATHER_DAILY_CALLS = int(os.getenv("OPENWEATHER_DAILY_CALLS", "0"))
+OPENWEATHER_MONTHLY_CALLS = int(os.getenv("OPENWEATHER_MONTHLY_CALLS", "1000000"))
+
+# Share of the monthly quota held back for retries and manual runs
+QUOTA_RESERVE = float(os.getenv("QUOTA_RESERVE", "0.05"))
+
+# Longest wait for a rate-limit token before a request is given up
+MAX_TOKEN_WAIT_SECONDS = float(os.getenv("MAX_TOKEN_WAIT_SECONDS", "30"))
+
+# Calls counted in memory before they are merged into the ledger file
+FLUSH_EVERY = 50
+
+# Days of per-day counts kept in the ledger
+KEEP_DAYS = 40
+
+class QuotaLedger:
+    """
+    Persisted API quota ledger with a token-bucket rate limiter.
+
+    Every request is acquired from the ledger first. The token bucket (capacity one
+    minute of calls) spaces requests to the per-minute limit, and per-day and per-month
+    call counts stop requests once the plan limit is reached. Counts are merged into a
+    JSON file under a file lock, so every job and shard using the same API key draws
+    from one ledger.
+
+    Each run also plans against a paced daily budget: the month's remaining calls spread
+    over its remaining days, unlocked gradually over the day. ration() trims a run that
+    would use more than that, so the quota lasts until it resets instead of running out
+    mid-period.
+    """
+
+    def __init__(self, name="openweather", path=None, calls_per_minute=OPENWEATHER_CALLS_PER_MINUTE,
+                 daily_limit=OPENWEATHER_DAILY_CALLS, monthly_limit=OPENWEATHER_MONTHLY_CALLS,
+                 reserve=QUOTA_RESERVE, max_wait=MAX_TOKEN_WAIT_SECONDS, shard_count=1, clock=time.time,
+                 sleep=time.sleep):
+        """
+        Initializes the QuotaLedger object.
+
+        Args:
+            name (str, optional): The API name, used as the file name.
+            path (str, optional): Path of the ledger file, defaults to <state dir>/quota/<name>.json.
+            calls_per_minute (float, optional): Rate limit (0 disables the token bucket).
+            daily_limit (int, optional): Calls allowed per UTC day (0 for none).
+            monthly_limit (int, optional): Calls allowed per UTC month (0 for none).
+            reserve (float, optional): Share of the monthly limit kept out of the paced budget.
+            max_wait (float, optional): Longest wait for a token before acquire() gives up.
+            shard_count (int, optional): Sharded runs splitting the plan. Each shard keeps its ledger on its
+                own state volume, so each gets an equal share of the rate and limits.
+            clock (callable, optional): Returns the current time in seconds.
+            sleep (callable, optional): Sleeps for a number of seconds.
+        """
+        self.path = path or os.path.join(STATE_DIR, "quota", f"{name}.json")
+        self.calls_per_minute = calls_per_minute / shard_count
+        self.daily_limit = max(daily_limit // shard_count, 1) if daily_limit else 0
+        self.monthly_limit = max(monthly_limit // shard_count, 1) if monthly_limit else 0
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+
+        state = load_json(self.path, {})
+        self.days = state.get("days", {})
+        self.months = state.get("months", {})
+        bucket = state.get("bucket", {})
+        self.tokens = min(float(bucket.get("tokens", self.capacity)), self.capacity)
+        self.updated = float(bucket.get("updated", clock()))
+
+        self.pending = 0  # Calls not yet merged into the file
+        self.calls = 0  # Calls made by this run
+        self.denied = 0
+        self.rejected = False  # The API answered 429: stop for the rest of the run
+
+    @property
+    def capacity(self):
+        """Token bucket size: one minute of calls."""
+        return max(self.calls_per_minute, 1)
+
+    def _now(self):
+        return datetime.fromtimestamp(self.clock(), tz=timezone.utc)
+
+    def used_today(self):
+        """Calls made so far in the current UTC day."""
+        return self.days.get(self._now().strftime("%Y-%m-%d"), 0)
+
+    def used_this_month(self):
+        """Calls made so far in the current UTC month."""
+        return self.months.get(self._now().strftime("%Y-%m"), 0)
+
+    def exhausted(self):
+        """Return True if a plan limit has been reached or the API rejected a call."""
+        return (self.rejected
+                or (self.daily_limit and self.used_today() >= self.daily_limit)
+                or (self.monthly_limit and self.used_this_month() >= self.monthly_limit))
+
+    def acquire(self):
+        """
+        Take one call from the ledger, waiting for a rate-limit token if needed.
+
+        Returns:
+            bool: True if the call may be made, False if the quota is exhausted or no token
+                becomes available within max_wait.
+        """
+        with self.lock:
+            if self.exhausted():
+                self.denied += 1
+                return False
+
+            if self.calls_per_minute > 0:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.calls_per_minute / 60)
+                self.updated = now
+                if self.tokens < 1:
+                    wait = (1 - self.tokens) * 60 / self.calls_per_minute
+                    if wait > self.max_wait:
+                        self.denied += 1
+                        return False
+                    self.sleep(wait)
+                    self.tokens, self.updated = 1.0, self.updated + wait
+                self.tokens -= 1
+
+            now = self._now()
+            day, month = now.strftime("%Y-%m-%d"), now.strftime("%Y-%m")
+            self.days[day] = self.days.get(day, 0) + 1
+            self.months[month] = self.months.get(month, 0) + 1
+            self.pending += 1
+            self.calls += 1
+            flush = self.pending >= FLUSH_EVERY
+        if flush:
+            self.save()
+        return True
+
+    def record_rejection(self):
+        """Note that the API rejected a call for exceeding the quota (HTTP 429)."""
+        self.rejected = True
+
+    def save(self):
+        """Merge this process's new calls into the ledger file, which other jobs may have updated since."""
+        with self.lock:
+            pending, self.pending = self.pending, 0
+            now = self._now()
+            day, month = now.strftime("%Y-%m-%d"), now.strftime("%Y-%m")
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(f"{self.path}.lock", "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                state = load_json(self.path, {})
+                days, months = state.get("days", {}), state.get("months", {})
+                # Calls are attributed to the day of the merge; at most FLUSH_EVERY can straddle midnight
+                days[day] = days.get(day, 0) + pending
+                months[month] = months.get(month, 0) + pending
+                days = {key: days[key] for key in sorted(days)[-KEEP_DAYS:]}
+                months = {key: months[key] for key in sorted(months)[-2:]}
+                save_json(self.path, {"days": days, "months": months,
+                                      "bucket": {"tokens": self.tokens, "updated": self.updated}})
+            self.days, self.months = days, months
+
+    def daily_budget(self):
+        """Calls available for the whole current day: the month's remaining calls (less the reserve) over its remaining days."""
+        now = self._now()
+        budget = math.inf
+        if self.monthly_limit:
+            next_month = datetime(now.year + now.month // 12, now.month % 12 + 1, 1, tzinfo=timezone.utc)
+            days_left = (next_month.date() - now.date()).days
+            month_before_today = self.used_this_month() - self.used_today()
+            budget = max(self.monthly_limit * (1 - self.reserve) - month_before_today, 0) / days_left
+        if self.daily_limit:
+            budget = min(budget, self.daily_limit)
+        return budget
+
+    def allowance(self, interval_seconds=3600):
+        """
+        Calls this run may plan to use.
+
+        The daily budget is unlocked in proportion to the part of the day that will have
+        passed by the next run, so usage is paced across the day; calls left unused by
+        earlier runs stay available.
+
+        Args:
+            interval_seconds (float, optional): Time until the next run of the job.
+
+        Returns:
+            float: The allowance (inf without limits).
+        """
+        if self.exhausted():
+            return 0
+        now = self._now()
+        elapsed = now.hour * 3600 + now.minute * 60 + now.second
+        unlocked = self.daily_budget() * min(1.0, (elapsed + interval_seconds) / 86400)
+        return max(unlocked - self.used_today(), 0)
+
+    def ration(self, items, estimate, linked=None, interval_seconds=3600):
+        """
+        Trim a run's work to its allowance.
+
+        Args:
+            items (list): The stations to fetch, highest priority first.
+            estimate (callable): Returns the number of calls needed to fetch a list of items.
+            linked (callable, optional): Returns True for items that must be kept before others.
+            interval_seconds (float, optional): Time until the next run of the job.
+
+        Returns:
+            tuple: The items to fetch and the level: "normal", "linked_only" (only linked
+                items fit), "rationed" (only the highest priority prefix fits) or "paused"
+                (nothing fits).
+        """
+        allowance = self.allowance(interval_seconds)
+        if estimate(items) <= allowance:
+            return items, "normal"
+
+        if linked:
+            linked_items = [item for item in items if linked(item)]
+            if linked_items and len(linked_items) < len(items) and estimate(linked_items) <= allowance:
+                return linked_items, "linked_only"
+            items = linked_items or items
+
+        # Largest prefix that fits (estimates grow with the number of items)
+        low, high = 0, len(items)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if estimate(items[:middle]) <= allowance:
+                low = middle
+            else:
+                high = middle - 1
+        return items[:low], "rationed" if low else "paused"
+
+    def report(self):
+        """Quota use, for the run log."""
+        daily_budget = self.daily_budget()
+        return {
+            "calls": self.calls,
+            "denied": self.denied,
+            "rejected": self.rejected,
+            "used_today": self.used_today(),
+            "daily_budget": None if math.isinf(daily_budget) else int(daily_budget),
+            "used_this_month": self.used_this_month(),
+            "monthly_limit": self.monthly_limit or None
+        }
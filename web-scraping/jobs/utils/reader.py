@@ -0,0 +1,313 @@
+# Standard Library Imports
+import os
+import time
+from collections import OrderedDict, namedtuple
+
+# Third-Party Imports
+import numpy as np
+import pandas as pd
+
+# Memory the cached time ranges may use before the least recently read ones are evicted
+READER_MEMORY_BUDGET_MB = float(os.getenv("READER_MEMORY_BUDGET_MB", "256"))
+
+# Readings this recent may still arrive (late pages, spool replays), so they are returned but not cached
+READER_SETTLE_SECONDS = float(os.getenv("READER_SETTLE_SECONDS", "7200"))
+
+# Station column and value columns with their NumPy dtypes. NULLs become NaN, so SMALLINT
+# columns are read as float32.
+TableSpec = namedtuple("TableSpec", ["station_key", "columns"])
+READ_TABLES = {
+    "ingested.swell_data": TableSpec("buoy_id", {
+        "wave_height": np.float64,
+        "swell_height": np.float64,
+        "swell_period": np.float64,
+        "swell_direction": np.float32,
+        "wind_wave_height": np.float64,
+        "wind_wave_period": np.float64,
+        "wind_wave_direction": np.float32,
+        "wave_steepness": np.float32,
+        "average_wave_period": np.float64,
+        "tide": np.float64
+    }),
+    "ingested.wind_data": TableSpec("spot_id", {
+        "wind_speed": np.float64,
+        "wind_direction": np.float32,
+        "wind_gust": np.float64
+    }),
+    "ingested.spot_conditions": TableSpec("spot_id", {
+        "wave_height": np.float64,
+        "swell_height": np.float64,
+        "swell_period": np.float64,
+        "swell_direction": np.float64,
+        "wind_wave_height": np.float64,
+        "wind_wave_period": np.float64,
+        "wind_wave_direction": np.float64,
+        "average_wave_period": np.float64,
+        "tide": np.float64,
+        "wind_speed": np.float64,
+        "wind_direction": np.float32,
+        "wind_gust": np.float64
+    })
+}
+
+def to_utc(value):
+    """Convert a datetime, string or Timestamp to a UTC pandas Timestamp; naive values are taken as UTC."""
+    timestamp = pd.Timestamp(value)
+    return timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp.tz_convert("UTC")
+
+def subtract_ranges(start, end, covered):
+    """
+    Return the parts of [start, end) not covered by any of the sorted, non-overlapping ranges.
+
+    Args:
+        start (Timestamp): Start of the requested range.
+        end (Timestamp): Exclusive end of the requested range.
+        covered (list): (start, end) ranges ordered by start.
+
+    Returns:
+        list: The missing (start, end) ranges, in order.
+    """
+    gaps = []
+    cursor = start
+    for covered_start, covered_end in covered:
+        if covered_end <= cursor:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start))
+        cursor = max(cursor, covered_end)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+class _Segment:
+    """One station's cached readings for a contiguous time range [start, end)."""
+
+    __slots__ = ("key", "start", "end", "frame", "times", "nbytes")
+
+    def __init__(self, key, start, end, frame):
+        self.key = key
+        self.start = start
+        self.end = end
+        self.frame = frame.reset_index(drop=True)
+        self.times = self.frame["timestamp"].to_numpy(dtype="datetime64[ns]")
+        self.nbytes = int(self.frame.memory_usage(index=True).sum())
+
+    def slice(self, start, end):
+        """Return the readings in [start, end)."""
+        lo, hi = np.searchsorted(self.times, [start.to_datetime64(), end.to_datetime64()])
+        return self.frame.iloc[lo:hi]
+
+class SurfDataReader:
+    """
+    Reads station time series from ingested.* into column-oriented NumPy/pandas results.
+
+    Rows are streamed from a server-side cursor in chunks and converted straight into typed
+    arrays (float64/float32 with NaN for NULL, datetime64 timestamps), without building
+    per-row Python objects for the caller. Every station's settled readings are cached as
+    time ranges; a request that overlaps cached ranges only fetches the missing parts, with
+    one query per distinct gap covering all the requested stations. Cached ranges are
+    evicted least recently read first once they exceed the memory budget.
+
+    Usage:
+        with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+            reader = SurfDataReader(db_connection)
+            swell = reader.read("ingested.swell_data", [46225, 46221], "2025-12-01", "2025-12-31")
+    """
+
+    def __init__(self, db_connection, memory_budget_mb=READER_MEMORY_BUDGET_MB, settle_seconds=READER_SETTLE_SECONDS,
+                 fetch_size=5000, clock=time.time):
+        """
+        Initializes the SurfDataReader object.
+
+        Args:
+            db_connection (PostgresConnection): An open database connection.
+            memory_budget_mb (float, optional): Memory the cached ranges may use, in MiB.
+            settle_seconds (float, optional): Readings newer than this are never cached.
+            fetch_size (int, optional): Rows fetched from the server per round trip.
+            clock (callable, optional): Returns the current Unix time, for tests.
+        """
+        self.db_connection = db_connection
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.settle_seconds = settle_seconds
+        self.fetch_size = fetch_size
+        self.clock = clock
+        self.segments = {}  # (table, station_id) -> [_Segment] ordered by start
+        self.lru = OrderedDict()  # id(_Segment) -> _Segment, least recently read first
+        self.nbytes = 0
+        self.stats = {"requests": 0, "hits": 0, "queries": 0, "rows_fetched": 0, "evictions": 0}
+
+    def read(self, table, station_ids, start, end, columns=None):
+        """
+        Read the readings of some stations in [start, end).
+
+        Args:
+            table (str): One of READ_TABLES, e.g. "ingested.swell_data".
+            station_ids (list): Buoy or spot IDs.
+            start: Inclusive start (datetime, string or Timestamp; naive means UTC).
+            end: Exclusive end.
+            columns (list, optional): Value columns to return, defaults to all of the table's.
+
+        Returns:
+            pandas.DataFrame: The station column, a UTC timestamp column and the value
+                columns, ordered by station and time.
+
+        Raises:
+            ValueError: If the table or a column is not readable.
+            ConnectionError, psycopg2.Error: If a fetch fails (see PostgresConnection.stream_query).
+        """
+        spec = self._spec(table, columns)
+        columns = list(spec.columns) if columns is None else list(columns)
+        start, end = to_utc(start), to_utc(end)
+        station_ids = list(dict.fromkeys(int(station_id) for station_id in station_ids))
+        self.stats["requests"] += 1
+
+        # Stations sharing the same missing ranges are fetched together
+        missing = {}
+        for station_id in station_ids:
+            covered = [(segment.start, segment.end) for segment in self.segments.get((table, station_id), [])]
+            for gap in subtract_ranges(start, end, covered):
+                missing.setdefault(gap, []).append(station_id)
+        if not missing:
+            self.stats["hits"] += 1
+
+        settled = to_utc(pd.Timestamp(self.clock() - self.settle_seconds, unit="s"))
+        unsettled = []
+        for (gap_start, gap_end), gap_station_ids in missing.items():
+            fetched = self._fetch(table, spec, gap_station_ids, gap_start, gap_end)
+            unsettled.append(fetched[fetched["timestamp"] >= settled])
+            if gap_start < settled:
+                self._store(table, spec, gap_station_ids, gap_start, min(gap_end, settled),
+                            fetched[fetched["timestamp"] < settled])
+
+        pieces = []
+        for station_id in station_ids:
+            for segment in self.segments.get((table, station_id), []):
+                if segment.end > start and segment.start < end:
+                    self.lru.move_to_end(id(segment))
+                    pieces.append(segment.slice(start, end).assign(**{spec.station_key: station_id}))
+        pieces.extend(unsettled)
+        result = self._combine(pieces, spec)
+        self._evict()
+        return result[[spec.station_key, "timestamp"] + columns]
+
+    def read_arrays(self, table, station_ids, start, end, columns=None):
+        """
+        Read like read(), returning a dict of column name to NumPy array.
+
+        Returns:
+            dict: The station IDs (int32), timestamps (datetime64[ns], UTC) and value columns.
+        """
+        frame = self.read(table, station_ids, start, end, columns)
+        return {column: frame[column].to_numpy() for column in frame.columns}
+
+    def cache_info(self):
+        """Return the request statistics and the cache's current size."""
+        return {**self.stats, "segments": len(self.lru), "bytes": self.nbytes, "budget": self.memory_budget}
+
+    def clear(self):
+        """Drop every cached range."""
+        self.segments.clear()
+        self.lru.clear()
+        self.nbytes = 0
+
+    @staticmethod
+    def _spec(table, columns):
+        """Return the table's spec, validating the requested columns."""
+        if table not in READ_TABLES:
+            raise ValueError(f"Unsupported table: {table}")
+        spec = READ_TABLES[table]
+        unknown = [column for column in columns or [] if column not in spec.columns]
+        if unknown:
+            raise ValueError(f"Unknown columns for {table}: {unknown}")
+        return spec
+
+    def _fetch(self, table, spec, station_ids, start, end):
+        """Fetch every value column of some stations in [start, end) into typed arrays."""
+        query = (
+            f"SELECT {spec.station_key}, timestamp, {', '.join(spec.columns)} FROM {table} "
+            f"WHERE {spec.station_key} = ANY(%s) AND timestamp >= %s AND timestamp < %s "
+            f"ORDER BY {spec.station_key}, timestamp"
+        )
+        params = (station_ids, start.to_pydatetime(), end.to_pydatetime())
+        self.stats["queries"] += 1
+
+        chunks = {name: [] for name in [spec.station_key, "timestamp"] + list(spec.columns)}
+        for chunk in self.db_connection.stream_query(query, params, fetch_size=self.fetch_size, columnar=True):
+            chunks[spec.station_key].append(np.asarray(chunk[spec.station_key], dtype=np.int32))
+            chunks["timestamp"].append(pd.to_datetime(chunk["timestamp"], utc=True).tz_localize(None).to_numpy())
+            for column, dtype in spec.columns.items():
+                chunks[column].append(np.array(chunk[column], dtype=dtype))
+
+        arrays = {
+            column: np.concatenate(parts) if parts else np.empty(0, dtype=self._dtype(spec, column))
+            for column, parts in chunks.items()
+        }
+        self.stats["rows_fetched"] += len(arrays["timestamp"])
+        frame = pd.DataFrame(arrays)
+        frame["timestamp"] = frame["timestamp"].dt.tz_localize("UTC")
+        return frame
+
+    @staticmethod
+    def _dtype(spec, column):
+        """Return the dtype of a column of the fetched frame."""
+        if column == spec.station_key:
+            return np.int32
+        if column == "timestamp":
+            return "datetime64[ns]"
+        return spec.columns[column]
+
+    def _store(self, table, spec, station_ids, start, end, fetched):
+        """Cache the fetched range [start, end) of every station, merging it with adjacent ranges."""
+        stations = fetched[spec.station_key].to_numpy()
+        for station_id in station_ids:
+            lo, hi = np.searchsorted(stations, [station_id, station_id + 1])
+            frame = fetched.iloc[lo:hi].drop(columns=spec.station_key)
+
+            key = (table, station_id)
+            touching = [segment for segment in self.segments.get(key, []) if segment.end >= start and segment.start <= end]
+            for segment in touching:
+                self._drop(segment)
+            if touching:
+                frames = [segment.frame for segment in touching] + [frame]
+                frame = pd.concat(frames, ignore_index=True).sort_values("timestamp", kind="stable")
+                frame = frame.drop_duplicates("timestamp", keep="last")
+                start_, end_ = min(start, touching[0].start), max(end, touching[-1].end)
+            else:
+                start_, end_ = start, end
+
+            segment = _Segment(key, start_, end_, frame)
+            segments = self.segments.setdefault(key, [])
+            segments.append(segment)
+            segments.sort(key=lambda cached: cached.start)
+            self.lru[id(segment)] = segment
+            self.nbytes += segment.nbytes
+
+    def _drop(self, segment):
+        """Remove a segment from the cache."""
+        segments = self.segments[segment.key]
+        segments.remove(segment)
+        if not segments:
+            del self.segments[segment.key]
+        del self.lru[id(segment)]
+        self.nbytes -= segment.nbytes
+
+    def _evict(self):
+        """Evict the least recently read ranges until the cache fits the memory budget."""
+        while self.nbytes > self.memory_budget and self.lru:
+            self._drop(next(iter(self.lru.values())))
+            self.stats["evictions"] += 1
+
+    def _combine(self, pieces, spec):
+        """Concatenate the result pieces ordered by station and time."""
+        columns = [spec.station_key, "timestamp"] + list(spec.columns)
+        pieces = [piece for piece in pieces if len(piece)]
+        if not pieces:
+            empty = {column: np.empty(0, dtype=self._dtype(spec, column)) for column in columns}
+            frame = pd.DataFrame(empty)
+            frame["timestamp"] = frame["timestamp"].dt.tz_localize("UTC")
+            return frame
+        frame = pd.concat([piece[columns] for piece in pieces], ignore_index=True)
+        frame[spec.station_key] = frame[spec.station_key].astype(np.int32)
+        return frame.sort_values([spec.station_key, "timestamp"], kind="stable", ignore_index=True)
@@ -0,0 +1,131 @@
+# Standard Library Imports
+import json
+import os
+from datetime import datetime, timezone
+
+# Third-Party Imports (optional: publishing is disabled when redis is not installed)
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Redis Configuration (publishing is disabled unless REDIS_URL is set)
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+
+# Latest reading per station, read by the API's /spots/:id/live route before it falls back
+# to Postgres (api/src/config/redis.ts), so payloads match the rows that route selects.
+# TTLs cover the longest interval between two fresh readings (swell buoys are polled at
+# least every 3 hours, wind hourly) so an entry only expires once its station stops reporting.
+SWELL_FIELDS = ["timestamp", "wave_height", "swell_height", "swell_period", "swell_direction", "tide"]
+WIND_FIELDS = ["timestamp", "wind_speed", "wind_direction", "wind_gust"]
+SWELL_TTL_SECONDS = 3 * 3600
+WIND_TTL_SECONDS = 2 * 3600
+
+# Readings are stored as naive UTC; the API serializes timestamps the way node-postgres does
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+API_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.000Z"
+
+def swell_key(buoy_id):
+    """Cache key of a buoy's latest swell reading."""
+    return f"swell:buoy:{buoy_id}:latest"
+
+def wind_key(spot_id):
+    """Cache key of a spot's latest wind reading."""
+    return f"wind:spot:{spot_id}:latest"
+
+def to_payload(reading, fields):
+    """
+    Select the API's fields of a reading, with numbers as numbers and the timestamp in ISO 8601 UTC.
+
+    Args:
+        reading (dict): An inserted row.
+        fields (list): The columns the API selects.
+
+    Returns:
+        dict: The payload to cache.
+    """
+    payload = {}
+    for field in fields:
+        value = reading.get(field)
+        if field == "timestamp" and isinstance(value, str):
+            value = datetime.strptime(value, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+        if isinstance(value, datetime):
+            value = (value.astimezone(timezone.utc) if value.tzinfo else value).strftime(API_TIMESTAMP_FORMAT)
+        elif isinstance(value, str):
+            try:
+                value = float(value)
+            except ValueError:
+                pass
+        payload[field] = value
+    return payload
+
+class RedisPublisher:
+    """
+    Writes freshly ingested readings into Redis for the API's live spot data.
+
+    The API reads these keys first and only queries Postgres on a miss, so the live route
+    serves the latest committed reading without a database round trip. Publishing is optional:
+    without REDIS_URL (or the redis package) every call is a no-op, and Redis errors are
+    logged as warnings without failing the job.
+    """
+
+    def __init__(self, client=None, url=REDIS_URL):
+        """
+        Initializes the RedisPublisher object.
+
+        Args:
+            client (redis.Redis, optional): A Redis client, defaults to one for REDIS_URL.
+            url (str, optional): The Redis URL, e.g. redis://redis.default.svc:6379/0.
+        """
+        if client is None and url and redis is not None:
+            client = redis.Redis.from_url(url, password=REDIS_PASSWORD, socket_timeout=2, socket_connect_timeout=2)
+        self.client = client
+
+    @property
+    def enabled(self):
+        """Whether readings are published."""
+        return self.client is not None
+
+    def publish(self, entries, ttl, logger):
+        """
+        Write readings in a single pipelined round trip.
+
+        Args:
+            entries (list): Tuples of (key, payload dict).
+            ttl (int): Expiry of every entry, in seconds.
+            logger (Logger): The logger instance to log messages.
+
+        Returns:
+            int: The number of entries written.
+        """
+        if not self.enabled or not entries:
+            return 0
+
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for key, payload in entries:
+                pipeline.set(key, json.dumps(payload, default=str), ex=ttl)
+            pipeline.execute()
+        except Exception as e:
+            logger.log_json("WARNING", "Failed to publish readings to Redis", {"entries": len(entries), "error": str(e)})
+            return 0
+
+        logger.log_json("INFO", "Published readings to Redis", {"entries": len(entries)})
+        return len(entries)
+
+    def publish_swell(self, readings, logger):
+        """Publish inserted swell readings under swell:buoy:<buoy_id>:latest."""
+        entries = [
+            (swell_key(reading["buoy_id"]), to_payload(reading, SWELL_FIELDS))
+            for reading in readings
+        ]
+        return self.publish(entries, SWELL_TTL_SECONDS, logger)
+
+    def publish_wind(self, readings, logger):
+        """Publish inserted wind readings under wind:spot:<spot_id>:latest."""
+        entries = [
+            (wind_key(reading["spot_id"]), to_payload(reading, WIND_FIELDS))
+            for reading in readings
+        ]
+        return self.publish(entries, WIND_TTL_SECONDS, logger)
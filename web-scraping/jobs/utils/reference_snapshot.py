@@ -0,0 +1,126 @@
+# Standard Library Imports
+import os
+from datetime import datetime, timezone
+
+# Local Application Imports
+from .state import STATE_DIR, load_json, save_json
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Checksums of the reference rows the scrapers use; the snapshot is rebuilt only when one of them changes
+REFERENCE_VERSION_QUERY = """
+SELECT (SELECT md5(COALESCE(string_agg(concat_ws(':', id, latitude, longitude), ',' ORDER BY id), ''))
+        FROM reference.buoy_info),
+       (SELECT md5(COALESCE(string_agg(concat_ws(':', id, latitude, longitude), ',' ORDER BY id), ''))
+        FROM reference.spot_info),
+       (SELECT md5(COALESCE(string_agg(concat_ws(':', spot_id, buoy_id), ',' ORDER BY spot_id, buoy_id), ''))
+        FROM reference.spot_buoy_link)
+"""
+
+BUOYS_QUERY = "SELECT id, latitude, longitude FROM reference.buoy_info ORDER BY id"
+SPOTS_QUERY = "SELECT id, latitude, longitude FROM reference.spot_info ORDER BY id"
+LINKS_QUERY = "SELECT spot_id, buoy_id FROM reference.spot_buoy_link ORDER BY spot_id, buoy_id"
+
+class ReferenceSnapshot:
+    """
+    Persisted snapshot of the reference data: buoys, spots and the spot-buoy links.
+
+    The snapshot is shared by every run on the volume. A run checks one checksum query
+    against the snapshot's version and only re-reads the reference tables when they
+    changed, so an unchanged station list costs a single cheap query. The lookups the
+    scrapers need (station lists, link maps, fetch priorities) are built once on load.
+    """
+
+    def __init__(self, path=None):
+        """
+        Initializes the ReferenceSnapshot object from the snapshot file, if there is one.
+
+        Args:
+            path (str, optional): Path of the JSON snapshot, defaults to <state dir>/reference-snapshot.json.
+        """
+        self.path = path or os.getenv("REFERENCE_SNAPSHOT_PATH", os.path.join(STATE_DIR, "reference-snapshot.json"))
+        snapshot = load_json(self.path, {})
+        try:
+            self._index(snapshot["version"], snapshot["buoys"], snapshot["spots"], snapshot["links"])
+            self.saved_at = snapshot.get("saved_at")
+        except (KeyError, TypeError, ValueError):
+            self._index(None, [], [], [])
+            self.saved_at = None
+
+    def _index(self, version, buoys, spots, links):
+        """Replace the reference data and rebuild the lookups derived from it."""
+        self.version = version
+        self.buoys = [(int(buoy_id), float(latitude), float(longitude)) for buoy_id, latitude, longitude in buoys]
+        self.spots = [(int(spot_id), float(latitude), float(longitude)) for spot_id, latitude, longitude in spots]
+        self.links = [(int(spot_id), int(buoy_id)) for spot_id, buoy_id in links]
+
+        self.buoy_ids = [buoy[0] for buoy in self.buoys]
+        self.buoy_locations = {buoy_id: (latitude, longitude) for buoy_id, latitude, longitude in self.buoys}
+        self.spot_buoys = {}
+        self.buoy_spots = {}
+        for spot_id, buoy_id in self.links:
+            self.spot_buoys.setdefault(spot_id, []).append(buoy_id)
+            self.buoy_spots.setdefault(buoy_id, []).append(spot_id)
+
+        # Fetch priorities for utils.deadline.prioritize: station ID (as a string) to number of links.
+        # Stations more spots depend on are fetched first, so a run out of time skips the least used.
+        self.buoy_priorities = {str(buoy_id): len(spot_ids) for buoy_id, spot_ids in self.buoy_spots.items()}
+        self.spot_priorities = {str(spot_id): len(buoy_ids) for spot_id, buoy_ids in self.spot_buoys.items()}
+
+    @property
+    def loaded(self):
+        """Whether reference data has been loaded, from the database or the snapshot file."""
+        return self.version is not None
+
+    def refresh(self, db_connection, logger):
+        """
+        Reload the reference tables if their checksums differ from the snapshot's, and save the new snapshot.
+
+        When the version check or the reload fails, the snapshot already loaded is kept.
+
+        Args:
+            db_connection (PostgresConnection): An open database connection.
+            logger (Logger): The logger instance to log messages.
+
+        Returns:
+            bool: True if the reference data was (re)loaded from the database.
+        """
+        rows = db_connection.execute_query(REFERENCE_VERSION_QUERY, fetch=True)
+        if not rows:
+            logger.log_json("WARNING", "Could not check the reference data version", {"cached": self.loaded})
+            return False
+
+        version = [str(checksum) for checksum in rows[0]]
+        if version == self.version:
+            return False
+
+        buoys = db_connection.execute_query(BUOYS_QUERY, fetch=True)
+        spots = db_connection.execute_query(SPOTS_QUERY, fetch=True)
+        links = db_connection.execute_query(LINKS_QUERY, fetch=True)
+        if buoys is None or spots is None or links is None:
+            logger.log_json("WARNING", "Could not load the reference data", {"cached": self.loaded})
+            return False
+
+        self._index(version, buoys, spots, links)
+        self.saved_at = datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+        try:
+            save_json(self.path, self.to_dict())
+        except OSError as e:
+            logger.log_json("WARNING", "Could not save the reference data snapshot", {"path": self.path, "error": str(e)})
+
+        logger.log_json("INFO", "Loaded reference data", {
+            "buoys": len(self.buoys),
+            "spots": len(self.spots),
+            "links": len(self.links)
+        })
+        return True
+
+    def to_dict(self):
+        """The snapshot as saved: the version and the raw rows, from which the lookups are rebuilt on load."""
+        return {
+            "version": self.version,
+            "saved_at": self.saved_at,
+            "buoys": [list(buoy) for buoy in self.buoys],
+            "spots": [list(spot) for spot in self.spots],
+            "links": [list(link) for link in self.links]
+        }
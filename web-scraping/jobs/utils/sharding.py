@@ -0,0 +1,56 @@
+# Standard Library Imports
+import zlib
+
+def add_shard_arguments(parser):
+    """
+    Add the --shard-index/--shard-count arguments shared by every job entry point.
+
+    Args:
+        parser (argparse.ArgumentParser): The job's argument parser.
+    """
+    parser.add_argument("--shard-index", type=int, default=0, help="Index of the shard processed by this pod (0-based)")
+    parser.add_argument("--shard-count", type=int, default=1, help="Total number of shards the stations are split into")
+
+def check_shard_arguments(parser, args):
+    """Exit with a usage error if the parsed shard arguments are impossible."""
+    if args.shard_count < 1 or not 0 <= args.shard_index < args.shard_count:
+        parser.error(f"--shard-index must be in [0, {args.shard_count}) and --shard-count at least 1")
+
+def shard_of(station_id, shard_count):
+    """
+    Return the shard a station belongs to.
+
+    Uses CRC32 of the station ID rather than hash(), which is salted per process, so the
+    assignment is identical in every pod and a station never moves when others are added.
+
+    Args:
+        station_id (str or int): The station identifier.
+        shard_count (int): Total number of shards.
+
+    Returns:
+        int: The shard index in [0, shard_count).
+    """
+    return zlib.crc32(str(station_id).encode("utf-8")) % shard_count
+
+def filter_shard(station_ids, shard_index, shard_count):
+    """
+    Keep only the stations assigned to one shard.
+
+    Args:
+        station_ids (list): Station identifiers, or tuples whose first element is the identifier.
+        shard_index (int): The shard processed by this pod.
+        shard_count (int): Total number of shards.
+
+    Returns:
+        list: The stations belonging to the shard, in their original order.
+    """
+    if shard_count == 1:
+        return list(station_ids)
+    return [
+        station for station in station_ids
+        if shard_of(station[0] if isinstance(station, tuple) else station, shard_count) == shard_index
+    ]
+
+def shard_label(shard_index, shard_count):
+    """Return a suffix identifying the shard in file and object names, or an empty string when unsharded."""
+    return f"shard-{shard_index}-of-{shard_count}" if shard_count > 1 else ""
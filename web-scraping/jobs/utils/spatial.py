@@ -0,0 +1,124 @@
+# Third-Party Imports
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Mean Earth radius used for haversine distances
+EARTH_RADIUS_KM = 6371.0088
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance between points, in kilometres. Arguments broadcast like NumPy arrays.
+
+    Args:
+        lat1, lon1 (array-like): First points in degrees.
+        lat2, lon2 (array-like): Second points in degrees.
+
+    Returns:
+        numpy.ndarray or float: The distances.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=float)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def to_unit_vectors(latitudes, longitudes):
+    """Convert coordinates in degrees to points on the unit sphere, shape (n, 3)."""
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+def chord_to_km(chord):
+    """Convert a straight-line distance between unit vectors to the great-circle distance in kilometres."""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord, dtype=float) / 2, 0.0, 1.0))
+
+def km_to_chord(distance_km):
+    """Convert a great-circle distance in kilometres to the straight-line distance between unit vectors."""
+    return 2 * np.sin(np.minimum(np.asarray(distance_km, dtype=float), np.pi * EARTH_RADIUS_KM) / (2 * EARTH_RADIUS_KM))
+
+class SpatialIndex:
+    """
+    Nearest-neighbour index over points given by latitude and longitude.
+
+    Points are stored as 3-D unit vectors in a KD-tree (scipy's cKDTree). The straight-line
+    distance between unit vectors grows monotonically with the haversine distance, so
+    nearest and within-radius queries on the tree are exact for great-circle distance, with
+    no special cases at the antimeridian or the poles. Building is O(n log n) and each
+    query O(log n), instead of comparing every spot with every buoy.
+    """
+
+    def __init__(self, ids, latitudes, longitudes):
+        """
+        Initializes the SpatialIndex object.
+
+        Args:
+            ids (array-like): Identifier of each point (e.g. buoy IDs).
+            latitudes (array-like): Latitudes in degrees.
+            longitudes (array-like): Longitudes in degrees.
+        """
+        self.ids = np.asarray(ids)
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.tree = cKDTree(to_unit_vectors(self.latitudes, self.longitudes)) if len(self.ids) else None
+
+    @classmethod
+    def from_points(cls, points):
+        """Build an index from a dict of ID to (latitude, longitude)."""
+        coordinates = np.asarray(list(points.values()), dtype=float).reshape(-1, 2)
+        return cls(list(points), coordinates[:, 0], coordinates[:, 1])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def nearest(self, latitudes, longitudes, k=1, max_distance_km=None):
+        """
+        Find the k nearest points of many query locations at once.
+
+        Args:
+            latitudes (array-like): Query latitudes in degrees.
+            longitudes (array-like): Query longitudes in degrees.
+            k (int, optional): Number of neighbours per query location.
+            max_distance_km (float, optional): Ignore points farther than this.
+
+        Returns:
+            tuple: (ids, distances_km), both of shape (n, k) ordered nearest first. Missing
+                neighbours (fewer than k points, or beyond max_distance_km) have a distance of
+                inf and an ID of None.
+        """
+        queries = to_unit_vectors(latitudes, longitudes)
+        ids = np.full((len(queries), k), None, dtype=object)
+        distances = np.full((len(queries), k), np.inf)
+        if self.tree is None or not len(queries):
+            return ids, distances
+
+        upper = np.inf if max_distance_km is None else float(km_to_chord(max_distance_km)) * (1 + 1e-12)
+        chords, indices = self.tree.query(queries, k=k, distance_upper_bound=upper)
+        chords, indices = chords.reshape(len(queries), k), indices.reshape(len(queries), k)
+        found = indices < len(self.ids)
+        ids[found] = self.ids[indices[found]]
+        distances[found] = chord_to_km(chords[found])
+        return ids, distances
+
+    def within(self, latitudes, longitudes, radius_km):
+        """
+        Find every point within a radius of many query locations at once.
+
+        Args:
+            latitudes (array-like): Query latitudes in degrees.
+            longitudes (array-like): Query longitudes in degrees.
+            radius_km (float): The search radius.
+
+        Returns:
+            list: For each query location, an (ids, distances_km) tuple ordered nearest first.
+        """
+        queries = to_unit_vectors(latitudes, longitudes)
+        if self.tree is None:
+            return [(self.ids[:0], np.empty(0)) for _ in range(len(queries))]
+
+        chord = float(km_to_chord(radius_km)) * (1 + 1e-12)
+        results = []
+        for query, indices in zip(queries, self.tree.query_ball_point(queries, chord)):
+            indices = np.asarray(indices, dtype=int)
+            distances = chord_to_km(np.linalg.norm(self.tree.data[indices] - query, axis=1))
+            order = np.argsort(distances, kind="stable")
+            results.append((self.ids[indices[order]], distances[order]))
+        return results
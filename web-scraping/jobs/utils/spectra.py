@@ -0,0 +1,176 @@
+# Standard Library Imports
+from collections import namedtuple
+
+# Third-Party Imports
+import numpy as np
+
+# NDBC realtime spectral files: <station>.data_spec holds the spectral energy density (m^2/Hz)
+# per frequency band plus the separation frequency between swell and wind waves, and
+# <station>.swdir the mean wave direction (alpha1, degrees) per band. Every data line is
+#   YY MM DD hh mm [sep_freq] value_1 (freq_1) value_2 (freq_2) ...
+# and the files cover the last 45 days, newest observation first.
+SPECTRA_URL = "https://www.ndbc.noaa.gov/data/realtime2/{buoy_id}.{kind}"
+
+# Placeholders NDBC writes for missing values
+MISSING_VALUE = 999.0
+MISSING_SEPARATION = 9.999
+
+# Arrays are stored as little-endian float32 bytea, so they decode with np.frombuffer
+ARRAY_DTYPE = np.dtype("<f4")
+
+Spectrum = namedtuple("Spectrum", ["timestamps", "frequencies", "values", "separation_frequency"])
+SpectraBatch = namedtuple("SpectraBatch", ["timestamps", "frequencies", "energy", "direction", "separation_frequency"])
+
+def parse_spectral_file(text, has_separation=False):
+    """
+    Parse an NDBC spectral file into arrays with one row per observation.
+
+    The whole file is converted in a single NumPy call; lines whose number of bands differs
+    from the first observation (a station changing its frequency bins) are dropped.
+
+    Args:
+        text (str): The file content.
+        has_separation (bool, optional): Whether lines carry a separation frequency (.data_spec).
+
+    Returns:
+        Spectrum: UTC observation times (datetime64[m]), the band centre frequencies (Hz),
+            the values per observation and band (float32, NaN where missing) and the
+            separation frequencies (or None), ordered oldest first.
+    """
+    lines = [line for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+    if not lines:
+        empty = np.empty((0, 0), dtype=ARRAY_DTYPE)
+        return Spectrum(np.empty(0, dtype="datetime64[m]"), np.empty(0, dtype=ARRAY_DTYPE), empty,
+                        np.empty(0, dtype=ARRAY_DTYPE) if has_separation else None)
+
+    cleaned = [line.replace("(", " ").replace(")", " ") for line in lines]
+    width = len(cleaned[0].split())
+    cleaned = [line for line in cleaned if len(line.split()) == width]
+    table = np.array(" ".join(cleaned).split(), dtype=np.float64).reshape(len(cleaned), width)
+
+    # Dates come first, then (value, frequency) pairs
+    dates = table[:, :5].astype(np.int64)
+    years = np.where(dates[:, 0] < 100, dates[:, 0] + 2000, dates[:, 0])
+    timestamps = (
+        (years - 1970).astype("datetime64[Y]").astype("datetime64[M]")
+        + (dates[:, 1] - 1).astype("timedelta64[M]")
+    ).astype("datetime64[D]") + (dates[:, 2] - 1).astype("timedelta64[D]")
+    timestamps = timestamps.astype("datetime64[m]") + (dates[:, 3] * 60 + dates[:, 4]).astype("timedelta64[m]")
+
+    start = 6 if has_separation else 5
+    values = table[:, start::2].astype(ARRAY_DTYPE)
+    values[values >= MISSING_VALUE] = np.nan
+    frequencies = table[0, start + 1::2].astype(ARRAY_DTYPE)
+    separation = None
+    if has_separation:
+        separation = table[:, 5].astype(ARRAY_DTYPE)
+        separation[np.isclose(separation, MISSING_SEPARATION)] = np.nan
+
+    order = np.argsort(timestamps, kind="stable")
+    return Spectrum(timestamps[order], frequencies, values[order],
+                    separation[order] if separation is not None else None)
+
+def pack_array(values):
+    """Encode a 1-D array as little-endian float32 bytes for a bytea column."""
+    return np.ascontiguousarray(values, dtype=ARRAY_DTYPE).tobytes()
+
+def unpack_array(buffer):
+    """Decode a bytea value (bytes or memoryview) into a read-only float32 array without copying."""
+    return np.frombuffer(buffer, dtype=ARRAY_DTYPE)
+
+def spectra_rows(buoy_id, energy, direction, since=None):
+    """
+    Build ingested.swell_spectra rows from a parsed .data_spec and .swdir file.
+
+    Observations are matched on time; an observation missing from the direction file is
+    stored with NaN directions.
+
+    Args:
+        buoy_id (str): The ID of the buoy.
+        energy (Spectrum): The parsed .data_spec file.
+        direction (Spectrum or None): The parsed .swdir file.
+        since (numpy.datetime64, optional): Only observations after this time are returned.
+
+    Returns:
+        list: Row dicts with the arrays packed as float32 bytes.
+    """
+    keep = np.ones(len(energy.timestamps), dtype=bool) if since is None else energy.timestamps > since
+    timestamps = energy.timestamps[keep]
+    values = energy.values[keep]
+    separation = energy.separation_frequency[keep]
+
+    directions = np.full(values.shape, np.nan, dtype=ARRAY_DTYPE)
+    if direction is not None and len(direction.timestamps) and direction.values.shape[1] == values.shape[1]:
+        index = np.searchsorted(direction.timestamps, timestamps)
+        index = np.minimum(index, len(direction.timestamps) - 1)
+        matched = direction.timestamps[index] == timestamps
+        directions[matched] = direction.values[index[matched]]
+
+    frequencies = pack_array(energy.frequencies)
+    return [
+        {
+            "timestamp": f"{timestamp.astype('datetime64[s]').item():%Y-%m-%d %H:%M:%S}+00",
+            "buoy_id": int(buoy_id),
+            "separation_frequency": None if np.isnan(separation[i]) else float(separation[i]),
+            "frequencies": frequencies,
+            "energy": pack_array(values[i]),
+            "direction": pack_array(directions[i])
+        }
+        for i, timestamp in enumerate(timestamps)
+    ]
+
+def decode_spectra(rows):
+    """
+    Decode (timestamp, separation_frequency, frequencies, energy, direction) rows of one buoy into 2-D arrays.
+
+    The bytea values of all rows are joined once and reinterpreted with np.frombuffer, so
+    no Python work is done per array element.
+
+    Args:
+        rows (list): Rows as selected by read_spectra(), oldest first.
+
+    Returns:
+        SpectraBatch: The observation times, the frequency bins and the energy and
+            direction matrices (observations x bands); the separation frequencies are NaN where missing.
+
+    Raises:
+        ValueError: If the rows do not share the same frequency bins.
+    """
+    if not rows:
+        empty = np.empty((0, 0), dtype=ARRAY_DTYPE)
+        return SpectraBatch([], np.empty(0, dtype=ARRAY_DTYPE), empty, empty, np.empty(0, dtype=ARRAY_DTYPE))
+
+    frequencies = bytes(rows[0][2])
+    if any(bytes(row[2]) != frequencies for row in rows):
+        raise ValueError("Spectra use different frequency bins; read them in separate ranges")
+
+    bands = len(frequencies) // ARRAY_DTYPE.itemsize
+    energy = unpack_array(b"".join(row[3] for row in rows)).reshape(len(rows), bands)
+    direction = unpack_array(b"".join(row[4] for row in rows)).reshape(len(rows), bands)
+    separation = np.array([np.nan if row[1] is None else row[1] for row in rows], dtype=ARRAY_DTYPE)
+    return SpectraBatch([row[0] for row in rows], unpack_array(frequencies), energy, direction, separation)
+
+READ_SPECTRA_QUERY = """
+SELECT timestamp, separation_frequency, frequencies, energy, direction
+FROM ingested.swell_spectra
+WHERE buoy_id = %s AND timestamp >= %s AND timestamp < %s
+ORDER BY timestamp
+"""
+
+def read_spectra(db_connection, buoy_id, start, end):
+    """
+    Read a buoy's spectra between two times as NumPy arrays.
+
+    Args:
+        db_connection (PostgresConnection): An open database connection.
+        buoy_id (int): The ID of the buoy.
+        start (datetime or str): Inclusive start of the range.
+        end (datetime or str): Exclusive end of the range.
+
+    Returns:
+        SpectraBatch or None: The decoded spectra, or None if the query failed.
+    """
+    rows = db_connection.execute_query(READ_SPECTRA_QUERY, (buoy_id, start, end), fetch=True)
+    if rows is None:
+        return None
+    return decode_spectra(rows)
@@ -0,0 +1,225 @@
+# Standard Library Imports
+import glob
+import json
+import os
+import time
+
+# Local Application Imports
+from .state import STATE_DIR
+
+class Spool:
+    """
+    Durable, append-only write-ahead spool for readings that could not be inserted.
+
+    Each failed insert is appended as one JSON line and fsynced before returning, so a
+    reading survives a crash of the job or the node. At the start of the next run the
+    spool is sealed (renamed aside) and replayed as a single idempotent bulk load.
+    Sealed files are only removed once the load has been committed, so a crash during
+    replay simply replays the same rows again on the following run. Rows the database
+    rejects (a constraint violation, a station that no longer exists) are moved to a
+    dead-letter file instead of blocking every record spooled after them.
+
+    Sharded runs of a job each append to their own active file (identified by writer_id)
+    and replay only their own sealed files, since every shard has its own state volume.
+    A run without a writer_id replays every sealed file of the job, including files left
+    by shards that wrote to the same volume.
+    """
+
+    def __init__(self, job_name, spool_dir=None, writer_id=None):
+        """
+        Initializes the Spool object.
+
+        Args:
+            job_name (str): Name of the job owning the spool, used as the file name.
+            spool_dir (str, optional): Directory holding spool files, defaults to <state dir>/spool.
+            writer_id (str, optional): Identifies this writer (e.g. a shard label) when several runs
+                of the job append concurrently.
+        """
+        self.job_name = job_name
+        self.writer_id = writer_id
+        self.spool_dir = spool_dir or os.path.join(STATE_DIR, "spool")
+        file_name = f"{job_name}.{writer_id}.jsonl" if writer_id else f"{job_name}.jsonl"
+        self.path = os.path.join(self.spool_dir, file_name)
+
+    def append(self, table, data):
+        """
+        Durably append a single row destined for a table.
+
+        Args:
+            table (str): The schema-qualified table the row belongs to.
+            data (dict): A dictionary of column-value pairs.
+        """
+        os.makedirs(self.spool_dir, exist_ok=True)
+        line = json.dumps({"table": table, "data": data}, default=str) + "\n"
+
+        with open(self.path, "a+b") as spool_file:
+            # Terminate a line torn by an earlier crash so it cannot swallow this record
+            if spool_file.tell() > 0:
+                spool_file.seek(-1, os.SEEK_END)
+                if spool_file.read(1) != b"\n":
+                    line = "\n" + line
+            spool_file.write(line.encode("utf-8"))
+            spool_file.flush()
+            os.fsync(spool_file.fileno())
+
+    def pending_files(self):
+        """Return the sealed spool files awaiting replay, oldest first."""
+        pattern = f"{self.job_name}.{self.writer_id}.*.replay" if self.writer_id else f"{self.job_name}.*.replay"
+        return sorted(glob.glob(os.path.join(self.spool_dir, pattern)))
+
+    def has_pending(self):
+        """Return True if there is anything to replay."""
+        return os.path.exists(self.path) or bool(self.pending_files())
+
+    def seal(self):
+        """Move the active spool file aside so it can be replayed while new failures start a fresh file."""
+        if os.path.exists(self.path):
+            sealed_name = ".".join(part for part in (self.job_name, self.writer_id, str(time.time_ns())) if part)
+            sealed_path = os.path.join(self.spool_dir, f"{sealed_name}.replay")
+            os.replace(self.path, sealed_path)
+            self._fsync_dir()
+
+    def read_records(self, path):
+        """
+        Read every complete record from a spool file.
+
+        Args:
+            path (str): The spool file to read.
+
+        Returns:
+            tuple: A list of records and the number of unreadable (torn) lines skipped.
+        """
+        records = []
+        skipped = 0
+        with open(path, "r", encoding="utf-8") as spool_file:
+            for line in spool_file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    skipped += 1
+        return records, skipped
+
+    def replay(self, db_connection, logger, page_size=1000, transforms=None):
+        """
+        Replay every sealed spool file as one batched, idempotent bulk load.
+
+        Rows that already exist in the target table are skipped, so replaying the same
+        file twice is harmless. When a batch fails while the database is reachable, it is
+        bisected to find the rejected rows, which go to a dead-letter file
+        (<job_name>.<time>.dead in the spool directory); the rest are loaded. When the
+        database is unreachable, nothing is removed and the files are replayed next run.
+
+        Args:
+            db_connection (PostgresConnection): An open database connection.
+            logger (Logger): The logger instance to log messages.
+            page_size (int, optional): Maximum number of rows sent per INSERT statement.
+            transforms (dict, optional): Table to a function applied to each of its rows before
+                loading, to upgrade rows spooled by an older version of the job.
+
+        Returns:
+            int: The number of spooled rows loaded, or 0 if nothing was replayed.
+        """
+        self.seal()
+        files = self.pending_files()
+        if not files:
+            return 0
+
+        batches = {}
+        skipped = 0
+        for path in files:
+            records, torn = self.read_records(path)
+            skipped += torn
+            for record in records:
+                data = record["data"]
+                if transforms and record["table"] in transforms:
+                    data = transforms[record["table"]](data)
+                key = (record["table"], tuple(data.keys()))
+                batches.setdefault(key, []).append(data)
+
+        if skipped:
+            logger.log_json("WARNING", "Skipped torn records in spool", {"job_name": self.job_name, "skipped": skipped})
+
+        replayed = 0
+        rejected = []
+        for (table, _), rows in batches.items():
+            try:
+                replayed += self._load(db_connection, table, rows, page_size, rejected)
+            except ConnectionError:
+                logger.log_json("ERROR", "Failed to replay spooled data", {"table": table, "rows": len(rows)})
+                return 0
+
+        if rejected:
+            dead_path = self.dead_letter(rejected)
+            logger.log_json("WARNING", "Moved rejected spooled rows to dead-letter file", {
+                "job_name": self.job_name,
+                "rows": len(rejected),
+                "path": dead_path
+            })
+
+        for path in files:
+            os.remove(path)
+        self._fsync_dir()
+
+        logger.log_json("INFO", "Replayed spooled data", {"job_name": self.job_name, "rows": replayed, "files": len(files)})
+        return replayed
+
+    def _load(self, db_connection, table, rows, page_size, rejected):
+        """
+        Load rows into a table, bisecting a failed batch until the rejected rows are isolated.
+
+        Args:
+            db_connection (PostgresConnection): An open database connection.
+            table (str): The schema-qualified target table.
+            rows (list): Rows sharing the same columns.
+            page_size (int): Maximum number of rows sent per INSERT statement.
+            rejected (list): Receives a spool record for every row the database rejected.
+
+        Returns:
+            int: The number of rows loaded.
+
+        Raises:
+            ConnectionError: If a batch failed and the database is not reachable.
+        """
+        if db_connection.insert_many(table, rows, on_conflict="nothing", page_size=page_size):
+            return len(rows)
+        # A failure is only the rows' fault if the database is still answering
+        if not db_connection.execute_query("SELECT 1", fetch=True):
+            raise ConnectionError("PostgreSQL is not reachable")
+        if len(rows) == 1:
+            rejected.append({"table": table, "data": rows[0]})
+            return 0
+
+        middle = len(rows) // 2
+        return (self._load(db_connection, table, rows[:middle], page_size, rejected) +
+                self._load(db_connection, table, rows[middle:], page_size, rejected))
+
+    def dead_letter(self, records):
+        """
+        Durably write rejected records to a new dead-letter file, in the spool's line format.
+
+        Args:
+            records (list): Spool records ({"table": ..., "data": ...}).
+
+        Returns:
+            str: The path of the dead-letter file.
+        """
+        path = os.path.join(self.spool_dir, f"{self.job_name}.{time.time_ns()}.dead")
+        with open(path, "w", encoding="utf-8") as dead_file:
+            for record in records:
+                dead_file.write(json.dumps(record, default=str) + "\n")
+            dead_file.flush()
+            os.fsync(dead_file.fileno())
+        self._fsync_dir()
+        return path
+
+    def _fsync_dir(self):
+        """Flush directory entries so renames and deletes survive a crash."""
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(self.spool_dir, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
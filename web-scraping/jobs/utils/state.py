@@ -0,0 +1,39 @@
+# Standard Library Imports
+import json
+import os
+
+# Local state directory (must be mounted on a persistent volume in the cluster)
+STATE_DIR = os.getenv("SCRAPER_STATE_DIR", "/var/lib/web-scraper")
+
+def load_json(path, default):
+    """
+    Load a JSON state file.
+
+    Args:
+        path (str): The file to read.
+        default: The value returned when the file is missing or unreadable.
+
+    Returns:
+        The decoded JSON document, or the default.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        return default
+
+def save_json(path, data):
+    """
+    Atomically replace a JSON state file, so a crash never leaves a half-written file behind.
+
+    Args:
+        path (str): The file to write.
+        data: A JSON-serializable document.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as state_file:
+        json.dump(data, state_file, default=str)
+        state_file.flush()
+        os.fsync(state_file.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,127 @@
+# Standard Library Imports
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Local Application Imports
+from .state import STATE_DIR, load_json, save_json
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+class StationHealth:
+    """
+    Persisted per-station circuit breaker.
+
+    Tracks consecutive failures, the last success and the last error class of every
+    station. Once a station reaches the failure threshold it is tripped and skipped,
+    then probed again after an exponentially growing backoff. A successful probe
+    closes the breaker.
+    """
+
+    def __init__(self, job_name, path=None, failure_threshold=3, base_backoff_hours=1, max_backoff_hours=168):
+        """
+        Initializes the StationHealth object.
+
+        Args:
+            job_name (str): Name of the job owning the state, used as the file name.
+            path (str, optional): Path of the JSON state file, defaults to <state dir>/health/<job_name>.json.
+            failure_threshold (int, optional): Consecutive failures before a station is tripped.
+            base_backoff_hours (float, optional): Delay before the first probe of a tripped station.
+            max_backoff_hours (float, optional): Upper bound for the probe delay.
+        """
+        self.job_name = job_name
+        self.path = path or os.path.join(STATE_DIR, "health", f"{job_name}.json")
+        self.failure_threshold = failure_threshold
+        self.base_backoff = timedelta(hours=base_backoff_hours)
+        self.max_backoff = timedelta(hours=max_backoff_hours)
+        self.stations = load_json(self.path, {})
+
+    def _state(self, station_id):
+        """Return the mutable state for a station, creating it if needed."""
+        return self.stations.setdefault(str(station_id), {
+            "consecutive_failures": 0,
+            "last_success": None,
+            "last_failure": None,
+            "last_error_class": None,
+            "next_probe_at": None
+        })
+
+    def is_tripped(self, station_id):
+        """Return True if the station has reached the failure threshold."""
+        state = self.stations.get(str(station_id))
+        return bool(state) and state["consecutive_failures"] >= self.failure_threshold
+
+    def should_fetch(self, station_id, now=None):
+        """
+        Decide whether a station should be fetched on this run.
+
+        Args:
+            station_id (str or int): The station identifier.
+            now (datetime, optional): The current time, defaults to datetime.now().
+
+        Returns:
+            bool: False while the station is tripped and its next probe is not yet due.
+        """
+        if not self.is_tripped(station_id):
+            return True
+        now = now or datetime.now()
+        next_probe_at = datetime.strptime(self.stations[str(station_id)]["next_probe_at"], TIMESTAMP_FORMAT)
+        return now >= next_probe_at
+
+    def record_success(self, station_id, now=None):
+        """Record a successful fetch, closing the breaker."""
+        state = self._state(station_id)
+        state["consecutive_failures"] = 0
+        state["last_success"] = (now or datetime.now()).strftime(TIMESTAMP_FORMAT)
+        state["next_probe_at"] = None
+
+    def record_failure(self, station_id, error_class, now=None):
+        """
+        Record a failed fetch and schedule the next probe once the station is tripped.
+
+        Args:
+            station_id (str or int): The station identifier.
+            error_class (str): Short machine-readable failure reason, e.g. "http_404".
+            now (datetime, optional): The current time, defaults to datetime.now().
+        """
+        now = now or datetime.now()
+        state = self._state(station_id)
+        state["consecutive_failures"] += 1
+        state["last_failure"] = now.strftime(TIMESTAMP_FORMAT)
+        state["last_error_class"] = error_class
+
+        if state["consecutive_failures"] >= self.failure_threshold:
+            exponent = state["consecutive_failures"] - self.failure_threshold
+            backoff = min(self.base_backoff * (2 ** min(exponent, 32)), self.max_backoff)
+            state["next_probe_at"] = (now + backoff).strftime(TIMESTAMP_FORMAT)
+
+    def tripped(self):
+        """
+        List the stations that are currently tripped.
+
+        Returns:
+            list: One dictionary per tripped station, sorted by station ID.
+        """
+        return [
+            {"station_id": station_id, **state}
+            for station_id, state in sorted(self.stations.items())
+            if state["consecutive_failures"] >= self.failure_threshold
+        ]
+
+    def save(self):
+        """Persist the health state."""
+        save_json(self.path, self.stations)
+
+    def log_report(self, logger):
+        """Log the stations currently tripped so it is clear what is being skipped and why."""
+        tripped = self.tripped()
+        if tripped:
+            logger.log_json("WARNING", "Stations currently tripped", {"job_name": self.job_name, "stations": tripped})
+
+if __name__ == "__main__":
+    # Usage: python -m utils.station_health <job-name>
+    health = StationHealth(sys.argv[1])
+    print(f"{'STATION':<10} {'FAILURES':>8}  {'ERROR CLASS':<18} {'LAST SUCCESS':<20} {'NEXT PROBE':<20}")
+    for station in health.tripped():
+        print(f"{station['station_id']:<10} {station['consecutive_failures']:>8}  "
+              f"{str(station['last_error_class']):<18} {str(station['last_success']):<20} {station['next_probe_at']:<20}")
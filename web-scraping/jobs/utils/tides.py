@@ -0,0 +1,305 @@
+# Third-Party Imports
+import numpy as np
+import pandas as pd
+
+# Schureman equilibrium arguments V = a*T + b*s + c*h + d*p + e*p1 + offset (degrees), where T is
+# the hour angle of the mean sun, s, h, p the mean longitudes of the moon, sun and lunar perigee
+# and p1 that of the solar perigee, and the nodal group whose factor f and angle u apply.
+CONSTITUENTS = {
+    "M2": ((2, -2, 2, 0, 0), 0, "M2"),
+    "S2": ((2, 0, 0, 0, 0), 0, None),
+    "N2": ((2, -3, 2, 1, 0), 0, "M2"),
+    "K1": ((1, 0, 1, 0, 0), -90, "K1"),
+    "M4": ((4, -4, 4, 0, 0), 0, "M2^2"),
+    "O1": ((1, -2, 1, 0, 0), 90, "O1"),
+    "M6": ((6, -6, 6, 0, 0), 0, "M2^3"),
+    "MK3": ((3, -2, 3, 0, 0), -90, "M2K1"),
+    "S4": ((4, 0, 0, 0, 0), 0, None),
+    "MN4": ((4, -5, 4, 1, 0), 0, "M2^2"),
+    "NU2": ((2, -3, 4, -1, 0), 0, "M2"),
+    "S6": ((6, 0, 0, 0, 0), 0, None),
+    "MU2": ((2, -4, 4, 0, 0), 0, "M2"),
+    "2N2": ((2, -4, 2, 2, 0), 0, "M2"),
+    "OO1": ((1, 2, 1, 0, 0), -90, "OO1"),
+    "LAM2": ((2, -1, 0, 1, 0), 180, "M2"),
+    "J1": ((1, 1, 1, -1, 0), -90, "J1"),
+    "MM": ((0, 1, 0, -1, 0), 0, "MM"),
+    "SSA": ((0, 0, 2, 0, 0), 0, None),
+    "SA": ((0, 0, 1, 0, 0), 0, None),
+    "MSF": ((0, 2, -2, 0, 0), 0, "-M2"),
+    "MF": ((0, 2, 0, 0, 0), 0, "MF"),
+    "RHO1": ((1, -3, 3, -1, 0), 90, "O1"),
+    "Q1": ((1, -3, 1, 1, 0), 90, "O1"),
+    "T2": ((2, 0, -1, 0, 1), 0, None),
+    "R2": ((2, 0, 1, 0, -1), 180, None),
+    "2Q1": ((1, -4, 1, 2, 0), 90, "O1"),
+    "P1": ((1, 0, -1, 0, 0), 90, None),
+    "2SM2": ((2, 2, -2, 0, 0), 0, "-M2"),
+    "M3": ((3, -3, 3, 0, 0), 0, "M2^1.5"),
+    "L2": ((2, -1, 2, -1, 0), 180, "M2"),
+    "2MK3": ((3, -4, 3, 0, 0), 90, "M2^2K1"),
+    "K2": ((2, 0, 2, 0, 0), 0, "K2"),
+    "M8": ((8, -8, 8, 0, 0), 0, "M2^4"),
+    "MS4": ((4, -2, 2, 0, 0), 0, "M2")
+}
+
+# Rates of T, s, h, p and p1 in degrees per hour
+ARGUMENT_SPEEDS = np.array([15.0, 0.5490165321, 0.0410686388, 0.0046418336, 0.0000019610])
+
+# Mean datum offset: stored as constituent Z0 with zero speed (mean sea level above the station datum)
+DATUM_CONSTITUENT = "Z0"
+
+# Stored speeds that differ from the computed ones by more than this (degrees per hour) are rejected
+SPEED_TOLERANCE = 1e-4
+
+# Mean longitudes (degrees) at J2000.0 and their rates (degrees per Julian century), from Meeus
+J2000 = pd.Timestamp("2000-01-01 12:00:00", tz="UTC")
+MEAN_LONGITUDES = {
+    "s": (218.3164477, 481267.88123421),
+    "h": (280.46646, 36000.76983),
+    "p": (83.3532465, 4069.0137287),
+    "N": (125.04452, -1934.136261),
+    "p1": (282.93735, 1.71946)
+}
+
+CONSTITUENTS_QUERY = "SELECT buoy_id, constituent, amplitude, phase, speed FROM reference.tide_constituents"
+
+def to_utc(times):
+    """Convert timestamps (datetimes, ISO 8601 strings or datetime64, naive ones taken as UTC) to a UTC DatetimeIndex."""
+    return pd.DatetimeIndex(pd.to_datetime(times if np.ndim(times) else [times], utc=True, format="ISO8601"))
+
+def astronomical_arguments(times):
+    """
+    Astronomical arguments at each timestamp.
+
+    Args:
+        times (array-like): Timestamps, naive ones taken as UTC.
+
+    Returns:
+        tuple: T, s, h, p, p1 and N in degrees, each an array with one value per timestamp.
+    """
+    days = (to_utc(times) - J2000).total_seconds().to_numpy() / 86400.0
+    centuries = days / 36525.0
+    # T is 180 degrees at midnight UT and the J2000 epoch falls at noon, so T = 360 * fraction of the day
+    hour_angle = 360.0 * (days % 1.0)
+    s, h, p, node, p1 = (
+        (MEAN_LONGITUDES[name][0] + MEAN_LONGITUDES[name][1] * centuries) % 360.0
+        for name in ("s", "h", "p", "N", "p1")
+    )
+    return hour_angle, s, h, p, p1, node
+
+def nodal_corrections(node):
+    """
+    Nodal factors f and angles u (degrees) of each nodal group, from the longitude of the moon's node.
+
+    Args:
+        node (numpy.ndarray): Longitude of the ascending node N in degrees.
+
+    Returns:
+        dict: Group name to (f, u) arrays.
+    """
+    n = np.radians(node)
+    cos_n, cos_2n, cos_3n = np.cos(n), np.cos(2 * n), np.cos(3 * n)
+    sin_n, sin_2n, sin_3n = np.sin(n), np.sin(2 * n), np.sin(3 * n)
+
+    m2 = (1.0004 - 0.0373 * cos_n + 0.0002 * cos_2n, -2.14 * sin_n)
+    k1 = (1.0060 + 0.1150 * cos_n - 0.0088 * cos_2n + 0.0006 * cos_3n, -8.86 * sin_n + 0.68 * sin_2n - 0.07 * sin_3n)
+    groups = {
+        "M2": m2,
+        "K1": k1,
+        "O1": (1.0089 + 0.1871 * cos_n - 0.0147 * cos_2n + 0.0014 * cos_3n,
+               10.80 * sin_n - 1.34 * sin_2n + 0.19 * sin_3n),
+        "K2": (1.0241 + 0.2863 * cos_n + 0.0083 * cos_2n - 0.0015 * cos_3n,
+               -17.74 * sin_n + 0.68 * sin_2n - 0.04 * sin_3n),
+        "J1": (1.1029 + 0.1676 * cos_n - 0.0170 * cos_2n + 0.0016 * cos_3n,
+               -12.94 * sin_n + 1.34 * sin_2n - 0.19 * sin_3n),
+        "OO1": (1.1027 + 0.6504 * cos_n + 0.0317 * cos_2n - 0.0014 * cos_3n,
+                -36.68 * sin_n + 4.02 * sin_2n - 0.57 * sin_3n),
+        "MF": (1.0429 + 0.4135 * cos_n - 0.004 * cos_2n, -23.74 * sin_n + 2.68 * sin_2n - 0.38 * sin_3n),
+        "MM": (1.0 - 0.1300 * cos_n + 0.0013 * cos_2n, np.zeros_like(n)),
+        "-M2": (m2[0], -m2[1]),
+        "M2K1": (m2[0] * k1[0], m2[1] + k1[1]),
+        "M2^2K1": (m2[0] ** 2 * k1[0], 2 * m2[1] - k1[1])
+    }
+    for power in (1.5, 2, 3, 4):
+        groups[f"M2^{power:g}"] = (m2[0] ** power, power * m2[1])
+    return groups
+
+def constituent_speed(name):
+    """The angular speed of a constituent in degrees per hour, from its argument coefficients."""
+    return float(np.dot(CONSTITUENTS[name][0], ARGUMENT_SPEEDS))
+
+def constituent_arguments(names, times):
+    """
+    Nodal factors and phase arguments V + u of constituents at each timestamp, in one pass.
+
+    Args:
+        names (list): Constituent names (keys of CONSTITUENTS).
+        times (array-like): Timestamps, naive ones taken as UTC.
+
+    Returns:
+        tuple: f and V + u in degrees, both arrays of shape (len(names), len(times)).
+    """
+    *arguments, node = astronomical_arguments(times)
+    coefficients = np.array([CONSTITUENTS[name][0] for name in names], dtype=float).reshape(len(names), 5)
+    offsets = np.array([CONSTITUENTS[name][1] for name in names], dtype=float)
+    phase = coefficients @ np.vstack(arguments) + offsets[:, None]
+
+    groups = nodal_corrections(node)
+    f = np.ones_like(phase)
+    for i, name in enumerate(names):
+        group = CONSTITUENTS[name][2]
+        if group:
+            f[i], u = groups[group]
+            phase[i] += u
+    return f, phase % 360.0
+
+class TidePredictor:
+    """
+    Harmonic tide prediction from each station's constituents (reference.tide_constituents).
+
+    The height at time t is Z0 + sum_i f_i A_i cos(V_i + u_i - G_i), where A_i and G_i are a
+    constituent's amplitude and Greenwich phase lag (the NOAA CO-OPS "phase_GMT"), V_i its
+    equilibrium argument from the mean longitudes of the moon and sun, and f_i and u_i its
+    nodal corrections. Arguments are computed once per timestamp for all constituents, and
+    heights for every station in one matrix product, so a week of 6-minute heights for
+    hundreds of stations takes milliseconds and needs no network call. Heights are in the
+    units of the stored amplitudes, above the datum of the stored Z0.
+    """
+
+    def __init__(self, constituents):
+        """
+        Initializes the TidePredictor object.
+
+        Args:
+            constituents (dict): Station ID to a list of (name, amplitude, phase, speed) tuples.
+                Unknown constituents, and those whose speed (degrees per hour, may be None)
+                does not match the name, are skipped and listed in self.skipped.
+        """
+        self.skipped = {}
+        usable = {}
+        for station_id, rows in constituents.items():
+            for name, amplitude, phase, speed in rows:
+                name = name.upper()
+                if name == DATUM_CONSTITUENT or (
+                    name in CONSTITUENTS and (speed is None or abs(constituent_speed(name) - float(speed)) <= SPEED_TOLERANCE)
+                ):
+                    usable.setdefault(station_id, []).append((name, float(amplitude), float(phase)))
+                else:
+                    self.skipped.setdefault(station_id, []).append(name)
+
+        self.station_ids = list(usable)
+        self.positions = {station_id: i for i, station_id in enumerate(self.station_ids)}
+        self.names = sorted({name for rows in usable.values() for name, _, _ in rows if name != DATUM_CONSTITUENT})
+        columns = {name: j for j, name in enumerate(self.names)}
+
+        # Per-station amplitude and phase over the union of constituents (0 amplitude when absent)
+        self.datum = np.zeros(len(self.station_ids))
+        amplitudes = np.zeros((len(self.station_ids), len(self.names)))
+        phases = np.zeros_like(amplitudes)
+        for i, station_id in enumerate(self.station_ids):
+            for name, amplitude, phase in usable[station_id]:
+                if name == DATUM_CONSTITUENT:
+                    self.datum[i] = amplitude
+                else:
+                    amplitudes[i, columns[name]] = amplitude
+                    phases[i, columns[name]] = np.radians(phase)
+        self.cos_terms = amplitudes * np.cos(phases)
+        self.sin_terms = amplitudes * np.sin(phases)
+
+    @classmethod
+    def load(cls, db_connection):
+        """
+        Load every station's constituents from reference.tide_constituents.
+
+        Returns:
+            TidePredictor or None: The predictor, or None if the query failed.
+        """
+        rows = db_connection.execute_query(CONSTITUENTS_QUERY, fetch=True)
+        if rows is None:
+            return None
+        constituents = {}
+        for station_id, name, amplitude, phase, speed in rows:
+            constituents.setdefault(str(station_id), []).append((name, amplitude, phase, speed))
+        return cls(constituents)
+
+    def __contains__(self, station_id):
+        return str(station_id) in self.positions
+
+    def _terms(self, times):
+        """f cos(V + u) and f sin(V + u), each of shape (constituents, times)."""
+        f, phase = constituent_arguments(self.names, times)
+        radians = np.radians(phase)
+        return f * np.cos(radians), f * np.sin(radians)
+
+    def predict(self, station_ids, times):
+        """
+        Tide heights of several stations over the same timestamps.
+
+        Args:
+            station_ids (list): Stations with constituents.
+            times (array-like): Timestamps, naive ones taken as UTC.
+
+        Returns:
+            numpy.ndarray: Heights of shape (len(station_ids), len(times)).
+
+        Raises:
+            KeyError: If a station has no constituents.
+        """
+        rows = [self.positions[str(station_id)] for station_id in station_ids]
+        cos_vu, sin_vu = self._terms(times)
+        # cos(V + u - G) = cos(V + u) cos G + sin(V + u) sin G
+        return self.datum[rows, None] + self.cos_terms[rows] @ cos_vu + self.sin_terms[rows] @ sin_vu
+
+    def predict_at(self, station_ids, times):
+        """
+        Tide heights for pairs of station and timestamp, e.g. one per ingested reading.
+
+        Args:
+            station_ids (list): Station of each reading; stations without constituents get NaN.
+            times (array-like): Timestamp of each reading, naive ones taken as UTC.
+
+        Returns:
+            numpy.ndarray: One height per pair.
+        """
+        rows = np.array([self.positions.get(str(station_id), -1) for station_id in station_ids], dtype=int)
+        heights = np.full(len(rows), np.nan)
+        known = rows >= 0
+        if known.any():
+            cos_vu, sin_vu = self._terms(to_utc(times)[known])
+            rows = rows[known]
+            heights[known] = (self.datum[rows] + np.einsum("ij,ji->i", self.cos_terms[rows], cos_vu)
+                              + np.einsum("ij,ji->i", self.sin_terms[rows], sin_vu))
+        return heights
+
+    def curves(self, start, days, step_minutes, station_ids=None):
+        """
+        Tide curves of stations over the days ahead.
+
+        Args:
+            start (datetime or str): First timestamp, naive taken as UTC.
+            days (float): Length of the curves in days.
+            step_minutes (int): Minutes between heights.
+            station_ids (list, optional): Stations to predict, defaults to all.
+
+        Returns:
+            tuple: The station IDs, the timestamps (DatetimeIndex) and heights of shape (stations, timestamps).
+        """
+        station_ids = list(self.station_ids if station_ids is None else station_ids)
+        times = pd.date_range(to_utc([start])[0], periods=int(days * 1440 // step_minutes), freq=f"{step_minutes}min")
+        return station_ids, times, self.predict(station_ids, times)
+
+def constituents_from_harcon(payload):
+    """
+    Read a NOAA CO-OPS harmonic constituents response (mdapi harcon.json) into constituent rows.
+
+    Args:
+        payload (dict): The decoded response; request it with units=english to match NDBC's tide column (feet).
+
+    Returns:
+        list: (name, amplitude, phase, speed) tuples with the Greenwich phase lag.
+    """
+    return [
+        (entry["name"].upper(), float(entry["amplitude"]), float(entry["phase_GMT"]), float(entry["speed"]))
+        for entry in payload.get("HarmonicConstituents", [])
+    ]
@@ -0,0 +1,253 @@
+# Standard Library Imports
+import json
+from collections import namedtuple
+
+# Third-Party Imports
+import numpy as np
+import pandas as pd
+
+# Rule sets per ingested table.
+#   ranges:       plausible physical range per field; values outside are quarantined
+#   sentinels:    placeholder values some stations report instead of a reading; nulled and flagged
+#   spikes:       largest plausible change from the station's last stored value; larger jumps are flagged
+#   required:     fields that must be present; rows missing one are quarantined
+#   required_any: at least one of these measurements must be present; rows with none are quarantined
+# Swell heights are in feet and periods in seconds (NDBC station pages); wind is in m/s (OpenWeather).
+SWELL_RULES = {
+    "table": "ingested.swell_data",
+    "station_key": "buoy_id",
+    "ranges": {
+        "wave_height": (0, 100),
+        "swell_height": (0, 100),
+        "swell_period": (0, 40),
+        "wind_wave_height": (0, 100),
+        "wind_wave_period": (0, 40),
+        "average_wave_period": (0, 40),
+        "tide": (-20, 20)
+    },
+    "sentinels": (99, 999, 9999),
+    "spikes": {
+        "wave_height": 10,
+        "swell_height": 10,
+        "tide": 4
+    },
+    "required": ["timestamp", "buoy_id"],
+    "required_any": ["wave_height", "swell_height", "swell_period", "tide"]
+}
+
+WIND_RULES = {
+    "table": "ingested.wind_data",
+    "station_key": "spot_id",
+    "ranges": {
+        "wind_speed": (0, 75),
+        "wind_direction": (0, 360),
+        "wind_gust": (0, 100)
+    },
+    "sentinels": (),
+    "spikes": {
+        "wind_speed": 20
+    },
+    "required": ["timestamp", "spot_id", "wind_speed"],
+    "required_any": []
+}
+
+# Rules whose violation keeps a reading out of its table; every other rule only flags it
+QUARANTINE_RULES = ("range", "missing", "missing_all")
+
+LAST_VALUES_QUERY = """
+SELECT DISTINCT ON ({station_key}) {station_key}, {fields}
+FROM {table}
+WHERE timestamp > NOW() - make_interval(hours => %s)
+ORDER BY {station_key}, timestamp DESC
+"""
+
+QUALITY_TABLE = "ingested.data_quality"
+QUALITY_CONFLICT_COLUMNS = ["source_table", "station_id", "timestamp"]
+
+ValidationResult = namedtuple("ValidationResult", ["accepted", "flagged", "quarantined", "counts"])
+
+class Validator:
+    """
+    Checks a whole batch of readings at once before they are inserted.
+
+    All checks are column-wise NumPy/pandas operations over the batch, so validating
+    thousands of readings costs a few milliseconds. Each reading ends up accepted (no
+    issues), flagged (inserted, with the violated rules recorded in ingested.data_quality)
+    or quarantined (kept out of its table and stored in ingested.data_quality instead).
+    """
+
+    def __init__(self, rules, lookback_hours=24):
+        """
+        Initializes the Validator object.
+
+        Args:
+            rules (dict): The rule set, e.g. SWELL_RULES or WIND_RULES.
+            lookback_hours (int, optional): How far back to look for a station's last stored value.
+        """
+        self.rules = rules
+        self.lookback_hours = lookback_hours
+        self.last_values = pd.DataFrame(columns=list(rules["spikes"]))
+
+    def load_last_values(self, db_connection):
+        """
+        Load each station's last stored value of the spike-checked fields.
+
+        Args:
+            db_connection (PostgresConnection): An open database connection.
+
+        Returns:
+            bool: True if the last values could be loaded.
+        """
+        fields = list(self.rules["spikes"])
+        if not fields:
+            return True
+        query = LAST_VALUES_QUERY.format(station_key=self.rules["station_key"], fields=", ".join(fields),
+                                         table=self.rules["table"])
+        rows = db_connection.execute_query(query, (self.lookback_hours,), fetch=True)
+        if rows is None:
+            return False
+        self.set_last_values({row[0]: dict(zip(fields, row[1:])) for row in rows})
+        return True
+
+    def set_last_values(self, last_values):
+        """Set the last stored values directly, as a dict of station ID to {field: value}."""
+        frame = pd.DataFrame.from_dict(last_values, orient="index", columns=list(self.rules["spikes"]))
+        frame.index = frame.index.map(str)
+        self.last_values = frame.apply(pd.to_numeric, errors="coerce")
+
+    def validate(self, records):
+        """
+        Validate a batch of readings.
+
+        Args:
+            records (list): Reading dicts as produced by the scrapers (numeric fields may be strings).
+
+        Returns:
+            ValidationResult: accepted records, flagged and quarantined (record, rules) pairs,
+                and the number of readings that violated each rule.
+        """
+        if not records:
+            return ValidationResult([], [], [], {})
+
+        frame = pd.DataFrame.from_records(records)
+        ranges = self.rules["ranges"]
+        numeric_fields = [field for field in ranges if field in frame]
+        raw = frame[numeric_fields]
+        values = raw.apply(pd.to_numeric, errors="coerce")
+        present = raw.notna().to_numpy()
+        checks = {}
+
+        # Values that are not numbers or are sentinel placeholders are nulled and flagged
+        unparseable = present & values.isna().to_numpy()
+        sentinel = values.isin(self.rules["sentinels"]).to_numpy() if self.rules["sentinels"] else np.zeros_like(present)
+        nulled = unparseable | sentinel
+        checks["not_numeric"] = unparseable.any(axis=1)
+        checks["sentinel"] = sentinel.any(axis=1)
+        values = values.mask(nulled)
+
+        for field, (low, high) in ranges.items():
+            if field in values:
+                column = values[field]
+                checks[f"range:{field}"] = ((column < low) | (column > high)).to_numpy()
+
+        station_ids = frame[self.rules["station_key"]].astype(str)
+        last = self.last_values.reindex(station_ids.to_numpy())
+        for field, max_delta in self.rules["spikes"].items():
+            if field in values:
+                jump = (values[field].to_numpy() - last[field].to_numpy(dtype=float))
+                checks[f"spike:{field}"] = np.abs(np.nan_to_num(jump, nan=0.0)) > max_delta
+
+        for field in self.rules["required"]:
+            missing = frame[field].isna().to_numpy() if field in frame else np.ones(len(frame), dtype=bool)
+            if field in values:
+                missing |= values[field].isna().to_numpy()
+            checks[f"missing:{field}"] = missing
+
+        required_any = [field for field in self.rules["required_any"] if field in values]
+        if self.rules["required_any"]:
+            checks["missing_all"] = values[required_any].isna().all(axis=1).to_numpy() if required_any \
+                else np.ones(len(frame), dtype=bool)
+
+        if "wind_gust" in values and "wind_speed" in values:
+            checks["gust_below_speed"] = (values["wind_gust"] < values["wind_speed"]).to_numpy()
+
+        names = np.array(list(checks))
+        matrix = np.column_stack([checks[name] for name in names])
+        quarantine = np.array([name.split(":")[0] in QUARANTINE_RULES for name in names])
+        quarantined_rows = (matrix & quarantine).any(axis=1)
+        flagged_rows = matrix.any(axis=1) & ~quarantined_rows
+        counts = {name: int(count) for name, count in zip(names, matrix.sum(axis=0)) if count}
+
+        accepted, flagged, quarantined = [], [], []
+        nulled_rows = nulled.any(axis=1)
+        for i, record in enumerate(records):
+            if nulled_rows[i]:
+                record = {**record, **{field: None for field, is_nulled in zip(numeric_fields, nulled[i]) if is_nulled}}
+            if quarantined_rows[i]:
+                quarantined.append((record, names[matrix[i]].tolist()))
+            elif flagged_rows[i]:
+                flagged.append((record, names[matrix[i]].tolist()))
+            else:
+                accepted.append(record)
+        return ValidationResult(accepted, flagged, quarantined, counts)
+
+    def quality_rows(self, result):
+        """
+        Build the ingested.data_quality rows for the flagged and quarantined readings of a result.
+
+        Returns:
+            list: Row dicts keyed by (source_table, station_id, timestamp).
+        """
+        return [
+            {
+                "source_table": self.rules["table"],
+                "station_id": int(record[self.rules["station_key"]]),
+                "timestamp": record["timestamp"],
+                "status": status,
+                "rules": rules,
+                "record": json.dumps(record, default=str)
+            }
+            for status, issues in (("flagged", result.flagged), ("quarantined", result.quarantined))
+            for record, rules in issues
+            if record.get("timestamp") is not None and record.get(self.rules["station_key"]) is not None
+        ]
+
+    def record_issues(self, db_connection, result, logger, spool=None):
+        """
+        Store the flagged and quarantined readings of a result in ingested.data_quality.
+
+        Args:
+            db_connection (PostgresConnection): An open database connection.
+            result (ValidationResult): The validation outcome.
+            logger (Logger): The logger instance to log messages.
+            spool (Spool, optional): Spool that receives the rows if the write fails.
+
+        Returns:
+            bool: True if the rows were written (or there were none).
+        """
+        rows = self.quality_rows(result)
+        if not rows or db_connection.insert_many(QUALITY_TABLE, rows, on_conflict="update",
+                                                 conflict_columns=QUALITY_CONFLICT_COLUMNS):
+            return True
+
+        logger.log_json("ERROR", "Failed to record data quality issues", {"table": self.rules["table"], "rows": len(rows)})
+        if spool:
+            for row in rows:
+                spool.append(QUALITY_TABLE, row)
+        return False
+
+    def log_summary(self, result, logger):
+        """Log the outcome of a validation with the number of readings that violated each rule."""
+        logger.log_json("INFO", "Validated readings", {
+            "table": self.rules["table"],
+            "accepted": len(result.accepted),
+            "flagged": len(result.flagged),
+            "quarantined": len(result.quarantined),
+            "rules": result.counts
+        })
+        if result.quarantined:
+            station_key = self.rules["station_key"]
+            logger.log_json("WARNING", "Quarantined readings", {
+                "table": self.rules["table"],
+                "readings": [{station_key: record.get(station_key), "rules": rules} for record, rules in result.quarantined]
+            })
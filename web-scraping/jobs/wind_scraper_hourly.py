@@ -1,14 +1,19 @@
 # Standard Library Imports
+import argparse
 import sys
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 
 # Third-Party Imports
 import requests
 
 # Local Application Imports
-from utils import Logger, PostgresConnection
+from utils import (WIND_RULES, Logger, PostgresConnection, QuotaLedger, RedisPublisher, ReferenceSnapshot, RunDeadline, Spool,
+                   Validator, add_shard_arguments, check_shard_arguments, filter_shard, shard_label)
+from utils.archive import ResponseArchive
+from utils.deadline import prioritize
+from utils.state import STATE_DIR, load_json, save_json
 
 # Accessing environment variables for DB connection and API key info
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
@@ -17,39 +22,280 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 
-def fetch_wind_data(latitude, longitude, logger):
-    """Fetch current wind data from OpenWeather API and extract only numeric values.
+# Forecast mode: endpoint (5 day / 3 hour by default, the pro hourly endpoint returns the same shape)
+# and the grid size in degrees used to share one forecast request between nearby spots (0 = one per spot)
+OPENWEATHER_FORECAST_URL = os.getenv("OPENWEATHER_FORECAST_URL", "https://api.openweathermap.org/data/2.5/forecast")
+FORECAST_CELL_DEGREES = float(os.getenv("FORECAST_CELL_DEGREES", "0.1"))
+FORECAST_CONFLICT_COLUMNS = ["spot_id", "forecast_time", "issued_at"]
+
+# Batched current mode: /group returns the current weather of up to GROUP_MAX_LOCATIONS city IDs
+# per call. Each spot's city ID comes from its first /weather response and is cached here.
+OPENWEATHER_GROUP_URL = os.getenv("OPENWEATHER_GROUP_URL", "https://api.openweathermap.org/data/2.5/group")
+GROUP_MAX_LOCATIONS = 20
+LOCATION_CACHE_PATH = os.getenv("OPENWEATHER_LOCATION_CACHE", os.path.join(STATE_DIR, "openweather-locations.json"))
+
+# Kinds of the archived OpenWeather responses (see utils/archive.py and reprocess_archive.py)
+ARCHIVE_KINDS = {"current": "openweather_weather", "forecast": "openweather_forecast", "group": "openweather_group"}
+
+# Seconds between runs, used to pace the OpenWeather quota across the day
+RUN_INTERVAL_SECONDS = float(os.getenv("RUN_INTERVAL_SECONDS", "3600"))
+
+# Run deadline: the last FLUSH_RESERVE_SECONDS of the budget are kept for validating and inserting
+RUN_BUDGET_SECONDS = float(os.getenv("RUN_BUDGET_SECONDS", "3300"))
+FLUSH_RESERVE_SECONDS = float(os.getenv("FLUSH_RESERVE_SECONDS", "120"))
+
+def parse_wind_response(data):
+    """Extract the numeric wind values from an OpenWeather current weather payload.
+
+    Args:
+        data (dict): The decoded response.
+
+    Returns:
+        dict: A dictionary containing wind speed, wind direction, and wind gust (if available).
+
+    Raises:
+        KeyError: If the payload has no wind speed or direction.
+    """
+    wind_speed = data["wind"]["speed"]  # Speed in meters per second
+    wind_direction = data["wind"]["deg"]  # Wind direction in degrees
+    wind_gust = data["wind"].get("gust", None)  # Gust speed (optional)
+
+    return {
+        "wind_speed": wind_speed,
+        "wind_direction": wind_direction,
+        "wind_gust": wind_gust if wind_gust is not None else None  # Insert NULL for missing gust data
+    }
+
+def acquire_call(quota, logger, context):
+    """Take one call from the quota ledger; a denied call is logged and must not be made.
+
+    Args:
+        quota (QuotaLedger or None): The OpenWeather quota ledger, None for no accounting.
+        logger (Logger): The logger instance to log messages.
+        context (dict): Identifies the request in the log.
+
+    Returns:
+        bool: True if the request may be made.
+    """
+    if quota is None or quota.acquire():
+        return True
+    logger.log_json("WARNING", "OpenWeather quota exhausted, request skipped", context)
+    return False
+
+def note_rejection(quota, error):
+    """Stop spending calls for the rest of the run once OpenWeather answers 429 Too Many Requests."""
+    if quota and getattr(getattr(error, "response", None), "status_code", None) == 429:
+        quota.record_rejection()
+
+def fetch_current_weather(latitude, longitude, logger, timeout=None, archive=None, archive_meta=None, quota=None, spot_id=None):
+    """Fetch the OpenWeather current weather payload of a location.
 
     Args:
         latitude (float): Latitude of the location.
         longitude (float): Longitude of the location.
         logger (Logger): The logger instance to log messages.
+        timeout (float, optional): Request timeout in seconds.
+        archive (ResponseArchive, optional): Archive that receives the raw response body.
+        archive_meta (dict, optional): Details stored with the archived body (spot and fetch time).
+        quota (QuotaLedger, optional): Quota ledger the request is taken from.
+        spot_id (int, optional): The spot the location belongs to, logged with failures.
 
     Returns:
-        dict: A dictionary containing wind speed, wind direction, and wind gust (if available).
+        dict or None: The decoded response, or None if the request failed or the quota is exhausted.
     """
+    context = {"latitude": latitude, "longitude": longitude, "spot_id": spot_id}
+    if not acquire_call(quota, logger, context):
+        return None
     url = f"https://api.openweathermap.org/data/2.5/weather?lat={latitude}&lon={longitude}&appid={OPENWEATHER_API_KEY}"
     try:
-        response = requests.get(url)
+        response = requests.get(url, timeout=timeout)
         response.raise_for_status()  # Will raise HTTPError for bad responses (4xx, 5xx)
-        data = response.json()
+        if archive:
+            archive.add(ARCHIVE_KINDS["current"], response.content, archive_meta or {}, logger)
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        note_rejection(quota, e)
+        logger.log_json("ERROR", "Error fetching wind data", {"error": str(e), **context})
+        return None
+
+def fetch_wind_data(latitude, longitude, logger, timeout=None, archive=None, archive_meta=None, quota=None, spot_id=None):
+    """Fetch current wind data from OpenWeather API and extract only numeric values.
 
-        wind_speed = data["wind"]["speed"]  # Speed in meters per second
-        wind_direction = data["wind"]["deg"]  # Wind direction in degrees
-        wind_gust = data["wind"].get("gust", None)  # Gust speed (optional)
+    Args:
+        latitude (float): Latitude of the location.
+        longitude (float): Longitude of the location.
+        logger (Logger): The logger instance to log messages.
+        timeout (float, optional): Request timeout in seconds.
+        archive (ResponseArchive, optional): Archive that receives the raw response body.
+        archive_meta (dict, optional): Details stored with the archived body (spot and fetch time).
+        quota (QuotaLedger, optional): Quota ledger the request is taken from.
+        spot_id (int, optional): The spot the location belongs to, logged with failures.
 
-        return {
-            "wind_speed": wind_speed,
-            "wind_direction": wind_direction,
-            "wind_gust": wind_gust if wind_gust is not None else None  # Insert NULL for missing gust data
-        }
-    except requests.exceptions.RequestException as e:
-        logger.log_json("ERROR", "Error fetching wind data", {"error": str(e), "latitude": latitude, "longitude": longitude})
+    Returns:
+        dict: A dictionary containing wind speed, wind direction, and wind gust (if available).
+    """
+    data = fetch_current_weather(latitude, longitude, logger, timeout, archive, archive_meta, quota, spot_id)
+    if data is None:
         return None
+    try:
+        return parse_wind_response(data)
     except KeyError as e:
-        logger.log_json("ERROR", "Missing key in API response", {"error": str(e), "latitude": latitude, "longitude": longitude})
+        logger.log_json("ERROR", "Missing key in API response",
+                        {"error": str(e), "latitude": latitude, "longitude": longitude, "spot_id": spot_id})
         return None
 
+def split_group_response(payload):
+    """Split an OpenWeather /group payload into per-location wind readings.
+
+    Args:
+        payload (dict): The decoded response.
+
+    Returns:
+        tuple: A dict of city ID to wind data, and the IDs of entries without usable wind data.
+    """
+    readings, missing = {}, []
+    for entry in payload.get("list", []):
+        try:
+            readings[int(entry["id"])] = parse_wind_response(entry)
+        except (KeyError, TypeError, ValueError):
+            missing.append(entry.get("id"))
+    return readings, missing
+
+def fetch_wind_group(location_ids, logger, timeout=None, archive=None, archive_meta=None, quota=None, spot_ids=None):
+    """Fetch the current wind of up to GROUP_MAX_LOCATIONS OpenWeather city IDs in one request.
+
+    Args:
+        location_ids (list): OpenWeather city IDs.
+        logger (Logger): The logger instance to log messages.
+        timeout (float, optional): Request timeout in seconds.
+        archive (ResponseArchive, optional): Archive that receives the raw response body.
+        archive_meta (dict, optional): Details stored with the archived body (spots per city ID and fetch time).
+        quota (QuotaLedger, optional): Quota ledger the request is taken from.
+        spot_ids (list, optional): The spots served by the city IDs, logged with failures.
+
+    Returns:
+        dict or None: City ID to wind data, or None if the request failed or the quota is exhausted.
+    """
+    context = {"location_ids": location_ids, "spot_ids": spot_ids}
+    if not acquire_call(quota, logger, context):
+        return None
+    ids = ",".join(str(location_id) for location_id in location_ids)
+    url = f"{OPENWEATHER_GROUP_URL}?id={ids}&appid={OPENWEATHER_API_KEY}"
+    try:
+        response = requests.get(url, timeout=timeout)
+        response.raise_for_status()
+        if archive:
+            archive.add(ARCHIVE_KINDS["group"], response.content, archive_meta or {}, logger)
+        readings, missing = split_group_response(response.json())
+    except requests.exceptions.RequestException as e:
+        note_rejection(quota, e)
+        logger.log_json("ERROR", "Error fetching grouped wind data", {"error": str(e), **context})
+        return None
+    except ValueError as e:
+        logger.log_json("ERROR", "Invalid grouped wind response", {"error": str(e), **context})
+        return None
+
+    if missing:
+        logger.log_json("WARNING", "Missing wind data for locations", {"location_ids": missing})
+    return readings
+
+def fetch_wind_forecast(latitude, longitude, logger, timeout=None, archive=None, archive_meta=None, quota=None, spot_ids=None):
+    """Fetch the multi-hour wind forecast for a location from the OpenWeather API.
+
+    Args:
+        latitude (float): Latitude of the location.
+        longitude (float): Longitude of the location.
+        logger (Logger): The logger instance to log messages.
+        timeout (float, optional): Request timeout in seconds.
+        archive (ResponseArchive, optional): Archive that receives the raw response body.
+        archive_meta (dict, optional): Details stored with the archived body (spots and issue time).
+        quota (QuotaLedger, optional): Quota ledger the request is taken from.
+        spot_ids (list, optional): The spots of the forecast cell, logged with failures.
+
+    Returns:
+        dict: The forecast payload, or None if the request failed or the quota is exhausted.
+    """
+    context = {"latitude": latitude, "longitude": longitude, "spot_ids": spot_ids}
+    if not acquire_call(quota, logger, context):
+        return None
+    url = f"{OPENWEATHER_FORECAST_URL}?lat={latitude}&lon={longitude}&appid={OPENWEATHER_API_KEY}"
+    try:
+        response = requests.get(url, timeout=timeout)
+        response.raise_for_status()
+        if archive:
+            archive.add(ARCHIVE_KINDS["forecast"], response.content, archive_meta or {}, logger)
+        data = response.json()
+        if not isinstance(data.get("list"), list):
+            raise KeyError("list")
+        return data
+    except requests.exceptions.RequestException as e:
+        note_rejection(quota, e)
+        logger.log_json("ERROR", "Error fetching wind forecast", {"error": str(e), **context})
+        return None
+    except (KeyError, ValueError) as e:
+        logger.log_json("ERROR", "Invalid forecast response", {"error": str(e), **context})
+        return None
+
+def group_spots_by_cell(spots, cell_degrees=FORECAST_CELL_DEGREES):
+    """Group nearby spots so each grid cell needs a single forecast request.
+
+    Args:
+        spots (list): Tuples of (id, latitude, longitude).
+        cell_degrees (float, optional): Grid cell size in degrees, 0 puts every spot in its own cell.
+
+    Returns:
+        list: Tuples of (spot_ids, latitude, longitude) with the cell's mean position, in first-seen order.
+    """
+    cells = {}
+    for spot_id, latitude, longitude in spots:
+        if cell_degrees > 0:
+            key = (int(float(latitude) // cell_degrees), int(float(longitude) // cell_degrees))
+        else:
+            key = spot_id
+        cells.setdefault(key, []).append((spot_id, float(latitude), float(longitude)))
+
+    return [
+        (
+            [spot_id for spot_id, _, _ in members],
+            round(sum(lat for _, lat, _ in members) / len(members), 4),
+            round(sum(lon for _, _, lon in members) / len(members), 4)
+        )
+        for members in cells.values()
+    ]
+
+def flatten_forecast(spot_ids, payload, issued_at):
+    """Flatten a forecast payload into one row per spot and forecast time.
+
+    Args:
+        spot_ids (list): The spots sharing this forecast.
+        payload (dict): The OpenWeather forecast response.
+        issued_at (str): The forecast issue time (the run's hour), part of the row key.
+
+    Returns:
+        list: Rows for ingested.wind_forecast; entries without wind data are skipped.
+    """
+    rows = []
+    for entry in payload.get("list", []):
+        wind = entry.get("wind")
+        if not wind or wind.get("speed") is None or entry.get("dt") is None:
+            continue
+        forecast_time = datetime.fromtimestamp(entry["dt"], tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S%z")
+        for spot_id in spot_ids:
+            rows.append({
+                "spot_id": spot_id,
+                "forecast_time": forecast_time,
+                "issued_at": issued_at,
+                "wind_speed": wind["speed"],
+                "wind_direction": wind.get("deg"),
+                "wind_gust": wind.get("gust")
+            })
+    return rows
+
+def forecast_issue_time(now=None):
+    """Return the run's hour in UTC, so reruns within the hour replace the same forecast rows."""
+    now = now or datetime.now(timezone.utc)
+    return now.replace(minute=0, second=0, microsecond=0).strftime("%Y-%m-%d %H:%M:%S%z")
+
 def get_spot_info(logger):
     """Fetch spot info from the database.
 
@@ -65,15 +311,20 @@ def get_spot_info(logger):
 
     return spots
 
-def insert_wind_data(spot_id, wind_data, logger):
+def insert_wind_data(spot_id, wind_data, logger, spool=None, timestamp=None):
     """Insert wind data into the database.
 
     Args:
         spot_id (int): The spot's unique identifier.
         wind_data (dict): A dictionary containing wind data to be inserted into the database.
         logger (Logger): The logger instance to log messages.
+        spool (Spool, optional): Spool that receives the row if the insert fails, for replay on the next run.
+        timestamp (str, optional): Fetch time of the reading, defaults to now.
+
+    Returns:
+        dict or None: The inserted row, or None if the insert failed.
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     data = {
         "spot_id": spot_id,
         "timestamp": timestamp,
@@ -85,22 +336,394 @@ def insert_wind_data(spot_id, wind_data, logger):
     with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
         if db_connection.insert("ingested.wind_data", data):
             logger.log_json("INFO", "Wind data inserted successfully", {"spot_id": spot_id})
+            return data
+
+    logger.log_json("ERROR", "Failed to insert wind data", {"spot_id": spot_id, "data": data})
+    if spool:
+        spool.append("ingested.wind_data", data)
+        logger.log_json("INFO", "Wind data spooled for replay", {"spot_id": spot_id})
+    return None
+
+def notify_wind_changes(rows, logger):
+    """Announce the inserted wind readings on the ingested_wind_data channel in a single NOTIFY.
+
+    Args:
+        rows (list): The inserted rows, as returned by insert_wind_data().
+        logger (Logger): The logger instance to log messages.
+    """
+    if not rows:
+        return
+
+    with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+        if not db_connection.notify_changes("ingested.wind_data", rows, "spot_id"):
+            logger.log_json("WARNING", "Failed to notify wind data changes", {"rows": len(rows)})
+
+def validate_wind_data(readings, fetched_at, validator, logger, spool=None):
+    """Validate a batch of wind readings before they are inserted.
+
+    Flagged and quarantined readings are recorded in ingested.data_quality; quarantined
+    readings are not returned, so they never reach ingested.wind_data. Each reading is
+    checked at its fetch time, the timestamp it is inserted with.
+
+    Args:
+        readings (list): Tuples of (spot_id, wind_data) as returned by fetch_wind_data().
+        fetched_at (dict): The fetch time of each spot's reading, by spot ID.
+        validator (Validator): Validator configured with WIND_RULES.
+        logger (Logger): The logger instance to log messages.
+        spool (Spool, optional): Spool that receives the data quality rows if they cannot be written.
+
+    Returns:
+        list: Tuples of (spot_id, wind_data) for the accepted and flagged readings.
+    """
+    records = [{"spot_id": spot_id, "timestamp": fetched_at[spot_id], **wind_data} for spot_id, wind_data in readings]
+
+    with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+        if not validator.load_last_values(db_connection):
+            logger.log_json("WARNING", "Could not load last stored wind readings, skipping spike checks")
+        result = validator.validate(records)
+        validator.log_summary(result, logger)
+        validator.record_issues(db_connection, result, logger, spool)
+
+    return [
+        (record["spot_id"], {key: record[key] for key in ("wind_speed", "wind_direction", "wind_gust")})
+        for record in result.accepted + [record for record, _ in result.flagged]
+    ]
+
+def insert_wind_forecast(rows, logger, spool=None):
+    """Write forecast rows in one batched transaction, replacing rows with the same (spot, forecast_time, issued_at).
+
+    Args:
+        rows (list): Rows produced by flatten_forecast().
+        logger (Logger): The logger instance to log messages.
+        spool (Spool, optional): Spool that receives the rows if the write fails, for replay on the next run.
+    """
+    if not rows:
+        return
+
+    with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+        if db_connection.insert_many("ingested.wind_forecast", rows, on_conflict="update",
+                                     conflict_columns=FORECAST_CONFLICT_COLUMNS):
+            logger.log_json("INFO", "Wind forecast inserted successfully", {"rows": len(rows)})
+            db_connection.notify_changes("ingested.wind_forecast", rows, "spot_id", "forecast_time")
+            return
+
+    logger.log_json("ERROR", "Failed to insert wind forecast", {"rows": len(rows)})
+    if spool:
+        for row in rows:
+            spool.append("ingested.wind_forecast", row)
+        logger.log_json("INFO", "Wind forecast spooled for replay", {"rows": len(rows)})
+
+def ingest_forecasts(spots, logger, spool=None, deadline=None, archive=None, quota=None):
+    """Fetch one forecast per grid cell of spots and write every spot's rows in a single batch.
+
+    Args:
+        spots (list): Tuples of (id, latitude, longitude), in fetch order.
+        logger (Logger): The logger instance to log messages.
+        spool (Spool, optional): Spool for rows that cannot be written.
+        deadline (RunDeadline, optional): Run deadline; cells left when it runs out are skipped.
+        archive (ResponseArchive, optional): Archive that receives the raw forecast responses.
+        quota (QuotaLedger, optional): Quota ledger the requests are taken from.
+
+    Returns:
+        list: IDs of the spots skipped at the deadline.
+    """
+    issued_at = forecast_issue_time()
+    cells = group_spots_by_cell(spots)
+    rows, late_spot_ids = [], []
+    for i, (spot_ids, latitude, longitude) in enumerate(cells):
+        timeout = deadline.station_timeout(len(cells) - i) if deadline else None
+        if deadline and timeout is None:
+            late_spot_ids = [spot_id for cell in cells[i:] for spot_id in cell[0]]
+            break
+        payload = fetch_wind_forecast(latitude, longitude, logger, timeout, archive,
+                                      {"spot_ids": spot_ids, "issued_at": issued_at}, quota, spot_ids)
+        if payload:
+            rows.extend(flatten_forecast(spot_ids, payload, issued_at))
         else:
-            logger.log_json("ERROR", "Failed to insert wind data", {"spot_id": spot_id, "data": data})
+            logger.log_json("WARNING", "Failed to retrieve wind forecast", {"spot_ids": spot_ids})
 
-if __name__ == "__main__":
-    with Logger(job_name="wind-scraper-hourly") as logger:
-        spots = get_spot_info(logger)
+    logger.log_json("INFO", "Fetched wind forecasts", {"spots": len(spots), "requests": len(cells), "rows": len(rows)})
+    insert_wind_forecast(rows, logger, spool)
+    return late_spot_ids
 
-        if not spots:
-            logger.log_json("WARNING", "No spot information to process wind data for")
+def get_reference(logger):
+    """Load the reference data snapshot, re-reading the reference tables only if they changed since it was saved.
+
+    Returns:
+        ReferenceSnapshot: The buoys, spots and spot-buoy links.
+    """
+    reference = ReferenceSnapshot()
+    with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+        reference.refresh(db_connection, logger)
+
+    if not reference.loaded:
+        logger.log_json("WARNING", "No reference data snapshot available, fetching in default order")
+    return reference
+
+def fetch_wind_per_spot(spots, logger, deadline, archive=None, quota=None):
+    """Fetch the current wind of every spot with one /weather request per spot.
+
+    Args:
+        spots (list): Tuples of (id, latitude, longitude), in fetch order.
+        logger (Logger): The logger instance to log messages.
+        deadline (RunDeadline): Run deadline; spots left when it runs out are skipped.
+        archive (ResponseArchive, optional): Archive that receives the raw responses.
+        quota (QuotaLedger, optional): Quota ledger the requests are taken from.
+
+    Returns:
+        tuple: (spot_id, wind_data) readings, the fetch time of each spot, and the IDs of the spots skipped at the deadline.
+    """
+    readings, fetched_at = [], {}
+    for i, spot in enumerate(spots):
+        spot_id = spot[0]
+        latitude, longitude = spot[1], spot[2]
+        timeout = deadline.station_timeout(len(spots) - i)
+        if timeout is None:
+            return readings, fetched_at, [spot[0] for spot in spots[i:]]
+        # The fetch time is the reading's timestamp, so reprocessing an archived response overwrites the same row
+        fetched_at[spot_id] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        wind_data = fetch_wind_data(latitude, longitude, logger, timeout, archive,
+                                    {"spot_id": spot_id, "timestamp": fetched_at[spot_id]}, quota, spot_id)
+
+        if wind_data:
+            readings.append((spot_id, wind_data))
+        else:
+            logger.log_json("WARNING", "Failed to retrieve or insert wind data", {"spot_id": spot_id})
+    return readings, fetched_at, []
 
-        for spot in spots:
-            spot_id = spot[0]
-            latitude, longitude = spot[1], spot[2]
-            wind_data = fetch_wind_data(latitude, longitude, logger)
+def fetch_wind_batched(spots, logger, deadline, archive=None, cache_path=LOCATION_CACHE_PATH, quota=None):
+    """Fetch the current wind of every spot with grouped /group requests.
 
-            if wind_data:
-                insert_wind_data(spot_id, wind_data, logger)
+    Spots are mapped to the OpenWeather city ID that /weather reports for their coordinates.
+    A spot without a cached ID (new or moved) gets one /weather request, which provides both
+    its ID and this run's reading. Every other spot is served by one /group request per
+    GROUP_MAX_LOCATIONS distinct city IDs, so spots near the same town share a location.
+    Spots for which OpenWeather reports no city (ID 0, e.g. offshore) are fetched one by one.
+
+    Args:
+        spots (list): Tuples of (id, latitude, longitude), in fetch order.
+        logger (Logger): The logger instance to log messages.
+        deadline (RunDeadline): Run deadline; requests left when it runs out are skipped.
+        archive (ResponseArchive, optional): Archive that receives the raw responses.
+        cache_path (str, optional): The spot-to-city-ID cache file.
+        quota (QuotaLedger, optional): Quota ledger the requests are taken from.
+
+    Returns:
+        tuple: (spot_id, wind_data) readings, the fetch time of each spot, and the IDs of the spots skipped at the deadline.
+    """
+    cache = load_json(cache_path, {})
+    readings, fetched_at, late_spot_ids = [], {}, []
+    grouped, single = {}, []
+    for spot in spots:
+        entry = cache.get(str(spot[0]))
+        if entry and [entry["latitude"], entry["longitude"]] == [float(spot[1]), float(spot[2])]:
+            if entry["location_id"]:
+                grouped.setdefault(entry["location_id"], []).append(spot[0])
             else:
-                logger.log_json("WARNING", "Failed to retrieve or insert wind data", {"spot_id": spot_id})
+                single.append(spot)
+        else:
+            cache.pop(str(spot[0]), None)
+            single.append(spot)
+
+    locations = list(grouped)
+    batches = [locations[i:i + GROUP_MAX_LOCATIONS] for i in range(0, len(locations), GROUP_MAX_LOCATIONS)]
+    requests_made = 0
+    for i, batch in enumerate(batches):
+        timeout = deadline.station_timeout(len(batches) - i + len(single))
+        if timeout is None:
+            late_spot_ids = [spot_id for location_id in locations[i * GROUP_MAX_LOCATIONS:] for spot_id in grouped[location_id]]
+            late_spot_ids += [spot[0] for spot in single]
+            single = []
+            break
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        meta = {"locations": {str(location_id): grouped[location_id] for location_id in batch}, "timestamp": timestamp}
+        spot_ids = [spot_id for location_id in batch for spot_id in grouped[location_id]]
+        wind_by_location = fetch_wind_group(batch, logger, timeout, archive, meta, quota, spot_ids) or {}
+        requests_made += 1
+        for location_id in batch:
+            for spot_id in grouped[location_id]:
+                if location_id in wind_by_location:
+                    readings.append((spot_id, wind_by_location[location_id]))
+                    fetched_at[spot_id] = timestamp
+                else:
+                    logger.log_json("WARNING", "Failed to retrieve or insert wind data", {"spot_id": spot_id})
+
+    for i, (spot_id, latitude, longitude) in enumerate(single):
+        timeout = deadline.station_timeout(len(single) - i)
+        if timeout is None:
+            late_spot_ids += [spot[0] for spot in single[i:]]
+            break
+        fetched_at[spot_id] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        data = fetch_current_weather(latitude, longitude, logger, timeout, archive,
+                                     {"spot_id": spot_id, "timestamp": fetched_at[spot_id]}, quota, spot_id)
+        requests_made += 1
+        if data is None:
+            logger.log_json("WARNING", "Failed to retrieve or insert wind data", {"spot_id": spot_id})
+            continue
+        cache[str(spot_id)] = {"location_id": int(data.get("id") or 0),
+                               "latitude": float(latitude), "longitude": float(longitude)}
+        try:
+            readings.append((spot_id, parse_wind_response(data)))
+        except KeyError as e:
+            logger.log_json("ERROR", "Missing key in API response", {"error": str(e), "spot_id": spot_id})
+
+    save_json(cache_path, cache)
+    logger.log_json("INFO", "Fetched wind data in batches", {
+        "spots": len(spots),
+        "requests": requests_made,
+        "locations": len(locations),
+        "readings": len(readings)
+    })
+    return readings, fetched_at, late_spot_ids
+
+def estimate_requests(spots, mode="current", batched=False, location_cache=None):
+    """Estimate the OpenWeather requests a run over these spots makes.
+
+    Args:
+        spots (list): Tuples of (id, latitude, longitude).
+        mode (str, optional): "current" or "forecast".
+        batched (bool, optional): Whether current conditions are fetched with /group requests.
+        location_cache (dict, optional): The spot-to-city-ID cache of batched mode.
+
+    Returns:
+        int: One request per forecast cell, per spot, or per GROUP_MAX_LOCATIONS cached city IDs
+            plus one per uncached spot in batched mode.
+    """
+    if mode == "forecast":
+        return len(group_spots_by_cell(spots))
+    if not batched:
+        return len(spots)
+
+    locations, single = set(), 0
+    for spot_id, latitude, longitude in spots:
+        entry = (location_cache or {}).get(str(spot_id))
+        if entry and entry["location_id"] and [entry["latitude"], entry["longitude"]] == [float(latitude), float(longitude)]:
+            locations.add(entry["location_id"])
+        else:
+            single += 1
+    return -(-len(locations) // GROUP_MAX_LOCATIONS) + single
+
+def replay_spooled_data(spool, logger):
+    """Replay wind data spooled by earlier runs that could not reach the database.
+
+    Args:
+        spool (Spool): The spool holding rows from failed inserts.
+        logger (Logger): The logger instance to log messages.
+    """
+    if not spool.has_pending():
+        return
+
+    with PostgresConnection(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, logger) as db_connection:
+        spool.replay(db_connection, logger)
+
+def job_name(mode):
+    """Return the job name (log prefix and spool name) of a mode."""
+    return "wind-forecast-hourly" if mode == "forecast" else "wind-scraper-hourly"
+
+def run(logger, mode="current", shard_index=0, shard_count=1, spots=None, archive=None, batched=False, quota=None,
+        reference=None, budget=None):
+    """Run one collection pass: replay the spool, fetch every spot's wind data or forecast, then validate and insert it.
+
+    Args:
+        logger (Logger): The logger instance of the run.
+        mode (str, optional): "current" for current conditions or "forecast" for the multi-hour forecast.
+        shard_index (int, optional): The shard processed by this run.
+        shard_count (int, optional): The total number of shards.
+        spots (list, optional): All spots as (id, latitude, longitude), taken from the reference data snapshot if not given.
+        archive (ResponseArchive, optional): Archive for the raw responses, defaults to one if ARCHIVE_RESPONSES is set.
+        batched (bool, optional): Fetch current conditions with grouped /group requests instead of one per spot.
+        quota (QuotaLedger, optional): The OpenWeather quota ledger, defaults to the persisted one.
+        reference (ReferenceSnapshot, optional): Reference data already refreshed for this run, loaded otherwise.
+        budget (float, optional): Run deadline in seconds, defaults to RUN_BUDGET_SECONDS.
+    """
+    deadline = RunDeadline(budget or RUN_BUDGET_SECONDS, FLUSH_RESERVE_SECONDS)
+    quota = quota or QuotaLedger(shard_count=shard_count)
+    if archive is None:
+        archive = ResponseArchive.from_env(job_name(mode), shard_index, shard_count)
+    label = shard_label(shard_index, shard_count)
+    spool = Spool(job_name(mode), writer_id=label or None)
+
+    # Every shard replays the spool on its own state volume
+    replay_spooled_data(spool, logger)
+
+    if reference is None:
+        reference = get_reference(logger)
+    if spots is None:
+        spots = reference.spots
+    spots = filter_shard(spots, shard_index, shard_count)
+
+    if not spots:
+        logger.log_json("WARNING", "No spot information to process wind data for")
+
+    # Spots feeding the most buoy links go first, so a run that runs out of time skips the least used ones
+    priorities = reference.spot_priorities
+    spots = prioritize(spots, priorities, key=lambda spot: spot[0])
+
+    # When the quota is tight, only linked spots (or the highest priority ones) are fetched this run.
+    # Priorities are keyed by the spot ID as a string, as in ReferenceSnapshot.spot_priorities.
+    location_cache = load_json(LOCATION_CACHE_PATH, {}) if batched and mode == "current" else None
+    planned, level = quota.ration(spots, lambda items: estimate_requests(items, mode, batched, location_cache),
+                                  linked=lambda spot: priorities.get(str(spot[0]), 0) > 0,
+                                  interval_seconds=RUN_INTERVAL_SECONDS)
+    if level != "normal":
+        planned_ids = {spot[0] for spot in planned}
+        logger.log_json("WARNING", "OpenWeather quota is tight, running in degraded mode", {
+            "level": level,
+            "allowance": int(quota.allowance(RUN_INTERVAL_SECONDS)),
+            "deferred_spot_ids": [spot[0] for spot in spots if spot[0] not in planned_ids]
+        })
+    spots = planned
+
+    late_spot_ids = []
+    if mode == "forecast":
+        if spots:
+            late_spot_ids = ingest_forecasts(spots, logger, spool, deadline, archive, quota)
+    else:
+        if batched:
+            readings, fetched_at, late_spot_ids = fetch_wind_batched(spots, logger, deadline, archive, quota=quota)
+        else:
+            readings, fetched_at, late_spot_ids = fetch_wind_per_spot(spots, logger, deadline, archive, quota)
+
+        # The whole batch is validated at once before anything is inserted
+        inserted, unflushed = [], []
+        if readings:
+            for spot_id, wind_data in validate_wind_data(readings, fetched_at, Validator(WIND_RULES), logger, spool):
+                if deadline.expired:
+                    unflushed.append((spot_id, wind_data))
+                    continue
+                row = insert_wind_data(spot_id, wind_data, logger, spool, fetched_at[spot_id])
+                if row:
+                    inserted.append(row)
+
+        # Past the deadline the remaining readings go to the spool and are inserted by the next run
+        if unflushed:
+            for spot_id, wind_data in unflushed:
+                spool.append("ingested.wind_data", {"spot_id": spot_id, "timestamp": fetched_at[spot_id], **wind_data})
+            logger.log_json("WARNING", "Run deadline reached, spooled remaining wind data",
+                            {"spot_ids": [spot_id for spot_id, _ in unflushed]})
+
+        # Warm the API cache with the readings that were committed
+        RedisPublisher().publish_wind(inserted, logger)
+        notify_wind_changes(inserted, logger)
+
+    logger.log_json("WARNING" if late_spot_ids else "INFO", "Run deadline summary",
+                    {"skipped_spot_ids": late_spot_ids, **deadline.summary()})
+    if archive:
+        archive.save_index(logger)
+
+    quota.save()
+    report = quota.report()
+    logger.log_json("WARNING" if report["denied"] or report["rejected"] else "INFO", "OpenWeather quota use", report)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect wind data from the OpenWeather API.")
+    parser.add_argument("--mode", choices=["current", "forecast"], default="current",
+                        help="Ingest current conditions or the multi-hour forecast")
+    parser.add_argument("--batched", action="store_true",
+                        help="Fetch current conditions for up to 20 locations per request")
+    add_shard_arguments(parser)
+    args = parser.parse_args()
+    check_shard_arguments(parser, args)
+
+    with Logger(job_name=job_name(args.mode), shard_index=args.shard_index, shard_count=args.shard_count) as logger:
+        run(logger, args.mode, args.shard_index, args.shard_count, batched=args.batched)